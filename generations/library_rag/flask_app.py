@@ -34,8 +34,9 @@ SSE Implementation:
 
 Weaviate Connection:
     The application uses a context manager ``get_weaviate_client()`` to handle
-    Weaviate connections. This ensures proper cleanup of connections even when
-    errors occur. The client connects to localhost:8080 (HTTP) and localhost:50051
+    Weaviate connections. Clients are borrowed from the shared connection pool
+    (``memory.core.weaviate_pool``) and returned on exit, even when errors
+    occur. The pool connects to localhost:8080 (HTTP) and localhost:50051
     (gRPC) by default.
 
 Configuration:
@@ -73,6 +74,7 @@ import uuid
 import threading
 import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple, Union
 
@@ -83,6 +85,16 @@ from werkzeug.wrappers import Response as WerkzeugResponse
 import weaviate
 import weaviate.classes.query as wvq
 
+from utils.corpus_catalog import get_corpus_catalog
+from utils.hybrid_search import search_chunks as hybrid_search_chunks
+from utils.rank_fusion import reciprocal_rank_fusion
+from utils.sse_stream import (
+    SessionEventLog,
+    TTLSweeper,
+    TokenCoalescer,
+    iter_event_frames,
+    parse_last_event_id,
+)
 from utils.types import (
     CollectionStats,
     ProcessingOptions,
@@ -93,6 +105,7 @@ from utils.types import (
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
 
 app = Flask(__name__)
 
@@ -118,7 +131,7 @@ ALLOWED_EXTENSIONS = {"pdf", "md", "docx"}
 processing_jobs: Dict[str, Dict[str, Any]] = {}  # {job_id: {"status": str, "queue": Queue, "result": dict}}
 
 # Stockage des sessions de chat en cours
-chat_sessions: Dict[str, Dict[str, Any]] = {}  # {session_id: {"status": str, "queue": Queue, "context": list}}
+chat_sessions: Dict[str, Dict[str, Any]] = {}  # {session_id: {"status": str, "events": SessionEventLog, "context": list}}
 
 # Stockage des jobs TTS en cours
 tts_jobs: Dict[str, Dict[str, Any]] = {}  # {job_id: {"status": str, "filepath": Path, "error": str}}
@@ -126,6 +139,23 @@ tts_jobs: Dict[str, Dict[str, Any]] = {}  # {job_id: {"status": str, "filepath":
 # Stockage des batch jobs (upload multiple)
 batch_jobs: Dict[str, Dict[str, Any]] = {}  # {batch_id: BatchJob dict}
 
+# Éviction des sessions/jobs terminés (JOB_TTL_SECONDS, JOB_MAX_AGE_SECONDS)
+job_sweeper = TTLSweeper({
+    "chat_sessions": chat_sessions,
+    "processing_jobs": processing_jobs,
+    "tts_jobs": tts_jobs,
+    "batch_jobs": batch_jobs,
+})
+JOB_SWEEPER_ENABLED: bool = os.environ.get("JOB_SWEEPER", "1") != "0"
+
+
+@app.before_request
+def start_job_sweeper() -> None:
+    """Start the job sweeper with the first request rather than at import."""
+    if JOB_SWEEPER_ENABLED:
+        job_sweeper.start()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Template Filters
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -157,16 +187,15 @@ def timestamp_to_date(timestamp: float) -> str:
 def get_weaviate_client() -> Generator[Optional[weaviate.WeaviateClient], None, None]:
     """Context manager for Weaviate connection.
 
+    Borrows a long-lived client from the shared connection pool
+    (``memory.core.weaviate_pool``) and gives it back on exit.
+
     Yields:
         WeaviateClient if connection succeeds, None otherwise.
     """
     client: Optional[weaviate.WeaviateClient] = None
     try:
-        client = weaviate.connect_to_local(
-            host="localhost",
-            port=8080,
-            grpc_port=50051,
-        )
+        client = get_weaviate_pool().acquire()
         yield client
     except Exception as e:
         print(f"Erreur connexion Weaviate: {e}")
@@ -179,48 +208,40 @@ def get_weaviate_client() -> Generator[Optional[weaviate.WeaviateClient], None,
                 print(f"Erreur fermeture client Weaviate: {e}")
 
 
-def get_collection_stats() -> Optional[CollectionStats]:
-    """Get statistics about Weaviate collections.
+def _ensure_catalog_fresh() -> bool:
+    """Rebuild the corpus catalog from Weaviate if it is missing or stale.
 
     Returns:
-        CollectionStats with passage counts and unique values, or None on error.
+        True if the catalog can be read, False if a rebuild was needed but
+        Weaviate is unreachable.
+
+    Raises:
+        Exception: Propagates Weaviate query errors from the rebuild.
     """
-    try:
-        with get_weaviate_client() as client:
-            if client is None:
-                return None
+    catalog = get_corpus_catalog()
+    if catalog.is_fresh():
+        return True
+    with get_weaviate_client() as client:
+        if client is None:
+            return False
+        catalog.rebuild(client)
+        return True
 
-            stats: CollectionStats = {}
 
-            # Chunk stats (renamed from Passage)
-            passages = client.collections.get("Chunk")
-            passage_count = passages.aggregate.over_all(total_count=True)
-            stats["passages"] = passage_count.total_count or 0
+def get_collection_stats() -> Optional[CollectionStats]:
+    """Get statistics about Weaviate collections.
 
-            # Get unique authors and works (from direct properties in v2)
-            all_passages = passages.query.fetch_objects(limit=10000)
-            authors: set[str] = set()
-            works: set[str] = set()
-            languages: set[str] = set()
+    Served from the materialized corpus catalog (``utils.corpus_catalog``),
+    which ingestion keeps up to date; Weaviate is only queried when the
+    catalog needs a rebuild.
 
-            for obj in all_passages.objects:
-                props = obj.properties
-                # In v2: workAuthor and workTitle are direct properties
-                if props.get("workAuthor"):
-                    authors.add(str(props["workAuthor"]))
-                if props.get("workTitle"):
-                    works.add(str(props["workTitle"]))
-                if props.get("language"):
-                    languages.add(str(props["language"]))
-
-            stats["authors"] = len(authors)
-            stats["works"] = len(works)
-            stats["languages"] = len(languages)
-            stats["author_list"] = sorted(authors)
-            stats["work_list"] = sorted(works)
-            stats["language_list"] = sorted(languages)
-
-            return stats
+    Returns:
+        CollectionStats with passage counts and unique values, or None on error.
+    """
+    try:
+        if not _ensure_catalog_fresh():
+            return None
+        return get_corpus_catalog().collection_stats()
     except Exception as e:
         print(f"Erreur stats: {e}")
         return None
@@ -277,7 +298,11 @@ def simple_search(
     author_filter: Optional[str] = None,
     work_filter: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    """Single-stage semantic search on Chunk collection (original implementation).
+    """Single-stage search on Chunk collection.
+
+    Uses ``utils.hybrid_search.search_chunks``: exact-reference queries
+    ("CP 5.628", "Ménon 80a") are answered by an index lookup, other
+    queries by vector, BM25 or hybrid search depending on ``SEARCH_MODE``.
 
     Args:
         query: Search query text.
@@ -307,11 +332,12 @@ def simple_search(
             embedder = get_gpu_embedder()
             query_vector = embedder.embed_single(query)
 
-            result = chunks.query.near_vector(
-                near_vector=query_vector.tolist(),
+            hits = hybrid_search_chunks(
+                chunks,
+                query,
+                query_vector,
                 limit=limit,
                 filters=filters,
-                return_metadata=wvq.MetadataQuery(distance=True),
                 return_properties=[
                     "text", "sectionPath", "chapterTitle",
                     "canonicalReference", "unitType", "keywords", "orderIndex", "language"
@@ -320,18 +346,38 @@ def simple_search(
 
             return [
                 {
-                    "uuid": str(obj.uuid),
-                    "distance": obj.metadata.distance if obj.metadata else None,
-                    "similarity": round((1 - obj.metadata.distance) * 100, 1) if obj.metadata and obj.metadata.distance else None,
-                    **obj.properties
+                    "uuid": hit.uuid,
+                    "distance": hit.distance,
+                    "similarity": hit.similarity,
+                    "match": hit.source,
+                    **hit.properties
                 }
-                for obj in result.objects
+                for hit in hits
             ]
     except Exception as e:
         print(f"Erreur recherche: {e}")
         return []
 
 
+# Max concurrent per-section Chunk queries in hierarchical search (stage 2)
+HIERARCHICAL_MAX_WORKERS = 20
+
+
+def _default_vector(obj: Any) -> Optional[List[float]]:
+    """Extract the default vector of a Weaviate object fetched with include_vector.
+
+    Args:
+        obj: Weaviate object returned by a query with ``include_vector=True``.
+
+    Returns:
+        The vector as a list of floats, or None if the object has no vector.
+    """
+    vector = getattr(obj, "vector", None)
+    if isinstance(vector, dict):
+        vector = vector.get("default") or next(iter(vector.values()), None)
+    return list(vector) if vector else None
+
+
 def hierarchical_search(
     query: str,
     limit: int = 10,
@@ -387,6 +433,9 @@ def hierarchical_search(
                 near_vector=query_vector.tolist(),
                 limit=sections_limit,
                 return_metadata=wvq.MetadataQuery(distance=True),
+                # Summary vectors = embeddings of the summary text, reused as
+                # stage-2 query vectors (no re-embedding per section)
+                include_vector=True,
                 # Note: Don't specify return_properties - let Weaviate return all properties
                 # including nested objects like "document" which we need for source_id
             )
@@ -403,9 +452,14 @@ def hierarchical_search(
 
             # Extract section data
             sections_data = []
+            summary_vectors: Dict[str, List[float]] = {}
             for summary_obj in summaries_result.objects:
                 props = summary_obj.properties
 
+                summary_vector = _default_vector(summary_obj)
+                if summary_vector is not None:
+                    summary_vectors[str(summary_obj.uuid)] = summary_vector
+
                 # In v2: Summary has workTitle property, need to get sourceId from Work
                 work_title = props.get("workTitle", "")
 
@@ -498,11 +552,24 @@ def hierarchical_search(
             all_chunks = []
             chunks_per_section = max(3, limit // len(sections_data))  # Distribute chunks across sections
 
-            for section in sections_data:
+            # Query vector per section: the stored Summary vector (embedding of
+            # the summary text). Sections without one are embedded in one batch.
+            section_vectors: List[Optional[List[float]]] = [
+                summary_vectors.get(section["summary_uuid"]) for section in sections_data
+            ]
+            missing = [i for i, vector in enumerate(section_vectors) if vector is None]
+            if missing:
                 # Use section's summary text as query to find relevant chunks
                 # This ensures chunks are semantically related to the section
-                section_query = section["summary_text"] or section["title"] or query
+                missing_queries = [
+                    sections_data[i]["summary_text"] or sections_data[i]["title"] or query
+                    for i in missing
+                ]
+                missing_vectors = embedder.embed_batch(missing_queries)
+                for i, vector in zip(missing, missing_vectors):
+                    section_vectors[i] = vector.tolist()
 
+            def search_section_chunks(section: Dict[str, Any], section_vector: List[float]) -> List[Dict[str, Any]]:
                 # Build filters: base filters (author/work) + sectionPath filter
                 # Use .like() to match hierarchical sections (e.g., "Chapter 1*" matches "Chapter 1 > Section A")
                 # This ensures each chunk only appears in its own section hierarchy
@@ -511,11 +578,8 @@ def hierarchical_search(
                 if base_filters:
                     section_filters = base_filters & section_filters
 
-                # Generate query vector with GPU embedder (Phase 5: manual vectorization)
-                section_query_vector = embedder.embed_single(section_query)
-
                 chunks_result = chunk_collection.query.near_vector(
-                    near_vector=section_query_vector.tolist(),
+                    near_vector=section_vector,
                     limit=chunks_per_section,
                     filters=section_filters,
                     return_metadata=wvq.MetadataQuery(distance=True),
@@ -533,7 +597,16 @@ def hierarchical_search(
                 ]
 
                 print(f"[HIERARCHICAL] Section '{section['section_path'][:50]}...' filter='{section_path_pattern[:50]}...' -> {len(section_chunks)} chunks")
+                return section_chunks
+
+            # Per-section Chunk queries run concurrently (stage-2 latency stays
+            # flat as sections_limit grows); results keep the section order
+            with ThreadPoolExecutor(max_workers=min(HIERARCHICAL_MAX_WORKERS, len(sections_data))) as executor:
+                chunks_per_section_results = list(
+                    executor.map(search_section_chunks, sections_data, section_vectors)
+                )
 
+            for section, section_chunks in zip(sections_data, chunks_per_section_results):
                 section["chunks"] = section_chunks
                 section["chunks_count"] = len(section_chunks)
                 all_chunks.extend(section_chunks)
@@ -1057,11 +1130,13 @@ def rag_search(
             query_vector = embedder.embed_single(query)
 
             # Query with properties needed for RAG context
-            result = chunks.query.near_vector(
-                near_vector=query_vector.tolist(),
+            # (reference lookup, then vector/BM25/hybrid per SEARCH_MODE)
+            hits = hybrid_search_chunks(
+                chunks,
+                query,
+                query_vector,
                 limit=limit,
                 filters=work_filter,
-                return_metadata=wvq.MetadataQuery(distance=True),
                 return_properties=[
                     "text",
                     "workAuthor",  # Top-level author property
@@ -1074,17 +1149,17 @@ def rag_search(
 
             # Format results for RAG prompt construction
             formatted_results = []
-            for obj in result.objects:
-                props = obj.properties
-                similarity = round((1 - obj.metadata.distance) * 100, 1) if obj.metadata and obj.metadata.distance else 0.0
+            for hit in hits:
+                props = hit.properties
 
                 formatted_results.append({
                     "text": props.get("text", ""),
                     "author": props.get("workAuthor", "Auteur inconnu"),
                     "work": props.get("workTitle", "Œuvre inconnue"),
                     "section": props.get("sectionPath") or props.get("chapterTitle") or "Section inconnue",
-                    "similarity": similarity,
-                    "uuid": str(obj.uuid),
+                    "similarity": hit.similarity or 0.0,
+                    "uuid": hit.uuid,
+                    "match": hit.source,
                 })
 
             # Log search metrics
@@ -1513,6 +1588,7 @@ def api_get_works() -> Union[Response, tuple[Response, int]]:
 
     Returns a JSON array of all unique works in the database, sorted by author
     then title. Each work includes the title, author, and number of chunks.
+    Counts are read from the corpus catalog (``utils.corpus_catalog``).
 
     Returns:
         JSON response with array of works:
@@ -1529,45 +1605,18 @@ def api_get_works() -> Union[Response, tuple[Response, int]]:
         Returns: [{"title": "Ménon", "author": "Platon", "chunks_count": 127}, ...]
     """
     try:
-        with get_weaviate_client() as client:
-            if client is None:
-                return jsonify({
-                    "error": "Weaviate connection failed",
-                    "message": "Cannot connect to Weaviate database"
-                }), 500
-
-            # Query Chunk collection to get all unique works with counts
-            chunks = client.collections.get("Chunk")
+        if not _ensure_catalog_fresh():
+            return jsonify({
+                "error": "Weaviate connection failed",
+                "message": "Cannot connect to Weaviate database"
+            }), 500
 
-            # Fetch all chunks to aggregate by work
-            # In v2: work is NOT a nested object, use workTitle and workAuthor properties
-            all_chunks = chunks.query.fetch_objects(limit=10000)
+        # Per-work counts from the corpus catalog, sorted by author then title
+        works_list = get_corpus_catalog().works()
 
-            # Aggregate chunks by work (title + author)
-            works_count: Dict[str, Dict[str, Any]] = {}
+        print(f"[API] /api/get-works: Found {len(works_list)} unique works")
 
-            for obj in all_chunks.objects:
-                props = obj.properties
-                title = props.get("workTitle", "")
-                author = props.get("workAuthor", "")
-
-                if title:  # Only count if title exists
-                    # Use title as key (assumes unique titles)
-                    if title not in works_count:
-                        works_count[title] = {
-                            "title": title,
-                            "author": author or "Unknown",
-                            "chunks_count": 0
-                        }
-                    works_count[title]["chunks_count"] += 1
-
-            # Convert to list and sort by author, then title
-            works_list = list(works_count.values())
-            works_list.sort(key=lambda w: (w["author"].lower(), w["title"].lower()))
-
-            print(f"[API] /api/get-works: Found {len(works_list)} unique works")
-
-            return jsonify(works_list)
+        return jsonify(works_list)
 
     except Exception as e:
         print(f"[API] /api/get-works error: {e}")
@@ -1614,6 +1663,52 @@ def chat() -> str:
 
 
 def rerank_rag_chunks(question: str, chunks: List[Dict[str, Any]], provider: str, model: str) -> List[Dict[str, Any]]:
+    """Re-rank RAG chunks to filter out irrelevant results.
+
+    Dispatches on ``RERANK_MODE`` (see ``utils.reranker``):
+
+    - "cross-encoder" (default): local bge-reranker scores every
+      (question, chunk) pair; chunks below ``RERANKER_THRESHOLD`` are dropped
+      and at most ``RERANKER_TOP_K`` are kept. Falls back to the LLM
+      reranker if the model cannot be loaded or scoring fails. Also used
+      when ``RERANK_MODE`` is invalid.
+    - "llm": ``llm_rerank_rag_chunks`` (one LLM round-trip).
+    - "none": chunks returned unchanged.
+
+    Args:
+        question: The search query.
+        chunks: List of RAG chunks from semantic search.
+        provider: LLM provider name (LLM mode and fallback).
+        model: LLM model name (LLM mode and fallback).
+
+    Returns:
+        Filtered list of relevant chunks, best first in cross-encoder mode.
+    """
+    from utils.reranker import (
+        RERANK_MODE_CROSS_ENCODER, RERANK_MODE_LLM, RERANK_MODE_NONE, get_rerank_mode, get_reranker,
+    )
+
+    try:
+        mode = get_rerank_mode()
+    except ValueError as e:
+        print(f"[Re-ranking] {e}; using {RERANK_MODE_CROSS_ENCODER}")
+        mode = RERANK_MODE_CROSS_ENCODER
+    if mode == RERANK_MODE_NONE or not chunks:
+        return chunks
+    if mode == RERANK_MODE_LLM:
+        return llm_rerank_rag_chunks(question, chunks, provider, model)
+
+    try:
+        start_time = time.time()
+        reranked = get_reranker().rerank(question, chunks)
+        print(f"[Re-ranking] Cross-encoder kept {len(reranked)}/{len(chunks)} chunks in {time.time() - start_time:.2f}s")
+        return reranked
+    except Exception as e:
+        print(f"[Re-ranking] Cross-encoder failed ({e}), falling back to LLM re-ranking")
+        return llm_rerank_rag_chunks(question, chunks, provider, model)
+
+
+def llm_rerank_rag_chunks(question: str, chunks: List[Dict[str, Any]], provider: str, model: str) -> List[Dict[str, Any]]:
     """Re-rank RAG chunks using LLM to filter out irrelevant results.
 
     After semantic search, uses LLM to evaluate which chunks are actually
@@ -1630,7 +1725,7 @@ def rerank_rag_chunks(question: str, chunks: List[Dict[str, Any]], provider: str
 
     Example:
         >>> chunks = rag_search("L'apport de Duns Scotus à Peirce", limit=5)
-        >>> relevant = rerank_rag_chunks("L'apport de Duns Scotus à Peirce", chunks, "mistral", "mistral-small-latest")
+        >>> relevant = llm_rerank_rag_chunks("L'apport de Duns Scotus à Peirce", chunks, "mistral", "mistral-small-latest")
         >>> len(relevant) <= len(chunks)
         True
     """
@@ -1787,6 +1882,74 @@ REFORMULATION EXPANSIVE (4-6 lignes de texte détaillé, sans explication suppl
     return reformulated.strip()
 
 
+# Paramètres de diverse_author_search pour le chat (pool large, 8 auteurs max)
+CHAT_SEARCH_PARAMS: Dict[str, int] = {
+    "limit": 25,  # Get 25 diverse chunks
+    "initial_pool": 200,  # LARGE pool to find all relevant authors (increased from 100)
+    "max_authors": 8,  # Include up to 8 distinct authors (increased from 6)
+    "chunks_per_author": 3,  # Max 3 chunks per author for balance
+}
+
+
+def pipelined_retrieval(
+    question: str,
+    provider: str,
+    model: str,
+    selected_works: List[str],
+    on_first_pool: Optional[Any] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Retrieve on the raw question while the reformulation LLM call runs.
+
+    Pipeline:
+    1. In parallel: ``reformulate_question`` and ``diverse_author_search``
+       on the raw question
+    2. ``on_first_pool(chunks)`` as soon as the raw pool is ready
+    3. ``diverse_author_search`` on the reformulated query
+    4. Merge both pools with reciprocal-rank fusion
+
+    If the reformulation fails or returns the question unchanged, the raw
+    pool is returned as is.
+
+    Args:
+        question: User's original question.
+        provider: LLM provider name (for the reformulation).
+        model: LLM model name.
+        selected_works: Work titles to filter search. Empty = all works.
+        on_first_pool: Optional callback receiving the raw-question pool.
+
+    Returns:
+        Tuple (merged chunks, reformulated question or None).
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reformulation_future = executor.submit(reformulate_question, question, provider, model)
+        raw_future = executor.submit(
+            diverse_author_search, query=question, selected_works=selected_works, **CHAT_SEARCH_PARAMS
+        )
+
+        raw_pool = raw_future.result()
+        print(f"[Pipeline] Raw-question pool ready: {len(raw_pool)} chunks")
+        if on_first_pool is not None:
+            on_first_pool(raw_pool)
+
+        try:
+            reformulated = reformulation_future.result()
+        except Exception as e:
+            print(f"[Pipeline] Reformulation failed, keeping raw pool: {e}")
+            return raw_pool, None
+
+    if not reformulated or reformulated.strip() == question.strip():
+        return raw_pool, None
+
+    reformulated_pool = diverse_author_search(
+        query=reformulated, selected_works=selected_works, **CHAT_SEARCH_PARAMS
+    )
+    merged = reciprocal_rank_fusion(
+        [raw_pool, reformulated_pool], limit=CHAT_SEARCH_PARAMS["limit"]
+    )
+    print(f"[Pipeline] RRF merge: {len(raw_pool)} + {len(reformulated_pool)} -> {len(merged)} chunks")
+    return merged, reformulated
+
+
 def run_chat_generation(
     session_id: str,
     question: str,
@@ -1795,15 +1958,22 @@ def run_chat_generation(
     limit: int,
     use_reformulation: bool = True,
     selected_works: List[str] = None,
+    pipelined: bool = False,
 ) -> None:
     """Execute RAG search and LLM generation in background thread.
 
     Pipeline:
-    1. Reformulate question for optimal RAG search (optional)
-    2. RAG search with chosen question version
+    1. RAG search with chosen question version (or ``pipelined_retrieval``:
+       raw-question search overlapped with the reformulation, RRF merge)
+    2. Re-rank chunks
     3. Build prompt with context
     4. Stream LLM response
 
+    Besides context/token/complete events, a ``timing`` event is emitted
+    just before the first token with the time-to-first-token (``ttft_ms``,
+    measured from the start of the session), and the ``complete`` event
+    carries all stage timings.
+
     Args:
         session_id: Unique session identifier.
         question: User's question (may be original or reformulated).
@@ -1812,9 +1982,17 @@ def run_chat_generation(
         limit: Number of RAG context chunks to retrieve.
         use_reformulation: Whether reformulation was used (for display purposes).
         selected_works: List of work titles to filter search. Empty/None = all works.
+        pipelined: Reformulate server-side while retrieving on the raw question.
     """
     session: Dict[str, Any] = chat_sessions[session_id]
-    q: queue.Queue[Dict[str, Any]] = session["queue"]
+    events: SessionEventLog = session["events"]
+    coalescer = TokenCoalescer(events)
+    started_at: float = session.get("created_at", time.time())
+    timings: Dict[str, float] = {}
+    session["timings"] = timings
+
+    def elapsed_ms() -> float:
+        return round((time.time() - started_at) * 1000, 1)
 
     # Normalize selected_works (None -> empty list)
     if selected_works is None:
@@ -1831,14 +2009,25 @@ def run_chat_generation(
         # Step 1: Diverse author search (avoids corpus imbalance bias)
         # Apply selected_works filter if specified
         session["status"] = "searching"
-        rag_context = diverse_author_search(
-            query=question,
-            limit=25,  # Get 25 diverse chunks
-            initial_pool=200,  # LARGE pool to find all relevant authors (increased from 100)
-            max_authors=8,  # Include up to 8 distinct authors (increased from 6)
-            chunks_per_author=3,  # Max 3 chunks per author for balance
-            selected_works=selected_works  # Filter by selected works (empty = all)
-        )
+        if pipelined:
+            def send_first_pool(chunks: List[Dict[str, Any]]) -> None:
+                # Contexte provisoire : affiché avant la reformulation et le re-ranking
+                timings["first_context_ms"] = elapsed_ms()
+                events.append({"type": "context", "chunks": chunks, "stage": "initial"})
+
+            rag_context, reformulated = pipelined_retrieval(
+                question, provider, model, selected_works, on_first_pool=send_first_pool
+            )
+            if reformulated:
+                session["reformulated"] = reformulated
+                events.append({"type": "reformulation", "original": question, "reformulated": reformulated})
+        else:
+            rag_context = diverse_author_search(
+                query=question,
+                selected_works=selected_works,  # Filter by selected works (empty = all)
+                **CHAT_SEARCH_PARAMS
+            )
+        timings["retrieval_ms"] = elapsed_ms()
 
         print(f"[Pipeline] diverse_author_search returned {len(rag_context)} chunks")
         if rag_context:
@@ -1848,6 +2037,7 @@ def run_chat_generation(
         # Step 1.5: Re-rank chunks to filter out irrelevant results
         session["status"] = "reranking"
         filtered_context = rerank_rag_chunks(question, rag_context, provider, model)
+        timings["rerank_ms"] = elapsed_ms()
 
         print(f"[Pipeline] rerank_rag_chunks returned {len(filtered_context)} chunks")
         if filtered_context:
@@ -1857,9 +2047,12 @@ def run_chat_generation(
         # Send filtered context to client
         context_event: Dict[str, Any] = {
             "type": "context",
-            "chunks": filtered_context
+            "chunks": filtered_context,
+            "stage": "final",
         }
-        q.put(context_event)
+        if "first_context_ms" not in timings:
+            timings["first_context_ms"] = elapsed_ms()
+        events.append(context_event)
 
         # Store context in session
         session["context"] = filtered_context
@@ -1868,36 +2061,41 @@ def run_chat_generation(
         session["status"] = "generating"
         prompt = build_prompt_with_context(question, filtered_context)
 
-        # Step 4: Stream LLM response
+        # Step 4: Stream LLM response (tokens coalesced: ~30 ms or 64 chars per event)
         for token in call_llm(prompt, provider, model, stream=True):
-            token_event: Dict[str, Any] = {
-                "type": "token",
-                "content": token
-            }
-            q.put(token_event)
+            if "ttft_ms" not in timings and token:
+                timings["ttft_ms"] = elapsed_ms()
+                print(f"[Pipeline] Time to first token: {timings['ttft_ms']:.0f} ms (pipelined={pipelined})")
+                events.append({"type": "timing", "ttft_ms": timings["ttft_ms"]})
+            coalescer.add(token)
+        coalescer.flush()
 
         # Send completion event
         session["status"] = "complete"
+        timings["total_ms"] = elapsed_ms()
         complete_event: Dict[str, Any] = {
-            "type": "complete"
+            "type": "complete",
+            "timings": timings,
         }
-        q.put(complete_event)
+        events.append(complete_event)
 
     except LLMError as e:
+        coalescer.flush()
         session["status"] = "error"
         error_event: Dict[str, Any] = {
             "type": "error",
             "message": f"Erreur LLM: {str(e)}"
         }
-        q.put(error_event)
+        events.append(error_event)
 
     except Exception as e:
+        coalescer.flush()
         session["status"] = "error"
         error_event: Dict[str, Any] = {
             "type": "error",
             "message": f"Erreur: {str(e)}"
         }
-        q.put(error_event)
+        events.append(error_event)
 
 
 @app.route("/chat/reformulate", methods=["POST"])
@@ -1979,6 +2177,8 @@ def chat_send() -> tuple[Dict[str, Any], int]:
         limit (int, optional): Number of RAG chunks. Defaults to 5.
         use_reformulation (bool, optional): Use reformulated question. Defaults to True.
         selected_works (list[str], optional): Work titles to filter search. Defaults to [] (all works).
+        pipelined (bool, optional): Skip /chat/reformulate; reformulate server-side while
+            retrieving on the raw question, then merge both pools (RRF). Defaults to False.
 
     Returns:
         JSON response with session_id and status.
@@ -2028,6 +2228,10 @@ def chat_send() -> tuple[Dict[str, Any], int]:
 
     use_reformulation = data.get("use_reformulation", True)
 
+    pipelined = data.get("pipelined", False)
+    if not isinstance(pipelined, bool):
+        return {"error": "pipelined must be a boolean"}, 400
+
     # Extract selected_works filter (list of work titles to search in)
     selected_works = data.get("selected_works", [])
     if not isinstance(selected_works, list):
@@ -2042,17 +2246,18 @@ def chat_send() -> tuple[Dict[str, Any], int]:
     session_id = str(uuid.uuid4())
     chat_sessions[session_id] = {
         "status": "initializing",
-        "queue": queue.Queue(),
+        "events": SessionEventLog(),
         "context": [],
         "question": question,
         "provider": provider,
         "model": model,
+        "created_at": time.time(),
     }
 
     # Start background thread
     thread = threading.Thread(
         target=run_chat_generation,
-        args=(session_id, question, provider, model, limit, use_reformulation, selected_works),
+        args=(session_id, question, provider, model, limit, use_reformulation, selected_works, pipelined),
         daemon=True,
     )
     thread.start()
@@ -2067,17 +2272,22 @@ def chat_send() -> tuple[Dict[str, Any], int]:
 def chat_stream(session_id: str) -> WerkzeugResponse:
     """Server-Sent Events endpoint for streaming LLM responses.
 
-    Streams events from the chat generation background thread to the client
-    using Server-Sent Events (SSE). Events include RAG context, LLM tokens,
-    completion, and errors.
+    Streams events from the session event log to the client using
+    Server-Sent Events (SSE). Every event carries an ``id:`` line; a client
+    reconnecting with ``Last-Event-ID`` (sent automatically by EventSource,
+    or ``?last_event_id=`` for manual resumes) receives only the events it
+    missed. Events include RAG context, LLM tokens, completion, and errors.
 
     Args:
         session_id: Unique session identifier from POST /chat/send.
 
     Event Types:
-        - context: RAG chunks used for generation
-        - token: Individual LLM output token
-        - complete: Generation finished successfully
+        - context: RAG chunks used for generation (``stage``: "initial" for the
+          provisional raw-question pool in pipelined mode, "final" after re-ranking)
+        - reformulation: Server-side reformulation (pipelined mode)
+        - timing: Time to first token (``ttft_ms``), sent before the first token
+        - token: LLM output text (consecutive tokens coalesced, ~30 ms or 64 chars)
+        - complete: Generation finished successfully (with stage ``timings``)
         - error: Error occurred during generation
 
     Returns:
@@ -2087,12 +2297,13 @@ def chat_stream(session_id: str) -> WerkzeugResponse:
         GET /chat/stream/uuid-here
 
         Event stream:
+        id: 1
         data: {"type": "context", "chunks": [...]}
 
-        data: {"type": "token", "content": "La"}
-
-        data: {"type": "token", "content": " philosophie"}
+        id: 2
+        data: {"type": "token", "content": "La philosophie"}
 
+        id: 3
         data: {"type": "complete"}
     """
     if session_id not in chat_sessions:
@@ -2101,40 +2312,21 @@ def chat_stream(session_id: str) -> WerkzeugResponse:
         return Response(error_stream(), mimetype='text/event-stream')
 
     session: Dict[str, Any] = chat_sessions[session_id]
-    q: queue.Queue[Dict[str, Any]] = session["queue"]
+    events: SessionEventLog = session["events"]
+    last_event_id = parse_last_event_id(
+        request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    )
 
     def generate_events() -> Iterator[str]:
-        """Generate SSE events from queue."""
-        last_keepalive = time.time()
-        keepalive_interval = 30  # seconds
-
-        while True:
-            try:
-                # Non-blocking get with timeout for keep-alive
-                try:
-                    event = q.get(timeout=1)
-
-                    # Send event to client
-                    yield f"data: {json.dumps(event)}\n\n"
-
-                    # If complete or error, end stream
-                    if event["type"] in ["complete", "error"]:
-                        break
-
-                except queue.Empty:
-                    # Send keep-alive if needed
-                    now = time.time()
-                    if now - last_keepalive > keepalive_interval:
-                        yield f": keepalive\n\n"
-                        last_keepalive = now
-
-                    # Check if session is stale (no activity for 5 minutes)
-                    if session.get("status") == "error":
-                        break
-
-            except GeneratorExit:
-                # Client disconnected
-                break
+        """Replay missed events, then follow the log until completion."""
+        # Délai de reconnexion automatique du navigateur (ms)
+        yield "retry: 2000\n\n"
+        yield from iter_event_frames(
+            events,
+            last_id=last_event_id,
+            keepalive_interval=30,
+            is_alive=lambda: session.get("status") != "error",
+        )
 
     return Response(
         generate_events(),
@@ -2448,6 +2640,7 @@ def chat_generate_audio() -> tuple[Dict[str, Any], int]:
             "status": "pending",
             "filepath": None,
             "error": None,
+            "created_at": time.time(),
         }
 
         # Launch background thread for audio generation
@@ -2683,6 +2876,7 @@ def run_batch_sequential(
             "result": None,
             "filename": filename,
             "batch_id": batch_id,  # New field to link back to batch
+            "created_at": time.time(),
         }
 
         # 2. Update batch state
@@ -2902,6 +3096,7 @@ def upload() -> str:
             "queue": queue.Queue(),
             "result": None,
             "filename": filename,
+            "created_at": time.time(),
         }
 
         # Démarrer le traitement en background (Word ou PDF)
@@ -3241,7 +3436,7 @@ def delete_document(doc_name: str) -> WerkzeugResponse:
 
     # 1. Supprimer de Weaviate en premier
     from utils.weaviate_ingest import DeleteResult
-    weaviate_result: DeleteResult = delete_document_chunks(doc_name)
+    weaviate_result: DeleteResult = delete_document_chunks(doc_name, output_dir)
 
     if weaviate_result.get("success"):
         deleted_chunks: int = weaviate_result.get("deleted_chunks", 0)
@@ -3386,8 +3581,8 @@ def view_document(doc_name: str) -> Union[str, WerkzeugResponse]:
 def documents() -> str:
     """Render the list of all processed documents.
 
-    Queries Weaviate to get actual document statistics from the database,
-    not from the local files.
+    Document statistics come from the corpus catalog, which mirrors what
+    is actually stored in Weaviate (not the local files).
 
     Returns:
         Rendered HTML template (documents.html) with list of document info.
@@ -3411,68 +3606,31 @@ def documents() -> str:
     output_dir: Path = app.config["UPLOAD_FOLDER"]
     documents_list: List[Dict[str, Any]] = []
 
-    # Query Weaviate to get actual documents and their stats
+    # Per-document stats from the corpus catalog (rebuilt from Weaviate if stale)
     documents_from_weaviate: Dict[str, Dict[str, Any]] = {}
 
-    with get_weaviate_client() as client:
-        if client is not None:
-            from typing import cast
-
-            # Get all Works (now with sourceId added in Phase 1 of migration)
-            try:
-                work_collection = client.collections.get("Work")
-                chunk_collection = client.collections.get("Chunk")
-
-                # Build documents from Work collection
-                for work in work_collection.iterator(include_vector=False):
-                    props = work.properties
-                    source_id = props.get("sourceId")
-
-                    # Skip Works without sourceId (not documents)
-                    if not source_id:
-                        continue
-
-                    documents_from_weaviate[source_id] = {
-                        "source_id": source_id,
-                        "title": props.get("title", "Unknown"),
-                        "author": props.get("author", "Unknown"),
-                        "pages": props.get("pages", 0),
-                        "edition": props.get("edition", ""),
-                        "chunks_count": 0,
-                        "summaries_count": 0,
-                        "authors": set(),
-                    }
-
-                    # Add author to set
-                    if props.get("author") and props.get("author") != "Unknown":
-                        documents_from_weaviate[source_id]["authors"].add(props.get("author"))
-
-                # Count chunks per document (via workTitle)
-                for chunk in chunk_collection.iterator(include_vector=False):
-                    work_title = chunk.properties.get("workTitle")
+    try:
+        if _ensure_catalog_fresh():
+            for entry in get_corpus_catalog().entries():
+                source_id = entry.get("source_id")
 
-                    # Find corresponding sourceId
-                    for source_id, doc_data in documents_from_weaviate.items():
-                        if doc_data["title"] == work_title:
-                            doc_data["chunks_count"] += 1
-                            break
-            except Exception as e:
-                print(f"Warning: Could not load Work collection: {e}")
+                # Skip works without sourceId (not documents)
+                if not source_id:
+                    continue
 
-            # Count summaries (if collection exists)
-            try:
-                summary_collection = client.collections.get("Summary")
-                for summary in summary_collection.iterator(include_vector=False):
-                    work_title = summary.properties.get("workTitle")
-
-                    # Find corresponding sourceId
-                    for source_id, doc_data in documents_from_weaviate.items():
-                        if doc_data["title"] == work_title:
-                            doc_data["summaries_count"] += 1
-                            break
-            except Exception:
-                # Summary collection may not exist
-                pass
+                author = entry.get("author") or "Unknown"
+                documents_from_weaviate[source_id] = {
+                    "source_id": source_id,
+                    "title": entry.get("title") or "Unknown",
+                    "author": author,
+                    "pages": entry.get("pages", 0),
+                    "edition": entry.get("edition", ""),
+                    "chunks_count": entry.get("chunks_count", 0),
+                    "summaries_count": entry.get("summaries_count", 0),
+                    "authors": {author} if author != "Unknown" else set(),
+                }
+    except Exception as e:
+        print(f"Warning: Could not load corpus catalog: {e}")
 
     # Match with local files if they exist
     for source_id, weaviate_data in documents_from_weaviate.items():
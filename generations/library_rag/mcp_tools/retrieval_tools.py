@@ -4,7 +4,7 @@ This module implements semantic search and document retrieval tools that query
 the Weaviate vector database.
 
 Available tools:
-    - search_chunks: Semantic search on text chunks
+    - search_chunks: Hybrid (BM25 + vector) search on text chunks
     - search_summaries: Search in chapter/section summaries
     - get_document: Retrieve document by ID
     - list_documents: List all documents with filtering
@@ -27,10 +27,15 @@ Example:
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
+import threading
 import time
-from contextlib import contextmanager
-from typing import Any, cast, Dict, Generator, List, Mapping, Optional
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncGenerator, cast, Dict, List, Mapping, Optional, Tuple
 
 import weaviate
 from weaviate import WeaviateClient
@@ -69,8 +74,12 @@ from mcp_tools.logging_config import (
     log_weaviate_query,
 )
 
+from utils.hybrid_search import get_search_mode, search_chunks
+from utils.weaviate_ingest import clear_ingest_checkpoint
+
 # GPU embedder for BGE-M3 vectorization (replaces text2vec-transformers)
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
 
 # Logger for this module - uses structured logging
 logger = get_tool_logger("retrieval")
@@ -132,7 +141,6 @@ def extract_canonical_reference(
 
     # Extract leading number/reference from section_path
     # Format: "628. Text..." or "80a. Text..." or "§128. Text..."
-    import re
 
     # Match various formats:
     # - "628. " → "628"
@@ -161,73 +169,182 @@ def extract_canonical_reference(
     return None
 
 
-def get_peirce_volume_from_text(paragraph: int, text_snippet: str) -> Optional[int]:
-    """Find Peirce CP volume by matching paragraph number AND text.
+# Processed Peirce Collected Papers (source of the CP volume index)
+PEIRCE_CHUNKS_FILE = Path(
+    "output/peirce_collected_papers_fixed/peirce_collected_papers_fixed_chunks.json"
+)
 
-    Since paragraphs restart in each volume, we need to match the actual
-    text to find the correct volume.
+# "Peirce: CP X.YYY" (level-1 TOC entries of the Collected Papers)
+_PEIRCE_CP_PATTERN = re.compile(r"Peirce:\s*CP\s+(\d+)\.(\d+)\b")
 
-    Args:
-        paragraph: Paragraph number (e.g., 42)
-        text_snippet: First ~50 chars of text after paragraph number
 
-    Returns:
-        Volume number (1-8) or None if not found.
+class PeirceReferenceIndex:
+    """Paragraph number → CP volume index built from the Peirce chunks file.
 
-    Examples:
-        >>> get_peirce_volume_from_text(42, "My philosophy resuscitates Hegel")
-        5  # Found in Volume 5
+    Paragraph numbers restart in each volume of the Collected Papers, so the
+    index keeps, for every paragraph, the list of ``(volume, text)`` pairs in
+    TOC order, where ``text`` is the lowercased level-2 TOC title following
+    the "Peirce: CP X.YYY" entry (None if there is none).
+
+    The index is built once from the chunks file and cached in a sidecar
+    ``*_cp_index.json`` next to it, so other processes load a few hundred KB
+    instead of parsing the multi-megabyte chunks file. It is rebuilt
+    automatically when the chunks file's mtime or size changes.
+
+    Attributes:
+        chunks_file: Path of the source ``*_chunks.json`` file.
+        index_file: Path of the sidecar index file.
     """
-    import json
-    import re
-    from pathlib import Path
 
-    chunks_file = Path("output/peirce_collected_papers_fixed/peirce_collected_papers_fixed_chunks.json")
-    if not chunks_file.exists():
-        return None
+    def __init__(self, chunks_file: Path) -> None:
+        self.chunks_file = Path(chunks_file)
+        self.index_file = self.chunks_file.with_name(
+            self.chunks_file.name.replace("_chunks.json", "") + "_cp_index.json"
+        )
+        self._paragraphs: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+        self._signature: Optional[Tuple[float, int]] = None
+        self._lock = threading.Lock()
 
-    try:
-        with open(chunks_file, 'r', encoding='utf-8') as f:
+    def _source_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = self.chunks_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+    def _ensure_loaded(self) -> bool:
+        """Load or rebuild the index if the source changed. Returns availability."""
+        signature = self._source_signature()
+        if signature is None:
+            return False
+        if signature == self._signature:
+            return True
+
+        with self._lock:
+            if signature != self._signature:
+                if not self._load_sidecar(signature):
+                    self._build(signature)
+                self._signature = signature
+        return True
+
+    def _load_sidecar(self, signature: Tuple[float, int]) -> bool:
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if [data.get("source_mtime"), data.get("source_size")] != list(signature):
+            return False
+
+        self._paragraphs = {
+            int(paragraph): [(int(volume), text) for volume, text in entries]
+            for paragraph, entries in data.get("paragraphs", {}).items()
+        }
+        return True
+
+    def _build(self, signature: Tuple[float, int]) -> None:
+        logger.info(f"Building Peirce CP index from {self.chunks_file}")
+        with open(self.chunks_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        toc = data.get('metadata', {}).get('toc', [])
-        if not toc:
-            return None
+        toc = data.get("metadata", {}).get("toc", [])
+        paragraphs: Dict[int, List[Tuple[int, Optional[str]]]] = {}
 
-        # Search for entries matching paragraph number
         # TOC structure:
         # - Level 1: "Peirce: CP X.YYY"
         # - Level 2: "YYY. Actual text content..."
-        cp_pattern = re.compile(rf'Peirce:\s*CP\s+(\d+)\.{paragraph}\b')
+        for i, entry in enumerate(toc):
+            cp_match = _PEIRCE_CP_PATTERN.search(entry.get("title", ""))
+            if not cp_match:
+                continue
 
-        # Clean text_snippet for fuzzy matching
-        clean_snippet = text_snippet.lower().strip()
+            text: Optional[str] = None
+            if i + 1 < len(toc) and toc[i + 1].get("level", 0) == 2:
+                text = toc[i + 1].get("title", "").lower()
 
-        for i, entry in enumerate(toc):
-            title = entry.get('title', '')
-            cp_match = cp_pattern.search(title)
-
-            if cp_match:
-                volume = int(cp_match.group(1))
-
-                # Check next entry (Level 2) for actual text
-                if i + 1 < len(toc):
-                    next_entry = toc[i + 1]
-                    next_title = next_entry.get('title', '').lower()
-                    next_level = next_entry.get('level', 0)
-
-                    # Verify it's Level 2 (the content entry)
-                    if next_level == 2:
-                        # Fuzzy match: check if significant words appear
-                        words = [w for w in clean_snippet.split() if len(w) > 3]
-                        if words:
-                            # If first meaningful word matches, found the right volume
-                            if words[0] in next_title:
-                                return volume
+            volume, paragraph = int(cp_match.group(1)), int(cp_match.group(2))
+            paragraphs.setdefault(paragraph, []).append((volume, text))
+
+        self._paragraphs = paragraphs
+
+        # Persist for other processes (best effort: output dir may be read-only)
+        try:
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "source_mtime": signature[0],
+                        "source_size": signature[1],
+                        "paragraphs": {str(p): e for p, e in paragraphs.items()},
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.warning(f"Could not write Peirce CP index {self.index_file}: {e}")
+
+    def volume_for_paragraph(self, paragraph: int) -> Optional[int]:
+        """Return the first volume containing the paragraph, or None."""
+        if not self._ensure_loaded():
+            return None
+        entries = self._paragraphs.get(paragraph)
+        return entries[0][0] if entries else None
+
+    def volume_for_text(self, paragraph: int, text_snippet: str) -> Optional[int]:
+        """Return the volume whose level-2 TOC title contains the snippet's first word."""
+        if not self._ensure_loaded():
+            return None
+
+        # Fuzzy match: first significant word of the snippet in the TOC title
+        words = [w for w in text_snippet.lower().strip().split() if len(w) > 3]
+        if not words:
+            return None
+
+        for volume, text in self._paragraphs.get(paragraph, ()):
+            if text is not None and words[0] in text:
+                return volume
 
         # If no text match, return None (ambiguous)
         return None
 
+
+_peirce_index: Optional[PeirceReferenceIndex] = None
+
+
+def get_peirce_index() -> PeirceReferenceIndex:
+    """Get the process-wide Peirce CP index (built lazily on first lookup).
+
+    Returns:
+        PeirceReferenceIndex for PEIRCE_CHUNKS_FILE.
+    """
+    global _peirce_index
+    if _peirce_index is None:
+        _peirce_index = PeirceReferenceIndex(PEIRCE_CHUNKS_FILE)
+    return _peirce_index
+
+
+def get_peirce_volume_from_text(paragraph: int, text_snippet: str) -> Optional[int]:
+    """Find Peirce CP volume by matching paragraph number AND text.
+
+    Since paragraphs restart in each volume, we need to match the actual
+    text to find the correct volume. Uses the precomputed PeirceReferenceIndex
+    (O(1) lookup by paragraph number).
+
+    Args:
+        paragraph: Paragraph number (e.g., 42)
+        text_snippet: First ~50 chars of text after paragraph number
+
+    Returns:
+        Volume number (1-8) or None if not found.
+
+    Examples:
+        >>> get_peirce_volume_from_text(42, "My philosophy resuscitates Hegel")
+        5  # Found in Volume 5
+    """
+    try:
+        return get_peirce_index().volume_for_text(paragraph, text_snippet)
     except Exception as e:
         logger.error(f"Failed to match Peirce text: {e}")
         return None
@@ -236,7 +353,7 @@ def get_peirce_volume_from_text(paragraph: int, text_snippet: str) -> Optional[i
 def get_peirce_volume_from_paragraph(paragraph: int) -> Optional[int]:
     """Determine Peirce Collected Papers volume from paragraph number.
 
-    Loads TOC from cached chunks file and finds the volume for the paragraph.
+    Uses the precomputed PeirceReferenceIndex built from the chunks file TOC.
 
     Args:
         paragraph: Paragraph number (e.g., 628)
@@ -248,37 +365,12 @@ def get_peirce_volume_from_paragraph(paragraph: int) -> Optional[int]:
         >>> get_peirce_volume_from_paragraph(628)
         1  # Found "Peirce: CP 1.628" in TOC
     """
-    import json
-    import re
-    from pathlib import Path
-
-    # Try to load TOC from cached chunks file
-    chunks_file = Path("output/peirce_collected_papers_fixed/peirce_collected_papers_fixed_chunks.json")
-    if not chunks_file.exists():
-        logger.warning(f"Peirce chunks file not found: {chunks_file}")
+    if not PEIRCE_CHUNKS_FILE.exists():
+        logger.warning(f"Peirce chunks file not found: {PEIRCE_CHUNKS_FILE}")
         return None
 
     try:
-        with open(chunks_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        toc = data.get('metadata', {}).get('toc', [])
-        if not toc:
-            return None
-
-        # Search for "Peirce: CP X.{paragraph}" in TOC
-        # Example: "Peirce: CP 5.628"
-        pattern = re.compile(rf'Peirce:\s*CP\s+(\d+)\.{paragraph}\b')
-
-        for entry in toc:
-            title = entry.get('title', '')
-            match = pattern.search(title)
-            if match:
-                volume = int(match.group(1))
-                return volume
-
-        return None
-
+        return get_peirce_index().volume_for_paragraph(paragraph)
     except Exception as e:
         logger.error(f"Failed to load Peirce TOC: {e}")
         return None
@@ -289,12 +381,13 @@ def get_peirce_volume_from_paragraph(paragraph: int) -> Optional[int]:
 # =============================================================================
 
 
-@contextmanager
-def get_weaviate_client() -> Generator[WeaviateClient, None, None]:
-    """Context manager for Weaviate connection.
+@asynccontextmanager
+async def get_weaviate_client() -> AsyncGenerator[WeaviateClient, None]:
+    """Async context manager for Weaviate connection.
 
-    Establishes a connection to the local Weaviate instance and ensures
-    proper cleanup after use.
+    Borrows a long-lived client from the shared connection pool and returns
+    it to the pool after use. Waiting for a free pooled client happens in a
+    worker thread, so the handler's event loop is never blocked.
 
     Yields:
         WeaviateClient instance.
@@ -303,16 +396,12 @@ def get_weaviate_client() -> Generator[WeaviateClient, None, None]:
         WeaviateConnectionError: If connection to Weaviate fails.
 
     Example:
-        >>> with get_weaviate_client() as client:
+        >>> async with get_weaviate_client() as client:
         ...     chunks = client.collections.get("Chunk")
     """
     client: Optional[WeaviateClient] = None
     try:
-        client = weaviate.connect_to_local(
-            host="localhost",
-            port=8080,
-            grpc_port=50051,
-        )
+        client = await get_weaviate_pool().acquire_async()
         yield client
     except Exception as e:
         logger.error(
@@ -436,11 +525,13 @@ def safe_json_parse(value: Any) -> Optional[Dict[str, Any]]:
 
 
 async def search_chunks_handler(input_data: SearchChunksInput) -> SearchChunksOutput:
-    """Search for text chunks using semantic similarity.
+    """Search for text chunks using hybrid BM25 + semantic similarity.
 
-    Performs a near_text query on the Weaviate Chunk collection to find
-    semantically similar text passages. Supports filtering by author,
-    work title, and language, as well as a minimum similarity threshold.
+    Exact-reference queries ("CP 5.628", "Ménon 80a") are answered by a
+    canonicalReference lookup; other queries run a vector, BM25 or hybrid
+    search on the Weaviate Chunk collection (``SEARCH_MODE``, see
+    ``utils.hybrid_search``). Supports filtering by author, work title,
+    and language, as well as a minimum similarity threshold.
 
     Args:
         input_data: Validated input containing:
@@ -474,7 +565,7 @@ async def search_chunks_handler(input_data: SearchChunksInput) -> SearchChunksOu
 
     with log_tool_invocation("search_chunks", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 chunks = client.collections.get("Chunk")
 
                 # Build filters for nested object properties
@@ -506,34 +597,37 @@ async def search_chunks_handler(input_data: SearchChunksInput) -> SearchChunksOu
                 embedder = get_gpu_embedder()
                 query_vector = embedder.embed_single(input_data.query)
 
-                # Perform near_vector query with timing
+                # Perform reference lookup / hybrid query with timing
                 query_start = time.perf_counter()
-                result = chunks.query.near_vector(
-                    near_vector=query_vector.tolist(),
+                hits = search_chunks(
+                    chunks,
+                    input_data.query,
+                    query_vector,
                     limit=input_data.limit,
                     filters=filters,
-                    return_metadata=wvq.MetadataQuery(distance=True),
                 )
                 query_duration_ms = (time.perf_counter() - query_start) * 1000
+                operation = hits[0].source if hits and hits[0].source == "reference" else get_search_mode()
 
                 # Log Weaviate query
                 log_weaviate_query(
-                    operation="near_vector",
+                    operation=operation,
                     collection="Chunk",
                     filters={
                         "author": input_data.author_filter,
                         "work": input_data.work_filter,
                         "language": input_data.language_filter,
                     },
-                    result_count=len(result.objects),
+                    result_count=len(hits),
                     duration_ms=query_duration_ms,
                 )
 
                 # Convert results to output schema
                 chunk_results: List[ChunkResult] = []
-                for obj in result.objects:
+                for hit in hits:
+                    obj = hit.object
                     # Calculate similarity from distance (Weaviate uses cosine distance)
-                    distance = obj.metadata.distance if obj.metadata else 0.0
+                    distance = hit.distance
                     similarity = 1.0 - (distance if distance else 0.0)
 
                     # Apply min_similarity filter
@@ -636,7 +730,7 @@ async def search_summaries_handler(
 
     with log_tool_invocation("search_summaries", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 summaries = client.collections.get("Summary")
 
                 # Build filters for level constraints
@@ -772,7 +866,7 @@ async def get_document_handler(
 
     with log_tool_invocation("get_document", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 # Use Work collection (Document was merged into Work)
                 works = client.collections.get("Work")
 
@@ -955,7 +1049,7 @@ async def list_documents_handler(
 
     with log_tool_invocation("list_documents", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 # Use Work collection (Document was merged into Work)
                 works_collection = client.collections.get("Work")
 
@@ -1097,7 +1191,7 @@ async def get_chunks_by_document_handler(
 
     with log_tool_invocation("get_chunks_by_document", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 chunks_collection = client.collections.get("Chunk")
 
                 # Build filter for document.sourceId
@@ -1249,7 +1343,7 @@ async def filter_by_author_handler(
 
     with log_tool_invocation("filter_by_author", tool_inputs) as invocation:
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 # Use Work collection (Document was merged into Work)
                 works_collection = client.collections.get("Work")
                 chunks_collection = client.collections.get("Chunk")
@@ -1434,7 +1528,7 @@ async def delete_document_handler(
             return output
 
         try:
-            with get_weaviate_client() as client:
+            async with get_weaviate_client() as client:
                 chunks_deleted = 0
                 summaries_deleted = 0
 
@@ -1521,6 +1615,9 @@ async def delete_document_handler(
 
                 query_duration_ms = (time.perf_counter() - query_start) * 1000
 
+                # Re-processing the document must ingest it again
+                clear_ingest_checkpoint(input_data.source_id)
+
                 log_weaviate_query(
                     operation="delete_many",
                     collection="Chunk,Summary,Work",
@@ -14,12 +14,16 @@ Uses asyncio for async test support and mocks all Weaviate connections.
 """
 
 import asyncio
+import json
+import os
+from pathlib import Path
 from typing import Any, Dict, List
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from mcp_tools.retrieval_tools import (
+    PeirceReferenceIndex,
     delete_document_handler,
     filter_by_author_handler,
     get_chunks_by_document_handler,
@@ -197,6 +201,69 @@ class TestSafeJsonParse:
         assert safe_json_parse("[1, 2, 3]") is None
 
 
+class TestPeirceReferenceIndex:
+    """Tests for the precomputed Peirce CP volume index."""
+
+    @staticmethod
+    def _write_chunks(path: Path, toc: List[Dict[str, Any]]) -> None:
+        path.write_text(
+            json.dumps({"metadata": {"toc": toc}, "chunks": []}), encoding="utf-8"
+        )
+
+    @pytest.fixture
+    def chunks_file(self, tmp_path: Path) -> Path:
+        """Chunks file where paragraph 42 exists in volumes 1 and 5."""
+        path = tmp_path / "peirce_collected_papers_fixed_chunks.json"
+        self._write_chunks(path, [
+            {"title": "Peirce: CP 1.42", "level": 1},
+            {"title": "42. On the classification of sciences", "level": 2},
+            {"title": "Peirce: CP 5.42", "level": 1},
+            {"title": "42. My philosophy resuscitates Hegel", "level": 2},
+            {"title": "Peirce: CP 5.628", "level": 1},
+        ])
+        return path
+
+    def test_volume_for_text_disambiguates(self, chunks_file: Path) -> None:
+        """Test that the text snippet selects the right volume."""
+        index = PeirceReferenceIndex(chunks_file)
+        assert index.volume_for_text(42, "My philosophy resuscitates Hegel") == 5
+        assert index.volume_for_text(42, "On the classification") == 1
+        assert index.volume_for_text(42, "Nothing matching here") is None
+
+    def test_volume_for_paragraph(self, chunks_file: Path) -> None:
+        """Test paragraph-only lookup (first volume in TOC order)."""
+        index = PeirceReferenceIndex(chunks_file)
+        assert index.volume_for_paragraph(628) == 5
+        assert index.volume_for_paragraph(42) == 1
+        assert index.volume_for_paragraph(999) is None
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing chunks file yields None."""
+        index = PeirceReferenceIndex(tmp_path / "missing_chunks.json")
+        assert index.volume_for_paragraph(42) is None
+
+    def test_sidecar_index_reused(self, chunks_file: Path) -> None:
+        """Test that a second index loads the sidecar instead of the chunks file."""
+        PeirceReferenceIndex(chunks_file).volume_for_paragraph(42)
+        assert (chunks_file.parent / "peirce_collected_papers_fixed_cp_index.json").exists()
+
+        index = PeirceReferenceIndex(chunks_file)
+        with patch.object(PeirceReferenceIndex, "_build") as mock_build:
+            assert index.volume_for_text(42, "My philosophy") == 5
+            mock_build.assert_not_called()
+
+    def test_rebuild_on_source_change(self, chunks_file: Path) -> None:
+        """Test that the index is rebuilt when the chunks file changes."""
+        index = PeirceReferenceIndex(chunks_file)
+        assert index.volume_for_paragraph(7) is None
+
+        self._write_chunks(chunks_file, [{"title": "Peirce: CP 3.7", "level": 1}])
+        stat = chunks_file.stat()
+        os.utime(chunks_file, (stat.st_atime, stat.st_mtime + 10))
+
+        assert index.volume_for_paragraph(7) == 3
+
+
 # =============================================================================
 # Fixtures for Weaviate Mocking
 # =============================================================================
@@ -289,8 +356,8 @@ class TestSearchChunksHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchChunksInput(query="justice and virtue", limit=10)
                 result = await search_chunks_handler(input_data)
@@ -320,8 +387,8 @@ class TestSearchChunksHandler:
 
                     mock_collection.query.near_text.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = SearchChunksInput(
                         query="virtue",
@@ -350,8 +417,8 @@ class TestSearchChunksHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchChunksInput(
                     query="virtue",
@@ -376,8 +443,8 @@ class TestSearchChunksHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchChunksInput(query="nonexistent topic")
                 result = await search_chunks_handler(input_data)
@@ -392,10 +459,10 @@ class TestSearchChunksHandler:
 
         async def run_test() -> None:
             with patch("mcp_tools.retrieval_tools.get_weaviate_client") as mock_ctx:
-                mock_ctx.return_value.__enter__ = MagicMock(
+                mock_ctx.return_value.__aenter__ = AsyncMock(
                     side_effect=WeaviateConnectionError("Connection failed")
                 )
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchChunksInput(query="test")
                 with pytest.raises(WeaviateConnectionError):
@@ -424,8 +491,8 @@ class TestSearchSummariesHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchSummariesInput(query="virtue and ethics", limit=5)
                 result = await search_summaries_handler(input_data)
@@ -452,8 +519,8 @@ class TestSearchSummariesHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchSummariesInput(
                     query="virtue",
@@ -479,8 +546,8 @@ class TestSearchSummariesHandler:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchSummariesInput(query="nonexistent")
                 result = await search_summaries_handler(input_data)
@@ -511,8 +578,8 @@ class TestGetDocumentHandler:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = GetDocumentInput(source_id="platon-menon")
                 result = await get_document_handler(input_data)
@@ -539,8 +606,8 @@ class TestGetDocumentHandler:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = GetDocumentInput(source_id="nonexistent-document")
                 result = await get_document_handler(input_data)
@@ -584,8 +651,8 @@ class TestGetDocumentHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = GetDocumentInput(
                         source_id="platon-menon",
@@ -621,8 +688,8 @@ class TestListDocumentsHandler:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = ListDocumentsInput()
                 result = await list_documents_handler(input_data)
@@ -652,8 +719,8 @@ class TestListDocumentsHandler:
 
                     mock_collection.query.fetch_objects.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = ListDocumentsInput(
                         author_filter="Platon",
@@ -683,8 +750,8 @@ class TestListDocumentsHandler:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = ListDocumentsInput(limit=1, offset=1)
                 result = await list_documents_handler(input_data)
@@ -708,8 +775,8 @@ class TestListDocumentsHandler:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = ListDocumentsInput()
                 result = await list_documents_handler(input_data)
@@ -746,8 +813,8 @@ class TestGetChunksByDocumentHandler:
 
                     mock_collection.query.fetch_objects.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = GetChunksByDocumentInput(source_id="test-document")
                     result = await get_chunks_by_document_handler(input_data)
@@ -795,8 +862,8 @@ class TestGetChunksByDocumentHandler:
 
                     mock_collection.query.fetch_objects.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = GetChunksByDocumentInput(source_id="test-document")
                     result = await get_chunks_by_document_handler(input_data)
@@ -827,8 +894,8 @@ class TestGetChunksByDocumentHandler:
 
                     mock_collection.query.fetch_objects.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = GetChunksByDocumentInput(
                         source_id="test-document",
@@ -862,8 +929,8 @@ class TestGetChunksByDocumentHandler:
 
                     mock_collection.query.fetch_objects.return_value = mock_result
                     mock_client.collections.get.return_value = mock_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = GetChunksByDocumentInput(
                         source_id="test-document",
@@ -929,8 +996,8 @@ class TestFilterByAuthorHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = FilterByAuthorInput(author="Platon")
                     result = await filter_by_author_handler(input_data)
@@ -972,8 +1039,8 @@ class TestFilterByAuthorHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = FilterByAuthorInput(author="Unknown Author")
                     result = await filter_by_author_handler(input_data)
@@ -1026,8 +1093,8 @@ class TestFilterByAuthorHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = FilterByAuthorInput(
                         author="Platon", include_chunk_counts=True
@@ -1104,8 +1171,8 @@ class TestDeleteDocumentHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = DeleteDocumentInput(
                         source_id="test-document",
@@ -1126,10 +1193,10 @@ class TestDeleteDocumentHandler:
 
         async def run_test() -> None:
             with patch("mcp_tools.retrieval_tools.get_weaviate_client") as mock_ctx:
-                mock_ctx.return_value.__enter__ = MagicMock(
+                mock_ctx.return_value.__aenter__ = AsyncMock(
                     side_effect=WeaviateConnectionError("Connection failed")
                 )
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = DeleteDocumentInput(
                     source_id="test-document",
@@ -1179,8 +1246,8 @@ class TestDeleteDocumentHandler:
                         return MagicMock()
 
                     mock_client.collections.get.side_effect = get_collection
-                    mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                    mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                    mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                    mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                     input_data = DeleteDocumentInput(
                         source_id="test-document",
@@ -1218,8 +1285,8 @@ class TestOutputSchemaValidation:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchChunksInput(query="test")
                 result = await search_chunks_handler(input_data)
@@ -1246,8 +1313,8 @@ class TestOutputSchemaValidation:
 
                 mock_collection.query.near_text.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = SearchSummariesInput(query="test")
                 result = await search_summaries_handler(input_data)
@@ -1274,8 +1341,8 @@ class TestOutputSchemaValidation:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = GetDocumentInput(source_id="test")
                 result = await get_document_handler(input_data)
@@ -1304,8 +1371,8 @@ class TestOutputSchemaValidation:
 
                 mock_collection.query.fetch_objects.return_value = mock_result
                 mock_client.collections.get.return_value = mock_collection
-                mock_ctx.return_value.__enter__ = MagicMock(return_value=mock_client)
-                mock_ctx.return_value.__exit__ = MagicMock(return_value=None)
+                mock_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+                mock_ctx.return_value.__aexit__ = AsyncMock(return_value=None)
 
                 input_data = ListDocumentsInput()
                 result = await list_documents_handler(input_data)
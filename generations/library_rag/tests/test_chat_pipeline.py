@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Unit tests for the pipelined chat mode.
+
+Tests that retrieval on the raw question overlaps the reformulation LLM
+call, that both pools are merged with RRF, and the event sequence of a
+pipelined session (provisional context, reformulation, timing, tokens).
+All retrieval and LLM calls are mocked.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from utils.sse_stream import SessionEventLog
+
+
+def make_chunks(prefix: str, n: int) -> List[Dict[str, Any]]:
+    """Build n fake chunks with uuids prefix-0..prefix-(n-1)."""
+    return [
+        {"uuid": f"{prefix}-{i}", "text": f"{prefix} {i}", "author": "Platon",
+         "work": "Ménon", "similarity": 90 - i}
+        for i in range(n)
+    ]
+
+
+def fake_search(query: str, selected_works: Any = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """diverse_author_search stub: shared chunk 'common' plus query-specific ones."""
+    prefix = "reform" if query.startswith("Reformulation") else "raw"
+    return [{"uuid": "common", "text": "commun", "author": "Platon", "work": "Ménon",
+             "similarity": 95}] + make_chunks(prefix, 3)
+
+
+class TestPipelinedRetrieval:
+    """Tests for flask_app.pipelined_retrieval."""
+
+    def test_raw_pool_is_ready_before_reformulation_returns(self) -> None:
+        """Test that the raw-question pool is delivered while the LLM still runs."""
+        from flask_app import pipelined_retrieval
+
+        first_pool_seen = threading.Event()
+
+        def slow_reformulation(question: str, provider: str, model: str) -> str:
+            # Blocks until the raw pool was delivered: fails if calls are serialized
+            assert first_pool_seen.wait(timeout=5)
+            return "Reformulation détaillée"
+
+        def on_first_pool(chunks: List[Dict[str, Any]]) -> None:
+            assert {c["uuid"] for c in chunks} >= {"raw-0", "common"}
+            first_pool_seen.set()
+
+        with patch("flask_app.diverse_author_search", side_effect=fake_search), \
+                patch("flask_app.reformulate_question", side_effect=slow_reformulation):
+            merged, reformulated = pipelined_retrieval(
+                "vertu ?", "ollama", "qwen2.5:7b", [], on_first_pool=on_first_pool
+            )
+
+        assert reformulated == "Reformulation détaillée"
+        assert merged[0]["uuid"] == "common"
+        assert {c["uuid"] for c in merged} == {"common", "raw-0", "raw-1", "raw-2",
+                                                "reform-0", "reform-1", "reform-2"}
+
+    def test_failed_reformulation_keeps_raw_pool(self) -> None:
+        """Test that a reformulation error falls back to the raw pool."""
+        from flask_app import pipelined_retrieval
+
+        with patch("flask_app.diverse_author_search", side_effect=fake_search) as search, \
+                patch("flask_app.reformulate_question", side_effect=RuntimeError("LLM down")):
+            merged, reformulated = pipelined_retrieval("vertu ?", "ollama", "qwen2.5:7b", [])
+
+        assert reformulated is None
+        assert [c["uuid"] for c in merged] == ["common", "raw-0", "raw-1", "raw-2"]
+        assert search.call_count == 1
+
+
+class TestPipelinedSession:
+    """Tests for run_chat_generation(pipelined=True)."""
+
+    def test_event_sequence_and_timings(self) -> None:
+        """Test provisional context, reformulation, TTFT and final timings."""
+        from flask_app import chat_sessions, run_chat_generation
+
+        def fake_llm(prompt: str, provider: str, model: str, stream: bool = True) -> Iterator[str]:
+            time.sleep(0.01)
+            yield "La vertu"
+            yield " s'enseigne."
+
+        chat_sessions["pipeline-test"] = {
+            "status": "initializing", "events": SessionEventLog(),
+            "context": [], "created_at": time.time(),
+        }
+        try:
+            with patch("flask_app.diverse_author_search", side_effect=fake_search), \
+                    patch("flask_app.reformulate_question", return_value="Reformulation détaillée"), \
+                    patch("flask_app.rerank_rag_chunks", side_effect=lambda q, c, p, m: c[:4]), \
+                    patch("utils.llm_chat.call_llm", side_effect=fake_llm):
+                run_chat_generation("pipeline-test", "vertu ?", "ollama", "qwen2.5:7b", 5,
+                                    selected_works=[], pipelined=True)
+            session = chat_sessions["pipeline-test"]
+        finally:
+            chat_sessions.pop("pipeline-test", None)
+
+        events = [event for _, event in session["events"].events_after(0)]
+        types = [event["type"] for event in events]
+        assert types[:4] == ["context", "reformulation", "context", "timing"]
+        assert types[-1] == "complete"
+        assert [e.get("stage") for e in events if e["type"] == "context"] == ["initial", "final"]
+        assert "".join(e["content"] for e in events if e["type"] == "token") == "La vertu s'enseigne."
+
+        timings = events[-1]["timings"]
+        assert timings["first_context_ms"] <= timings["retrieval_ms"] <= timings["ttft_ms"]
+        assert events[3]["ttft_ms"] == timings["ttft_ms"]
+        assert session["reformulated"] == "Reformulation détaillée"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
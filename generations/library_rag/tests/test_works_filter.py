@@ -19,15 +19,86 @@ import pytest
 # =============================================================================
 
 
+def make_group_by_result(works: List[Dict[str, str]]) -> MagicMock:
+    """Build a mock Chunk aggregate grouped by workTitle.
+
+    Args:
+        works: One {"title", "author"} dict per chunk.
+
+    Returns:
+        MagicMock simulating an AggregateGroupByReturn.
+    """
+    from weaviate.collections.classes.aggregate import AggregateText, TopOccurrence
+
+    counts: Dict[str, int] = {}
+    authors: Dict[str, str] = {}
+    for work in works:
+        counts[work["title"]] = counts.get(work["title"], 0) + 1
+        authors[work["title"]] = work["author"]
+
+    groups = []
+    for title, count in counts.items():
+        group = MagicMock()
+        group.grouped_by.value = title
+        group.total_count = count
+        group.properties = {
+            "workAuthor": AggregateText(
+                count=None,
+                top_occurrences=[TopOccurrence(count=count, value=authors[title])],
+            ),
+            "language": AggregateText(
+                count=None, top_occurrences=[TopOccurrence(count=count, value="fr")]
+            ),
+        }
+        groups.append(group)
+
+    result = MagicMock()
+    result.groups = groups
+    return result
+
+
+def mock_weaviate_context(mock_context: MagicMock, works: List[Dict[str, str]]) -> MagicMock:
+    """Configure a patched get_weaviate_client to serve the given chunks.
+
+    Args:
+        mock_context: Patched flask_app.get_weaviate_client.
+        works: One {"title", "author"} dict per chunk.
+
+    Returns:
+        The mocked Weaviate client.
+    """
+    mock_client = MagicMock()
+
+    # Mock the collections (Work and Summary iterators are empty)
+    mock_collection = MagicMock()
+    mock_collection.aggregate.over_all.return_value = make_group_by_result(works)
+    mock_client.collections.get.return_value = mock_collection
+
+    # Configure context manager
+    mock_context.return_value.__enter__ = MagicMock(return_value=mock_client)
+    mock_context.return_value.__exit__ = MagicMock(return_value=False)
+
+    return mock_client
+
+
+@pytest.fixture(autouse=True)
+def isolated_corpus_catalog(tmp_path: Any) -> Generator[Any, None, None]:
+    """Use an empty corpus catalog so every test rebuilds it from the mocks."""
+    from utils.corpus_catalog import CorpusCatalog
+
+    catalog = CorpusCatalog(path=tmp_path / "corpus_catalog.json", max_age=0)
+    with patch("flask_app.get_corpus_catalog", return_value=catalog):
+        yield catalog
+
+
 @pytest.fixture
-def mock_chunk_objects() -> List[MagicMock]:
-    """Create mock Weaviate chunk objects with work metadata.
+def mock_chunk_works() -> List[Dict[str, str]]:
+    """Create test data representing chunks from different works.
 
     Returns:
-        List of MagicMock objects simulating Weaviate chunk results.
+        One {"title", "author"} dict per chunk.
     """
-    # Create test data representing chunks from different works
-    test_works = [
+    return [
         {"title": "Ménon", "author": "Platon"},
         {"title": "Ménon", "author": "Platon"},
         {"title": "Ménon", "author": "Platon"},
@@ -36,43 +107,21 @@ def mock_chunk_objects() -> List[MagicMock]:
         {"title": "La pensée-signe", "author": "Claudine Tiercelin"},
     ]
 
-    mock_objects = []
-    for work in test_works:
-        obj = MagicMock()
-        obj.properties = {"work": work}
-        mock_objects.append(obj)
-
-    return mock_objects
-
 
 @pytest.fixture
 def mock_weaviate_client_get_works(
-    mock_chunk_objects: List[MagicMock],
+    mock_chunk_works: List[Dict[str, str]],
 ) -> Generator[MagicMock, None, None]:
     """Provide a mocked Weaviate client for /api/get-works tests.
 
     Args:
-        mock_chunk_objects: List of mock chunk objects.
+        mock_chunk_works: Work metadata of each mock chunk.
 
     Yields:
         MagicMock configured as a Weaviate client with chunks.
     """
     with patch("flask_app.get_weaviate_client") as mock_context:
-        mock_client = MagicMock()
-
-        # Mock the chunks collection
-        mock_chunks_collection = MagicMock()
-        mock_query_result = MagicMock()
-        mock_query_result.objects = mock_chunk_objects
-
-        mock_chunks_collection.query.fetch_objects.return_value = mock_query_result
-        mock_client.collections.get.return_value = mock_chunks_collection
-
-        # Configure context manager
-        mock_context.return_value.__enter__ = MagicMock(return_value=mock_client)
-        mock_context.return_value.__exit__ = MagicMock(return_value=False)
-
-        yield mock_client
+        yield mock_weaviate_context(mock_context, mock_chunk_works)
 
 
 @pytest.fixture
@@ -216,16 +265,7 @@ class TestApiGetWorksEdgeCases:
     ) -> None:
         """Test behavior when database has no chunks."""
         with patch("flask_app.get_weaviate_client") as mock_context:
-            mock_client = MagicMock()
-            mock_chunks_collection = MagicMock()
-            mock_query_result = MagicMock()
-            mock_query_result.objects = []  # Empty
-
-            mock_chunks_collection.query.fetch_objects.return_value = mock_query_result
-            mock_client.collections.get.return_value = mock_chunks_collection
-
-            mock_context.return_value.__enter__ = MagicMock(return_value=mock_client)
-            mock_context.return_value.__exit__ = MagicMock(return_value=False)
+            mock_weaviate_context(mock_context, [])
 
             response = flask_test_client.get("/api/get-works")
 
@@ -239,23 +279,10 @@ class TestApiGetWorksEdgeCases:
     ) -> None:
         """Test that chunks without titles are ignored."""
         with patch("flask_app.get_weaviate_client") as mock_context:
-            mock_client = MagicMock()
-            mock_chunks_collection = MagicMock()
-
-            # Create mock with empty title (should be ignored)
-            obj1 = MagicMock()
-            obj1.properties = {"work": {"title": "", "author": "Unknown"}}
-            obj2 = MagicMock()
-            obj2.properties = {"work": {"title": "Valid Work", "author": "Author"}}
-
-            mock_query_result = MagicMock()
-            mock_query_result.objects = [obj1, obj2]
-
-            mock_chunks_collection.query.fetch_objects.return_value = mock_query_result
-            mock_client.collections.get.return_value = mock_chunks_collection
-
-            mock_context.return_value.__enter__ = MagicMock(return_value=mock_client)
-            mock_context.return_value.__exit__ = MagicMock(return_value=False)
+            mock_weaviate_context(mock_context, [
+                {"title": "", "author": "Unknown"},
+                {"title": "Valid Work", "author": "Author"},
+            ])
 
             response = flask_test_client.get("/api/get-works")
 
@@ -270,20 +297,7 @@ class TestApiGetWorksEdgeCases:
     ) -> None:
         """Test that missing author defaults to 'Unknown'."""
         with patch("flask_app.get_weaviate_client") as mock_context:
-            mock_client = MagicMock()
-            mock_chunks_collection = MagicMock()
-
-            obj = MagicMock()
-            obj.properties = {"work": {"title": "Orphan Work", "author": ""}}
-
-            mock_query_result = MagicMock()
-            mock_query_result.objects = [obj]
-
-            mock_chunks_collection.query.fetch_objects.return_value = mock_query_result
-            mock_client.collections.get.return_value = mock_chunks_collection
-
-            mock_context.return_value.__enter__ = MagicMock(return_value=mock_client)
-            mock_context.return_value.__exit__ = MagicMock(return_value=False)
+            mock_weaviate_context(mock_context, [{"title": "Orphan Work", "author": ""}])
 
             response = flask_test_client.get("/api/get-works")
 
@@ -292,6 +306,31 @@ class TestApiGetWorksEdgeCases:
             assert len(data) == 1
             assert data[0]["author"] == "Unknown"
 
+    def test_get_works_served_from_fresh_catalog(
+        self,
+        flask_test_client: Any,
+        isolated_corpus_catalog: Any,
+    ) -> None:
+        """Test that a fresh catalog is served without querying Weaviate.
+
+        Re-ingesting the document sets its count, it does not add to it.
+        """
+        isolated_corpus_catalog.max_age = 3600
+        isolated_corpus_catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 12)
+        isolated_corpus_catalog.invalidate()
+        with patch("flask_app.get_weaviate_client") as mock_context:
+            mock_weaviate_context(mock_context, [{"title": "Ménon", "author": "Platon"}])
+            flask_test_client.get("/api/get-works")  # rebuild: 1 chunk
+
+        for _ in range(2):
+            isolated_corpus_catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 4)
+        with patch("flask_app.get_weaviate_client") as mock_context:
+            response = flask_test_client.get("/api/get-works")
+            mock_context.assert_not_called()
+
+        data = json.loads(response.data)
+        assert data == [{"title": "Ménon", "author": "Platon", "chunks_count": 4}]
+
 
 # =============================================================================
 # Tests for /chat/send selected_works parameter
@@ -0,0 +1,90 @@
+"""Unit tests for the materialized corpus catalog.
+
+Tests incremental updates (ingest/delete), persistence and the
+collection statistics derived from the catalog.
+"""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from utils.corpus_catalog import CorpusCatalog
+
+
+def record_documents(path: Path, prefix: str, n: int) -> None:
+    """Record ``n`` documents from a separate process."""
+    catalog = CorpusCatalog(path=path, max_age=3600)
+    for i in range(n):
+        catalog.record_chunks(f"{prefix}_{i}", f"{prefix} {i}", "Auteur", "fr", 1)
+
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> CorpusCatalog:
+    """Empty catalog stored in a temporary directory."""
+    return CorpusCatalog(path=tmp_path / "corpus_catalog.json", max_age=3600)
+
+
+class TestCorpusCatalog:
+    """Tests for CorpusCatalog."""
+
+    def test_new_catalog_is_stale(self, catalog: CorpusCatalog) -> None:
+        """Test that a catalog never rebuilt asks for a rebuild."""
+        catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 10)
+        assert not catalog.is_fresh()
+
+    def test_record_chunks_and_summaries(self, catalog: CorpusCatalog) -> None:
+        """Test that ingestions record per-work counts."""
+        catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 10, pages=80)
+        catalog.record_summaries("platon_menon", 4)
+        catalog.record_chunks("peirce_cp", "Collected Papers", "Peirce", "en", 5)
+
+        entries = {e["source_id"]: e for e in catalog.entries()}
+        assert entries["platon_menon"]["chunks_count"] == 10
+        assert entries["platon_menon"]["summaries_count"] == 4
+        assert entries["platon_menon"]["pages"] == 80
+
+        stats = catalog.collection_stats()
+        assert stats["passages"] == 15
+        assert stats["author_list"] == ["Peirce", "Platon"]
+        assert stats["language_list"] == ["en", "fr"]
+
+    def test_reingestion_is_idempotent(self, catalog: CorpusCatalog) -> None:
+        """Test that re-ingesting a document replaces its counts."""
+        for _ in range(2):
+            catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 10)
+            catalog.record_summaries("platon_menon", 4)
+        catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 8)
+
+        entry = catalog.entries()[0]
+        assert (entry["chunks_count"], entry["summaries_count"]) == (8, 4)
+        assert entry["languages"] == {"fr": 8}
+
+    def test_record_deletion(self, catalog: CorpusCatalog) -> None:
+        """Test that deleted documents disappear from works and stats."""
+        catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 10)
+        catalog.record_summaries("platon_menon", 4)
+        catalog.record_deletion("platon_menon", 10, 4)
+
+        assert catalog.works() == []
+        assert catalog.collection_stats()["languages"] == 0
+
+    def test_persisted_across_instances(self, catalog: CorpusCatalog) -> None:
+        """Test that another process sees the updates through the file."""
+        catalog.record_chunks("platon_menon", "Ménon", "Platon", "fr", 3)
+
+        other = CorpusCatalog(path=catalog.path, max_age=3600)
+        assert other.works() == [{"title": "Ménon", "author": "Platon", "chunks_count": 3}]
+
+    def test_concurrent_processes_do_not_lose_updates(self, catalog: CorpusCatalog) -> None:
+        """Test that two ingesting processes both see their documents recorded."""
+        workers = [
+            multiprocessing.Process(target=record_documents, args=(catalog.path, prefix, 25))
+            for prefix in ("flask", "cli")
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        assert len(catalog.entries()) == 50
@@ -0,0 +1,171 @@
+"""Unit tests for hybrid BM25 + vector chunk retrieval.
+
+Tests reference-query detection, the index lookup route, RRF and alpha
+fusion, and the distance of BM25-only hits. Weaviate is replaced by a fake
+collection returning canned results.
+"""
+
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pytest
+
+from utils.hybrid_search import (
+    fuse_results,
+    normalize_reference,
+    parse_reference_query,
+    search_chunks,
+)
+
+
+def make_object(name: str, vector: List[float], distance: Optional[float] = None,
+                score: Optional[float] = None, **props: Any) -> SimpleNamespace:
+    """Build a fake Weaviate object."""
+    return SimpleNamespace(
+        uuid=uuid.uuid5(uuid.NAMESPACE_DNS, name),
+        properties={"text": name, **props},
+        metadata=SimpleNamespace(distance=distance, score=score),
+        vector={"default": vector},
+    )
+
+
+class FakeCollection:
+    """Chunk collection with canned near_vector / bm25 / fetch_objects results."""
+
+    def __init__(self, dense: List[Any], sparse: List[Any], fetched: Optional[List[Any]] = None) -> None:
+        self.dense = dense
+        self.sparse = sparse
+        self.fetched = fetched or []
+        self.calls: List[str] = []
+        self.query = self
+
+    def near_vector(self, limit: int, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append("near_vector")
+        return SimpleNamespace(objects=self.dense[:limit])
+
+    def bm25(self, query: str, limit: int, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append("bm25")
+        return SimpleNamespace(objects=self.sparse[:limit])
+
+    def fetch_objects(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append("fetch_objects")
+        return SimpleNamespace(objects=self.fetched)
+
+
+QUERY_VECTOR = np.array([1.0, 0.0])
+
+
+class TestReferenceQueries:
+    """Tests for parse_reference_query."""
+
+    @pytest.mark.parametrize("query, kind, reference", [
+        ("CP 5.628", "cp", "CP 5.628"),
+        ("c.p. 5 . 628", "cp", "CP 5.628"),
+        ("Ménon 80a", "stephanus", "Ménon 80a"),
+        ("« République 514 a-b »", "stephanus", "République 514a"),
+        ("§ 128", "section", "128"),
+    ])
+    def test_detects_references(self, query: str, kind: str, reference: str) -> None:
+        """Test that bare references are detected and normalized."""
+        ref = parse_reference_query(query)
+        assert ref is not None
+        assert (ref.kind, ref.reference) == (kind, reference)
+
+    @pytest.mark.parametrize("query", [
+        "Qu'est-ce que la vertu ?",
+        "Que dit Peirce en CP 5.628 sur l'instinct ?",
+        "Peirce",
+        "",
+    ])
+    def test_ignores_other_queries(self, query: str) -> None:
+        """Test that questions and names are not routed to the lookup."""
+        assert parse_reference_query(query) is None
+
+    def test_normalize_reference(self) -> None:
+        """Test the comparison form of references."""
+        assert normalize_reference("CP 5 . 628") == normalize_reference("cp 5.628")
+
+
+class TestSearchChunks:
+    """Tests for search_chunks routing and fusion."""
+
+    def test_reference_query_uses_index_lookup(self) -> None:
+        """Test that an exact reference skips vector and BM25 search."""
+        fetched = [
+            make_object("wrong volume", [0.0, 1.0], canonicalReference="CP 1.628", orderIndex=1),
+            make_object("second", [1.0, 1.0], canonicalReference="CP 5.628", orderIndex=9),
+            make_object("first", [1.0, 0.0], canonicalReference="cp 5.628", orderIndex=3),
+        ]
+        collection = FakeCollection([], [], fetched)
+
+        hits = search_chunks(collection, "CP 5.628", QUERY_VECTOR, limit=10)
+
+        assert collection.calls == ["fetch_objects"]
+        assert [h.properties["text"] for h in hits] == ["first", "second"]
+        assert {h.source for h in hits} == {"reference"}
+        assert hits[0].similarity == 100.0
+
+    def test_stephanus_reference_without_work_name(self) -> None:
+        """Test that '80a' stored alone matches through the work title."""
+        fetched = [
+            make_object("menon", [1.0, 0.0], canonicalReference="80a", workTitle="Ménon"),
+            make_object("phedon", [1.0, 0.0], canonicalReference="80a", workTitle="Phédon"),
+        ]
+        hits = search_chunks(FakeCollection([], [], fetched), "Ménon 80a", QUERY_VECTOR, limit=5)
+
+        assert [h.properties["text"] for h in hits] == ["menon"]
+
+    def test_unknown_reference_falls_back_to_hybrid(self) -> None:
+        """Test the fallback when the lookup finds nothing."""
+        collection = FakeCollection([make_object("a", [1.0, 0.0], distance=0.1)], [])
+
+        hits = search_chunks(collection, "Ménon 99e", QUERY_VECTOR, limit=5, mode="hybrid")
+
+        assert collection.calls == ["fetch_objects", "near_vector", "bm25"]
+        assert [h.source for h in hits] == ["vector"]
+
+    def test_vector_mode_skips_bm25(self) -> None:
+        """Test SEARCH_MODE=vector keeps the previous near_vector behaviour."""
+        collection = FakeCollection([make_object("a", [1.0, 0.0], distance=0.15)], [])
+
+        hits = search_chunks(collection, "la vertu", QUERY_VECTOR, limit=5, mode="vector")
+
+        assert collection.calls == ["near_vector"]
+        assert hits[0].similarity == 85.0
+
+
+class TestFusion:
+    """Tests for fuse_results."""
+
+    def setup_method(self) -> None:
+        self.shared = make_object("shared", [1.0, 0.0], distance=0.2, score=3.0)
+        self.dense_only = make_object("dense", [1.0, 0.0], distance=0.1)
+        self.sparse_only = make_object("sparse", [0.6, 0.8], score=9.0)
+        self.dense = [self.dense_only, self.shared]
+        self.sparse = [self.sparse_only, self.shared]
+
+    def test_rrf_favours_hits_found_by_both(self) -> None:
+        """Test that RRF ranks a chunk found by both searches first."""
+        hits = fuse_results(self.dense, self.sparse, QUERY_VECTOR, fusion="rrf")
+
+        assert [h.properties["text"] for h in hits] == ["shared", "dense", "sparse"]
+        assert [h.source for h in hits] == ["hybrid", "vector", "bm25"]
+        assert hits[0].explain == {"vector_rank": 2, "bm25_rank": 2}
+
+    def test_bm25_only_hits_get_a_cosine_distance(self) -> None:
+        """Test that BM25-only hits are compared to the query vector locally."""
+        hits = fuse_results(self.dense, self.sparse, QUERY_VECTOR)
+        sparse_hit = next(h for h in hits if h.source == "bm25")
+
+        assert sparse_hit.distance == pytest.approx(0.4)
+        assert sparse_hit.similarity == 60.0
+
+    def test_alpha_weights_the_two_sides(self) -> None:
+        """Test that alpha=1 follows vector scores and alpha=0 follows BM25."""
+        vector_first = fuse_results(self.dense, self.sparse, QUERY_VECTOR, fusion="alpha", alpha=1.0)
+        bm25_first = fuse_results(self.dense, self.sparse, QUERY_VECTOR, fusion="alpha", alpha=0.0)
+
+        assert vector_first[0].properties["text"] == "dense"
+        assert bm25_first[0].properties["text"] == "sparse"
@@ -0,0 +1,119 @@
+"""Unit tests for the LLM response cache.
+
+The Mistral HTTP call is replaced by a fake ``requests.post``; no network
+access or API key is needed.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from utils import llm_structurer
+from utils.llm_cache import LLMResponseCache, llm_cache_key
+from utils.llm_metadata import extract_metadata
+
+
+class FakeResponse:
+    """Minimal ``requests.Response`` returned by the fake Mistral API."""
+
+    def __init__(self, content: str) -> None:
+        self._content = content
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict[str, Any]:
+        return {
+            "choices": [{"message": {"content": self._content}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+        }
+
+
+@pytest.fixture
+def cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LLMResponseCache:
+    """Fresh cache wired into llm_structurer."""
+    llm_cache = LLMResponseCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(llm_structurer, "get_llm_cache", lambda: llm_cache)
+    return llm_cache
+
+
+class FakeMistral:
+    """Answers queued responses in order and records the prompts sent."""
+
+    def __init__(self) -> None:
+        self.answers: List[str] = []
+        self.sent: List[str] = []
+
+    def post(self, url: str, headers: Dict[str, str], json: Dict[str, Any], timeout: int) -> FakeResponse:
+        self.sent.append(json["messages"][0]["content"])
+        return FakeResponse(self.answers.pop(0))
+
+
+@pytest.fixture
+def mistral(monkeypatch: pytest.MonkeyPatch) -> FakeMistral:
+    """Fake Mistral API (no key, no rate limit, no network)."""
+    fake = FakeMistral()
+    monkeypatch.setenv("MISTRAL_API_KEY", "test-key")
+    monkeypatch.setattr(llm_structurer.requests, "post", fake.post)
+    monkeypatch.setattr(llm_structurer._mistral_bucket, "acquire", lambda: None)
+    return fake
+
+
+class TestLLMResponseCache:
+    """Storage primitives."""
+
+    def test_put_get_invalidate(self, tmp_path: Path) -> None:
+        cache = LLMResponseCache(tmp_path / "llm.sqlite")
+        cache.put("mistral", "small", 0.2, "prompt", "answer")
+
+        assert cache.get("mistral", "small", 0.2, "prompt") == "answer"
+        assert cache.get("mistral", "small", 0.3, "prompt") is None
+        assert cache.invalidate("mistral", "small", 0.2, "prompt") is True
+        assert cache.get("mistral", "small", 0.2, "prompt") is None
+        assert cache.invalidate("mistral", "small", 0.2, "prompt") is False
+
+    def test_empty_response_not_stored(self, tmp_path: Path) -> None:
+        cache = LLMResponseCache(tmp_path / "llm.sqlite")
+        cache.put("ollama", "qwen", 0.1, "prompt", "")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_key_depends_on_every_parameter(self) -> None:
+        base = llm_cache_key("mistral", "small", 0.2, "p")
+        assert base != llm_cache_key("ollama", "small", 0.2, "p")
+        assert base != llm_cache_key("mistral", "large", 0.2, "p")
+        assert base != llm_cache_key("mistral", "small", 0.1, "p")
+        assert base != llm_cache_key("mistral", "small", 0.2, "q")
+
+
+class TestParseFailureInvalidation:
+    """Only responses that parse are replayed from the cache."""
+
+    def test_parsed_response_is_replayed(self, cache: LLMResponseCache, mistral: FakeMistral) -> None:
+        mistral.answers.append('<JSON>{"title": "Ménon", "author": "Platon"}</JSON>')
+
+        first = extract_metadata("Platon, Ménon", provider="mistral")
+        second = extract_metadata("Platon, Ménon", provider="mistral")
+
+        assert first["title"] == second["title"] == "Ménon"
+        assert len(mistral.sent) == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_malformed_response_is_not_replayed(self, cache: LLMResponseCache, mistral: FakeMistral) -> None:
+        mistral.answers.append('<JSON>{"title": "Ménon", "auth')   # truncated
+        mistral.answers.append('<JSON>{"title": "Ménon", "author": "Platon"}</JSON>')
+
+        first = extract_metadata("Platon, Ménon", provider="mistral")
+        assert first["title"] is None
+        assert cache.stats()["entries"] == 0
+
+        second = extract_metadata("Platon, Ménon", provider="mistral")
+        assert second["author"] == "Platon"
+        assert len(mistral.sent) == 2
+        assert cache.stats()["entries"] == 1
+
+    def test_invalidate_without_cache_is_noop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(llm_structurer, "get_llm_cache", lambda: None)
+
+        llm_structurer.invalidate_last_response()
@@ -0,0 +1,111 @@
+"""Unit tests for the bounded LLM task executor.
+
+Tasks are plain Python functions with short sleeps; no LLM is called.
+"""
+
+import threading
+import time
+from typing import List, Set, Tuple
+
+import pytest
+
+from utils.llm_executor import run_llm_tasks
+from utils import llm_structurer
+from utils.llm_structurer import get_llm_cost, reset_llm_cost
+
+
+class TestRunLLMTasks:
+    """Ordering, errors, concurrency bound and cost reporting."""
+
+    def test_results_follow_input_order(self) -> None:
+        # Later items finish first
+        def task(i: int) -> int:
+            time.sleep(0.01 * (5 - i))
+            return i * 10
+
+        assert run_llm_tasks(task, list(range(5)), max_workers=5) == [0, 10, 20, 30, 40]
+
+    def test_concurrency_bound(self) -> None:
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def task(i: int) -> int:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return i
+
+        run_llm_tasks(task, list(range(12)), max_workers=3)
+
+        assert 1 < peak <= 3
+
+    def test_pool_sized_by_provider_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(llm_structurer.LLM_MAX_CONCURRENCY, "mistral", 2)
+        threads: Set[str] = set()
+
+        def task(i: int) -> int:
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01)
+            return i
+
+        run_llm_tasks(task, list(range(6)), provider="mistral")
+
+        assert len(threads) == 2
+
+    def test_first_error_propagates_and_cancels_pending(self) -> None:
+        started: List[int] = []
+
+        def task(i: int) -> int:
+            started.append(i)
+            if i == 0:
+                raise ValueError("boom")
+            time.sleep(0.05)
+            return i
+
+        with pytest.raises(ValueError, match="boom"):
+            run_llm_tasks(task, list(range(20)), max_workers=2)
+
+        assert len(started) < 20
+
+    def test_error_propagates_sequentially(self) -> None:
+        def task(i: int) -> int:
+            if i == 1:
+                raise RuntimeError("sequential")
+            return i
+
+        with pytest.raises(RuntimeError, match="sequential"):
+            run_llm_tasks(task, [0, 1, 2], max_workers=1)
+
+    def test_progress_reported_in_caller_thread(self) -> None:
+        caller = threading.current_thread()
+        calls: List[Tuple[int, int]] = []
+
+        def on_progress(done: int, total: int) -> None:
+            assert threading.current_thread() is caller
+            calls.append((done, total))
+
+        run_llm_tasks(lambda i: i, list(range(4)), on_progress=on_progress, max_workers=2)
+
+        assert calls == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    def test_worker_costs_added_to_caller(self) -> None:
+        def task(i: int) -> int:
+            llm_structurer.add_llm_cost({
+                "total_cost": 0.5, "total_input_tokens": 10, "total_output_tokens": 1,
+                "calls_count": 1, "cache_hits": 0,
+            })
+            return i
+
+        reset_llm_cost()
+        run_llm_tasks(task, list(range(4)), max_workers=2)
+
+        assert get_llm_cost()["calls_count"] == 4
+        assert get_llm_cost()["total_cost"] == pytest.approx(2.0)
+
+    def test_empty_items(self) -> None:
+        assert run_llm_tasks(lambda i: i, []) == []
@@ -0,0 +1,152 @@
+"""Unit tests for sharded OCR.
+
+Tests page-range sharding, page-ordered merge, the per-shard disk cache
+and the retry of failed shards only. The Mistral client is mocked.
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, List, Set
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from mistralai.models import OCRResponse
+
+from utils.ocr_processor import OCRShardError, count_pdf_pages, run_ocr_sharded
+
+
+def make_pdf_bytes(nb_pages: int) -> bytes:
+    """Real PDF 1.5 whose catalog, page tree and pages live in a compressed /ObjStm.
+
+    Only a cross-reference stream points into the object stream, so no
+    ``/Type /Page`` appears in the raw bytes.
+    """
+    kids = " ".join(f"{3 + i} 0 R" for i in range(nb_pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {nb_pages} >>".encode(),
+    ] + [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"] * nb_pages
+    offsets: List[str] = []
+    body = b""
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(f"{number} {len(body)}")
+        body += obj + b"\n"
+    first = (" ".join(offsets) + "\n").encode()
+    data = zlib.compress(first + body)
+
+    stream_number = len(objects) + 1
+    xref_number = stream_number + 1
+    pdf = b"%PDF-1.5\n"
+    stream_offset = len(pdf)
+    pdf += (
+        f"{stream_number} 0 obj\n<< /Type /ObjStm /N {len(objects)} /First {len(first)} "
+        f"/Filter /FlateDecode /Length {len(data)} >>\nstream\n"
+    ).encode() + data + b"\nendstream\nendobj\n"
+
+    # Cross-reference stream: type 2 entries point into the object stream
+    xref_offset = len(pdf)
+    rows = [struct.pack(">BIH", 0, 0, 65535)]
+    rows += [struct.pack(">BIH", 2, stream_number, index) for index in range(len(objects))]
+    rows += [struct.pack(">BIH", 1, stream_offset, 0), struct.pack(">BIH", 1, xref_offset, 0)]
+    xref = b"".join(rows)
+    pdf += (
+        f"{xref_number} 0 obj\n<< /Type /XRef /Size {xref_number + 1} /W [1 4 2] /Root 1 0 R "
+        f"/Length {len(xref)} >>\nstream\n"
+    ).encode() + xref + b"\nendstream\nendobj\n"
+    return pdf + f"startxref\n{xref_offset}\n%%EOF\n".encode()
+
+
+def make_client(fail_pages: Set[int] | None = None) -> MagicMock:
+    """Mock Mistral client whose OCR returns one markdown page per requested index."""
+    client = MagicMock()
+
+    def process(model: str, document: Any, pages: List[int], include_image_base64: bool) -> OCRResponse:
+        if fail_pages and fail_pages.intersection(pages):
+            raise RuntimeError("Service unavailable")
+        return OCRResponse.model_validate({
+            "pages": [
+                {"index": i, "markdown": f"page {i}", "images": [], "dimensions": None}
+                for i in reversed(pages)
+            ],
+            "model": "mistral-ocr-latest",
+            "usage_info": {"pages_processed": len(pages), "doc_size_bytes": None},
+        })
+
+    client.ocr.process.side_effect = process
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_upload_no_sleep():
+    """Skip the real upload and the retry backoff."""
+    with patch("utils.ocr_processor.upload_pdf", return_value="https://signed.url") as upload, \
+            patch("utils.ocr_processor.time.sleep"):
+        yield upload
+
+
+class TestRunOcrSharded:
+    """Tests for run_ocr_sharded."""
+
+    def test_count_pdf_pages_in_object_stream(self) -> None:
+        """Test that pages stored in a compressed object stream are counted."""
+        pdf = make_pdf_bytes(7)
+
+        assert b"/Type /Page" not in pdf
+        assert count_pdf_pages(pdf) == 7
+
+    def test_count_pdf_pages_unreadable(self) -> None:
+        """Test that an unreadable page tree raises instead of guessing."""
+        with pytest.raises(ValueError):
+            count_pdf_pages(b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\n")
+
+    def test_uncountable_pdf_is_ocred_whole(self, tmp_path: Path) -> None:
+        """Test that a failed page count falls back to one whole-document OCR."""
+        client = make_client()
+        with patch("utils.ocr_processor.count_pdf_pages", side_effect=ValueError("xref")), \
+                patch("utils.ocr_processor.run_ocr", return_value="whole") as run_ocr:
+            response = run_ocr_sharded(client, b"%PDF-1.4", "doc.pdf", cache_dir=tmp_path)
+
+        assert response == "whole"
+        run_ocr.assert_called_once()
+        client.ocr.process.assert_not_called()
+
+    def test_shards_merged_in_page_order(self, tmp_path: Path) -> None:
+        """Test that shards cover every page and are merged in order."""
+        client = make_client()
+        response = run_ocr_sharded(
+            client, make_pdf_bytes(10), "doc.pdf", shard_pages=3, max_workers=4, cache_dir=tmp_path
+        )
+
+        assert [page.index for page in response.pages] == list(range(10))
+        assert response.usage_info.pages_processed == 10
+        assert client.ocr.process.call_count == 4
+
+    def test_cached_shards_are_not_reprocessed(self, tmp_path: Path, no_upload_no_sleep: MagicMock) -> None:
+        """Test that a second run is served entirely from the shard cache."""
+        pdf = make_pdf_bytes(6)
+        run_ocr_sharded(make_client(), pdf, "doc.pdf", shard_pages=2, cache_dir=tmp_path)
+
+        client = make_client()
+        response = run_ocr_sharded(client, pdf, "doc.pdf", shard_pages=2, cache_dir=tmp_path)
+
+        assert len(response.pages) == 6
+        client.ocr.process.assert_not_called()
+        assert no_upload_no_sleep.call_count == 1
+
+    def test_retry_only_failed_shards(self, tmp_path: Path) -> None:
+        """Test that after a partial failure only the failed shard is redone."""
+        pdf = make_pdf_bytes(6)
+        with pytest.raises(OCRShardError) as exc_info:
+            run_ocr_sharded(make_client(fail_pages={3}), pdf, "doc.pdf", shard_pages=2, cache_dir=tmp_path)
+        assert exc_info.value.failed_shards == [(2, 4)]
+
+        client = make_client()
+        response = run_ocr_sharded(client, pdf, "doc.pdf", shard_pages=2, cache_dir=tmp_path)
+
+        assert [page.index for page in response.pages] == list(range(6))
+        assert client.ocr.process.call_count == 1
+        assert client.ocr.process.call_args.kwargs["pages"] == [2, 3]
@@ -0,0 +1,130 @@
+"""Unit tests for the fingerprinted pipeline checkpoints.
+
+Tests step reuse and invalidation in StepCheckpoints, and the resume of
+process_pdf_v2 from the first step whose fingerprint changed.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from utils.pdf_pipeline import process_pdf_v2
+from utils.pipeline_checkpoint import StepCheckpoints, fingerprint
+from utils.weaviate_ingest import clear_ingest_checkpoint
+
+
+@pytest.fixture
+def checkpoints(tmp_path: Path) -> StepCheckpoints:
+    """Checkpoint store in a temporary directory."""
+    return StepCheckpoints(tmp_path / ".checkpoints")
+
+
+class TestStepCheckpoints:
+    """Tests for StepCheckpoints."""
+
+    def test_unchanged_fingerprint_is_reused(self, checkpoints: StepCheckpoints) -> None:
+        """Test that a step is computed once, then served from its checkpoint."""
+        calls: List[int] = []
+        fp = fingerprint("toc", "abc", "mistral")
+
+        first, first_cached = checkpoints.run("toc", fp, lambda: calls.append(1) or {"toc": [1]})
+        second, second_cached = checkpoints.run("toc", fp, lambda: calls.append(1) or {"toc": [2]})
+
+        assert (first_cached, second_cached) == (False, True)
+        assert second == {"toc": [1]}
+        assert len(calls) == 1
+        assert checkpoints.statuses == {"toc": "cached"}
+
+    def test_changed_fingerprint_recomputes(self, checkpoints: StepCheckpoints) -> None:
+        """Test that changing an option invalidates the step."""
+        checkpoints.run("toc", fingerprint("toc", "abc", "mistral"), lambda: 1)
+        output, cached = checkpoints.run("toc", fingerprint("toc", "abc", "ollama"), lambda: 2)
+
+        assert (output, cached) == (2, False)
+
+    def test_missing_artifact_invalidates(self, checkpoints: StepCheckpoints, tmp_path: Path) -> None:
+        """Test that a checkpoint whose artifact was deleted is recomputed."""
+        artifact = tmp_path / "page1_img1.png"
+        artifact.write_bytes(b"png")
+        checkpoints.run("images", "fp", lambda: ["page1_img1.png"], artifacts=[artifact])
+        artifact.unlink()
+
+        _, cached = checkpoints.run("images", "fp", lambda: [], artifacts=[artifact])
+        assert not cached
+
+    def test_disabled_store_always_computes(self, tmp_path: Path) -> None:
+        """Test that use_checkpoints=False computes every step."""
+        store = StepCheckpoints(tmp_path / ".checkpoints", enabled=False)
+        store.run("metadata", "fp", lambda: 1)
+        _, cached = store.run("metadata", "fp", lambda: 2)
+
+        assert not cached
+        assert not (tmp_path / ".checkpoints").exists()
+
+
+class TestProcessPdfV2Resume:
+    """Tests for the resume of process_pdf_v2 from checkpoints."""
+
+    def test_rerun_resumes_from_first_invalid_step(self, tmp_path: Path) -> None:
+        """Test that a re-run after a failed ingestion only redoes the ingestion."""
+        source = tmp_path / "menon.md"
+        source.write_text(
+            "# Ménon\n\nSocrate demande à Ménon si la vertu peut s'enseigner, "
+            "et ils examinent ensemble la définition de la vertu.\n",
+            encoding="utf-8",
+        )
+        events: List[Tuple[str, str]] = []
+
+        def on_progress(step: str, status: str, detail: Any = None) -> None:
+            events.append((step, status))
+
+        def run(ingest_result: Dict[str, Any], present: Optional[int] = None) -> Dict[str, Any]:
+            with patch("utils.pdf_pipeline.ingest_document", return_value=ingest_result) as ingest, \
+                    patch("utils.pdf_pipeline.count_ingested_objects", return_value=present):
+                result = process_pdf_v2(
+                    source,
+                    tmp_path / "output",
+                    use_llm=False,
+                    progress_callback=on_progress,
+                )
+            result["ingest_calls"] = ingest.call_count
+            return result
+
+        first = run({"success": False, "error": "Weaviate indisponible"})
+        assert first["steps"]["chunking"] == "computed"
+
+        events.clear()
+        second = run({"success": True, "count": 1})
+        assert second["ingest_calls"] == 1
+        assert second["steps"]["metadata"] == "cached"
+        assert second["steps"]["chunking"] == "cached"
+        assert second["steps"]["weaviate"] == "computed"
+        assert ("chunking", "cached") in events
+
+        third = run({"success": True, "count": 1}, present=1)
+        assert third["ingest_calls"] == 0
+        assert third["steps"]["weaviate"] == "cached"
+
+    def test_ingestion_checkpoint_requires_chunks_in_weaviate(self, tmp_path: Path) -> None:
+        """Test that chunks deleted from Weaviate are re-ingested despite the checkpoint."""
+        source = tmp_path / "menon.md"
+        source.write_text("# Ménon\n\nLa vertu peut-elle s'enseigner ?\n", encoding="utf-8")
+        output_dir = tmp_path / "output"
+
+        def run(present: Optional[int]) -> int:
+            with patch("utils.pdf_pipeline.ingest_document", return_value={"success": True, "count": 1}) as ingest, \
+                    patch("utils.pdf_pipeline.count_ingested_objects", return_value=present):
+                process_pdf_v2(source, output_dir, use_llm=False)
+            return ingest.call_count
+
+        assert run(present=None) == 1
+        # Chunks wiped from Weaviate (or a restore): the checkpoint is stale
+        assert run(present=0) == 1
+        assert run(present=1) == 0
+
+        # delete_document_chunks clears the checkpoint
+        clear_ingest_checkpoint("menon", output_dir)
+        assert not (output_dir / "menon" / ".checkpoints" / "weaviate.json").exists()
+        assert run(present=None) == 1
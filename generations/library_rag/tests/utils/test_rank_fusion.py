@@ -0,0 +1,40 @@
+"""Unit tests for reciprocal-rank fusion of chunk rankings."""
+
+import pytest
+
+from utils.rank_fusion import chunk_key, reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion:
+    """Tests for reciprocal_rank_fusion."""
+
+    def test_chunks_in_both_rankings_come_first(self) -> None:
+        """Test that a chunk ranked in both lists beats single-list chunks."""
+        raw = [{"uuid": "a", "text": "A"}, {"uuid": "b", "text": "B"}]
+        reformulated = [{"uuid": "c", "text": "C"}, {"uuid": "b", "text": "B'"}]
+
+        merged = reciprocal_rank_fusion([raw, reformulated], k=60)
+
+        assert [c["uuid"] for c in merged] == ["b", "a", "c"]
+        assert merged[0]["rrf_score"] == pytest.approx(1 / 62 + 1 / 62, abs=1e-6)
+        # First occurrence wins
+        assert merged[0]["text"] == "B"
+
+    def test_limit_and_weights(self) -> None:
+        """Test the limit and a ranking weight favouring the second list."""
+        raw = [{"uuid": "a"}, {"uuid": "b"}]
+        reformulated = [{"uuid": "c"}, {"uuid": "d"}]
+
+        merged = reciprocal_rank_fusion([raw, reformulated], limit=3, weights=[1.0, 2.0])
+
+        assert [c["uuid"] for c in merged] == ["c", "d", "a"]
+        with pytest.raises(ValueError):
+            reciprocal_rank_fusion([raw], weights=[1.0, 2.0])
+
+    def test_chunks_without_uuid_are_keyed_by_text(self) -> None:
+        """Test that chunks lacking a uuid are deduplicated on their text."""
+        assert chunk_key({"text": "x"}) == chunk_key({"text": "x", "uuid": ""})
+
+        merged = reciprocal_rank_fusion([[{"text": "x"}], [{"text": "x"}, {"text": "y"}]])
+
+        assert [c["text"] for c in merged] == ["x", "y"]
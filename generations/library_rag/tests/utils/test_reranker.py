@@ -0,0 +1,144 @@
+"""Unit tests for the local cross-encoder reranker.
+
+The cross-encoder is replaced by a fake model scoring pairs by word
+overlap; no model is downloaded.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from utils.reranker import CrossEncoderReranker, ScoreCache, get_rerank_mode
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the share of query words found in the passage."""
+
+    def __init__(self) -> None:
+        self.calls: List[int] = []
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], batch_size: int = 32, **kwargs: Any) -> List[float]:
+        self.calls.append(len(pairs))
+        scores = []
+        for query, passage in pairs:
+            words = set(query.lower().split())
+            scores.append(len(words & set(passage.lower().split())) / len(words))
+        return scores
+
+
+def make_chunks() -> List[Dict[str, Any]]:
+    """Candidates from most to least relevant for 'la vertu enseigne'."""
+    return [
+        {"uuid": "index", "text": "Index des noms propres"},
+        {"uuid": "full", "text": "la vertu s'enseigne dit Socrate : la vertu enseigne"},
+        {"uuid": "half", "text": "la vertu selon Ménon"},
+        {"uuid": "low", "text": "la réminiscence"},
+    ]
+
+
+@pytest.fixture
+def reranker() -> CrossEncoderReranker:
+    """Reranker with a fake model and no minimum kept chunks."""
+    return CrossEncoderReranker(model=FakeCrossEncoder(), threshold=0.5, top_k=10, min_keep=0)
+
+
+class TestCrossEncoderReranker:
+    """Tests for CrossEncoderReranker."""
+
+    def test_sorts_and_applies_threshold(self, reranker: CrossEncoderReranker) -> None:
+        """Test that chunks are sorted by score and filtered by the threshold."""
+        result = reranker.rerank("la vertu enseigne", make_chunks())
+
+        assert [c["uuid"] for c in result] == ["full", "half"]
+        assert result[0]["rerank_score"] == pytest.approx(1.0)
+
+    def test_top_k_and_min_keep(self, reranker: CrossEncoderReranker) -> None:
+        """Test the top-k cap and the minimum number of kept chunks."""
+        assert [c["uuid"] for c in reranker.rerank("la vertu enseigne", make_chunks(), top_k=1)] == ["full"]
+
+        result = reranker.rerank("la vertu enseigne", make_chunks(), threshold=2.0, min_keep=3)
+        assert [c["uuid"] for c in result] == ["full", "half", "low"]
+
+    def test_scores_are_cached_per_query_and_uuid(self, reranker: CrossEncoderReranker) -> None:
+        """Test that only unseen (query, uuid) pairs reach the model."""
+        model = reranker.model
+        chunks = make_chunks()
+
+        reranker.rerank("la vertu enseigne", chunks[:2])
+        reranker.rerank("la  vertu enseigne", chunks)
+        reranker.rerank("autre question", chunks[:1])
+
+        assert model.calls == [2, 2, 1]
+        assert reranker.cache.stats()["hits"] == 2
+
+    def test_failed_load_is_not_retried(self) -> None:
+        """Test that a model that failed to load is not loaded again."""
+        reranker = CrossEncoderReranker()
+        with patch.object(reranker, "_load", side_effect=OSError("model not found")) as load:
+            for _ in range(3):
+                with pytest.raises(RuntimeError, match="model not found"):
+                    reranker.rerank("q", make_chunks())
+
+        load.assert_called_once()
+        assert reranker.stats()["load_error"] == "model not found"
+
+    def test_score_cache_is_bounded(self) -> None:
+        """Test LRU eviction of the score cache."""
+        cache = ScoreCache(max_size=2)
+        cache.put(("q", "a"), 0.1)
+        cache.put(("q", "b"), 0.2)
+        cache.get(("q", "a"))
+        cache.put(("q", "c"), 0.3)
+
+        assert cache.get(("q", "b")) is None
+        assert cache.get(("q", "a")) == 0.1
+        assert len(cache) == 2
+
+
+class TestRerankDispatch:
+    """Tests for flask_app.rerank_rag_chunks modes and fallback."""
+
+    def test_mode_validation(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test RERANK_MODE parsing."""
+        monkeypatch.setenv("RERANK_MODE", "LLM")
+        assert get_rerank_mode() == "llm"
+        with pytest.raises(ValueError):
+            get_rerank_mode("bm25")
+
+    def test_cross_encoder_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the default mode uses the cross-encoder, not the LLM."""
+        from flask_app import rerank_rag_chunks
+
+        monkeypatch.setenv("RERANK_MODE", "cross-encoder")
+        fake = CrossEncoderReranker(model=FakeCrossEncoder(), threshold=0.5, min_keep=0)
+        with patch("utils.reranker.get_reranker", return_value=fake), \
+                patch("flask_app.llm_rerank_rag_chunks") as llm_rerank:
+            result = rerank_rag_chunks("la vertu enseigne", make_chunks(), "ollama", "qwen2.5:7b")
+
+        assert [c["uuid"] for c in result] == ["full", "half"]
+        llm_rerank.assert_not_called()
+
+    def test_falls_back_to_llm_when_model_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the LLM fallback when the cross-encoder cannot be loaded."""
+        from flask_app import rerank_rag_chunks
+
+        monkeypatch.setenv("RERANK_MODE", "cross-encoder")
+        with patch("utils.reranker.get_reranker", side_effect=OSError("model not found")), \
+                patch("flask_app.llm_rerank_rag_chunks", return_value=["llm"]) as llm_rerank:
+            assert rerank_rag_chunks("q", make_chunks(), "ollama", "qwen2.5:7b") == ["llm"]
+
+        llm_rerank.assert_called_once()
+        monkeypatch.setenv("RERANK_MODE", "none")
+        assert rerank_rag_chunks("q", make_chunks(), "ollama", "qwen2.5:7b") == make_chunks()
+
+    def test_invalid_mode_does_not_break_chat(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a RERANK_MODE typo falls back to the cross-encoder."""
+        from flask_app import rerank_rag_chunks
+
+        monkeypatch.setenv("RERANK_MODE", "cross-encodr")
+        fake = CrossEncoderReranker(model=FakeCrossEncoder(), threshold=0.5, min_keep=0)
+        with patch("utils.reranker.get_reranker", return_value=fake):
+            result = rerank_rag_chunks("la vertu enseigne", make_chunks(), "ollama", "qwen2.5:7b")
+
+        assert [c["uuid"] for c in result] == ["full", "half"]
@@ -0,0 +1,209 @@
+"""Unit tests for the resumable chat SSE stream.
+
+Tests token coalescing, event ids and Last-Event-ID replay in the session
+event log, TTL eviction of job registries, and the /chat/stream route.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from utils.sse_stream import (
+    SessionEventLog,
+    TTLSweeper,
+    TokenCoalescer,
+    format_sse,
+    iter_event_frames,
+    parse_last_event_id,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def parse_frames(body: str) -> List[Dict[str, Any]]:
+    """Parse SSE frames into {"id", "data"} dicts (comments ignored)."""
+    frames: List[Dict[str, Any]] = []
+    for block in body.split("\n\n"):
+        frame: Dict[str, Any] = {}
+        for line in block.splitlines():
+            if line.startswith("id: "):
+                frame["id"] = int(line[4:])
+            elif line.startswith("data: "):
+                frame["data"] = json.loads(line[6:])
+        if "data" in frame:
+            frames.append(frame)
+    return frames
+
+
+class TestTokenCoalescer:
+    """Tests for TokenCoalescer."""
+
+    def test_flushes_on_size(self) -> None:
+        """Test that tokens are merged until max_chars is reached."""
+        log = SessionEventLog()
+        coalescer = TokenCoalescer(log, flush_interval=10.0, max_chars=10, clock=FakeClock())
+
+        for token in ["abc", "def", "ghij", "kl", "m"]:
+            coalescer.add(token)
+        coalescer.flush()
+
+        contents = [event["content"] for _, event in log.events_after(0)]
+        assert contents == ["abcdefghij", "klm"]
+        assert (coalescer.tokens, coalescer.events) == (5, 2)
+
+    def test_flushes_on_time(self) -> None:
+        """Test that a token arriving after flush_interval flushes the buffer."""
+        clock = FakeClock()
+        log = SessionEventLog()
+        coalescer = TokenCoalescer(log, flush_interval=30.0, max_chars=1000, clock=clock)
+
+        coalescer.add("La")
+        clock.now = 10.0
+        coalescer.add(" vertu")
+        assert len(log) == 0
+
+        clock.now = 50.0
+        coalescer.add(" est")
+        assert [e["content"] for _, e in log.events_after(0)] == ["La vertu est"]
+
+    def test_flushes_when_the_llm_stalls(self) -> None:
+        """Test that buffered tokens are emitted without waiting for the next one."""
+        log = SessionEventLog()
+        coalescer = TokenCoalescer(log, flush_interval=0.05, max_chars=1000)
+
+        coalescer.add("La")
+        coalescer.add(" vertu")
+
+        assert [e["content"] for _, e in log.wait_after(0, timeout=5.0)] == ["La vertu"]
+        coalescer.flush()
+        assert len(log) == 1
+
+
+class TestSessionEventLog:
+    """Tests for SessionEventLog and SSE framing."""
+
+    def test_ids_are_monotonic_and_replayable(self) -> None:
+        """Test that events get ids 1..n and can be replayed from any id."""
+        log = SessionEventLog()
+        ids = [log.append({"type": "token", "content": str(i)}) for i in range(3)]
+        ids.append(log.append({"type": "complete"}))
+
+        assert ids == [1, 2, 3, 4]
+        assert log.closed
+        assert [i for i, _ in log.events_after(2)] == [3, 4]
+        assert log.events_after(10) == []
+
+    def test_iter_event_frames_resumes_after_id(self) -> None:
+        """Test that a reader resuming from id 2 only gets later events."""
+        log = SessionEventLog()
+        for i in range(3):
+            log.append({"type": "token", "content": str(i)})
+
+        def produce() -> None:
+            log.append({"type": "token", "content": "3"})
+            log.append({"type": "complete"})
+
+        threading.Timer(0.05, produce).start()
+        frames = parse_frames("".join(iter_event_frames(log, last_id=2, poll_timeout=0.5)))
+
+        assert [f["id"] for f in frames] == [3, 4, 5]
+        assert frames[-1]["data"] == {"type": "complete"}
+
+    def test_format_and_parse_ids(self) -> None:
+        """Test SSE framing and Last-Event-ID parsing."""
+        assert format_sse(7, {"type": "complete"}) == 'id: 7\ndata: {"type": "complete"}\n\n'
+        assert parse_last_event_id("12") == 12
+        assert parse_last_event_id(None) == 0
+        assert parse_last_event_id("abc") == 0
+        assert parse_last_event_id("-3") == 0
+
+
+class TestTTLSweeper:
+    """Tests for TTLSweeper."""
+
+    def test_evicts_finished_entries_after_ttl(self) -> None:
+        """Test that only finished entries older than the TTL are evicted."""
+        finished_log = SessionEventLog()
+        finished_log.append({"type": "complete"})
+        chats: Dict[str, Dict[str, Any]] = {
+            "done": {"status": "generating", "events": finished_log},
+            "running": {"status": "generating", "events": SessionEventLog()},
+        }
+        jobs: Dict[str, Dict[str, Any]] = {
+            "ok": {"status": "complete", "created_at": 0.0},
+            "failed": {"status": "failed", "created_at": 0.0, "finished_at": 50.0},
+            "stuck": {"status": "processing", "created_at": 0.0},
+        }
+        sweeper = TTLSweeper({"chat": chats, "jobs": jobs}, ttl=100, max_age=1000)
+
+        assert sweeper.sweep(now=100.0) == {"chat": 0, "jobs": 0}
+        assert sweeper.sweep(now=160.0) == {"chat": 0, "jobs": 1}
+        assert "failed" not in jobs
+
+        assert sweeper.sweep(now=250.0) == {"chat": 1, "jobs": 1}
+        assert set(chats) == {"running"} and set(jobs) == {"stuck"}
+
+        sweeper.sweep(now=1000.0)
+        assert jobs == {}
+        assert sweeper.stats()["evicted"] == {"chat": 1, "jobs": 3}
+
+
+class TestChatStreamRoute:
+    """Tests for GET /chat/stream/<session_id>."""
+
+    @pytest.fixture
+    def client(self) -> Any:
+        from flask_app import app
+
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    def test_last_event_id_replays_missed_events(self, client: Any) -> None:
+        """Test that a reconnecting client only receives events after its id."""
+        from flask_app import chat_sessions
+
+        log = SessionEventLog()
+        log.append({"type": "context", "chunks": []})
+        log.append({"type": "token", "content": "La vertu"})
+        log.append({"type": "token", "content": " s'enseigne"})
+        log.append({"type": "complete"})
+        chat_sessions["resume-test"] = {"status": "complete", "events": log}
+
+        try:
+            full = parse_frames(client.get("/chat/stream/resume-test").get_data(as_text=True))
+            resumed = parse_frames(client.get(
+                "/chat/stream/resume-test", headers={"Last-Event-ID": "2"}
+            ).get_data(as_text=True))
+        finally:
+            chat_sessions.pop("resume-test", None)
+
+        assert [f["id"] for f in full] == [1, 2, 3, 4]
+        assert [f["id"] for f in resumed] == [3, 4]
+        assert resumed[0]["data"]["content"] == " s'enseigne"
+
+    def test_sweeper_starts_with_first_request(self) -> None:
+        """Test that importing flask_app does not start the sweeper thread."""
+        import flask_app
+
+        if flask_app.job_sweeper._thread is None:
+            assert "ttl-sweeper" not in [t.name for t in threading.enumerate()]
+        with flask_app.app.test_client() as client:
+            client.get("/chat/stream/missing")
+        assert flask_app.job_sweeper._thread is not None
+
+    def test_unknown_session(self, client: Any) -> None:
+        """Test that an evicted or unknown session yields an error event."""
+        frames = parse_frames(client.get("/chat/stream/missing").get_data(as_text=True))
+
+        assert frames[0]["data"]["type"] == "error"
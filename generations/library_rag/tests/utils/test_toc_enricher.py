@@ -4,11 +4,16 @@ Tests the enrichment of chunk metadata with hierarchical information
 from the table of contents (TOC).
 """
 
-from typing import Any, Dict, List
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 
+from utils import toc_enricher
 from utils.toc_enricher import (
+    TocIndex,
     enrich_chunks_with_toc,
     extract_paragraph_number,
     find_matching_toc_entry,
@@ -427,3 +432,85 @@ class TestTocEnricherIntegration:
         assert enriched[1]["sectionPath"] == "Peirce: CP 6.628 > 629. The next point is..."
         assert enriched[1]["chapterTitle"] == "Peirce: CP 6.628"
         assert enriched[1]["canonical_reference"] == "CP 6.628"
+
+
+# Processed Peirce Collected Papers (benchmark input when available)
+PEIRCE_CHUNKS_FILE = Path(
+    "output/peirce_collected_papers_fixed/peirce_collected_papers_fixed_chunks.json"
+)
+
+
+def load_peirce_benchmark_data() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """TOC and chunks of the Peirce chunk file, or a synthetic corpus of the same shape."""
+    if PEIRCE_CHUNKS_FILE.exists():
+        data = json.loads(PEIRCE_CHUNKS_FILE.read_text(encoding="utf-8"))
+        toc = data.get("toc") or data.get("metadata", {}).get("toc", [])
+        return toc, data.get("chunks", [])
+
+    rng = random.Random(42)
+    toc: List[Dict[str, Any]] = []
+    for volume in range(1, 9):
+        for paragraph in range(1, 251):
+            toc.append({"title": f"Peirce: CP {volume}.{paragraph}", "level": 1})
+            toc.append({"title": f"{paragraph}. Sign{rng.randint(0, 9)} and its object", "level": 2})
+
+    chunks: List[Dict[str, Any]] = []
+    for order in range(2000):
+        paragraph = rng.randint(1, 300)
+        section = rng.choice([
+            f"{paragraph}. Sign{rng.randint(0, 9)} and interpretant",
+            f"Peirce: CP {rng.randint(1, 8)}.{paragraph}",
+            "Untitled section",
+        ])
+        chunks.append({"section": section, "order_index": order})
+    return toc, chunks
+
+
+class TestTocIndex:
+    """Tests for the indexed TOC matching used by enrich_chunks_with_toc."""
+
+    def test_index_matches_linear_scan(self) -> None:
+        """Test that TocIndex returns the same entry as the linear scan."""
+        toc, chunks = load_peirce_benchmark_data()
+        flat_toc = flatten_toc_with_paths(toc, {})
+        index = TocIndex(flat_toc)
+
+        for chunk in chunks[:500]:
+            assert index.find(chunk) is find_matching_toc_entry(chunk, flat_toc)
+
+    def test_proximity_ties_pick_first_entry(self) -> None:
+        """Test that the bisect fallback keeps min()'s first-entry tie-break."""
+        flat_toc = flatten_toc_with_paths(
+            [{"title": "A", "level": 1}, {"title": "B", "level": 1}], {}
+        )
+        index = TocIndex(flat_toc)
+
+        assert index.find({"section": "?", "order_index": 0.5})["title"] == "A"
+        assert index.find({"section": "?", "order_index": 99})["title"] == "B"
+        assert index.find({"section": "?", "order_index": -3})["title"] == "A"
+
+    def test_peirce_enrichment_parses_titles_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the index gives the linear results with O(toc + chunks) parsing."""
+        toc, chunks = load_peirce_benchmark_data()
+        flat_toc = flatten_toc_with_paths(toc, {})
+        calls = {"count": 0}
+        original = toc_enricher.extract_paragraph_number
+
+        def counting_extract(section_text: str) -> Optional[str]:
+            calls["count"] += 1
+            return original(section_text)
+
+        monkeypatch.setattr(toc_enricher, "extract_paragraph_number", counting_extract)
+
+        linear = [find_matching_toc_entry(chunk, flat_toc) for chunk in chunks]
+        linear_calls, calls["count"] = calls["count"], 0
+
+        index = TocIndex(flat_toc)
+        indexed = [index.find(chunk) for chunk in chunks]
+
+        assert indexed == linear
+        # Each TOC title is parsed once at build time, each chunk at most once
+        assert calls["count"] <= len(flat_toc) + len(chunks)
+        assert calls["count"] < linear_calls
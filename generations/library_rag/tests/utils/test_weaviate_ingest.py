@@ -0,0 +1,151 @@
+"""Unit tests for the pipelined Weaviate insertion.
+
+Tests the retry with exponential backoff of failed objects, the
+deterministic object uuids, the idempotence of a batch resent after a
+client-side timeout, and the deletion of stale objects left by a longer
+previous ingestion. The collection and the embedder are faked.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+from unittest.mock import patch
+
+import pytest
+
+import weaviate.classes.data as wvd
+
+from utils.weaviate_ingest import (
+    INSERT_BACKOFF_SECONDS,
+    INSERT_MAX_RETRIES,
+    _insert_batch_with_retry,
+    insert_with_pipeline,
+)
+
+
+class FakeData:
+    """insert_many() upserting objects by uuid, with scripted failures."""
+
+    def __init__(self, timeouts: int = 0, failing: Optional[Set[str]] = None) -> None:
+        self.stored: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[List[str]] = []
+        self.timeouts = timeouts
+        self.failing = failing or set()
+
+    def insert_many(self, objects: List[wvd.DataObject]) -> SimpleNamespace:
+        self.calls.append([str(obj.uuid) for obj in objects])
+        errors: Dict[int, SimpleNamespace] = {}
+        for i, obj in enumerate(objects):
+            uuid = str(obj.uuid)
+            if uuid in self.failing:
+                self.failing.discard(uuid)
+                errors[i] = SimpleNamespace(message="store is read-only")
+            else:
+                self.stored[uuid] = obj.properties
+        if self.timeouts:
+            # Committed server-side, but the response never reaches the client
+            self.timeouts -= 1
+            raise TimeoutError("Read timed out")
+        return SimpleNamespace(errors=errors)
+
+    def delete_many(self, where: Any) -> SimpleNamespace:
+        ids = {str(uuid) for uuid in where.value}
+        deleted = [uuid for uuid in self.stored if uuid in ids]
+        for uuid in deleted:
+            del self.stored[uuid]
+        return SimpleNamespace(successful=len(deleted))
+
+
+class FakeEmbedder:
+    """Embedder returning one constant vector per text."""
+
+    optimal_batch_size = 8
+
+    def embed_batch(self, texts: List[str], batch_size: int, show_progress: bool) -> List[List[float]]:
+        return [[0.1, 0.2] for _ in texts]
+
+
+def make_objects(n: int) -> List[wvd.DataObject]:
+    """DataObjects with fixed uuids."""
+    return [wvd.DataObject(properties={"text": f"t{i}"}, uuid=f"00000000-0000-0000-0000-{i:012d}") for i in range(n)]
+
+
+@pytest.fixture
+def sleeps():
+    """Record the backoff delays instead of sleeping."""
+    with patch("utils.weaviate_ingest.time.sleep") as sleep:
+        yield sleep
+
+
+class TestInsertBatchWithRetry:
+    """Tests for _insert_batch_with_retry."""
+
+    def test_only_failed_objects_are_retried_with_backoff(self, sleeps: Any) -> None:
+        """Test that failed objects are resent alone after an exponential delay."""
+        objects = make_objects(4)
+        data = FakeData(failing={str(objects[1].uuid), str(objects[3].uuid)})
+        collection = SimpleNamespace(data=data)
+
+        assert _insert_batch_with_retry(collection, objects, "Batch 1/1") == (4, 0, 1)
+        assert data.calls[1] == [str(objects[1].uuid), str(objects[3].uuid)]
+        assert [c.args[0] for c in sleeps.call_args_list] == [INSERT_BACKOFF_SECONDS]
+
+    def test_gives_up_after_max_retries(self, sleeps: Any) -> None:
+        """Test that a batch failing every attempt is reported as failed."""
+        data = FakeData()
+        data.insert_many = lambda objects: (_ for _ in ()).throw(TimeoutError("down"))
+        collection = SimpleNamespace(data=data)
+
+        assert _insert_batch_with_retry(collection, make_objects(3), "Batch 1/1") == (
+            0, 3, INSERT_MAX_RETRIES
+        )
+        assert [c.args[0] for c in sleeps.call_args_list] == [
+            INSERT_BACKOFF_SECONDS * 2 ** i for i in range(INSERT_MAX_RETRIES)
+        ]
+
+    def test_resent_batch_is_not_inserted_twice(self, sleeps: Any) -> None:
+        """Test that a batch committed before a client timeout is not duplicated."""
+        objects = make_objects(5)
+        data = FakeData(timeouts=1)
+        collection = SimpleNamespace(data=data)
+
+        assert _insert_batch_with_retry(collection, objects, "Batch 1/1") == (5, 0, 1)
+        assert len(data.stored) == 5
+        assert len(data.calls) == 2
+
+
+class TestInsertWithPipeline:
+    """Tests for insert_with_pipeline."""
+
+    def test_uuids_are_deterministic(self, sleeps: Any) -> None:
+        """Test that re-running an ingestion targets the same object uuids."""
+        objects = [{"text": f"chunk {i}"} for i in range(7)]
+        first, second = FakeData(), FakeData()
+
+        insert_with_pipeline(SimpleNamespace(data=first), objects, FakeEmbedder(), 3, "platon_menon", kind="chunks")
+        insert_with_pipeline(SimpleNamespace(data=second), objects, FakeEmbedder(), 3, "platon_menon", kind="chunks")
+        other = FakeData()
+        insert_with_pipeline(SimpleNamespace(data=other), objects, FakeEmbedder(), 3, "platon_republique", kind="chunks")
+
+        assert list(first.stored) == list(second.stored)
+        assert len(set(first.stored)) == 7
+        assert not set(first.stored) & set(other.stored)
+
+    def test_pipeline_survives_lost_response(self, sleeps: Any) -> None:
+        """Test that a timed-out but committed batch ends with no duplicate."""
+        objects = [{"text": f"chunk {i}"} for i in range(6)]
+        data = FakeData(timeouts=1)
+
+        stats = insert_with_pipeline(SimpleNamespace(data=data), objects, FakeEmbedder(), 4, "doc", kind="chunks")
+
+        assert (stats["inserted"], stats["failed"], stats["retries"]) == (6, 0, 1)
+        assert len(data.stored) == 6
+
+    def test_reingestion_deletes_stale_objects(self, sleeps: Any) -> None:
+        """Test that a shorter re-ingestion leaves no object of the longer one."""
+        data = FakeData()
+        collection = SimpleNamespace(data=data)
+
+        insert_with_pipeline(collection, [{"text": f"old {i}"} for i in range(9)], FakeEmbedder(), 4, "doc", kind="chunks")
+        insert_with_pipeline(collection, [{"text": f"new {i}"} for i in range(5)], FakeEmbedder(), 4, "doc", kind="chunks")
+
+        assert sorted(obj["text"] for obj in data.stored.values()) == [f"new {i}" for i in range(5)]
@@ -0,0 +1,480 @@
+"""Materialized corpus catalog (per-work counts, authors, languages, pages).
+
+The home page, ``/passages``, ``/search``, ``/chat``, ``/api/get-works`` and
+``/documents`` all need the same corpus overview: which works are indexed,
+by whom, in which languages, with how many chunks and summaries. Computing
+it on every request means scanning the whole Chunk and Summary collections.
+
+This module keeps that overview in a small JSON file instead. It is updated
+incrementally by the ingestion functions of ``utils.weaviate_ingest``
+(``ingest_document``, ``ingest_summaries``, ``delete_document_chunks``) and
+rebuilt from Weaviate only when it is missing or older than
+``CORPUS_CATALOG_MAX_AGE``. The rebuild uses aggregate ``group_by`` queries
+on the Chunk collection (one row per work, counted server-side) rather than
+fetching objects.
+
+Entries are keyed by document ``sourceId`` (``doc_name``). Works that only
+appear in chunks (no Work object with a sourceId) are keyed by title and
+have ``source_id`` set to None.
+
+Configuration:
+    - ``CORPUS_CATALOG_PATH`` : Catalog file (default: output/corpus_catalog.json)
+    - ``CORPUS_CATALOG_MAX_AGE`` : Seconds before a full rebuild (default: 86400,
+      0 = only rebuild when the file is missing)
+
+Usage:
+    >>> from utils.corpus_catalog import get_corpus_catalog
+    >>> catalog = get_corpus_catalog()
+    >>> if not catalog.is_fresh():
+    ...     with get_weaviate_client() as client:
+    ...         catalog.rebuild(client)
+    >>> stats = catalog.collection_stats()
+    >>> works = catalog.works()
+
+See Also:
+    - utils.weaviate_ingest: Incremental updates on ingest/delete
+    - flask_app.get_collection_stats: Main reader
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, TypedDict
+
+from weaviate import WeaviateClient
+from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.classes.query import Metrics
+
+from .types import CollectionStats, CorpusWorkEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / "output" / "corpus_catalog.json"
+DEFAULT_MAX_AGE = 86400.0
+
+# Upper bound on works returned by the group_by rebuild
+MAX_WORKS = 10000
+
+
+class CatalogFile(TypedDict):
+    """JSON layout of the catalog file.
+
+    Attributes:
+        built_at: ``time.time()`` of the last full rebuild (0 = never).
+        updated_at: ``time.time()`` of the last write.
+        works: Catalog entries keyed by sourceId (or title for orphans).
+    """
+
+    built_at: float
+    updated_at: float
+    works: Dict[str, CorpusWorkEntry]
+
+
+def _lock_file(f: IO[str]) -> None:
+    """Take an exclusive lock on an open file (blocks until available)."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f: IO[str]) -> None:
+    if sys.platform == "win32":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _prop_str(props: Mapping[str, Any], name: str) -> str:
+    """Text property of a Weaviate object ("" when missing)."""
+    value = props.get(name)
+    return str(value) if value else ""
+
+
+def _prop_int(props: Mapping[str, Any], name: str) -> int:
+    """Integer property of a Weaviate object (0 when missing)."""
+    value = props.get(name)
+    return int(value) if isinstance(value, (int, float)) else 0
+
+
+def _empty_entry(source_id: Optional[str], title: str = "") -> CorpusWorkEntry:
+    return CorpusWorkEntry(
+        source_id=source_id,
+        title=title,
+        author="",
+        edition="",
+        pages=0,
+        chunks_count=0,
+        summaries_count=0,
+        languages={},
+    )
+
+
+def _top_value(properties: Dict[str, Any], name: str) -> str:
+    """Most frequent value of a text metric in an aggregate group ("" if none)."""
+    metric = properties.get(name)
+    occurrences = getattr(metric, "top_occurrences", None) or []
+    for occurrence in occurrences:
+        if occurrence.value:
+            return str(occurrence.value)
+    return ""
+
+
+class CorpusCatalog:
+    """Per-work corpus statistics persisted to a JSON file.
+
+    Thread-safe within a process. Across processes (Flask workers, CLI
+    ingestion), every read-modify-write runs under an exclusive lock on a
+    sibling ``.lock`` file and re-reads the catalog first, so concurrent
+    updates are not lost. Readers re-read the file when another process has
+    written it since the last access.
+
+    Attributes:
+        path: Catalog file location.
+        max_age: Seconds after which ``is_fresh()`` reports the catalog stale.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age: Optional[float] = None) -> None:
+        """Initialize the catalog (the file is loaded lazily).
+
+        Args:
+            path: Catalog file. Defaults to ``CORPUS_CATALOG_PATH``.
+            max_age: Rebuild interval in seconds. Defaults to ``CORPUS_CATALOG_MAX_AGE``.
+        """
+        self.path: Path = Path(path or os.getenv("CORPUS_CATALOG_PATH") or DEFAULT_CATALOG_PATH)
+        self.max_age: float = (
+            max_age if max_age is not None
+            else float(os.getenv("CORPUS_CATALOG_MAX_AGE", DEFAULT_MAX_AGE))
+        )
+        self._lock = threading.RLock()
+        self.lock_path: Path = self.path.with_name(self.path.name + ".lock")
+        self._works: Dict[str, CorpusWorkEntry] = {}
+        self._built_at: float = 0.0
+        self._file_mtime: Optional[float] = None
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _load(self, force: bool = False) -> None:
+        """Reload the file if it changed on disk since the last read."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._file_mtime and not force:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data: CatalogFile = json.load(f)
+            self._works = data.get("works", {})
+            self._built_at = float(data.get("built_at", 0.0))
+            self._file_mtime = mtime
+        except (OSError, ValueError) as e:
+            logger.warning(f"Catalogue corpus illisible ({self.path}): {e}")
+            self._works = {}
+            self._built_at = 0.0
+
+    def _save(self) -> None:
+        """Write the catalog atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        data = CatalogFile(built_at=self._built_at, updated_at=time.time(), works=self._works)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._file_mtime = self.path.stat().st_mtime
+
+    @contextmanager
+    def _updating(self) -> Iterator[None]:
+        """Read-modify-write section, exclusive across threads and processes.
+
+        Takes the thread lock and the file lock, reloads the catalog from
+        disk, and saves it when the block exits without error.
+        """
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+", encoding="utf-8") as lock_file:
+                _lock_file(lock_file)
+                try:
+                    self._load(force=True)
+                    yield
+                    self._save()
+                finally:
+                    _unlock_file(lock_file)
+
+    def is_fresh(self) -> bool:
+        """Whether the catalog has been built and is younger than ``max_age``."""
+        with self._lock:
+            self._load()
+            if not self._built_at:
+                return False
+            return self.max_age <= 0 or time.time() - self._built_at < self.max_age
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next read."""
+        with self._updating():
+            self._built_at = 0.0
+
+    # -------------------------------------------------------------------------
+    # Incremental updates (called by utils.weaviate_ingest)
+    # -------------------------------------------------------------------------
+
+    def _entry(self, source_id: str) -> CorpusWorkEntry:
+        if source_id not in self._works:
+            self._works[source_id] = _empty_entry(source_id)
+        return self._works[source_id]
+
+    def record_chunks(
+        self,
+        source_id: str,
+        title: str,
+        author: str,
+        language: str,
+        count: int,
+        pages: int = 0,
+        edition: str = "",
+    ) -> None:
+        """Record the chunks of a document ingested by ``ingest_document``.
+
+        Chunk uuids are deterministic, so a re-ingestion replaces the
+        document's chunks in place: the counts are set, not added.
+
+        Args:
+            source_id: Document identifier (doc_name).
+            title: Work title written to Chunk.workTitle.
+            author: Author written to Chunk.workAuthor.
+            language: Language code of the chunks.
+            count: Number of chunks of the document now in Weaviate.
+            pages: Page count of the source document.
+            edition: Edition identifier.
+        """
+        with self._updating():
+            # A rebuild may have keyed this work by title before its Work
+            # existed: those chunks are the document's, superseded by this count
+            entry = self._entry(source_id)
+            orphan = self._works.get(title)
+            if title != source_id and orphan is not None and orphan.get("source_id") is None:
+                del self._works[title]
+
+            entry["title"] = title
+            entry["author"] = author
+            entry["pages"] = pages or entry.get("pages", 0)
+            entry["edition"] = edition or entry.get("edition", "")
+            entry["chunks_count"] = count
+            entry["languages"] = {language: count} if count else {}
+
+    def record_summaries(self, source_id: str, count: int) -> None:
+        """Record the summaries of a document ingested by ``ingest_summaries`` (set, not added)."""
+        with self._updating():
+            self._entry(source_id)["summaries_count"] = count
+
+    def record_deletion(self, source_id: str, chunks: int, summaries: int) -> None:
+        """Account for objects removed by ``delete_document_chunks``.
+
+        Language counts are scaled down proportionally since the deletion
+        result does not break chunks down by language.
+        """
+        with self._updating():
+            entry = self._works.get(source_id)
+            if entry is None:
+                return
+
+            before = entry["chunks_count"]
+            entry["chunks_count"] = max(0, before - chunks)
+            entry["summaries_count"] = max(0, entry["summaries_count"] - summaries)
+            if entry["chunks_count"] == 0:
+                entry["languages"] = {}
+            elif chunks and before:
+                ratio = entry["chunks_count"] / before
+                entry["languages"] = {
+                    lang: round(n * ratio) for lang, n in entry["languages"].items()
+                }
+
+    # -------------------------------------------------------------------------
+    # Full rebuild from Weaviate
+    # -------------------------------------------------------------------------
+
+    def rebuild(self, client: WeaviateClient) -> None:
+        """Recompute the catalog from Weaviate and persist it.
+
+        Work objects give source ids, titles, pages and editions. Chunk
+        counts, authors and languages come from one aggregate query grouped
+        by ``workTitle``. Summaries only reference their document through
+        the nested ``document.sourceId`` (which ``group_by`` cannot use), so
+        they are counted with a property-only scan of the small Summary
+        collection.
+
+        Args:
+            client: Connected Weaviate client.
+
+        Raises:
+            Exception: Propagates Weaviate errors; the previous catalog is kept.
+        """
+        started = time.time()
+        works: Dict[str, CorpusWorkEntry] = {}
+        source_by_title: Dict[str, str] = {}
+
+        # 1. Works with a sourceId = documents
+        try:
+            work_collection = client.collections.get("Work")
+            for work in work_collection.iterator(include_vector=False):
+                props = work.properties
+                source_id = _prop_str(props, "sourceId")
+                if not source_id:
+                    continue
+                entry = _empty_entry(source_id, _prop_str(props, "title"))
+                entry["author"] = _prop_str(props, "author")
+                entry["pages"] = _prop_int(props, "pages")
+                entry["edition"] = _prop_str(props, "edition")
+                works[source_id] = entry
+                if entry["title"]:
+                    source_by_title.setdefault(entry["title"], source_id)
+        except Exception as e:
+            logger.warning(f"Collection Work indisponible pour le catalogue: {e}")
+
+        # 2. Chunks: counts per work, computed server-side
+        chunk_collection = client.collections.get("Chunk")
+        grouped = chunk_collection.aggregate.over_all(
+            group_by=GroupByAggregate(prop="workTitle", limit=MAX_WORKS),
+            total_count=True,
+            return_metrics=[
+                Metrics("workAuthor").text(top_occurrences_value=True, limit=1),
+                Metrics("language").text(
+                    top_occurrences_count=True, top_occurrences_value=True, limit=20
+                ),
+            ],
+        )
+
+        for group in grouped.groups:
+            title = group.grouped_by.value
+            if not title:
+                continue
+            title = str(title)
+            key = source_by_title.get(title, title)
+            entry = works.setdefault(key, _empty_entry(None, title))
+            entry["chunks_count"] = group.total_count or 0
+            entry["author"] = _top_value(group.properties, "workAuthor") or entry["author"]
+            language_metric = group.properties.get("language")
+            entry["languages"] = {
+                str(o.value): o.count or 0
+                for o in (getattr(language_metric, "top_occurrences", None) or [])
+                if o.value
+            }
+
+        # 3. Summaries per document
+        try:
+            summary_collection = client.collections.get("Summary")
+            for summary in summary_collection.iterator(include_vector=False):
+                props = summary.properties
+                document = props.get("document")
+                key = _prop_str(document, "sourceId") if isinstance(document, dict) else ""
+                if not key:
+                    key = source_by_title.get(_prop_str(props, "workTitle"), "")
+                if key in works:
+                    works[key]["summaries_count"] += 1
+        except Exception as e:
+            logger.warning(f"Collection Summary indisponible pour le catalogue: {e}")
+
+        with self._updating():
+            self._works = works
+            self._built_at = time.time()
+
+        logger.info(
+            f"Catalogue corpus reconstruit: {len(works)} œuvres en {time.time() - started:.2f}s"
+        )
+
+    # -------------------------------------------------------------------------
+    # Readers
+    # -------------------------------------------------------------------------
+
+    def entries(self) -> List[CorpusWorkEntry]:
+        """Copy of all catalog entries."""
+        with self._lock:
+            self._load()
+            return [
+                CorpusWorkEntry(**{**entry, "languages": dict(entry.get("languages", {}))})
+                for entry in self._works.values()
+            ]
+
+    def works(self) -> List[Dict[str, Any]]:
+        """Works with chunks, as returned by ``/api/get-works``.
+
+        Returns:
+            List of ``{"title", "author", "chunks_count"}`` sorted by author
+            then title. Works sharing a title are merged.
+        """
+        by_title: Dict[str, Dict[str, Any]] = {}
+        for entry in self.entries():
+            title = entry.get("title", "")
+            if not title or not entry.get("chunks_count"):
+                continue
+            if title not in by_title:
+                by_title[title] = {
+                    "title": title,
+                    "author": entry.get("author") or "Unknown",
+                    "chunks_count": 0,
+                }
+            by_title[title]["chunks_count"] += entry["chunks_count"]
+
+        works_list = list(by_title.values())
+        works_list.sort(key=lambda w: (w["author"].lower(), w["title"].lower()))
+        return works_list
+
+    def collection_stats(self) -> CollectionStats:
+        """Corpus totals and unique authors/works/languages of indexed chunks."""
+        authors: set[str] = set()
+        titles: set[str] = set()
+        languages: set[str] = set()
+        passages = 0
+
+        for entry in self.entries():
+            if not entry.get("chunks_count"):
+                continue
+            passages += entry["chunks_count"]
+            if entry.get("author"):
+                authors.add(entry["author"])
+            if entry.get("title"):
+                titles.add(entry["title"])
+            languages.update(lang for lang, n in entry.get("languages", {}).items() if n)
+
+        return CollectionStats(
+            passages=passages,
+            authors=len(authors),
+            works=len(titles),
+            languages=len(languages),
+            author_list=sorted(authors),
+            work_list=sorted(titles),
+            language_list=sorted(languages),
+        )
+
+
+_catalog: Optional[CorpusCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_corpus_catalog() -> CorpusCatalog:
+    """Get the process-wide corpus catalog singleton."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = CorpusCatalog()
+        return _catalog
@@ -0,0 +1,426 @@
+"""Hybrid BM25 + vector retrieval on the Chunk collection.
+
+Dense bge-m3 vectors handle paraphrases well but rank exact references
+("CP 5.628", "Ménon 80a"), Greek/Latin terms and proper names poorly, which
+pushed callers to very large ``initial_pool`` sizes. This module combines
+Weaviate BM25 over ``text``, ``canonicalReference`` and ``keywords`` with
+the ``near_vector`` results, and routes exact-reference queries straight to
+a ``canonicalReference`` lookup.
+
+Architecture:
+    - ``parse_reference_query``: detects queries that are only a reference
+      (Peirce CP "CP 5.628", Stephanus "Ménon 80a", "§ 128")
+    - ``reference_lookup``: filtered ``fetch_objects`` on canonicalReference,
+      verified client-side (word tokenization ignores punctuation)
+    - ``search_chunks``: vector, BM25 or hybrid search; hybrid fuses both
+      lists with reciprocal-rank fusion or with Weaviate-style relative
+      score fusion (min-max normalized, ``alpha`` = weight of the vector side)
+    - Every hit keeps a cosine ``distance``: BM25-only hits are fetched with
+      their vector and compared to the query vector locally, so callers'
+      ``similarity`` stays on the same 0-100 scale
+
+Configuration:
+    - ``SEARCH_MODE`` : "hybrid" (default), "vector" or "bm25"
+    - ``HYBRID_FUSION`` : "rrf" (default) or "alpha"
+    - ``HYBRID_ALPHA`` : vector weight for alpha fusion, 0 = BM25 only, 1 = vector only (default: 0.6)
+    - ``HYBRID_POOL_FACTOR`` : candidates fetched per side, as a multiple of ``limit`` (default: 2)
+
+Usage:
+    >>> from utils.hybrid_search import search_chunks
+    >>> hits = search_chunks(chunks, "Ménon 80a", query_vector, limit=10)
+    >>> hits[0].source
+    'reference'
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import weaviate.classes.query as wvq
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODE_HYBRID = "hybrid"
+SEARCH_MODE_VECTOR = "vector"
+SEARCH_MODE_BM25 = "bm25"
+SEARCH_MODES = (SEARCH_MODE_HYBRID, SEARCH_MODE_VECTOR, SEARCH_MODE_BM25)
+
+FUSION_RRF = "rrf"
+FUSION_ALPHA = "alpha"
+
+DEFAULT_ALPHA = 0.6
+DEFAULT_POOL_FACTOR = 2
+RRF_K = 60
+
+BM25_PROPERTIES: List[str] = ["text", "canonicalReference^3", "keywords^2"]
+"""BM25 fields; a reference or keyword match weighs more than a word of the text."""
+
+# "CP 5.628", "C.P. 5.628", "CP5.628"
+_CP_PATTERN = re.compile(r"^\s*C\.?\s*P\.?\s*(\d{1,2})\s*[.:]\s*(\d{1,4})\s*$", re.IGNORECASE)
+# "Ménon 80a", "République 514a-b", "Phédon 72 e"
+_STEPHANUS_PATTERN = re.compile(
+    r"^\s*(?P<work>[^\W\d_][\w'’\- ]{1,60}?)\s+(?P<page>\d{1,4})\s*(?P<letter>[a-e])"
+    r"(?:\s*[-–]\s*\d{0,4}\s*[a-e]?)?\s*$",
+    re.IGNORECASE,
+)
+# "§ 128", "§128"
+_SECTION_PATTERN = re.compile(r"^\s*§\s*(\d{1,5})\s*$")
+
+
+@dataclass
+class ReferenceQuery:
+    """An exact-reference query.
+
+    Attributes:
+        kind: "cp", "stephanus" or "section".
+        reference: Canonical form ("CP 5.628", "Ménon 80a", "128").
+        locus: Reference without the work name ("5.628", "80a", "128").
+        work: Work name for Stephanus references.
+    """
+
+    kind: str
+    reference: str
+    locus: str
+    work: Optional[str] = None
+
+
+@dataclass
+class SearchHit:
+    """One retrieved chunk.
+
+    Attributes:
+        object: Weaviate object (``uuid``, ``properties``, ``metadata``).
+        distance: Cosine distance to the query vector (None if unknown).
+        score: Fused score (RRF, alpha-fused or BM25 score), higher is better.
+        source: "reference", "vector", "bm25" or "hybrid" (found by both sides).
+        explain: Rank of the hit in each result list (None when absent).
+    """
+
+    object: Any
+    distance: Optional[float]
+    score: float
+    source: str
+    explain: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def uuid(self) -> str:
+        return str(self.object.uuid)
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        return dict(self.object.properties)
+
+    @property
+    def similarity(self) -> Optional[float]:
+        """Cosine similarity in percent (same scale as near_vector results)."""
+        if self.distance is None:
+            return None
+        return round((1 - self.distance) * 100, 1)
+
+
+def get_search_mode(mode: Optional[str] = None) -> str:
+    """Resolve the retrieval mode from argument or ``SEARCH_MODE``.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    mode = (mode or os.environ.get("SEARCH_MODE", SEARCH_MODE_HYBRID)).strip().lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown SEARCH_MODE '{mode}'. Expected one of: {', '.join(SEARCH_MODES)}")
+    return mode
+
+
+def normalize_reference(reference: str) -> str:
+    """Comparable form of a reference (NFC, casefold, no spaces around dots)."""
+    text = unicodedata.normalize("NFC", reference or "").casefold()
+    text = re.sub(r"\s*([.:§])\s*", r"\1", text)
+    return " ".join(text.split())
+
+
+def parse_reference_query(query: str) -> Optional[ReferenceQuery]:
+    """Detect a query made only of a canonical reference.
+
+    Args:
+        query: Raw user query.
+
+    Returns:
+        ReferenceQuery, or None for any other query (including questions
+        that merely contain a reference).
+
+    Example:
+        >>> parse_reference_query("CP 5.628").reference
+        'CP 5.628'
+        >>> parse_reference_query("Ménon 80a").work
+        'Ménon'
+        >>> parse_reference_query("Qu'est-ce que la vertu ?") is None
+        True
+    """
+    query = (query or "").strip().strip("\"'«»“”").strip()
+    if not query or len(query) > 80:
+        return None
+
+    match = _CP_PATTERN.match(query)
+    if match:
+        locus = f"{int(match.group(1))}.{int(match.group(2))}"
+        return ReferenceQuery(kind="cp", reference=f"CP {locus}", locus=locus)
+
+    match = _SECTION_PATTERN.match(query)
+    if match:
+        return ReferenceQuery(kind="section", reference=match.group(1), locus=match.group(1))
+
+    match = _STEPHANUS_PATTERN.match(query)
+    if match:
+        work = " ".join(match.group("work").split())
+        locus = f"{int(match.group('page'))}{match.group('letter').lower()}"
+        return ReferenceQuery(kind="stephanus", reference=f"{work} {locus}", locus=locus, work=work)
+
+    return None
+
+
+def _matches_reference(props: Dict[str, Any], ref: ReferenceQuery) -> bool:
+    stored = normalize_reference(str(props.get("canonicalReference") or ""))
+    if stored == normalize_reference(ref.reference):
+        return True
+    if ref.kind == "stephanus" and stored == normalize_reference(ref.locus):
+        # Reference stored without the work name: check the work instead
+        work_title = normalize_reference(str(props.get("workTitle") or (props.get("work") or {}).get("title", "")))
+        return normalize_reference(ref.work or "") in work_title
+    if ref.kind == "section":
+        section_path = str(props.get("sectionPath") or "")
+        return re.match(rf"^\s*(?:§\s*)?{re.escape(ref.locus)}\.\s", section_path) is not None
+    return False
+
+
+def reference_lookup(
+    collection: Any,
+    ref: ReferenceQuery,
+    limit: int,
+    filters: Optional[Any] = None,
+    return_properties: Optional[Sequence[str]] = None,
+) -> List[Any]:
+    """Fetch the chunks carrying an exact canonical reference.
+
+    The inverted index matches the reference tokens; results are then
+    checked against the exact normalized reference.
+
+    Args:
+        collection: Weaviate Chunk collection.
+        ref: Parsed reference.
+        limit: Maximum number of chunks returned.
+        filters: Extra Weaviate filter (author/work/language).
+        return_properties: Properties to fetch (the checked ones are added).
+
+    Returns:
+        Matching Weaviate objects in document order (``orderIndex``).
+    """
+    if ref.kind == "section":
+        ref_filter = wvq.Filter.by_property("sectionPath").like(f"{ref.locus}*")
+    else:
+        ref_filter = wvq.Filter.by_property("canonicalReference").equal(ref.reference)
+        if ref.kind == "stephanus":
+            ref_filter = ref_filter | wvq.Filter.by_property("canonicalReference").equal(ref.locus)
+    if filters is not None:
+        ref_filter = ref_filter & filters
+
+    properties = list(return_properties) if return_properties else None
+    if properties is not None:
+        checked = ["canonicalReference", "sectionPath", "orderIndex"]
+        if ref.kind == "stephanus":
+            checked.append("workTitle")
+        for name in checked:
+            if name not in properties:
+                properties.append(name)
+
+    result = collection.query.fetch_objects(
+        filters=ref_filter,
+        limit=max(limit * 4, 20),
+        include_vector=True,  # similarity to the query, as for the other hits
+        return_properties=properties,
+    )
+    matches = [obj for obj in result.objects if _matches_reference(obj.properties, ref)]
+    matches.sort(key=lambda obj: obj.properties.get("orderIndex") or 0)
+    return matches[:limit]
+
+
+def _cosine_distance(query_vector: np.ndarray, vector: Optional[Sequence[float]]) -> Optional[float]:
+    if vector is None:
+        return None
+    if isinstance(vector, dict):
+        vector = vector.get("default") or next(iter(vector.values()), None)
+        if vector is None:
+            return None
+    v = np.asarray(vector, dtype=np.float32)
+    denom = float(np.linalg.norm(query_vector) * np.linalg.norm(v))
+    if denom == 0.0:
+        return None
+    return 1.0 - float(np.dot(query_vector, v)) / denom
+
+
+def _min_max(values: Dict[str, float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    low, high = min(values.values()), max(values.values())
+    if high == low:
+        return {key: 1.0 for key in values}
+    return {key: (value - low) / (high - low) for key, value in values.items()}
+
+
+def fuse_results(
+    dense: Sequence[Any],
+    sparse: Sequence[Any],
+    query_vector: np.ndarray,
+    fusion: str = FUSION_RRF,
+    alpha: float = DEFAULT_ALPHA,
+    limit: Optional[int] = None,
+) -> List[SearchHit]:
+    """Fuse near_vector and BM25 result lists.
+
+    Args:
+        dense: near_vector objects (metadata.distance), best first.
+        sparse: BM25 objects (metadata.score, vector included), best first.
+        query_vector: Query embedding (for the distance of BM25-only hits).
+        fusion: "rrf" (rank based) or "alpha" (relative score fusion).
+        alpha: Vector weight in alpha fusion.
+        limit: Maximum number of hits.
+
+    Returns:
+        Hits sorted by decreasing fused score.
+    """
+    objects: Dict[str, Any] = {}
+    distances: Dict[str, Optional[float]] = {}
+    dense_ranks: Dict[str, int] = {}
+    sparse_ranks: Dict[str, int] = {}
+    dense_scores: Dict[str, float] = {}
+    sparse_scores: Dict[str, float] = {}
+
+    for rank, obj in enumerate(dense, start=1):
+        key = str(obj.uuid)
+        objects.setdefault(key, obj)
+        dense_ranks[key] = rank
+        distance = obj.metadata.distance if obj.metadata else None
+        distances[key] = distance
+        dense_scores[key] = 1.0 - (distance or 0.0)
+
+    for rank, obj in enumerate(sparse, start=1):
+        key = str(obj.uuid)
+        objects.setdefault(key, obj)
+        sparse_ranks[key] = rank
+        sparse_scores[key] = float(getattr(obj.metadata, "score", None) or 0.0)
+        if distances.get(key) is None:
+            distances[key] = _cosine_distance(query_vector, getattr(obj, "vector", None))
+
+    if fusion == FUSION_ALPHA:
+        dense_norm, sparse_norm = _min_max(dense_scores), _min_max(sparse_scores)
+        scores = {
+            key: alpha * dense_norm.get(key, 0.0) + (1 - alpha) * sparse_norm.get(key, 0.0)
+            for key in objects
+        }
+    else:
+        scores = {
+            key: (1.0 / (RRF_K + dense_ranks[key]) if key in dense_ranks else 0.0)
+            + (1.0 / (RRF_K + sparse_ranks[key]) if key in sparse_ranks else 0.0)
+            for key in objects
+        }
+
+    ordered = sorted(objects, key=lambda key: scores[key], reverse=True)
+    if limit is not None:
+        ordered = ordered[:limit]
+
+    hits: List[SearchHit] = []
+    for key in ordered:
+        in_dense, in_sparse = key in dense_ranks, key in sparse_ranks
+        source = "hybrid" if in_dense and in_sparse else ("vector" if in_dense else "bm25")
+        hits.append(SearchHit(
+            object=objects[key],
+            distance=distances.get(key),
+            score=round(scores[key], 6),
+            source=source,
+            explain={"vector_rank": dense_ranks.get(key), "bm25_rank": sparse_ranks.get(key)},
+        ))
+    return hits
+
+
+def search_chunks(
+    collection: Any,
+    query: str,
+    query_vector: Any,
+    limit: int,
+    filters: Optional[Any] = None,
+    return_properties: Optional[Sequence[str]] = None,
+    mode: Optional[str] = None,
+    fusion: Optional[str] = None,
+    alpha: Optional[float] = None,
+    route_references: bool = True,
+) -> List[SearchHit]:
+    """Search chunks with reference routing and vector/BM25/hybrid retrieval.
+
+    Args:
+        collection: Weaviate Chunk collection.
+        query: Raw query text (BM25 and reference detection).
+        query_vector: Query embedding (numpy array or list).
+        limit: Maximum number of hits.
+        filters: Weaviate filter applied to every sub-query.
+        return_properties: Properties to fetch (None = all).
+        mode: "hybrid", "vector" or "bm25" (default: ``SEARCH_MODE``).
+        fusion: "rrf" or "alpha" (default: ``HYBRID_FUSION``).
+        alpha: Vector weight for alpha fusion (default: ``HYBRID_ALPHA``).
+        route_references: Answer exact-reference queries with an index lookup.
+
+    Returns:
+        Hits, best first.
+    """
+    mode = get_search_mode(mode)
+    fusion = (fusion or os.environ.get("HYBRID_FUSION", FUSION_RRF)).strip().lower()
+    alpha = float(os.environ.get("HYBRID_ALPHA", DEFAULT_ALPHA)) if alpha is None else alpha
+    pool_factor = max(1, int(os.environ.get("HYBRID_POOL_FACTOR", DEFAULT_POOL_FACTOR)))
+    query_vector = np.asarray(query_vector, dtype=np.float32)
+    properties = list(return_properties) if return_properties else None
+
+    if route_references:
+        ref = parse_reference_query(query)
+        if ref is not None:
+            matches = reference_lookup(collection, ref, limit, filters, properties)
+            if matches:
+                logger.info(f"Reference query '{ref.reference}' -> {len(matches)} chunks (index lookup)")
+                return [
+                    SearchHit(
+                        object=obj,
+                        distance=_cosine_distance(query_vector, getattr(obj, "vector", None)),
+                        score=1.0,
+                        source="reference",
+                    )
+                    for obj in matches
+                ]
+            logger.info(f"Reference query '{ref.reference}' not found in index, falling back to {mode} search")
+
+    dense: List[Any] = []
+    sparse: List[Any] = []
+    pool = limit if mode != SEARCH_MODE_HYBRID else limit * pool_factor
+
+    if mode in (SEARCH_MODE_VECTOR, SEARCH_MODE_HYBRID):
+        dense = list(collection.query.near_vector(
+            near_vector=query_vector.tolist(),
+            limit=pool,
+            filters=filters,
+            return_metadata=wvq.MetadataQuery(distance=True),
+            return_properties=properties,
+        ).objects)
+
+    if mode in (SEARCH_MODE_BM25, SEARCH_MODE_HYBRID):
+        sparse = list(collection.query.bm25(
+            query=query,
+            query_properties=BM25_PROPERTIES,
+            limit=pool,
+            filters=filters,
+            include_vector=True,
+            return_metadata=wvq.MetadataQuery(score=True),
+            return_properties=properties,
+        ).objects)
+
+    return fuse_results(dense, sparse, query_vector, fusion=fusion, alpha=alpha, limit=limit)
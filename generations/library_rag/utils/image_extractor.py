@@ -16,6 +16,7 @@ Components:
     1. ImageWriterProtocol: Interface definition for image saving
     2. create_image_writer(): Factory for standard file-based writers
     3. extract_images(): Batch extraction from OCR responses
+    4. image_relative_path(): Markdown path of an image (without writing it)
 
 Integration:
     The image writer is designed to integrate with markdown_builder:
@@ -86,6 +87,19 @@ class ImageWriterProtocol(Protocol):
 ImageWriter = Callable[[int, int, str], str]
 
 
+def image_relative_path(page_idx: int, img_idx: int) -> str:
+    """Relative markdown path of an extracted image.
+
+    Args:
+        page_idx: Page number (1-based).
+        img_idx: Image index within the page (1-based).
+
+    Returns:
+        Path relative to the document output directory, e.g. 'images/page1_img1.png'.
+    """
+    return f"images/page{page_idx}_img{img_idx}.png"
+
+
 def create_image_writer(images_dir: Path) -> ImageWriter:
     """Create a function for saving images to disk.
 
@@ -130,7 +144,7 @@ def create_image_writer(images_dir: Path) -> ImageWriter:
         filepath.write_bytes(image_data)
 
         # Return relative path for markdown
-        return f"images/{filename}"
+        return image_relative_path(page_idx, img_idx)
 
     return writer
 
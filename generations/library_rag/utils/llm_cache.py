@@ -0,0 +1,178 @@
+"""Persistent content-hash cache for LLM responses.
+
+Re-running the pipeline on a document (for instance with ``skip_ocr=True``
+to tweak one step) sends the same prompts again to metadata extraction,
+TOC extraction, classification, chunking and validation. This cache stores
+every successful response on disk, keyed by the call parameters, so an
+unchanged document is re-processed in seconds and at no cost. Responses are
+stored before they are parsed: callers that cannot parse one drop it with
+``invalidate`` (see ``llm_structurer.invalidate_last_response``) so a
+malformed or truncated answer is not replayed on the next run.
+
+Architecture:
+    - Key: sha256(provider, model, temperature, prompt)
+    - Storage: SQLite file (WAL mode, shared by threads and processes)
+    - Wired into ``llm_structurer._call_mistral_api`` and ``_call_ollama``;
+      hits are counted in ``get_llm_cost()["cache_hits"]``
+
+Configuration:
+    - ``LLM_CACHE`` : "1" (default) to enable, "0" to disable
+    - ``LLM_CACHE_PATH`` : SQLite file (default: ~/.cache/library_rag/llm_responses.sqlite)
+
+Usage:
+    >>> from utils.llm_cache import get_llm_cache
+    >>> cache = get_llm_cache()
+    >>> if cache is not None:
+    ...     response = cache.get("mistral", "mistral-small-latest", 0.2, prompt)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "library_rag" / "llm_responses.sqlite"
+
+
+def llm_cache_key(provider: str, model: str, temperature: float, prompt: str) -> str:
+    """Content-addressed key of an LLM call.
+
+    Args:
+        provider: "mistral" or "ollama".
+        model: Model name.
+        temperature: Sampling temperature.
+        prompt: Full prompt text.
+
+    Returns:
+        Hex sha256 digest.
+    """
+    prompt_hash: str = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload: str = f"{provider}\x00{model}\x00{float(temperature):.4f}\x00{prompt_hash}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed store of LLM responses.
+
+    Attributes:
+        path: SQLite file location.
+        hits: Cache hits since the cache was opened.
+        misses: Cache misses since the cache was opened.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite file location.
+        """
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+        self._conn: sqlite3.Connection = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=10
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " provider TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " temperature REAL NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, provider: str, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """Return the cached response for a call, or None."""
+        key: str = llm_cache_key(provider, model, temperature, prompt)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return str(row[0])
+
+    def put(self, provider: str, model: str, temperature: float, prompt: str, response: str) -> None:
+        """Store the response of a successful call (empty responses are skipped)."""
+        if not response:
+            return
+        key: str = llm_cache_key(provider, model, temperature, prompt)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, temperature, response, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, float(temperature), response, time.time()),
+            )
+            self._conn.commit()
+
+    def invalidate(self, provider: str, model: str, temperature: float, prompt: str) -> bool:
+        """Delete the cached response of a call.
+
+        Returns:
+            True if a response was cached for this call.
+        """
+        key: str = llm_cache_key(provider, model, temperature, prompt)
+        with self._lock:
+            deleted: int = self._conn.execute(
+                "DELETE FROM responses WHERE key = ?", (key,)
+            ).rowcount
+            self._conn.commit()
+        return deleted > 0
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries on disk and hit/miss counters of this process."""
+        with self._lock:
+            entries: int = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_initialized: bool = False
+_cache_lock: threading.Lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide LLM response cache.
+
+    Returns:
+        The cache, or None if disabled (``LLM_CACHE=0``) or unavailable.
+    """
+    global _cache, _cache_initialized
+    with _cache_lock:
+        if not _cache_initialized:
+            _cache_initialized = True
+            if os.getenv("LLM_CACHE", "1").lower() not in ("0", "false", "no", "off"):
+                path = Path(os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH).expanduser()
+                try:
+                    _cache = LLMResponseCache(path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Cache LLM indisponible ({path}): {e}")
+        return _cache
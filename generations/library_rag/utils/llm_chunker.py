@@ -49,6 +49,7 @@ from .llm_structurer import (
     _get_default_mistral_model,
     _get_default_model,
     call_llm,
+    invalidate_last_response,
 )
 from .llm_cleaner import clean_page_markers, is_chunk_valid
 from .types import LLMProvider, SemanticChunk
@@ -182,6 +183,8 @@ def _extract_json_from_response(text: str) -> Dict[str, Any]:
         except json.JSONDecodeError as e:
             logger.warning(f"JSON invalide: {e}")
 
+    # Réponse inexploitable : ne pas la rejouer depuis le cache
+    invalidate_last_response()
     return {"chunks": []}
 
 
@@ -557,6 +560,10 @@ Réponds avec une liste JSON simple:
 
         return []
         
+    except json.JSONDecodeError as e:
+        invalidate_last_response()
+        logger.warning(f"Erreur extraction concepts: {e}")
+        return []
     except Exception as e:
         logger.warning(f"Erreur extraction concepts: {e}")
         return []
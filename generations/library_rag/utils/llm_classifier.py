@@ -75,6 +75,7 @@ from .llm_structurer import (
     _get_default_mistral_model,
     _get_default_model,
     call_llm,
+    invalidate_last_response,
 )
 from .types import LLMProvider
 
@@ -132,6 +133,8 @@ def _extract_json_from_response(text: str) -> dict[str, Any]:
         except json.JSONDecodeError as e:
             logger.warning(f"JSON invalide: {e}")
 
+    # Réponse inexploitable : ne pas la rejouer depuis le cache
+    invalidate_last_response()
     return {"classifications": []}
 
 
@@ -0,0 +1,110 @@
+"""Bounded parallel execution of per-section LLM calls.
+
+The V2 pipeline makes one LLM call per section (semantic chunking) or per
+chunk (concept extraction). Run in a plain loop, a
+300-section book waits on 300 sequential round-trips. This module fans
+these calls out over a thread pool sized by the provider's concurrency
+limit (``LLM_MAX_CONCURRENCY_MISTRAL`` / ``LLM_MAX_CONCURRENCY_OLLAMA``).
+
+Rate limiting is not done here: ``call_llm`` itself holds a per-provider
+slot and, for Mistral, takes a token from the shared token bucket
+(``MISTRAL_REQUESTS_PER_SECOND``), so the limits also hold across
+concurrent pipelines.
+
+Guarantees:
+    - Results are returned in input order, whatever the completion order,
+      so chunk ids and order indexes assigned afterwards are deterministic.
+    - LLM costs accumulated in worker threads are added to the caller's
+      cost tracker (``get_llm_cost()`` stays correct).
+    - The progress callback runs in the calling thread.
+
+Usage:
+    >>> from utils.llm_executor import run_llm_tasks
+    >>> results = run_llm_tasks(
+    ...     lambda section: chunk_section_with_llm(section["content"], section["title"]),
+    ...     sections,
+    ...     provider="mistral",
+    ...     on_progress=lambda done, total: print(f"{done}/{total}"),
+    ... )
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from .llm_structurer import add_llm_cost, get_llm_cost, get_provider_concurrency, reset_llm_cost
+from .types import LLMCostStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _run_tracked(fn: Callable[[T], R], item: T) -> Tuple[R, LLMCostStats]:
+    """Run fn in a worker thread and return its result with the LLM cost it incurred."""
+    reset_llm_cost()
+    result: R = fn(item)
+    return result, get_llm_cost()
+
+
+def run_llm_tasks(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    provider: str = "ollama",
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    max_workers: Optional[int] = None,
+) -> List[R]:
+    """Apply an LLM-calling function to items concurrently.
+
+    Args:
+        fn: Function called once per item (typically wraps ``call_llm``).
+        items: Items to process.
+        provider: LLM provider, used to size the pool ("ollama" or "mistral").
+        on_progress: Optional callback ``(done, total)`` after each item.
+        max_workers: Override of the provider concurrency limit.
+
+    Returns:
+        One result per item, in input order.
+
+    Raises:
+        Exception: The first exception raised by fn; pending items are cancelled.
+    """
+    total: int = len(items)
+    if total == 0:
+        return []
+
+    workers: int = max(1, min(max_workers or get_provider_concurrency(provider), total))
+    if workers == 1:
+        results_seq: List[R] = []
+        for done, item in enumerate(items, start=1):
+            results_seq.append(fn(item))
+            if on_progress:
+                on_progress(done, total)
+        return results_seq
+
+    logger.info(f"Exécution parallèle: {total} appels LLM ({provider}, {workers} workers)")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"llm-{provider}") as executor:
+        futures: List[Future[Tuple[R, LLMCostStats]]] = [executor.submit(_run_tracked, fn, item) for item in items]
+        pending = set(futures)
+        done_count: int = 0
+
+        try:
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    # Re-raises the worker exception, if any
+                    _, cost = future.result()
+                    add_llm_cost(cost)
+                    done_count += 1
+                    if on_progress:
+                        on_progress(done_count, total)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return [future.result()[0] for future in futures]
@@ -70,6 +70,7 @@ from .llm_structurer import (
     _get_default_mistral_model,
     _get_default_model,
     call_llm,
+    invalidate_last_response,
 )
 from .types import LLMProvider
 
@@ -123,6 +124,8 @@ def _extract_json_from_response(text: str) -> Dict[str, Any]:
         except json.JSONDecodeError as e:
             logger.warning(f"JSON invalide: {e}")
 
+    # Réponse inexploitable : ne pas la rejouer depuis le cache
+    invalidate_last_response()
     return {}
 
 
@@ -7,7 +7,7 @@ import logging
 import os
 import re
 import time
-from typing import Any, Dict, List, Optional, TypedDict, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union, cast
 
 import requests
 from dotenv import load_dotenv
@@ -15,6 +15,7 @@ import threading
 
 # Import type definitions from central types module
 from utils.types import LLMCostStats
+from utils.llm_cache import get_llm_cache
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -105,6 +106,65 @@ def _get_default_mistral_model() -> str:
     return os.getenv("MISTRAL_LLM_MODEL", "mistral-small-latest")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Limites de concurrence et de débit par provider
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Appels simultanés max par provider (tous threads confondus)
+LLM_MAX_CONCURRENCY: Dict[str, int] = {
+    "mistral": int(os.getenv("LLM_MAX_CONCURRENCY_MISTRAL", "8")),
+    "ollama": int(os.getenv("LLM_MAX_CONCURRENCY_OLLAMA", "2")),
+}
+
+
+class TokenBucket:
+    """Limiteur de débit à seau de jetons (thread-safe).
+
+    Le seau contient au plus ``capacity`` jetons et se remplit de ``rate``
+    jetons par seconde ; chaque appel consomme un jeton et attend si le
+    seau est vide.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else max(1.0, rate)
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Consomme un jeton, en attendant qu'il soit disponible."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now: float = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait: float = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Débit Mistral API (requêtes/s, 0 = illimité) et rafale autorisée
+_mistral_bucket: TokenBucket = TokenBucket(
+    rate=float(os.getenv("MISTRAL_REQUESTS_PER_SECOND", "5")),
+    capacity=float(os.getenv("MISTRAL_REQUESTS_BURST", "5")),
+)
+
+_provider_slots: Dict[str, threading.BoundedSemaphore] = {
+    provider: threading.BoundedSemaphore(max(1, limit))
+    for provider, limit in LLM_MAX_CONCURRENCY.items()
+}
+
+
+def get_provider_concurrency(provider: str) -> int:
+    """Nombre d'appels simultanés autorisés pour un provider."""
+    return max(1, LLM_MAX_CONCURRENCY.get(provider, 1))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Appel Mistral API (rapide, cloud) avec tracking des coûts
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -128,6 +188,7 @@ def reset_llm_cost() -> None:
     _cost_tracker.total_input_tokens = 0
     _cost_tracker.total_output_tokens = 0
     _cost_tracker.calls_count = 0
+    _cost_tracker.cache_hits = 0
 
 
 def get_llm_cost() -> LLMCostStats:
@@ -137,9 +198,75 @@ def get_llm_cost() -> LLMCostStats:
         "total_input_tokens": getattr(_cost_tracker, "total_input_tokens", 0),
         "total_output_tokens": getattr(_cost_tracker, "total_output_tokens", 0),
         "calls_count": getattr(_cost_tracker, "calls_count", 0),
+        "cache_hits": getattr(_cost_tracker, "cache_hits", 0),
     }
 
 
+def add_llm_cost(stats: LLMCostStats) -> None:
+    """Ajoute des statistiques de coût (ex: d'un thread worker) au thread courant.
+
+    Le tracker étant thread-local, les appels faits dans un pool de threads
+    (voir utils.llm_executor) doivent être reportés dans le thread appelant.
+    """
+    if not hasattr(_cost_tracker, "total_cost"):
+        reset_llm_cost()
+    _cost_tracker.total_cost += stats.get("total_cost", 0.0)
+    _cost_tracker.total_input_tokens += stats.get("total_input_tokens", 0)
+    _cost_tracker.total_output_tokens += stats.get("total_output_tokens", 0)
+    _cost_tracker.calls_count += stats.get("calls_count", 0)
+    _cost_tracker.cache_hits += stats.get("cache_hits", 0)
+
+
+# Dernier appel LLM de chaque thread (provider, model, temperature, prompt),
+# pour retirer du cache une réponse que l'appelant n'a pas pu parser
+_last_call: threading.local = threading.local()
+
+
+def invalidate_last_response() -> None:
+    """Retire du cache la réponse du dernier appel LLM de ce thread.
+
+    Les réponses sont mises en cache avant d'être parsées : un JSON invalide
+    ou tronqué serait sinon rejoué à chaque exécution. Les extracteurs JSON
+    l'appellent quand la réponse est inexploitable.
+    """
+    params: Optional[Tuple[str, str, float, str]] = getattr(_last_call, "params", None)
+    cache = get_llm_cache()
+    if params is None or cache is None:
+        return
+    _last_call.params = None
+    try:
+        if cache.invalidate(*params):
+            logger.info(f"Réponse {params[0]} inexploitable retirée du cache ({params[1]})")
+    except Exception as e:
+        logger.warning(f"Invalidation cache LLM impossible: {e}")
+
+
+def _cached_response(provider: str, model: str, temperature: float, prompt: str) -> Optional[str]:
+    """Réponse en cache pour cet appel (et comptage du hit), ou None."""
+    _last_call.params = (provider, model, temperature, prompt)
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    response: Optional[str] = cache.get(provider, model, temperature, prompt)
+    if response is not None:
+        if not hasattr(_cost_tracker, "total_cost"):
+            reset_llm_cost()
+        _cost_tracker.cache_hits += 1
+        logger.info(f"Réponse {provider} en cache ({model}) - 0 token, 0€")
+    return response
+
+
+def _store_response(provider: str, model: str, temperature: float, prompt: str, response: str) -> str:
+    """Enregistre la réponse dans le cache (si activé) et la retourne."""
+    cache = get_llm_cache()
+    if cache is not None:
+        try:
+            cache.put(provider, model, temperature, prompt, response)
+        except Exception as e:
+            logger.warning(f"Écriture cache LLM impossible: {e}")
+    return response
+
+
 def _calculate_mistral_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     """Calcule le coût d'un appel Mistral API en euros."""
     pricing: MistralPricingEntry = MISTRAL_PRICING.get(model, MISTRAL_PRICING["default"])
@@ -171,6 +298,24 @@ def _call_mistral_api(
     Returns:
         Réponse textuelle du LLM
     """
+    cached: Optional[str] = _cached_response("mistral", model, temperature, prompt)
+    if cached is not None:
+        return cached
+
+    # Concurrence bornée + débit limité (les réponses en cache n'y sont pas soumises)
+    with _provider_slots["mistral"]:
+        _mistral_bucket.acquire()
+        return _request_mistral_api(prompt, model, temperature, max_tokens, timeout)
+
+
+def _request_mistral_api(
+    prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: int,
+) -> str:
+    """Envoie la requête à l'API Mistral et comptabilise son coût."""
     api_key: Optional[str] = _get_mistral_api_key()
     if not api_key:
         raise LLMStructureError("MISTRAL_API_KEY non définie dans .env")
@@ -218,7 +363,7 @@ def _call_mistral_api(
         
         logger.info(f"Mistral API terminé en {elapsed:.1f}s - {input_tokens}+{output_tokens} tokens = {call_cost:.6f}€")
 
-        return content
+        return _store_response("mistral", model, temperature, prompt, content)
 
     except requests.exceptions.Timeout:
         raise LLMStructureError(f"Timeout Mistral API ({timeout}s)")
@@ -323,6 +468,23 @@ def _call_ollama(
     Raises:
         LLMStructureError: En cas d'erreur d'appel
     """
+    cached: Optional[str] = _cached_response("ollama", model, temperature, prompt)
+    if cached is not None:
+        return cached
+
+    # Concurrence bornée (les réponses en cache n'y sont pas soumises)
+    with _provider_slots["ollama"]:
+        return _request_ollama(prompt, model, base_url, temperature, timeout)
+
+
+def _request_ollama(
+    prompt: str,
+    model: str,
+    base_url: Optional[str],
+    temperature: float,
+    timeout: int,
+) -> str:
+    """Envoie la requête à Ollama (SDK puis HTTP en fallback)."""
     # Essayer d'abord le SDK ollama
     try:
         import ollama
@@ -376,7 +538,7 @@ def _call_ollama(
             raise result_container["error"]
 
         if result_container["response"]:
-            return result_container["response"]
+            return _store_response("ollama", model, temperature, prompt, result_container["response"])
 
         raise LLMStructureError("Aucune réponse du SDK Ollama")
             
@@ -414,7 +576,7 @@ def _call_ollama(
             if "response" not in data:
                 raise LLMStructureError(f"Réponse Ollama inattendue: {data}")
             
-            return cast(str, data["response"])
+            return _store_response("ollama", model, temperature, prompt, cast(str, data["response"]))
             
         except requests.RequestException as e:
             if attempt < max_retries:
@@ -579,5 +741,9 @@ def structure_with_llm(
     )
     
     # Extraire le JSON
-    return _extract_json(raw_response)
+    try:
+        return _extract_json(raw_response)
+    except LLMStructureError:
+        invalidate_last_response()
+        raise
 
@@ -15,7 +15,8 @@ Overview:
 
     2. **Content Enrichment** (enrich_chunks_with_concepts, generate_section_summary):
        Enhances document content by extracting key philosophical concepts
-       from chunks and generating concise summaries for sections.
+       from chunks and generating concise summaries for sections. Per-chunk
+       LLM calls run concurrently (utils.llm_executor).
 
     3. **Correction Application** (apply_corrections, clean_validation_annotations):
        Applies suggested corrections from validation results and cleans
@@ -68,9 +69,16 @@ from __future__ import annotations
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional, Match
-
-from .llm_structurer import call_llm, _get_default_model, _get_default_mistral_model, _clean_json_string
+from typing import Any, Callable, Dict, List, Optional, Match
+
+from .llm_structurer import (
+    call_llm,
+    invalidate_last_response,
+    _get_default_model,
+    _get_default_mistral_model,
+    _clean_json_string,
+)
+from .llm_executor import run_llm_tasks
 from .types import LLMProvider, ValidationResult, ParsedDocument, ChunkData
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -115,6 +123,8 @@ def _extract_json_from_response(text: str) -> Dict[str, Any]:
         except json.JSONDecodeError as e:
             logger.warning(f"JSON invalide: {e}")
 
+    # Réponse inexploitable : ne pas la rejouer depuis le cache
+    invalidate_last_response()
     return {}
 
 
@@ -317,10 +327,46 @@ Résumé (en une phrase):"""
         return section_title
 
 
+def _extract_chunk_concepts(
+    text: str,
+    model: str,
+    provider: LLMProvider,
+) -> List[str]:
+    """Extract 3-5 key concepts from one chunk text (empty list on error)."""
+    prompt: str = f"""Extrait 3-5 concepts clés de ce texte.
+Réponds avec une liste JSON: ["concept1", "concept2", ...]
+
+Texte:
+{text[:1000]}
+
+Concepts:"""
+
+    try:
+        response: str = call_llm(
+            prompt, model=model, provider=provider, temperature=0.1, timeout=30
+        )
+
+        # Chercher la liste JSON
+        match: Optional[Match[str]] = re.search(r'\[.*?\]', response, re.DOTALL)
+        if match:
+            concepts: List[str] = json.loads(match.group())
+            return concepts[:5]
+        return []
+
+    except json.JSONDecodeError as e:
+        invalidate_last_response()
+        logger.warning(f"Erreur extraction concepts: {e}")
+        return []
+    except Exception as e:
+        logger.warning(f"Erreur extraction concepts: {e}")
+        return []
+
+
 def enrich_chunks_with_concepts(
     chunks: List[Dict[str, Any]],
     model: Optional[str] = None,
     provider: LLMProvider = "ollama",
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> List[Dict[str, Any]]:
     """Enrich text chunks with extracted key concepts using LLM.
 
@@ -334,13 +380,16 @@ def enrich_chunks_with_concepts(
             May also contain existing 'concepts' field (will be skipped).
         model: LLM model name. If None, uses provider's default model.
         provider: LLM provider, either "ollama" (local) or "mistral" (API).
+        on_progress: Optional callback ``(done, total)`` over the chunks
+            sent to the LLM.
 
     Returns:
         The same list of chunks, modified in-place with 'concepts' field
         added to each chunk. Each concepts field is a list of 0-5 strings.
 
     Note:
-        - Chunks are processed individually with logging every 10 chunks.
+        - Chunks are processed concurrently (see utils.llm_executor); the
+          order of the list is unchanged.
         - Only the first 1000 characters of each chunk are analyzed.
         - The function modifies chunks in-place AND returns them.
         - On extraction error, sets concepts to an empty list.
@@ -348,48 +397,28 @@ def enrich_chunks_with_concepts(
     if model is None:
         model = _get_default_mistral_model() if provider == "mistral" else _get_default_model()
 
-    # Limiter le nombre de chunks à traiter en une fois
-    batch_size: int = 10
-
-    i: int
-    chunk: Dict[str, Any]
-    for i, chunk in enumerate(chunks):
+    to_enrich: List[Dict[str, Any]] = []
+    for chunk in chunks:
         if "concepts" in chunk and chunk["concepts"]:
             continue  # Déjà enrichi
-
-        text: str = chunk.get("text", "")
-        if len(text) < 100:
+        if len(chunk.get("text", "")) < 100:
             chunk["concepts"] = []
             continue
-
-        # Traiter par batch pour optimiser
-        if i % batch_size == 0:
-            logger.info(f"Enrichissement concepts: chunks {i} à {min(i+batch_size, len(chunks))}")
-
-        prompt: str = f"""Extrait 3-5 concepts clés de ce texte.
-Réponds avec une liste JSON: ["concept1", "concept2", ...]
-
-Texte:
-{text[:1000]}
-
-Concepts:"""
-
-        try:
-            response: str = call_llm(
-                prompt, model=model, provider=provider, temperature=0.1, timeout=30
-            )
-
-            # Chercher la liste JSON
-            match: Optional[Match[str]] = re.search(r'\[.*?\]', response, re.DOTALL)
-            if match:
-                concepts: List[str] = json.loads(match.group())
-                chunk["concepts"] = concepts[:5]
-            else:
-                chunk["concepts"] = []
-
-        except Exception as e:
-            logger.warning(f"Erreur extraction concepts chunk {i}: {e}")
-            chunk["concepts"] = []
+        to_enrich.append(chunk)
+
+    if not to_enrich:
+        return chunks
+
+    logger.info(f"Enrichissement concepts: {len(to_enrich)} chunks")
+    resolved_model: str = model
+    concepts_per_chunk: List[List[str]] = run_llm_tasks(
+        lambda chunk: _extract_chunk_concepts(chunk.get("text", ""), resolved_model, provider),
+        to_enrich,
+        provider=provider,
+        on_progress=on_progress,
+    )
+    for chunk, concepts in zip(to_enrich, concepts_per_chunk):
+        chunk["concepts"] = concepts
 
     return chunks
 
@@ -16,6 +16,12 @@ OCR Modes:
        - Cost: ~1 EUR per 1000 pages (0.001 EUR/page)
        - Best for: Simple text extraction, content indexing
 
+    1b. **Sharded OCR** (run_ocr_sharded):
+       - Same output as run_ocr, OCRed as concurrent page-range shards
+       - Each shard cached on disk by (file hash, page range, mode)
+       - A failed run only redoes the failed shards on retry
+       - Best for: Large scanned volumes
+
     2. **OCR with Annotations** (run_ocr_with_annotations):
        - Extracts text with structural metadata (bounding boxes, document structure)
        - Cost: ~3 EUR per 1000 pages (0.003 EUR/page)
@@ -63,15 +69,33 @@ Note:
     serialize_ocr_response() to convert to dictionaries before JSON storage.
 """
 
+import hashlib
 import json
-from typing import Any, Dict, List, Optional, Type
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from mistralai import Mistral
+from mistralai.models import OCRResponse as MistralOCRResponse
 from pydantic import BaseModel
 
 from .pdf_uploader import upload_pdf
 from .types import OCRResponse
 
+logger = logging.getLogger(__name__)
+
+# Sharded OCR configuration
+OCR_SHARD_PAGES: int = int(os.getenv("OCR_SHARD_PAGES", "25"))
+OCR_MAX_WORKERS: int = int(os.getenv("OCR_MAX_WORKERS", "4"))
+OCR_SHARD_RETRIES: int = int(os.getenv("OCR_SHARD_RETRIES", "2"))
+OCR_CACHE_DIR: Path = Path(
+    os.getenv("OCR_CACHE_DIR") or Path.home() / ".cache" / "library_rag" / "ocr"
+).expanduser()
+
 
 def run_ocr(
     client: Mistral,
@@ -137,6 +161,217 @@ def run_ocr(
     return response
 
 
+# =============================================================================
+# Sharded OCR (page ranges, parallel, cached per shard)
+# =============================================================================
+
+
+class OCRShardError(RuntimeError):
+    """Raised when some OCR shards still fail after all retries.
+
+    Shards that succeeded are cached, so calling ``run_ocr_sharded`` again
+    only re-OCRs the shards listed in ``failed_shards``.
+    """
+
+    def __init__(self, failed_shards: List[Tuple[int, int]], errors: List[str]) -> None:
+        self.failed_shards = failed_shards
+        ranges = ", ".join(f"pages {start + 1}-{end}" for start, end in failed_shards)
+        super().__init__(f"OCR échoué pour {len(failed_shards)} shard(s) ({ranges}): {errors[0]}")
+
+
+def count_pdf_pages(file_bytes: bytes) -> int:
+    """Count the pages of a PDF without rendering it.
+
+    Uses pypdf, which resolves the page tree through compressed object
+    streams (``/ObjStm``) and cross-reference streams.
+
+    Args:
+        file_bytes: Binary content of the PDF.
+
+    Returns:
+        Number of pages.
+
+    Raises:
+        ImportError: If pypdf is not installed.
+        ValueError: If the page tree cannot be read or is empty.
+    """
+    from pypdf import PdfReader
+
+    try:
+        nb_pages: int = len(PdfReader(BytesIO(file_bytes)).pages)
+    except Exception as e:
+        raise ValueError(f"Arbre des pages illisible: {e}") from e
+    if nb_pages <= 0:
+        raise ValueError("Aucune page trouvée dans le PDF")
+    return nb_pages
+
+
+def _shard_cache_path(cache_dir: Path, file_hash: str, start: int, end: int, mode: str) -> Path:
+    """Cache file of one shard, keyed by (file hash, page range, mode)."""
+    return cache_dir / file_hash / f"{start:05d}-{end:05d}_{mode}.json"
+
+
+def _ocr_shard(
+    client: Mistral,
+    doc_url: str,
+    start: int,
+    end: int,
+    include_images: bool,
+) -> Dict[str, Any]:
+    """OCR one page range [start, end) of an uploaded document, with retries."""
+    last_error: Optional[Exception] = None
+    for attempt in range(OCR_SHARD_RETRIES + 1):
+        if attempt:
+            time.sleep(2 ** attempt)
+        try:
+            response = client.ocr.process(
+                model="mistral-ocr-latest",
+                document={
+                    "type": "document_url",
+                    "document_url": doc_url,
+                },
+                pages=list(range(start, end)),
+                include_image_base64=include_images,
+            )
+            return serialize_ocr_response(response)
+        except Exception as e:
+            last_error = e
+            logger.warning(f"OCR pages {start + 1}-{end} (tentative {attempt + 1}): {e}")
+    raise RuntimeError(str(last_error))
+
+
+def run_ocr_sharded(
+    client: Mistral,
+    file_bytes: bytes,
+    filename: str,
+    include_images: bool = True,
+    shard_pages: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Any:
+    """Execute standard OCR as concurrent page-range shards with a disk cache.
+
+    The PDF is uploaded once, then each range of ``shard_pages`` pages is
+    OCRed by its own ``client.ocr.process(pages=...)`` call on a bounded
+    worker pool. Every successful shard is saved to
+    ``<cache_dir>/<file sha256>/<start>-<end>_<mode>.json`` before merging,
+    so a large scanned volume no longer fails as one unit: a retry only
+    re-OCRs the shards that failed, and re-processing the same file costs
+    nothing.
+
+    Args:
+        client: Authenticated Mistral client instance.
+        file_bytes: Binary content of the PDF file to process.
+        filename: Original filename of the PDF (used for the upload).
+        include_images: Include base64 page images (part of the cache key).
+        shard_pages: Pages per shard. Defaults to ``OCR_SHARD_PAGES`` (25).
+        max_workers: Concurrent shard requests. Defaults to ``OCR_MAX_WORKERS`` (4).
+        cache_dir: Shard cache root. Defaults to ``OCR_CACHE_DIR``.
+        on_progress: Optional callback ``(shards_done, shards_total)``.
+
+    Returns:
+        Mistral OCRResponse with the pages of all shards in page order,
+        usable by build_markdown() and serialize_ocr_response().
+
+    Raises:
+        OCRShardError: If some shards still fail after ``OCR_SHARD_RETRIES``
+            retries (the successful ones stay cached).
+
+    Note:
+        If pypdf cannot count the pages (not installed, unreadable page
+        tree), falls back to run_ocr() on the whole document (single call,
+        not cached) rather than guessing the page ranges.
+    """
+    try:
+        nb_pages: int = count_pdf_pages(file_bytes)
+    except (ImportError, ValueError) as e:
+        # Un comptage faux ferait sauter des pages : on OCRise tout le document
+        logger.warning(f"Nombre de pages inconnu ({e}), OCR du document entier en un seul appel")
+        return run_ocr(client, file_bytes, filename, include_images=include_images)
+
+    size: int = max(1, shard_pages or OCR_SHARD_PAGES)
+    root: Path = cache_dir or OCR_CACHE_DIR
+    file_hash: str = hashlib.sha256(file_bytes).hexdigest()
+    mode: str = "images" if include_images else "text"
+
+    shards: List[Tuple[int, int]] = [
+        (start, min(start + size, nb_pages)) for start in range(0, nb_pages, size)
+    ]
+    results: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    # Shards déjà en cache
+    for start, end in shards:
+        path = _shard_cache_path(root, file_hash, start, end, mode)
+        if path.exists():
+            try:
+                results[(start, end)] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cache OCR illisible ({path.name}), shard refait: {e}")
+
+    missing: List[Tuple[int, int]] = [shard for shard in shards if shard not in results]
+    logger.info(
+        f"OCR par shards: {nb_pages} pages, {len(shards)} shards de {size} pages "
+        f"({len(shards) - len(missing)} en cache)"
+    )
+    if on_progress:
+        on_progress(len(results), len(shards))
+
+    failed: List[Tuple[int, int]] = []
+    errors: List[str] = []
+    if missing:
+        doc_url: str = upload_pdf(client, file_bytes, filename)
+        workers: int = max(1, min(max_workers or OCR_MAX_WORKERS, len(missing)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-shard") as executor:
+            futures = {
+                executor.submit(_ocr_shard, client, doc_url, start, end, include_images): (start, end)
+                for start, end in missing
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                try:
+                    shard_result: Dict[str, Any] = future.result()
+                except Exception as e:
+                    failed.append((start, end))
+                    errors.append(str(e))
+                    continue
+
+                path = _shard_cache_path(root, file_hash, start, end, mode)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(shard_result, ensure_ascii=False), encoding="utf-8")
+                tmp_path.replace(path)
+
+                results[(start, end)] = shard_result
+                if on_progress:
+                    on_progress(len(results), len(shards))
+
+    if failed:
+        raise OCRShardError(sorted(failed), errors)
+
+    # Fusion dans l'ordre des pages
+    pages: List[Dict[str, Any]] = []
+    pages_processed: int = 0
+    model: str = "mistral-ocr-latest"
+    for shard in shards:
+        shard_result = results[shard]
+        shard_pages_list: List[Dict[str, Any]] = sorted(
+            shard_result.get("pages", []), key=lambda page: page.get("index", 0)
+        )
+        pages.extend(shard_pages_list)
+        usage: Dict[str, Any] = shard_result.get("usage_info") or {}
+        pages_processed += usage.get("pages_processed") or len(shard_pages_list)
+        model = shard_result.get("model") or model
+
+    return MistralOCRResponse.model_validate({
+        "pages": pages,
+        "model": model,
+        "usage_info": {"pages_processed": pages_processed, "doc_size_bytes": len(file_bytes)},
+        "document_annotation": None,
+    })
+
+
 def run_ocr_with_annotations(
     client: Mistral,
     file_bytes: bytes,
@@ -310,3 +545,18 @@ def serialize_ocr_response(response: Any) -> Dict[str, Any]:
     raise TypeError("Réponse OCR non sérialisable")
 
 
+
+
+def deserialize_ocr_response(data: Dict[str, Any]) -> Any:
+    """Rebuild a Mistral OCRResponse from serialize_ocr_response() output.
+
+    Lets the pipeline rebuild the Markdown or the images from the saved
+    ``<doc>_ocr.json`` without calling the OCR API again.
+
+    Args:
+        data: Dictionary produced by serialize_ocr_response().
+
+    Returns:
+        Mistral OCRResponse usable by build_markdown().
+    """
+    return MistralOCRResponse.model_validate(data)
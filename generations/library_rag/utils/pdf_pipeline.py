@@ -26,6 +26,8 @@ Key Parameters:
     - ``use_semantic_chunking``: Use LLM for intelligent chunking (slower but precise)
     - ``use_ocr_annotations``: Use OCR annotations for TOC (3x cost, more reliable)
     - ``ingest_to_weaviate``: Insert chunks into Weaviate vector database
+    - ``use_checkpoints``: Reuse unchanged steps from ``<doc>/.checkpoints/``
+      (see utils.pipeline_checkpoint); a crashed run resumes where it failed
 
 Example:
     Basic usage with default settings (Ollama local)::
@@ -107,6 +109,7 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Literal, Optional, TYPE_CHECKING, Union, cast
 
@@ -141,9 +144,10 @@ from .types import (
 )
 
 from .mistral_client import create_client, estimate_ocr_cost
-from .ocr_processor import run_ocr, serialize_ocr_response
+from .ocr_processor import deserialize_ocr_response, run_ocr, run_ocr_sharded, serialize_ocr_response
 from .markdown_builder import build_markdown
-from .image_extractor import create_image_writer
+from .image_extractor import create_image_writer, extract_images, image_relative_path
+from .pipeline_checkpoint import CHECKPOINT_DIRNAME, StepCheckpoints, file_fingerprint, fingerprint
 from .hierarchy_parser import build_hierarchy, flatten_hierarchy
 from .llm_structurer import structure_with_llm, LLMStructureError, LLMStructuredResult, reset_llm_cost, get_llm_cost
 
@@ -154,8 +158,9 @@ from .llm_classifier import classify_sections, filter_indexable_sections
 from .llm_cleaner import clean_chunk, is_chunk_valid
 from .llm_chunker import chunk_section_with_llm, simple_chunk_by_paragraphs
 from .llm_validator import validate_document, apply_corrections, enrich_chunks_with_concepts
+from .llm_executor import run_llm_tasks
 
-from .weaviate_ingest import ingest_document
+from .weaviate_ingest import count_ingested_objects, ingest_document
 
 
 # Logger
@@ -247,6 +252,7 @@ def process_pdf_v2(
     use_ocr_annotations: bool = False,
     max_toc_pages: int = 8,
     use_semantic_chunking: bool = False,
+    use_checkpoints: bool = True,
     progress_callback: OptionalProgressCallback = None,
 ) -> V2PipelineResult:
     """Process a PDF document through the intelligent V2 pipeline with LLM extraction.
@@ -262,7 +268,7 @@ def process_pdf_v2(
         4. Metadata extraction via LLM (title, author, year, language)
         5. TOC extraction via LLM or OCR annotations
         6. Section classification via LLM (main_content, exposition, etc.)
-        7. Semantic chunking via LLM (argumentative units)
+        7. Semantic chunking via LLM (argumentative units, sections in parallel)
         8. Chunk cleaning (remove OCR artifacts, validate quality)
         9. Validation and concept enrichment via LLM
         10. Weaviate ingestion (vectorization and storage)
@@ -301,11 +307,16 @@ def process_pdf_v2(
         use_semantic_chunking: Use LLM-based semantic chunking instead of basic
             paragraph splitting. Slower but produces higher quality argumentative
             units. Defaults to False.
+        use_checkpoints: Save each step output in ``<doc>/.checkpoints/`` with a
+            fingerprint of its inputs and options, and reuse the steps whose
+            fingerprint is unchanged. A re-run after a crash resumes from the
+            first invalid step. Defaults to True.
         progress_callback: Optional callback function for progress updates.
             Signature: ``callback(step_id: str, status: str, detail: str | None)``.
-            step_id values: ocr, markdown, metadata, toc, classify, chunking,
-            cleaning, validation, weaviate.
-            status values: active, completed, error, skipped.
+            step_id values: ocr, markdown, images, metadata, toc, classify,
+            chunking, cleaning, validation, weaviate.
+            status values: active, completed (computed), cached (reused from
+            a checkpoint), error, skipped.
 
     Returns:
         V2PipelineResult dictionary containing:
@@ -323,6 +334,7 @@ def process_pdf_v2(
             - chunks_count (int): Number of chunks generated.
             - validation (dict | None): Validation results if enabled.
             - weaviate_ingest (dict | None): Weaviate ingestion results.
+            - steps (dict): "cached" or "computed" for each checkpointed step.
             - pipeline_version (str): Always "2.0" for this pipeline.
             - error (str): Error message if success is False.
 
@@ -363,7 +375,12 @@ def process_pdf_v2(
             - LLM (Ollama): Free (local processing)
 
         Use ``skip_ocr=True`` when re-processing to avoid OCR costs.
-        The function will reuse the existing markdown file.
+        The function will reuse the existing markdown file. With checkpoints
+        enabled, re-processing the same PDF also reuses the OCR and every
+        unchanged LLM step.
+
+        Image extraction (step 3) runs in a background thread while the
+        metadata and TOC are extracted.
     """
     pdf_path = Path(pdf_path).resolve()
 
@@ -397,13 +414,23 @@ def process_pdf_v2(
             except Exception:
                 pass
     
+    # Checkpoints par étape (reprise après crash, étapes inchangées réutilisées)
+    checkpoints: StepCheckpoints = StepCheckpoints(
+        doc_output_dir / CHECKPOINT_DIRNAME, enabled=use_checkpoints
+    )
+
+    def emit_step_done(step: str, cached: bool, detail: Optional[str] = None) -> None:
+        """Émet 'cached' (checkpoint réutilisé) ou 'completed' (étape calculée)."""
+        emit_progress(step, "cached" if cached else "completed", detail)
+
     try:
         # ═══════════════════════════════════════════════════════════════════
         # ÉTAPE 1-4 : OCR et Markdown (sauf si skip_ocr)
         # ═══════════════════════════════════════════════════════════════════
 
         nb_pages: int = 0
-        cost: float = 0.0  # Coût OCR (0 si skip_ocr)
+        cost: float = 0.0  # Coût OCR (0 si skip_ocr ou checkpoint)
+        ocr_cached: bool = False
 
         # Réinitialiser le compteur de coût LLM pour ce document
         if llm_provider == "mistral":
@@ -422,6 +449,7 @@ def process_pdf_v2(
             
             logger.info("[1-4/10] 📝 Chargement direct du fichier Markdown (pas d'OCR)")
             markdown_text: str = pdf_path.read_text(encoding="utf-8")
+            fp_markdown: str = fingerprint("markdown", file_fingerprint(pdf_path))
             
             # Copier le contenu vers le répertoire de sortie
             md_path.write_text(markdown_text, encoding="utf-8")
@@ -446,6 +474,7 @@ def process_pdf_v2(
 
             logger.info("[1-4/10] ⚡ Skip OCR - Réutilisation du markdown existant")
             markdown_text = md_path.read_text(encoding="utf-8")
+            fp_markdown = fingerprint("markdown", file_fingerprint(md_path))
             
             # Essayer de récupérer le nombre de pages depuis l'OCR existant
             if ocr_path.exists():
@@ -468,141 +497,236 @@ def process_pdf_v2(
                     "success": False,
                     "error": f"Fichier PDF introuvable : {pdf_path}",
                 }
-            
-            emit_progress("ocr", "active", "Connexion à Mistral...")
-            logger.info("[1/10] Connexion à Mistral...")
-            client: Any = create_client(api_key)  # Mistral client
-
-            pdf_bytes: bytes = pdf_path.read_bytes()
 
-            emit_progress("ocr", "active", "OCR en cours...")
-            logger.info("[2/10] OCR en cours...")
-            # Step 1: OCR processing - returns Mistral OCR response (Pydantic model)
-            ocr_response: Any = run_ocr(client, pdf_bytes, pdf_path.name, include_images=True)
-            
-            nb_pages = len(ocr_response.pages)
-            cost = estimate_ocr_cost(nb_pages)
-            emit_progress("ocr", "completed", f"{nb_pages} pages ({cost:.4f}€)")
-            logger.info(f"OCR terminé : {nb_pages} pages (coût estimé : {cost:.4f}€)")
-            
-            # Sauvegarder OCR brut
-            ocr_json: Dict[str, Any] = serialize_ocr_response(ocr_response)
-            ocr_path.write_text(json.dumps(ocr_json, ensure_ascii=False, indent=2), encoding="utf-8")
-
-            # Step 3: Image extraction
-            emit_progress("markdown", "active", "Construction du markdown...")
-            image_writer: Optional[Callable[[int, int, str], Optional[str]]] = None
-            if not embed_images:
-                logger.info("[3/10] Extraction des images...")
-                images_dir.mkdir(parents=True, exist_ok=True)
-                image_writer = create_image_writer(images_dir)
+            fp_ocr: str = fingerprint("ocr", file_fingerprint(pdf_path))
+            ocr_holder: Dict[str, Any] = {}  # Réponse OCR en mémoire si calculée dans ce run
+
+            def run_ocr_step() -> Dict[str, Any]:
+                emit_progress("ocr", "active", "Connexion à Mistral...")
+                logger.info("[1/10] Connexion à Mistral...")
+                client: Any = create_client(api_key)  # Mistral client
+
+                pdf_bytes: bytes = pdf_path.read_bytes()
+
+                emit_progress("ocr", "active", "OCR en cours...")
+                logger.info("[2/10] OCR en cours...")
+                # Step 1: OCR processing - returns Mistral OCR response (Pydantic model)
+                # Page-range shards OCRed in parallel, each cached on disk
+                ocr_response: Any = run_ocr_sharded(
+                    client,
+                    pdf_bytes,
+                    pdf_path.name,
+                    include_images=True,
+                    on_progress=lambda done, total: emit_progress(
+                        "ocr", "active", f"OCR en cours... (shards {done}/{total})"
+                    ),
+                )
+                ocr_holder["response"] = ocr_response
+
+                # Sauvegarder OCR brut
+                ocr_json: Dict[str, Any] = serialize_ocr_response(ocr_response)
+                ocr_path.write_text(json.dumps(ocr_json, ensure_ascii=False, indent=2), encoding="utf-8")
+
+                ocr_pages: int = len(ocr_response.pages)
+                return {"pages": ocr_pages, "cost": estimate_ocr_cost(ocr_pages)}
+
+            def load_ocr_response() -> Any:
+                """Réponse OCR du run courant, ou relue depuis le JSON sauvegardé."""
+                if "response" not in ocr_holder:
+                    ocr_holder["response"] = deserialize_ocr_response(
+                        json.loads(ocr_path.read_text(encoding="utf-8"))
+                    )
+                return ocr_holder["response"]
+
+            ocr_output, ocr_cached = checkpoints.run("ocr", fp_ocr, run_ocr_step, artifacts=[ocr_path])
+            nb_pages = ocr_output["pages"]
+            if ocr_cached:
+                emit_step_done("ocr", True, f"{nb_pages} pages (checkpoint, 0.00€)")
+            else:
+                cost = ocr_output["cost"]
+                emit_step_done("ocr", False, f"{nb_pages} pages ({cost:.4f}€)")
+                logger.info(f"OCR terminé : {nb_pages} pages (coût estimé : {cost:.4f}€)")
 
             # Step 4: Markdown building - input: OCR response, output: str
-            logger.info("[4/10] Construction du Markdown...")
-            markdown_text = build_markdown(ocr_response, embed_images=embed_images, image_writer=image_writer)
-            md_path.write_text(markdown_text, encoding="utf-8")
-            emit_progress("markdown", "completed", "Document généré")
-        
-        # Analyse hiérarchique basique (fallback)
-        hierarchy: DocumentHierarchy = build_hierarchy(markdown_text)
-        basic_chunks: List[FlatChunk] = flatten_hierarchy(hierarchy)
-
-        # ═══════════════════════════════════════════════════════════════════
-        # ÉTAPE 5 : Extraction métadonnées via LLM
-        # ═══════════════════════════════════════════════════════════════════
-
-        # Step 5: Metadata extraction - input: markdown str, output: Dict[str, Any]
-        emit_progress("metadata", "active", "Analyse du document...")
-        metadata: Dict[str, Any]
-        if use_llm:
-            logger.info(f"[5/10] Extraction métadonnées via {llm_provider.upper()}...")
-            metadata = extract_metadata(markdown_text, model=llm_model, provider=llm_provider, temperature=llm_temperature)
-        else:
-            logger.info("[5/10] Extraction métadonnées (mode basique)...")
-            metadata = cast(Dict[str, Any], extract_document_metadata_legacy(hierarchy, cast(List[Dict[str, Any]], basic_chunks), doc_name))
+            # Les images sont référencées par leur chemin ; l'écriture des fichiers
+            # (étape 3) se fait en parallèle de l'extraction métadonnées/TOC
+            fp_markdown = fingerprint("markdown", fp_ocr, embed_images)
+
+            def run_markdown_step() -> Dict[str, Any]:
+                emit_progress("markdown", "active", "Construction du markdown...")
+                logger.info("[4/10] Construction du Markdown...")
+                text: str = build_markdown(
+                    load_ocr_response(),
+                    embed_images=embed_images,
+                    image_writer=None if embed_images else (
+                        lambda page_idx, img_idx, _image_b64: image_relative_path(page_idx, img_idx)
+                    ),
+                )
+                return {"markdown": text}
 
-        # Compléter les métadonnées
-        metadata["work"] = metadata.get("title") or doc_name
-        metadata["chunks_count"] = 0  # Sera mis à jour plus tard
-        title_str = metadata.get("title") or "Métadonnées extraites"
-        emit_progress("metadata", "completed", title_str[:50])
+            markdown_output, markdown_cached = checkpoints.run("markdown", fp_markdown, run_markdown_step)
+            markdown_text = markdown_output["markdown"]
+            md_path.write_text(markdown_text, encoding="utf-8")
+            emit_step_done("markdown", markdown_cached, "Document généré")
+
+        # Step 3: Image extraction (en arrière-plan, indépendante des étapes LLM)
+        background: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-images")
+        images_future: Optional[Future[None]] = None
+        if not embed_images and not is_markdown_file and not skip_ocr:
+            fp_images: str = fingerprint("images", fp_ocr)
+            previous: Optional[Dict[str, Any]] = checkpoints.load("images", fp_images)
+            image_artifacts: List[Path] = [
+                doc_output_dir / rel for rel in (previous["output"] if previous else [])
+            ]
+
+            def run_images_step() -> List[str]:
+                logger.info("[3/10] Extraction des images...")
+                extracted: List[str] = extract_images(load_ocr_response(), doc_output_dir)
+                return [str(Path(p).relative_to(doc_output_dir).as_posix()) for p in extracted]
 
-        # ═══════════════════════════════════════════════════════════════════
-        # ÉTAPE 6 : Extraction TOC via LLM ou Annotations OCR
-        # ═══════════════════════════════════════════════════════════════════
+            def images_step() -> None:
+                images, images_cached = checkpoints.run(
+                    "images", fp_images, run_images_step, artifacts=image_artifacts
+                )
+                emit_step_done("images", images_cached, f"{len(images)} images")
 
-        # Step 6: TOC extraction - input: markdown str, output: List[Dict[str, Any]]
-        emit_progress("toc", "active", "Extraction de la structure...")
-        toc: List[Dict[str, Any]] = []
-        flat_toc: List[Dict[str, Any]] = []
+            images_future = background.submit(images_step)
 
-        # Branche 1 : OCR avec annotations (analyse markdown pour détecter indentation)
-        toc_result: Dict[str, Any]
-        if use_ocr_annotations:
-            logger.info(f"[6/10] Extraction TOC via analyse markdown (indentation)...")
-            emit_progress("toc", "active", "Analyse indentation TOC...")
+        try:
+            # Analyse hiérarchique basique (fallback)
+            hierarchy: DocumentHierarchy = build_hierarchy(markdown_text)
+            basic_chunks: List[FlatChunk] = flatten_hierarchy(hierarchy)
 
-            from .toc_extractor_markdown import extract_toc_from_markdown, MarkdownTOCResult
+            # ═══════════════════════════════════════════════════════════════
+            # ÉTAPE 5 : Extraction métadonnées via LLM
+            # ═══════════════════════════════════════════════════════════════
 
-            toc_result_typed: MarkdownTOCResult = extract_toc_from_markdown(
-                markdown_text,
-                max_lines=300,
+            # Step 5: Metadata extraction - input: markdown str, output: Dict[str, Any]
+            fp_metadata: str = fingerprint(
+                "metadata", fp_markdown, doc_name, use_llm, llm_provider, llm_model, llm_temperature
             )
-            toc_result = cast(Dict[str, Any], toc_result_typed)
-
-            if toc_result.get("success"):
-                # Succès : utiliser les annotations
-                metadata_annotated: Dict[str, Any] = toc_result["metadata"]
-                toc = toc_result["toc"]
-                flat_toc = toc_result["toc_flat"]
-                cost += toc_result["cost_ocr_annotated"]
-                
-                # Enrichir les métadonnées existantes
-                metadata.update({
-                    "title": metadata_annotated.get("title", metadata.get("title")),
-                    "author": metadata_annotated.get("author", metadata.get("author")),
-                    "languages": metadata_annotated.get("languages", []),
-                    "summary": metadata_annotated.get("summary", ""),
-                    "collection": metadata_annotated.get("collection"),
-                    "publisher": metadata_annotated.get("publisher"),
-                    "year": metadata_annotated.get("year"),
-                })
-                
-                emit_progress("toc", "completed", f"{len(flat_toc)} entrées (annotations, +{toc_result['cost_ocr_annotated']:.4f}€)")
-                logger.info(f"TOC extraite via annotations : {len(flat_toc)} entrées (coût : +{toc_result['cost_ocr_annotated']:.4f}€)")
-            else:
-                # Échec : fallback sur extraction LLM classique
-                error_msg = toc_result.get("error", "Erreur inconnue")
-                logger.warning(f"Échec annotations OCR ({error_msg}), fallback sur LLM...")
-                emit_progress("toc", "active", f"Fallback LLM après échec annotations...")
-                
+
+            def run_metadata_step() -> Dict[str, Any]:
+                emit_progress("metadata", "active", "Analyse du document...")
                 if use_llm:
-                    toc_result = extract_toc(markdown_text, document_title=metadata.get("title"), model=llm_model, provider=llm_provider)
+                    logger.info(f"[5/10] Extraction métadonnées via {llm_provider.upper()}...")
+                    return extract_metadata(markdown_text, model=llm_model, provider=llm_provider, temperature=llm_temperature)
+                logger.info("[5/10] Extraction métadonnées (mode basique)...")
+                return cast(Dict[str, Any], extract_document_metadata_legacy(hierarchy, cast(List[Dict[str, Any]], basic_chunks), doc_name))
+
+            metadata: Dict[str, Any]
+            metadata, metadata_cached = checkpoints.run("metadata", fp_metadata, run_metadata_step)
+
+            # Compléter les métadonnées
+            metadata["work"] = metadata.get("title") or doc_name
+            metadata["chunks_count"] = 0  # Sera mis à jour plus tard
+            title_str = metadata.get("title") or "Métadonnées extraites"
+            emit_step_done("metadata", metadata_cached, title_str[:50])
+
+            # ═══════════════════════════════════════════════════════════════
+            # ÉTAPE 6 : Extraction TOC via LLM ou Annotations OCR
+            # ═══════════════════════════════════════════════════════════════
+
+            # Step 6: TOC extraction - input: markdown str, output: List[Dict[str, Any]]
+            fp_toc: str = fingerprint("toc", fp_metadata, use_ocr_annotations, use_llm, llm_provider, llm_model)
+
+            def run_toc_step() -> Dict[str, Any]:
+                emit_progress("toc", "active", "Extraction de la structure...")
+                toc_metadata: Dict[str, Any] = dict(metadata)
+                toc: List[Dict[str, Any]] = []
+                flat_toc: List[Dict[str, Any]] = []
+                toc_cost: float = 0.0
+                detail: str
+
+                # Branche 1 : OCR avec annotations (analyse markdown pour détecter indentation)
+                toc_result: Dict[str, Any]
+                if use_ocr_annotations:
+                    logger.info(f"[6/10] Extraction TOC via analyse markdown (indentation)...")
+                    emit_progress("toc", "active", "Analyse indentation TOC...")
+
+                    from .toc_extractor_markdown import extract_toc_from_markdown, MarkdownTOCResult
+
+                    toc_result_typed: MarkdownTOCResult = extract_toc_from_markdown(
+                        markdown_text,
+                        max_lines=300,
+                    )
+                    toc_result = cast(Dict[str, Any], toc_result_typed)
+
+                    if toc_result.get("success"):
+                        # Succès : utiliser les annotations
+                        metadata_annotated: Dict[str, Any] = toc_result["metadata"]
+                        toc = toc_result["toc"]
+                        flat_toc = toc_result["toc_flat"]
+                        toc_cost = toc_result["cost_ocr_annotated"]
+
+                        # Enrichir les métadonnées existantes
+                        toc_metadata.update({
+                            "title": metadata_annotated.get("title", toc_metadata.get("title")),
+                            "author": metadata_annotated.get("author", toc_metadata.get("author")),
+                            "languages": metadata_annotated.get("languages", []),
+                            "summary": metadata_annotated.get("summary", ""),
+                            "collection": metadata_annotated.get("collection"),
+                            "publisher": metadata_annotated.get("publisher"),
+                            "year": metadata_annotated.get("year"),
+                        })
+
+                        detail = f"{len(flat_toc)} entrées (annotations, +{toc_cost:.4f}€)"
+                        logger.info(f"TOC extraite via annotations : {len(flat_toc)} entrées (coût : +{toc_cost:.4f}€)")
+                    else:
+                        # Échec : fallback sur extraction LLM classique
+                        error_msg = toc_result.get("error", "Erreur inconnue")
+                        logger.warning(f"Échec annotations OCR ({error_msg}), fallback sur LLM...")
+                        emit_progress("toc", "active", f"Fallback LLM après échec annotations...")
+
+                        if use_llm:
+                            toc_result = extract_toc(markdown_text, document_title=toc_metadata.get("title"), model=llm_model, provider=llm_provider)
+                            toc = toc_result.get("toc", [])
+                            flat_toc = toc_result.get("flat_toc", [])
+                        else:
+                            toc = toc_metadata.get("toc", [])
+                            flat_toc = toc
+
+                        detail = f"{len(flat_toc)} entrées (fallback LLM)"
+
+                # Branche 2 : Extraction LLM classique (moins fiable mais moins cher)
+                elif use_llm:
+                    logger.info(f"[6/10] Extraction TOC via {llm_provider.upper()}...")
+                    toc_result = extract_toc(markdown_text, document_title=toc_metadata.get("title"), model=llm_model, provider=llm_provider)
                     toc = toc_result.get("toc", [])
                     flat_toc = toc_result.get("flat_toc", [])
+                    detail = f"{len(flat_toc)} entrées (LLM)"
+
+                # Branche 3 : Mode basique (sans LLM ni annotations)
                 else:
-                    toc = metadata.get("toc", [])
+                    logger.info("[6/10] Extraction TOC (mode basique)...")
+                    toc = toc_metadata.get("toc", [])
                     flat_toc = toc
-                
-                emit_progress("toc", "completed", f"{len(flat_toc)} entrées (fallback LLM)")
-        
-        # Branche 2 : Extraction LLM classique (moins fiable mais moins cher)
-        elif use_llm:
-            logger.info(f"[6/10] Extraction TOC via {llm_provider.upper()}...")
-            toc_result = extract_toc(markdown_text, document_title=metadata.get("title"), model=llm_model, provider=llm_provider)
-            toc = toc_result.get("toc", [])
-            flat_toc = toc_result.get("flat_toc", [])
-            emit_progress("toc", "completed", f"{len(flat_toc)} entrées (LLM)")
-        
-        # Branche 3 : Mode basique (sans LLM ni annotations)
-        else:
-            logger.info("[6/10] Extraction TOC (mode basique)...")
-            toc = metadata.get("toc", [])
-            flat_toc = toc
-            emit_progress("toc", "completed", f"{len(flat_toc)} entrées (basique)")
-        
-        metadata["toc"] = toc
-        
+                    detail = f"{len(flat_toc)} entrées (basique)"
+
+                return {
+                    "metadata": toc_metadata,
+                    "toc": toc,
+                    "flat_toc": flat_toc,
+                    "cost": toc_cost,
+                    "detail": detail,
+                }
+
+            toc_output, toc_cached = checkpoints.run("toc", fp_toc, run_toc_step)
+            metadata = toc_output["metadata"]
+            toc: List[Dict[str, Any]] = toc_output["toc"]
+            flat_toc: List[Dict[str, Any]] = toc_output["flat_toc"]
+            if not toc_cached:
+                cost += toc_output["cost"]
+            emit_step_done("toc", toc_cached, toc_output["detail"])
+
+            metadata["toc"] = toc
+        finally:
+            background.shutdown(wait=False)
+
+        if images_future is not None:
+            # Propage une éventuelle erreur d'extraction des images
+            images_future.result()
+
         # ═══════════════════════════════════════════════════════════════════
         # ÉTAPE 7 : Aplatir la hiérarchie et classifier les sections
         # ═══════════════════════════════════════════════════════════════════
@@ -655,28 +779,35 @@ def process_pdf_v2(
         ]
 
         # Step 7: Section classification - input: sections, output: classified sections
-        emit_progress("classify", "active", f"Analyse de {len(sections_for_classification)} sections...")
-        classified_sections: List[Dict[str, Any]]
-        indexable_sections: List[Dict[str, Any]]
-        if use_llm and sections_for_classification:
-            logger.info(f"[7/10] Classification des sections via {llm_provider.upper()}...")
-            classified_sections = classify_sections(
-                cast(List[Dict[str, Any]], sections_for_classification),
-                document_title=metadata.get("title"),
-                model=llm_model,
-                provider=llm_provider,
-            )
-            # Double validation pour détecter les faux positifs (morceaux de TOC)
-            from .llm_classifier import validate_classified_sections
-            classified_sections = validate_classified_sections(classified_sections)
-            indexable_sections = filter_indexable_sections(classified_sections)
-        else:
+        fp_classify: str = fingerprint("classify", fp_toc, use_llm, llm_provider, llm_model)
+
+        def run_classify_step() -> Dict[str, Any]:
+            emit_progress("classify", "active", f"Analyse de {len(sections_for_classification)} sections...")
+            if use_llm and sections_for_classification:
+                logger.info(f"[7/10] Classification des sections via {llm_provider.upper()}...")
+                classified = classify_sections(
+                    cast(List[Dict[str, Any]], sections_for_classification),
+                    document_title=metadata.get("title"),
+                    model=llm_model,
+                    provider=llm_provider,
+                )
+                # Double validation pour détecter les faux positifs (morceaux de TOC)
+                from .llm_classifier import validate_classified_sections
+                classified = validate_classified_sections(classified)
+                return {"classified": classified, "indexable": filter_indexable_sections(classified)}
+
             logger.info("[7/10] Classification (mode basique)...")
-            classified_sections = cast(List[Dict[str, Any]], sections_for_classification)
             # Par défaut, tout est indexable sauf les sections vides
-            indexable_sections = cast(List[Dict[str, Any]], [s for s in sections_for_classification if s.get("content")])
+            return {
+                "classified": sections_for_classification,
+                "indexable": [s for s in sections_for_classification if s.get("content")],
+            }
 
-        emit_progress("classify", "completed", f"{len(indexable_sections)} sections indexables")
+        classify_output, classify_cached = checkpoints.run("classify", fp_classify, run_classify_step)
+        classified_sections: List[Dict[str, Any]] = classify_output["classified"]
+        indexable_sections: List[Dict[str, Any]] = classify_output["indexable"]
+
+        emit_step_done("classify", classify_cached, f"{len(indexable_sections)} sections indexables")
         logger.info(f"Sections indexables: {len(indexable_sections)} sections")
 
         # ═══════════════════════════════════════════════════════════════════
@@ -684,102 +815,147 @@ def process_pdf_v2(
         # ═══════════════════════════════════════════════════════════════════
 
         # Step 8: Chunking - input: sections, output: List[SemanticChunk]
-        all_chunks: List[SemanticChunk] = []
-        chunk_index: int = 0
-        
-        emit_progress("chunking", "active", "Découpage sémantique..." if use_semantic_chunking else "Découpage basique...")
-        if use_llm and use_semantic_chunking:
-            logger.info("[8/10] Chunking sémantique via LLM...")
-            
-            for section in indexable_sections:
-                section_title = section.get("title", "")
-                section_content = section.get("content", "")
-                section_level = section.get("level", 1)
-                chapter_title = section.get("chapter_title", section_title)
-                
-                # Déterminer le sous-chapitre (niveau 2) si on est niveau 3+
-                subsection_title = None
-                if section_level >= 2:
-                    subsection_title = section.get("parent_title") or section_title
-                
-                # Seuil plus bas pour inclure plus de contenu
-                if not section_content or len(section_content.strip()) < 30:
-                    continue
-                
-                # Chunker la section avec hiérarchie complète
-                section_chunks = chunk_section_with_llm(
-                    section_content,
-                    section_title,
-                    chapter_title=chapter_title,
-                    subsection_title=subsection_title,
-                    section_level=section_level,
-                    model=llm_model,
+        fp_chunking: str = fingerprint(
+            "chunking", fp_classify, use_llm, use_semantic_chunking, llm_provider, llm_model, llm_temperature
+        )
+
+        def run_chunking_step() -> List[SemanticChunk]:
+            chunks: List[SemanticChunk] = []
+            chunk_index: int = 0
+
+            emit_progress("chunking", "active", "Découpage sémantique..." if use_semantic_chunking else "Découpage basique...")
+            if use_llm and use_semantic_chunking:
+                logger.info("[8/10] Chunking sémantique via LLM...")
+
+                # Sections à chunker (seuil plus bas pour inclure plus de contenu)
+                sections_to_chunk: List[Dict[str, Any]] = [
+                    section for section in indexable_sections
+                    if section.get("content") and len(section["content"].strip()) >= 30
+                ]
+
+                def chunk_one_section(section: Dict[str, Any]) -> List[SemanticChunk]:
+                    section_title = section.get("title", "")
+                    section_level = section.get("level", 1)
+                    subsection_title = (
+                        section.get("parent_title") or section_title if section_level >= 2 else None
+                    )
+                    # Chunker la section avec hiérarchie complète
+                    return chunk_section_with_llm(
+                        section.get("content", ""),
+                        section_title,
+                        chapter_title=section.get("chapter_title", section_title),
+                        subsection_title=subsection_title,
+                        section_level=section_level,
+                        model=llm_model,
+                        provider=llm_provider,
+                        temperature=llm_temperature,
+                    )
+
+                def on_chunking_progress(done: int, total: int) -> None:
+                    emit_progress("chunking", "active", f"Sections {done}/{total}")
+
+                # Appels LLM en parallèle (bornés par provider), résultats dans l'ordre des sections
+                chunks_by_section: List[List[SemanticChunk]] = run_llm_tasks(
+                    chunk_one_section,
+                    sections_to_chunk,
                     provider=llm_provider,
-                    temperature=llm_temperature,
+                    on_progress=on_chunking_progress,
                 )
-                
-                # Ajouter les métadonnées à chaque chunk
-                for chunk in section_chunks:
-                    # Cast to Dict for modification
-                    chunk_dict = cast(Dict[str, Any], chunk)
-                    chunk_dict["chunk_id"] = f"chunk_{chunk_index:05d}"
-                    chunk_dict["section"] = section_title
-                    chunk_dict["section_level"] = section_level
-                    chunk_dict["chapter_title"] = chapter_title
-
-                    # Ajouter le sous-chapitre si différent
-                    if subsection_title and subsection_title != chapter_title:
-                        chunk_dict["subsection_title"] = subsection_title
-
-                    chunk_index += 1
-                    all_chunks.append(cast(SemanticChunk, chunk_dict))
-        else:
-            logger.info("[8/10] Chunking (mode basique)...")
-            # Utiliser les chunks basiques
-            for i, flat_chunk in enumerate(basic_chunks):
-                chunk_dict = cast(Dict[str, Any], flat_chunk)
-                basic_semantic_chunk: SemanticChunk = cast(SemanticChunk, {
-                    "chunk_id": f"chunk_{i:05d}",
-                    "text": chunk_dict.get("text", ""),
-                    "section": chunk_dict.get("title", f"Section {i}"),
-                    "section_level": chunk_dict.get("level", 1),
-                    "type": chunk_dict.get("type", "main_content"),
-                    "concepts": [],
-                })
-                all_chunks.append(basic_semantic_chunk)
+
+                for section, section_chunks in zip(sections_to_chunk, chunks_by_section):
+                    section_title = section.get("title", "")
+                    section_level = section.get("level", 1)
+                    chapter_title = section.get("chapter_title", section_title)
+
+                    # Déterminer le sous-chapitre (niveau 2) si on est niveau 3+
+                    subsection_title = None
+                    if section_level >= 2:
+                        subsection_title = section.get("parent_title") or section_title
+
+                    # Ajouter les métadonnées à chaque chunk (ids attribués séquentiellement)
+                    for chunk in section_chunks:
+                        # Cast to Dict for modification
+                        chunk_dict = cast(Dict[str, Any], chunk)
+                        chunk_dict["chunk_id"] = f"chunk_{chunk_index:05d}"
+                        chunk_dict["section"] = section_title
+                        chunk_dict["section_level"] = section_level
+                        chunk_dict["chapter_title"] = chapter_title
+
+                        # Ajouter le sous-chapitre si différent
+                        if subsection_title and subsection_title != chapter_title:
+                            chunk_dict["subsection_title"] = subsection_title
+
+                        chunk_index += 1
+                        chunks.append(cast(SemanticChunk, chunk_dict))
+            else:
+                logger.info("[8/10] Chunking (mode basique)...")
+                # Utiliser les chunks basiques
+                for i, flat_chunk in enumerate(basic_chunks):
+                    chunk_dict = cast(Dict[str, Any], flat_chunk)
+                    basic_semantic_chunk: SemanticChunk = cast(SemanticChunk, {
+                        "chunk_id": f"chunk_{i:05d}",
+                        "text": chunk_dict.get("text", ""),
+                        "section": chunk_dict.get("title", f"Section {i}"),
+                        "section_level": chunk_dict.get("level", 1),
+                        "type": chunk_dict.get("type", "main_content"),
+                        "concepts": [],
+                    })
+                    chunks.append(basic_semantic_chunk)
+            return chunks
+
+        all_chunks: List[SemanticChunk]
+        all_chunks, chunking_cached = checkpoints.run("chunking", fp_chunking, run_chunking_step)
         
         # ═══════════════════════════════════════════════════════════════════
         # ÉTAPE 9 : Nettoyage des chunks
         # ═══════════════════════════════════════════════════════════════════
         
-        emit_progress("chunking", "completed", f"{len(all_chunks)} chunks générés")
-        emit_progress("cleaning", "active", "Nettoyage des artefacts...")
-        logger.info("[9/10] Nettoyage et filtrage des chunks...")
-        
+        emit_step_done("chunking", chunking_cached, f"{len(all_chunks)} chunks générés")
+
         # Step 9: Cleaning - input: chunks, output: List[SemanticChunk]
-        cleaned_chunks: List[SemanticChunk] = []
-        for chunk in all_chunks:
-            # Nettoyer le texte
-            chunk_dict = cast(Dict[str, Any], chunk)
-            text: str = chunk_dict.get("text", "")
-            if clean_chunks and use_llm:
-                text = clean_chunk(text, use_llm=False)  # Nettoyage basique rapide
-            else:
-                text = clean_chunk(text, use_llm=False)
+        fp_cleaning: str = fingerprint(
+            "cleaning", fp_chunking, clean_chunks, extract_concepts, use_llm, llm_provider, llm_model
+        )
 
-            # Vérifier validité
-            if is_chunk_valid(text, min_chars=30, min_words=8):
-                chunk_dict["text"] = text
-                cleaned_chunks.append(cast(SemanticChunk, chunk_dict))
-        
-        emit_progress("cleaning", "completed", f"{len(cleaned_chunks)} chunks valides")
-        logger.info(f"Chunks après nettoyage: {len(cleaned_chunks)} (sur {len(all_chunks)})")
-        
-        # Extraire concepts si demandé
-        if extract_concepts and use_llm and cleaned_chunks:
-            logger.info(f"Enrichissement avec concepts via {llm_provider.upper()}...")
-            enriched = enrich_chunks_with_concepts(cast(List[Dict[str, Any]], cleaned_chunks[:50]), model=llm_model, provider=llm_provider)  # Limiter
-            cleaned_chunks = cast(List[SemanticChunk], enriched)
+        def run_cleaning_step() -> List[SemanticChunk]:
+            emit_progress("cleaning", "active", "Nettoyage des artefacts...")
+            logger.info("[9/10] Nettoyage et filtrage des chunks...")
+
+            cleaned: List[SemanticChunk] = []
+            for chunk in all_chunks:
+                # Nettoyer le texte
+                chunk_dict = cast(Dict[str, Any], chunk)
+                text: str = chunk_dict.get("text", "")
+                if clean_chunks and use_llm:
+                    text = clean_chunk(text, use_llm=False)  # Nettoyage basique rapide
+                else:
+                    text = clean_chunk(text, use_llm=False)
+
+                # Vérifier validité
+                if is_chunk_valid(text, min_chars=30, min_words=8):
+                    chunk_dict["text"] = text
+                    cleaned.append(cast(SemanticChunk, chunk_dict))
+
+            logger.info(f"Chunks après nettoyage: {len(cleaned)} (sur {len(all_chunks)})")
+
+            # Extraire concepts si demandé
+            if extract_concepts and use_llm and cleaned:
+                logger.info(f"Enrichissement avec concepts via {llm_provider.upper()}...")
+                emit_progress("validation", "active", "Extraction des concepts...")
+                enriched = enrich_chunks_with_concepts(
+                    cast(List[Dict[str, Any]], cleaned[:50]),  # Limiter
+                    model=llm_model,
+                    provider=llm_provider,
+                    on_progress=lambda done, total: emit_progress(
+                        "validation", "active", f"Concepts {done}/{total}"
+                    ),
+                )
+                cleaned = cast(List[SemanticChunk], enriched)
+            return cleaned
+
+        cleaned_chunks: List[SemanticChunk]
+        cleaned_chunks, cleaning_cached = checkpoints.run("cleaning", fp_cleaning, run_cleaning_step)
+        emit_step_done("cleaning", cleaning_cached, f"{len(cleaned_chunks)} chunks valides")
         
         metadata["chunks_count"] = len(cleaned_chunks)
         
@@ -788,27 +964,35 @@ def process_pdf_v2(
         # ═══════════════════════════════════════════════════════════════════
         
         # Step 10: Validation - input: parsed doc, output: ValidationResult
-        emit_progress("validation", "active", "Vérification de la qualité...")
-        validation_result: Optional[ValidationResult] = None
-        parsed_doc: Dict[str, Any] = {
-            "metadata": metadata,
-            "toc": toc,
-            "chunks": cleaned_chunks,
-        }
-        
+        fp_validation: str = fingerprint("validation", fp_cleaning, validate_output, use_llm, llm_provider, llm_model)
+
+        def run_validation_step() -> Dict[str, Any]:
+            emit_progress("validation", "active", "Vérification de la qualité...")
+            parsed_doc: Dict[str, Any] = {
+                "metadata": metadata,
+                "toc": toc,
+                "chunks": cleaned_chunks,
+            }
+            result: Optional[ValidationResult] = None
+
+            if validate_output and use_llm:
+                logger.info("[10/10] Validation du document...")
+                result = validate_document(parsed_doc, model=llm_model, provider=llm_provider)
+
+                # Appliquer les corrections (ou nettoyer les métadonnées)
+                parsed_doc = apply_corrections(parsed_doc, cast(Dict[str, Any], result))
+            else:
+                logger.info("[10/10] Validation (ignorée)...")
+                # Nettoyer quand même les métadonnées (titre, auteur)
+                parsed_doc = apply_corrections(parsed_doc, None)
+            return {"metadata": parsed_doc.get("metadata", metadata), "validation": result}
+
+        validation_output, validation_cached = checkpoints.run("validation", fp_validation, run_validation_step)
+        metadata = validation_output["metadata"]
+        validation_result: Optional[ValidationResult] = validation_output["validation"]
         if validate_output and use_llm:
-            logger.info("[10/10] Validation du document...")
-            validation_result = validate_document(parsed_doc, model=llm_model, provider=llm_provider)
-
-            # Appliquer les corrections (ou nettoyer les métadonnées)
-            parsed_doc = apply_corrections(parsed_doc, cast(Dict[str, Any], validation_result))
-            metadata = parsed_doc.get("metadata", metadata)
-            emit_progress("validation", "completed", "Qualité vérifiée")
+            emit_step_done("validation", validation_cached, "Qualité vérifiée")
         else:
-            logger.info("[10/10] Validation (ignorée)...")
-            # Nettoyer quand même les métadonnées (titre, auteur)
-            parsed_doc = apply_corrections(parsed_doc, None)
-            metadata = parsed_doc.get("metadata", metadata)
             emit_progress("validation", "skipped", "Non activée")
         
         # ═══════════════════════════════════════════════════════════════════
@@ -835,26 +1019,54 @@ def process_pdf_v2(
         # Ingestion Weaviate
         # ═══════════════════════════════════════════════════════════════════
         
-        # Weaviate ingestion step
+        # Weaviate ingestion step (checkpoint enregistré seulement en cas de succès,
+        # pour ne pas réinsérer un document déjà ingéré à l'identique). L'étape a
+        # un effet de bord : un checkpoint n'est réutilisé que si les chunks sont
+        # toujours présents dans Weaviate (suppression, purge ou restauration).
         weaviate_result: Optional[WeaviateIngestResult] = None
+        weaviate_path: Path = doc_output_dir / f"{doc_name}_weaviate.json"
         if ingest_to_weaviate:
-            emit_progress("weaviate", "active", "Vectorisation et stockage...")
-            logger.info("Ingestion dans Weaviate...")
-            weaviate_result = ingest_document(
-                doc_name=doc_name,
-                chunks=cast(List[Dict[str, Any]], cleaned_chunks),
-                metadata=metadata,
-                language=metadata.get("language", "fr"),
-            )
-            
+            fp_weaviate: str = fingerprint("weaviate", fp_validation)
+            weaviate_record: Optional[Dict[str, Any]] = checkpoints.load("weaviate", fp_weaviate)
+
+            if weaviate_record is not None:
+                previous_result = cast(WeaviateIngestResult, weaviate_record["output"])
+                expected: int = previous_result.get("count", 0)
+                submitted: int = previous_result.get("throughput", {}).get("objects", expected)
+                present: Optional[int] = count_ingested_objects(doc_name, submitted)
+                if present == expected:
+                    weaviate_result = previous_result
+                else:
+                    logger.warning(
+                        f"Checkpoint Weaviate obsolète ({present}/{expected} chunks présents), réingestion"
+                    )
+                    checkpoints.discard("weaviate")
+
+            if weaviate_result is not None:
+                checkpoints.mark("weaviate", "cached")
+                emit_step_done("weaviate", True, f"{weaviate_result.get('count', 0)} passages (déjà insérés)")
+                logger.info("Ingestion Weaviate reprise depuis le checkpoint (document inchangé)")
+            else:
+                emit_progress("weaviate", "active", "Vectorisation et stockage...")
+                logger.info("Ingestion dans Weaviate...")
+                weaviate_result = ingest_document(
+                    doc_name=doc_name,
+                    chunks=cast(List[Dict[str, Any]], cleaned_chunks),
+                    metadata=metadata,
+                    language=metadata.get("language", "fr"),
+                )
+                checkpoints.mark("weaviate", "computed")
+
+                if weaviate_result.get("success"):
+                    checkpoints.save("weaviate", fp_weaviate, weaviate_result)
+                    emit_progress("weaviate", "completed", f"{weaviate_result.get('count', 0)} passages insérés")
+                    logger.info(f"Ingestion terminée: {weaviate_result.get('count', 0)} passages")
+                else:
+                    emit_progress("weaviate", "error", weaviate_result.get('error', 'Erreur'))
+                    logger.warning(f"Erreur ingestion: {weaviate_result.get('error')}")
+
             if weaviate_result.get("success"):
-                emit_progress("weaviate", "completed", f"{weaviate_result.get('count', 0)} passages insérés")
-                logger.info(f"Ingestion terminée: {weaviate_result.get('count', 0)} passages")
-                weaviate_path = doc_output_dir / f"{doc_name}_weaviate.json"
                 weaviate_path.write_text(json.dumps(weaviate_result, ensure_ascii=False, indent=2), encoding="utf-8")
-            else:
-                emit_progress("weaviate", "error", weaviate_result.get('error', 'Erreur'))
-                logger.warning(f"Erreur ingestion: {weaviate_result.get('error')}")
         else:
             emit_progress("weaviate", "skipped", "Non activée")
         
@@ -866,7 +1078,7 @@ def process_pdf_v2(
         }
 
         if weaviate_result and weaviate_result.get("success"):
-            files_dict["weaviate"] = str(doc_output_dir / f"{doc_name}_weaviate.json")
+            files_dict["weaviate"] = str(weaviate_path)
 
         if not embed_images and images_dir.exists():
             image_files: List[Path] = list(images_dir.glob("*.png"))
@@ -880,7 +1092,14 @@ def process_pdf_v2(
         total_cost: float = cost  # Coût OCR
         if llm_cost_stats:
             total_cost += llm_cost_stats["total_cost"]
-            logger.info(f"Coût LLM Mistral: {llm_cost_stats['total_cost']:.4f}€ ({llm_cost_stats['calls_count']} appels)")
+            logger.info(
+                f"Coût LLM Mistral: {llm_cost_stats['total_cost']:.4f}€ ({llm_cost_stats['calls_count']} appels, "
+                f"{llm_cost_stats['cache_hits']} en cache)"
+            )
+
+        cached_steps: List[str] = [step for step, status in checkpoints.statuses.items() if status == "cached"]
+        if cached_steps:
+            logger.info(f"Étapes reprises depuis les checkpoints : {', '.join(cached_steps)}")
         
         logger.info(f"[V2] Traitement terminé : {doc_name} - Coût total: {total_cost:.4f}€")
         
@@ -899,6 +1118,7 @@ def process_pdf_v2(
             "chunks_count": len(cleaned_chunks),
             "validation": validation_result,
             "weaviate_ingest": weaviate_result,
+            "steps": dict(checkpoints.statuses),
             "pipeline_version": "2.0",
         }
         
@@ -0,0 +1,199 @@
+"""Fingerprinted step checkpoints for the V2 PDF pipeline.
+
+``process_pdf_v2`` runs OCR, Markdown construction, LLM metadata/TOC
+extraction, classification, chunking, cleaning, validation and ingestion in
+sequence. Without checkpoints, a crash during validation or ingestion throws
+away all the paid OCR and LLM work of the previous steps.
+
+Each step now saves its output to ``<doc>/.checkpoints/<step>.json`` together
+with a fingerprint of its inputs and options. The fingerprint of a step
+includes the fingerprint of the steps it depends on, so the fingerprints form
+a chain (a DAG): re-running a document reuses every step whose fingerprint is
+unchanged and resumes from the first invalid one. Changing an option (e.g. the
+LLM model) only invalidates the steps that use it and their descendants.
+
+Architecture:
+    - ``fingerprint(*parts)``: stable sha256 of JSON-serializable parts
+    - ``file_fingerprint(path)``: sha256 of a source file
+    - ``StepCheckpoints.run(step, fp, compute)``: load or compute and save
+    - Optional artifacts (OCR JSON, images): the checkpoint is only valid
+      while these files still exist
+
+Bump ``CHECKPOINT_VERSION`` when the output format of a step changes.
+
+Usage:
+    >>> checkpoints = StepCheckpoints(Path("output/menon/.checkpoints"))
+    >>> fp_meta = fingerprint("metadata", fp_markdown, "mistral", model)
+    >>> metadata, cached = checkpoints.run("metadata", fp_meta, compute_metadata)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+#: Checkpoint format version (part of every fingerprint)
+CHECKPOINT_VERSION: int = 1
+
+#: Name of the checkpoint directory inside the document output directory
+CHECKPOINT_DIRNAME: str = ".checkpoints"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable fingerprint of the inputs and options of a step.
+
+    Args:
+        *parts: JSON-serializable values (upstream fingerprints, options).
+            Non-serializable values are converted with ``str()``.
+
+    Returns:
+        Hex sha256 digest.
+    """
+    payload: str = json.dumps(
+        [CHECKPOINT_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path: Path) -> str:
+    """Fingerprint of a source file's content.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex sha256 digest of the file bytes.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StepCheckpoints:
+    """Per-document store of step outputs keyed by fingerprint.
+
+    Attributes:
+        directory: Checkpoint directory (one JSON file per step).
+        enabled: If False, every step is computed and nothing is saved.
+        statuses: "cached" or "computed" for each step run so far.
+    """
+
+    def __init__(self, directory: Path, enabled: bool = True) -> None:
+        """Create the store.
+
+        Args:
+            directory: Checkpoint directory, created on first save.
+            enabled: Set to False to disable reuse and saving.
+        """
+        self.directory: Path = Path(directory)
+        self.enabled: bool = enabled
+        self.statuses: Dict[str, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _path(self, step: str) -> Path:
+        return self.directory / f"{step}.json"
+
+    def load(self, step: str, fp: str, artifacts: Sequence[Path] = ()) -> Optional[Dict[str, Any]]:
+        """Return the saved record of a step if its fingerprint matches.
+
+        Args:
+            step: Step name.
+            fp: Expected fingerprint.
+            artifacts: Files that must still exist for the checkpoint to be valid.
+
+        Returns:
+            ``{"output": ...}`` if valid, None otherwise.
+        """
+        if not self.enabled:
+            return None
+        path: Path = self._path(step)
+        if not path.exists():
+            return None
+        try:
+            record: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Checkpoint illisible ({path.name}), étape recalculée: {e}")
+            return None
+        if record.get("fingerprint") != fp or "output" not in record:
+            return None
+        if any(not Path(artifact).exists() for artifact in artifacts):
+            return None
+        return record
+
+    def save(self, step: str, fp: str, output: Any) -> None:
+        """Save the output of a step (atomic write).
+
+        Args:
+            step: Step name.
+            fp: Fingerprint of the inputs that produced ``output``.
+            output: JSON-serializable step output.
+        """
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path: Path = self._path(step)
+        tmp_path: Path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        record: Dict[str, Any] = {
+            "step": step,
+            "fingerprint": fp,
+            "created_at": time.time(),
+            "output": output,
+        }
+        tmp_path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def discard(self, step: str) -> None:
+        """Delete the checkpoint of a step (no-op if absent).
+
+        Args:
+            step: Step name.
+        """
+        try:
+            self._path(step).unlink()
+        except FileNotFoundError:
+            pass
+
+    def mark(self, step: str, status: str) -> None:
+        """Record whether a step was "cached" or "computed"."""
+        with self._lock:
+            self.statuses[step] = status
+
+    def run(
+        self,
+        step: str,
+        fp: str,
+        compute: Callable[[], T],
+        artifacts: Sequence[Path] = (),
+    ) -> Tuple[T, bool]:
+        """Load a step output from its checkpoint, or compute and save it.
+
+        Args:
+            step: Step name.
+            fp: Fingerprint of the step inputs and options.
+            compute: Function producing the (JSON-serializable) output.
+            artifacts: Files that must still exist for a checkpoint hit.
+
+        Returns:
+            Tuple ``(output, cached)``.
+        """
+        record: Optional[Dict[str, Any]] = self.load(step, fp, artifacts)
+        if record is not None:
+            logger.info(f"Étape '{step}' reprise depuis le checkpoint")
+            self.mark(step, "cached")
+            return record["output"], True
+
+        output: T = compute()
+        self.save(step, fp, output)
+        self.mark(step, "computed")
+        return output, False
@@ -0,0 +1,79 @@
+"""Reciprocal-rank fusion of ranked chunk lists.
+
+Merges several rankings of the same corpus (e.g. retrieval on the raw
+question and on its LLM reformulation) without comparing their scores:
+each chunk gets ``sum(weight / (k + rank))`` over the lists it appears in.
+
+Usage:
+    >>> from utils.rank_fusion import reciprocal_rank_fusion
+    >>> raw = [{"uuid": "a"}, {"uuid": "b"}]
+    >>> reformulated = [{"uuid": "b"}, {"uuid": "c"}]
+    >>> [c["uuid"] for c in reciprocal_rank_fusion([raw, reformulated])]
+    ['b', 'a', 'c']
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence
+
+RRF_K: int = 60
+"""Rank offset from Cormack et al. (2009); damps the weight of the top ranks."""
+
+
+def chunk_key(chunk: Dict[str, Any], key: str = "uuid") -> str:
+    """Identity of a chunk across rankings.
+
+    Args:
+        chunk: Chunk dict.
+        key: Preferred identity field.
+
+    Returns:
+        The ``key`` value, or a hash of the chunk text when it is missing.
+    """
+    value = chunk.get(key)
+    if value:
+        return str(value)
+    return hashlib.sha1(str(chunk.get("text", "")).encode("utf-8")).hexdigest()
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Dict[str, Any]]],
+    k: int = RRF_K,
+    key: str = "uuid",
+    limit: Optional[int] = None,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Dict[str, Any]]:
+    """Merge rankings with reciprocal-rank fusion.
+
+    Args:
+        rankings: Lists of chunk dicts, best first.
+        k: RRF rank offset.
+        key: Chunk identity field (see ``chunk_key``).
+        limit: Maximum number of merged chunks (None = all).
+        weights: Optional weight per ranking (default 1.0 each).
+
+    Returns:
+        Copies of the chunks (first occurrence wins) with an added
+        ``rrf_score``, sorted by decreasing score. Ties keep the order of
+        first appearance.
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("weights must have one entry per ranking")
+
+    scores: Dict[str, float] = {}
+    chunks: Dict[str, Dict[str, Any]] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, chunk in enumerate(ranking, start=1):
+            identity = chunk_key(chunk, key)
+            scores[identity] = scores.get(identity, 0.0) + weight / (k + rank)
+            if identity not in chunks:
+                chunks[identity] = chunk
+
+    # sorted() is stable: ties keep first-appearance order
+    ordered = sorted(chunks, key=lambda identity: scores[identity], reverse=True)
+    if limit is not None:
+        ordered = ordered[:limit]
+    return [{**chunks[identity], "rrf_score": round(scores[identity], 6)} for identity in ordered]
@@ -0,0 +1,367 @@
+"""Local cross-encoder reranking of RAG chunks.
+
+Replaces the LLM round-trip of ``flask_app.rerank_rag_chunks`` (a prompt of
+400-char previews, then parsing indices out of free text) with a small
+multilingual cross-encoder of the bge-reranker family. The model scores
+every (question, chunk) pair in batches, on GPU when available.
+
+Architecture:
+    - Model: ``BAAI/bge-reranker-v2-m3`` (multilingual), sigmoid scores in [0, 1]
+    - Backends: "torch" (CUDA if available, else CPU) or "onnx-int8"
+      (dynamically int8-quantized ONNX export on CPU, exported on first use)
+    - Selection: chunks sorted by score, ``threshold`` filter, ``top_k`` cap,
+      at least ``min_keep`` chunks kept
+    - Cache: in-process LRU of scores keyed by (normalized query, chunk uuid)
+
+Configuration:
+    - ``RERANK_MODE`` : "cross-encoder" (default), "llm" (previous LLM reranker) or "none"
+    - ``RERANKER_MODEL`` : cross-encoder name (default: BAAI/bge-reranker-v2-m3)
+    - ``RERANKER_BACKEND`` : "torch" (default) or "onnx-int8"
+    - ``RERANKER_DEVICE`` : torch device (default: cuda when available, else cpu)
+    - ``RERANKER_BATCH_SIZE`` : pairs per forward pass (default: 16)
+    - ``RERANKER_THRESHOLD`` : minimum score kept (default: 0.05)
+    - ``RERANKER_TOP_K`` : maximum chunks kept (default: 12)
+    - ``RERANKER_MIN_KEEP`` : minimum chunks kept whatever their score (default: 4)
+    - ``RERANKER_CACHE_SIZE`` : cached (query, uuid) scores (default: 20000)
+    - ``RERANKER_ONNX_DIR`` : ONNX export directory
+      (default: ~/.cache/library_rag/onnx/<model>-int8)
+
+Usage:
+    >>> from utils.reranker import get_reranker
+    >>> reranker = get_reranker()
+    >>> best = reranker.rerank("Qu'est-ce que la vertu ?", chunks)
+    >>> best[0]["rerank_score"]
+    0.93
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.rank_fusion import chunk_key
+
+logger = logging.getLogger(__name__)
+
+RERANK_MODE_CROSS_ENCODER = "cross-encoder"
+RERANK_MODE_LLM = "llm"
+RERANK_MODE_NONE = "none"
+RERANK_MODES = (RERANK_MODE_CROSS_ENCODER, RERANK_MODE_LLM, RERANK_MODE_NONE)
+
+BACKEND_TORCH = "torch"
+BACKEND_ONNX_INT8 = "onnx-int8"
+
+DEFAULT_RERANKER_MODEL = "BAAI/bge-reranker-v2-m3"
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_THRESHOLD = 0.05
+DEFAULT_TOP_K = 12
+DEFAULT_MIN_KEEP = 4
+DEFAULT_CACHE_SIZE = 20_000
+MAX_PASSAGE_CHARS = 2000
+"""Passages are cut before tokenization (the model truncates at 512 tokens anyway)."""
+
+
+def get_rerank_mode(mode: Optional[str] = None) -> str:
+    """Resolve the reranking mode from argument or ``RERANK_MODE``.
+
+    Args:
+        mode: Explicit mode, or None to read the environment.
+
+    Returns:
+        One of ``RERANK_MODES``.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    mode = (mode or os.environ.get("RERANK_MODE", RERANK_MODE_CROSS_ENCODER)).strip().lower()
+    if mode not in RERANK_MODES:
+        raise ValueError(f"Unknown RERANK_MODE '{mode}'. Expected one of: {', '.join(RERANK_MODES)}")
+    return mode
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.environ.get(name)!r}")
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(_env_float(name, default))
+
+
+def _default_onnx_dir(model_name: str) -> Path:
+    configured = os.environ.get("RERANKER_ONNX_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    safe_name = model_name.replace("/", "__")
+    return Path.home() / ".cache" / "library_rag" / "onnx" / f"{safe_name}-int8"
+
+
+class ScoreCache:
+    """Thread-safe LRU of reranker scores keyed by (query, chunk id).
+
+    Attributes:
+        max_size: Maximum number of cached scores.
+        hits: Cache hits since creation.
+        misses: Cache misses since creation.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[float]:
+        """Return a cached score (and refresh its recency), or None."""
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: Tuple[str, str], score: float) -> None:
+        """Store a score, evicting the least recently used entries."""
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._scores)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._scores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+class CrossEncoderReranker:
+    """Batched cross-encoder scoring and selection of RAG chunks.
+
+    The model is loaded lazily on first use (or injected, e.g. for tests:
+    any object with a ``predict(pairs, batch_size=...)`` method). A failed
+    load is remembered: later calls raise at once instead of retrying it.
+
+    Attributes:
+        model_name: Hugging Face model name.
+        backend: "torch" or "onnx-int8".
+        batch_size: Pairs per forward pass.
+        threshold: Minimum score of a kept chunk.
+        top_k: Maximum number of kept chunks.
+        min_keep: Minimum number of kept chunks.
+        cache: Score cache (None to disable).
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        device: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        min_keep: Optional[int] = None,
+        cache: Optional[ScoreCache] = None,
+        model: Any = None,
+    ) -> None:
+        self.model_name: str = model_name or os.environ.get("RERANKER_MODEL", DEFAULT_RERANKER_MODEL)
+        self.backend: str = (backend or os.environ.get("RERANKER_BACKEND", BACKEND_TORCH)).strip().lower()
+        if self.backend not in (BACKEND_TORCH, BACKEND_ONNX_INT8):
+            raise ValueError(f"Unknown RERANKER_BACKEND '{self.backend}'")
+        self.device: Optional[str] = device or os.environ.get("RERANKER_DEVICE")
+        self.batch_size: int = batch_size or _env_int("RERANKER_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.threshold: float = threshold if threshold is not None else _env_float("RERANKER_THRESHOLD", DEFAULT_THRESHOLD)
+        self.top_k: int = top_k or _env_int("RERANKER_TOP_K", DEFAULT_TOP_K)
+        self.min_keep: int = min_keep if min_keep is not None else _env_int("RERANKER_MIN_KEEP", DEFAULT_MIN_KEEP)
+        self.cache: Optional[ScoreCache] = cache if cache is not None else ScoreCache(
+            _env_int("RERANKER_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+        )
+        self._model: Any = model
+        self._load_error: Optional[Exception] = None
+        self._load_lock: threading.Lock = threading.Lock()
+        # Forward passes are not re-entrant on a shared GPU model
+        self._predict_lock: threading.Lock = threading.Lock()
+
+    # ── Model loading ────────────────────────────────────────────────────
+
+    @property
+    def model(self) -> Any:
+        """The cross-encoder, loaded on first access.
+
+        Raises:
+            RuntimeError: If loading failed (now or on an earlier access).
+        """
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None and self._load_error is None:
+                    try:
+                        self._model = self._load()
+                    except Exception as e:
+                        logger.error(f"Reranker {self.model_name} could not be loaded: {e}")
+                        self._load_error = e
+                if self._model is None:
+                    raise RuntimeError(
+                        f"Reranker {self.model_name} unavailable: {self._load_error}"
+                    ) from self._load_error
+        return self._model
+
+    def _load(self) -> Any:
+        from sentence_transformers import CrossEncoder
+
+        if self.backend == BACKEND_ONNX_INT8:
+            return self._load_onnx_int8()
+
+        device = self.device
+        if device is None:
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading reranker {self.model_name} on {device}...")
+        model = CrossEncoder(self.model_name, device=device, max_length=512)
+        if device.startswith("cuda"):
+            model.model.half()
+        return model
+
+    def _load_onnx_int8(self) -> Any:
+        try:
+            from sentence_transformers import CrossEncoder, export_dynamic_quantized_onnx_model
+        except ImportError as e:
+            raise RuntimeError(
+                "The onnx-int8 reranker backend requires sentence-transformers>=4.1 and optimum.\n"
+                'Install with: pip install "optimum[onnxruntime]"'
+            ) from e
+
+        quantization = os.environ.get("RERANKER_ONNX_QUANTIZATION", "avx512_vnni")
+        export_dir = _default_onnx_dir(self.model_name)
+        file_name = f"onnx/model_qint8_{quantization}.onnx"
+
+        if not (export_dir / file_name).exists():
+            # One-time export: FP32 ONNX graph, then dynamic int8 quantization
+            logger.info(f"Exporting reranker {self.model_name} to ONNX in {export_dir} (one-time)...")
+            fp32_model = CrossEncoder(self.model_name, device="cpu", backend="onnx")
+            fp32_model.save_pretrained(str(export_dir))
+            export_dynamic_quantized_onnx_model(fp32_model, quantization, str(export_dir))
+
+        logger.info(f"Loading int8 ONNX reranker from {export_dir / file_name}...")
+        return CrossEncoder(
+            str(export_dir), device="cpu", backend="onnx",
+            model_kwargs={"file_name": file_name}, max_length=512,
+        )
+
+    # ── Scoring ──────────────────────────────────────────────────────────
+
+    def score(self, query: str, chunks: Sequence[Dict[str, Any]]) -> List[float]:
+        """Score (query, chunk) pairs, reusing cached scores.
+
+        Args:
+            query: User question.
+            chunks: Chunk dicts with a ``text`` key (and ideally ``uuid``).
+
+        Returns:
+            One score in [0, 1] per chunk, in input order.
+        """
+        normalized = _normalize_query(query)
+        scores: List[Optional[float]] = [None] * len(chunks)
+        missing: List[int] = []
+        for i, chunk in enumerate(chunks):
+            if self.cache is not None:
+                scores[i] = self.cache.get((normalized, chunk_key(chunk)))
+            if scores[i] is None:
+                missing.append(i)
+
+        if missing:
+            pairs = [(query, str(chunks[i].get("text", ""))[:MAX_PASSAGE_CHARS]) for i in missing]
+            with self._predict_lock:
+                predicted = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            for i, value in zip(missing, predicted):
+                score = float(value)
+                scores[i] = score
+                if self.cache is not None:
+                    self.cache.put((normalized, chunk_key(chunks[i])), score)
+
+        # Every slot is filled: either from the cache or by the model above
+        return [s if s is not None else 0.0 for s in scores]
+
+    def rerank(
+        self,
+        query: str,
+        chunks: Sequence[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        threshold: Optional[float] = None,
+        min_keep: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sort chunks by cross-encoder score and keep the relevant ones.
+
+        Args:
+            query: User question.
+            chunks: Candidate chunks.
+            top_k: Maximum kept chunks (default: ``self.top_k``).
+            threshold: Minimum score (default: ``self.threshold``).
+            min_keep: Minimum kept chunks, even below the threshold
+                (default: ``self.min_keep``).
+
+        Returns:
+            Copies of the kept chunks with a ``rerank_score`` key, best first.
+        """
+        if not chunks:
+            return []
+        top_k = top_k or self.top_k
+        threshold = self.threshold if threshold is None else threshold
+        min_keep = self.min_keep if min_keep is None else min_keep
+
+        scores = self.score(query, chunks)
+        order = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+        kept = [i for i in order if scores[i] >= threshold][:top_k]
+        if len(kept) < min_keep:
+            kept = order[:min(min_keep, top_k)]
+
+        return [{**chunks[i], "rerank_score": round(scores[i], 4)} for i in kept]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return configuration and cache statistics."""
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self._model is not None,
+            "load_error": str(self._load_error) if self._load_error is not None else None,
+            "threshold": self.threshold,
+            "top_k": self.top_k,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+_reranker: Optional[CrossEncoderReranker] = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """Get or create the process-wide cross-encoder reranker (lazy model load)."""
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = CrossEncoderReranker()
+    return _reranker
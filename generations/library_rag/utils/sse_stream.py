@@ -0,0 +1,380 @@
+"""Resumable Server-Sent Events streams and bounded in-memory job registries.
+
+The chat pipeline used to push one ``queue.Queue`` item per LLM token and
+``/chat/stream`` consumed it destructively: one ``data:`` frame and one
+``json.dumps`` per token, and a browser that lost its connection lost
+everything already streamed. Sessions and jobs were never evicted.
+
+Architecture:
+    - ``SessionEventLog``: append-only event log with monotonically
+      increasing ids (1, 2, ...). Readers never consume events, so any
+      number of connections can replay from an id (``Last-Event-ID``).
+    - ``TokenCoalescer``: merges consecutive tokens into one ``token`` event,
+      flushed every ``flush_interval`` seconds (by a timer, so a stalled LLM
+      does not hold buffered text) or ``max_chars`` characters.
+    - ``format_sse``: serializes an event with its ``id:`` line.
+    - ``TTLSweeper``: daemon thread evicting finished entries of the
+      ``chat_sessions``/``processing_jobs``/``tts_jobs``/``batch_jobs`` dicts,
+      started by the first request (not at import).
+
+Configuration:
+    - ``CHAT_COALESCE_MS`` : token flush interval (default: 30)
+    - ``CHAT_COALESCE_CHARS`` : token flush size (default: 64)
+    - ``JOB_TTL_SECONDS`` : lifetime of a finished entry (default: 1800)
+    - ``JOB_MAX_AGE_SECONDS`` : lifetime of any entry, even unfinished (default: 86400)
+    - ``JOB_SWEEP_INTERVAL`` : seconds between sweeps (default: 60)
+
+Usage:
+    >>> from utils.sse_stream import SessionEventLog, TokenCoalescer, format_sse
+    >>> log = SessionEventLog()
+    >>> coalescer = TokenCoalescer(log)
+    >>> for token in ["La", " vertu", " est"]:
+    ...     coalescer.add(token)
+    >>> coalescer.flush()
+    >>> log.append({"type": "complete"})
+    2
+    >>> [format_sse(i, e) for i, e in log.events_after(0)][0]
+    'id: 1\\ndata: {"type": "token", "content": "La vertu est"}\\n\\n'
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENT_TYPES = frozenset({"complete", "error"})
+"""Event types after which a stream is closed."""
+
+TERMINAL_STATUSES = frozenset({"complete", "completed", "error", "failed", "partial"})
+"""Job/session statuses considered finished by the sweeper."""
+
+DEFAULT_FLUSH_INTERVAL: float = int(os.environ.get("CHAT_COALESCE_MS", "30")) / 1000.0
+DEFAULT_MAX_CHARS: int = int(os.environ.get("CHAT_COALESCE_CHARS", "64"))
+DEFAULT_TTL_SECONDS: float = float(os.environ.get("JOB_TTL_SECONDS", "1800"))
+DEFAULT_MAX_AGE_SECONDS: float = float(os.environ.get("JOB_MAX_AGE_SECONDS", "86400"))
+DEFAULT_SWEEP_INTERVAL: float = float(os.environ.get("JOB_SWEEP_INTERVAL", "60"))
+
+
+class SessionEventLog:
+    """Append-only, thread-safe log of SSE events.
+
+    Event ids start at 1 and increase by one per event, so a reader that has
+    seen id ``n`` resumes with ``events_after(n)``.
+
+    Attributes:
+        closed: True once a terminal event (complete/error) was appended.
+        last_event_at: ``time.time()`` of the last append.
+    """
+
+    def __init__(self) -> None:
+        self._events: List[Dict[str, Any]] = []
+        self._cond: threading.Condition = threading.Condition()
+        self.closed: bool = False
+        self.last_event_at: float = time.time()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._events)
+
+    @property
+    def last_id(self) -> int:
+        """Id of the last appended event (0 when empty)."""
+        with self._cond:
+            return len(self._events)
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Append an event and wake up waiting readers.
+
+        Args:
+            event: JSON-serializable event dict with a ``type`` key.
+
+        Returns:
+            Id of the appended event.
+        """
+        with self._cond:
+            self._events.append(event)
+            self.last_event_at = time.time()
+            if event.get("type") in TERMINAL_EVENT_TYPES:
+                self.closed = True
+            self._cond.notify_all()
+            return len(self._events)
+
+    def events_after(self, last_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return the events with an id greater than ``last_id``.
+
+        Args:
+            last_id: Last id seen by the reader (0 for the whole log).
+
+        Returns:
+            List of (event_id, event) tuples.
+        """
+        with self._cond:
+            start = max(0, min(last_id, len(self._events)))
+            return [(i + 1, self._events[i]) for i in range(start, len(self._events))]
+
+    def wait_after(self, last_id: int, timeout: float) -> List[Tuple[int, Dict[str, Any]]]:
+        """Block until events newer than ``last_id`` exist, or ``timeout`` expires.
+
+        Args:
+            last_id: Last id seen by the reader.
+            timeout: Maximum wait in seconds.
+
+        Returns:
+            New (event_id, event) tuples, empty on timeout.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._events) > last_id or self.closed, timeout)
+        return self.events_after(last_id)
+
+
+class TokenCoalescer:
+    """Merge LLM tokens into fewer ``token`` events.
+
+    The buffer is flushed when it reaches ``max_chars`` characters or
+    ``flush_interval`` seconds after the first buffered token, even if no
+    further token arrives (a timer thread does the flush when the LLM
+    stalls). Call ``flush()`` before appending any other event so the order
+    of the log is preserved.
+
+    Attributes:
+        log: Destination event log.
+        flush_interval: Maximum age of the buffer in seconds.
+        max_chars: Maximum buffered characters.
+        tokens: Tokens received.
+        events: ``token`` events emitted.
+    """
+
+    def __init__(
+        self,
+        log: SessionEventLog,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.log: SessionEventLog = log
+        self.flush_interval: float = flush_interval
+        self.max_chars: int = max_chars
+        self.tokens: int = 0
+        self.events: int = 0
+        self._clock: Callable[[], float] = clock
+        self._parts: List[str] = []
+        self._size: int = 0
+        self._started: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, token: str) -> None:
+        """Buffer a token, flushing if the size or time budget is exceeded.
+
+        Args:
+            token: Text fragment yielded by the LLM.
+        """
+        if not token:
+            return
+        with self._lock:
+            if not self._parts:
+                self._started = self._clock()
+                if self.flush_interval > 0:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            self._parts.append(token)
+            self._size += len(token)
+            self.tokens += 1
+            if self._size >= self.max_chars or self._clock() - self._started >= self.flush_interval:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Emit the buffered tokens as a single ``token`` event."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._parts:
+            return
+        self.log.append({"type": "token", "content": "".join(self._parts)})
+        self.events += 1
+        self._parts = []
+        self._size = 0
+
+
+def format_sse(event_id: int, event: Mapping[str, Any]) -> str:
+    """Serialize an event as an SSE frame carrying its id.
+
+    Args:
+        event_id: Id used by the browser for ``Last-Event-ID``.
+        event: JSON-serializable event.
+
+    Returns:
+        SSE frame (``id:`` and ``data:`` lines, blank-line terminated).
+    """
+    return f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Parse a ``Last-Event-ID`` header or query value.
+
+    Args:
+        value: Raw value (may be None or garbage).
+
+    Returns:
+        Non-negative event id, 0 when absent or invalid.
+    """
+    try:
+        return max(0, int(str(value).strip()))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TTLSweeper:
+    """Evict finished entries from in-memory job registries.
+
+    An entry is finished when its ``status`` is in ``TERMINAL_STATUSES``. The
+    first sweep that sees it finished stamps ``finished_at`` (unless the
+    producer already set it); it is evicted ``ttl`` seconds later. Any entry
+    older than ``max_age`` seconds (``created_at``, stamped at first sight
+    when missing) is evicted whatever its status.
+
+    Attributes:
+        registries: Mapping of name -> dict of entries.
+        ttl: Lifetime of a finished entry in seconds.
+        max_age: Lifetime of any entry in seconds.
+        interval: Seconds between two sweeps of the background thread.
+        evicted: Number of evicted entries per registry.
+    """
+
+    def __init__(
+        self,
+        registries: Mapping[str, MutableMapping[str, Dict[str, Any]]],
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        interval: float = DEFAULT_SWEEP_INTERVAL,
+    ) -> None:
+        self.registries: Mapping[str, MutableMapping[str, Dict[str, Any]]] = registries
+        self.ttl: float = ttl
+        self.max_age: float = max_age
+        self.interval: float = interval
+        self.evicted: Dict[str, int] = {name: 0 for name in registries}
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _is_finished(entry: Mapping[str, Any]) -> bool:
+        log = entry.get("events")
+        if isinstance(log, SessionEventLog) and log.closed:
+            return True
+        return entry.get("status") in TERMINAL_STATUSES
+
+    def sweep(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Run one eviction pass over every registry.
+
+        Args:
+            now: Current ``time.time()`` (for tests).
+
+        Returns:
+            Number of entries evicted per registry during this pass.
+        """
+        now = time.time() if now is None else now
+        removed: Dict[str, int] = {}
+        for name, registry in self.registries.items():
+            expired: List[str] = []
+            # list() : the dicts are mutated by request and worker threads
+            for key, entry in list(registry.items()):
+                created_at = entry.setdefault("created_at", now)
+                if self._is_finished(entry):
+                    finished_at = entry.setdefault("finished_at", now)
+                    if now - finished_at >= self.ttl:
+                        expired.append(key)
+                        continue
+                if now - created_at >= self.max_age:
+                    expired.append(key)
+            for key in expired:
+                registry.pop(key, None)
+            removed[name] = len(expired)
+            self.evicted[name] = self.evicted.get(name, 0) + len(expired)
+        if any(removed.values()):
+            logger.info("Evicted finished entries: %s", removed)
+        return removed
+
+    def start(self) -> "TTLSweeper":
+        """Start the background daemon thread (idempotent, thread-safe)."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="ttl-sweeper", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:  # never let the sweeper die
+                logger.warning("TTL sweep failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current sizes and eviction counters."""
+        return {
+            "sizes": {name: len(registry) for name, registry in self.registries.items()},
+            "evicted": dict(self.evicted),
+            "ttl": self.ttl,
+            "max_age": self.max_age,
+        }
+
+
+def iter_event_frames(
+    log: SessionEventLog,
+    last_id: int = 0,
+    poll_timeout: float = 1.0,
+    keepalive_interval: float = 30.0,
+    is_alive: Callable[[], bool] = lambda: True,
+) -> Iterable[str]:
+    """Yield SSE frames from a log, starting after ``last_id``.
+
+    Ends after a terminal event, or when ``is_alive()`` turns False while no
+    event is pending. A comment line is sent every ``keepalive_interval``
+    seconds of silence.
+
+    Args:
+        log: Session event log.
+        last_id: Last id already received by the client.
+        poll_timeout: Wait granularity in seconds.
+        keepalive_interval: Seconds of silence before a keep-alive comment.
+        is_alive: Returns False once the producer is gone.
+
+    Yields:
+        SSE frames.
+    """
+    last_keepalive = time.time()
+    while True:
+        batch = log.wait_after(last_id, poll_timeout)
+        for event_id, event in batch:
+            last_id = event_id
+            yield format_sse(event_id, event)
+            if event.get("type") in TERMINAL_EVENT_TYPES:
+                return
+        if batch:
+            last_keepalive = time.time()
+            continue
+        if log.closed or not is_alive():
+            return
+        now = time.time()
+        if now - last_keepalive > keepalive_interval:
+            yield ": keepalive\n\n"
+            last_keepalive = now
@@ -14,6 +14,9 @@ Usage:
     >>> from utils.toc_enricher import enrich_chunks_with_toc
     >>> enriched_chunks = enrich_chunks_with_toc(chunks, toc, hierarchy)
 
+Matching is indexed (TocIndex: title map, paragraph map, bisect on
+``index_in_flat_list``), so enrichment is linear in chunks + TOC entries.
+
 See Also:
     - utils.types: FlatTOCEntryEnriched type definition
     - utils.weaviate_ingest: Integration point for enrichment
@@ -23,7 +26,8 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
 
 from .types import FlatTOCEntryEnriched
 
@@ -230,9 +234,108 @@ def extract_paragraph_number(section_text: str) -> Optional[str]:
     return None
 
 
+class TocIndex:
+    """Lookup structures over a flattened TOC, built once per document.
+
+    Matching a chunk by scanning the whole TOC (and re-parsing every
+    paragraph number) costs O(toc) per chunk, i.e. O(chunks × toc) for a
+    document such as Peirce's Collected Papers where both run into the
+    thousands. This index makes every strategy of find_matching_toc_entry
+    a hash lookup or a bisect:
+
+    - title → first entry with that exact title
+    - paragraph number → level-2 entries with that number (TOC order)
+    - sorted ``index_in_flat_list`` values for the proximity fallback
+
+    Attributes:
+        flat_toc: The indexed flat TOC.
+    """
+
+    def __init__(self, flat_toc: List[FlatTOCEntryEnriched]) -> None:
+        """Build the indexes.
+
+        Args:
+            flat_toc: Flattened TOC from flatten_toc_with_paths().
+        """
+        self.flat_toc: List[FlatTOCEntryEnriched] = flat_toc
+        self._by_title: Dict[str, FlatTOCEntryEnriched] = {}
+        # (entry, lowercased title, has significant words)
+        self._by_paragraph: Dict[str, List[Tuple[FlatTOCEntryEnriched, str, bool]]] = {}
+
+        for entry in flat_toc:
+            title: str = entry["title"]
+            self._by_title.setdefault(title, entry)
+
+            if entry["level"] == 2:
+                para = extract_paragraph_number(title)
+                if para:
+                    has_words = any(len(w) > 3 for w in title.split())
+                    self._by_paragraph.setdefault(para, []).append(
+                        (entry, title.lower(), has_words)
+                    )
+
+        # Entries sorted by position for the proximity fallback
+        by_position = sorted(flat_toc, key=lambda e: e["index_in_flat_list"])
+        self._positions: List[int] = [e["index_in_flat_list"] for e in by_position]
+        self._by_position: List[FlatTOCEntryEnriched] = by_position
+
+    def find(self, chunk: Dict[str, Any]) -> Optional[FlatTOCEntryEnriched]:
+        """Find the TOC entry of a chunk (same strategies as find_matching_toc_entry).
+
+        Args:
+            chunk: Chunk dict with 'section', 'sectionPath', 'order_index' fields
+
+        Returns:
+            Best matching TOC entry or None if no match found.
+        """
+        if not self.flat_toc:
+            return None
+
+        chunk_section = chunk.get("section", chunk.get("sectionPath", ""))
+        if not chunk_section:
+            return None
+
+        # Strategy 1: Exact title match
+        entry = self._by_title.get(chunk_section)
+        if entry is not None:
+            return entry
+
+        # Strategy 2: Paragraph number match (level 2 entries)
+        chunk_para = extract_paragraph_number(chunk_section)
+        if chunk_para:
+            chunk_words = [w for w in chunk_section.split() if len(w) > 3]
+            first_word = chunk_words[0].lower() if chunk_words else ""
+            for entry, title_lower, has_words in self._by_paragraph.get(chunk_para, ()):
+                if chunk_words and has_words:
+                    # Check if first significant words match
+                    if first_word in title_lower:
+                        return entry
+                else:
+                    # No text to compare, return paragraph match
+                    return entry
+
+        # Strategy 3: Proximity match using order_index
+        chunk_order = chunk.get("order_index")
+        if chunk_order is not None:
+            return self._closest(chunk_order)
+
+        return None
+
+    def _closest(self, order: float) -> FlatTOCEntryEnriched:
+        """Entry whose index_in_flat_list is closest to order (first one on ties)."""
+        pos = bisect_left(self._positions, order)
+        if pos == len(self._positions) or (
+            pos > 0 and order - self._positions[pos - 1] <= self._positions[pos] - order
+        ):
+            # Closest position is before order: first entry at that position
+            pos = bisect_left(self._positions, self._positions[pos - 1])
+        return self._by_position[pos]
+
+
 def find_matching_toc_entry(
     chunk: Dict[str, Any],
     flat_toc: List[FlatTOCEntryEnriched],
+    index: Optional[TocIndex] = None,
 ) -> Optional[FlatTOCEntryEnriched]:
     """Find matching TOC entry for a chunk using multi-strategy matching.
 
@@ -244,6 +347,8 @@ def find_matching_toc_entry(
     Args:
         chunk: Chunk dict with 'section', 'sectionPath', 'order_index' fields
         flat_toc: Flattened TOC with enriched metadata
+        index: Prebuilt TocIndex of flat_toc. Pass it when matching many
+            chunks; without it the TOC is scanned linearly.
 
     Returns:
         Best matching TOC entry or None if no match found.
@@ -254,6 +359,9 @@ def find_matching_toc_entry(
         >>> toc_entry["canonical_ref"]
         'CP 1.628'
     """
+    if index is not None:
+        return index.find(chunk)
+
     if not flat_toc:
         return None
 
@@ -310,8 +418,8 @@ def enrich_chunks_with_toc(
 
     Main orchestration function that:
     1. Checks if TOC is available (guard clause)
-    2. Flattens TOC once for efficiency
-    3. Matches each chunk to its TOC entry
+    2. Flattens and indexes TOC once for efficiency (TocIndex)
+    3. Matches each chunk to its TOC entry (hash lookups and bisect)
     4. Updates chunk metadata: sectionPath, chapterTitle, canonical_reference
 
     Args:
@@ -345,9 +453,10 @@ def enrich_chunks_with_toc(
 
     logger.info(f"Enriching {len(chunks)} chunks with TOC metadata...")
 
-    # Flatten TOC once for efficient matching
+    # Flatten and index TOC once for efficient matching
     try:
         flat_toc = flatten_toc_with_paths(toc, hierarchy)
+        toc_index = TocIndex(flat_toc)
         logger.info(f"Flattened TOC: {len(flat_toc)} entries")
     except Exception as e:
         logger.error(f"Failed to flatten TOC: {e}")
@@ -356,7 +465,7 @@ def enrich_chunks_with_toc(
     # Match each chunk to TOC entry and enrich
     enriched_count = 0
     for chunk in chunks:
-        matching_entry = find_matching_toc_entry(chunk, flat_toc)
+        matching_entry = toc_index.find(chunk)
 
         if matching_entry:
             # Update sectionPath with full hierarchical path
@@ -826,12 +826,43 @@ class LLMCostStats(TypedDict):
         total_input_tokens: Total input tokens used.
         total_output_tokens: Total output tokens used.
         calls_count: Number of API calls made.
+        cache_hits: Number of calls answered by the LLM response cache
+            (not counted in calls_count, tokens or cost).
     """
 
     total_cost: float
     total_input_tokens: int
     total_output_tokens: int
     calls_count: int
+    cache_hits: int
+
+
+class PipelineStats(TypedDict):
+    """Per-stage throughput of a pipelined ingestion.
+
+    Attributes:
+        objects: Number of objects submitted.
+        inserted: Number of objects inserted.
+        failed: Number of objects still failing after all retries.
+        retries: Number of insert_many retries performed.
+        embed_seconds: Time spent embedding (producer thread).
+        insert_seconds: Time spent in insert_many (consumer).
+        wall_seconds: Total elapsed time.
+        embed_per_second: Embedding throughput (objects/s of embed time).
+        insert_per_second: Insertion throughput (objects/s of insert time).
+        overall_per_second: End-to-end throughput (objects/s of wall time).
+    """
+
+    objects: int
+    inserted: int
+    failed: int
+    retries: int
+    embed_seconds: float
+    insert_seconds: float
+    wall_seconds: float
+    embed_per_second: float
+    insert_per_second: float
+    overall_per_second: float
 
 
 class WeaviateIngestResult(TypedDict, total=False):
@@ -850,6 +881,8 @@ class WeaviateIngestResult(TypedDict, total=False):
         author: Author of the ingested work.
         work_uuid: UUID of created Work object (if any).
         all_objects: Complete list of all inserted ChunkObjects.
+        failed: Number of chunks not inserted after all retries.
+        throughput: Per-stage counts and timings of the embed/insert pipeline.
 
     Note:
         The inserted and all_objects fields use Any to accommodate
@@ -865,6 +898,8 @@ class WeaviateIngestResult(TypedDict, total=False):
     author: str
     work_uuid: Optional[str]
     all_objects: List[Any]  # List[ChunkObject] from weaviate_ingest
+    failed: int
+    throughput: PipelineStats
 
 
 # Type alias for backward compatibility
@@ -1005,6 +1040,7 @@ class V2PipelineResult(TypedDict, total=False):
         chunks_count: Number of chunks
         validation: Validation result
         weaviate_ingest: Weaviate ingestion result
+        steps: "cached" or "computed" for each checkpointed step
         pipeline_version: Always "2.0"
         error: Error message if failed
     """
@@ -1023,6 +1059,7 @@ class V2PipelineResult(TypedDict, total=False):
     chunks_count: int
     validation: Optional[ValidationResult]
     weaviate_ingest: Optional[WeaviateIngestResult]
+    steps: Dict[str, str]
     pipeline_version: str
     error: str
 
@@ -1054,6 +1091,30 @@ class CollectionStats(TypedDict, total=False):
     language_list: List[str]
 
 
+class CorpusWorkEntry(TypedDict, total=False):
+    """Per-work entry of the materialized corpus catalog.
+
+    Attributes:
+        source_id: Document identifier (None for works only known from chunks)
+        title: Work title (same priority as Chunk.workTitle)
+        author: Work author
+        edition: Edition identifier
+        pages: Page count of the source document
+        chunks_count: Number of chunks in Weaviate
+        summaries_count: Number of summaries in Weaviate
+        languages: Chunk count per language code
+    """
+
+    source_id: Optional[str]
+    title: str
+    author: str
+    edition: str
+    pages: int
+    chunks_count: int
+    summaries_count: int
+    languages: Dict[str, int]
+
+
 class PassageResult(TypedDict, total=False):
     """Single passage/chunk result with metadata.
 
@@ -18,8 +18,16 @@ Architecture:
 
 Batch Operations:
     The module uses Weaviate insert_many() for efficient batch insertion.
-    Chunks are prepared as a list and inserted in a single operation,
-    which is significantly faster than individual insertions.
+    Embedding and insertion run as a pipeline (``insert_with_pipeline``):
+    the GPU embeds batch k+1 while Weaviate inserts batch k, only a few
+    embedded batches are held in memory, and failed batches are retried
+    with exponential backoff. Per-stage throughput is logged and returned
+    in the ingestion result.
+
+Corpus Catalog:
+    Inserted and deleted chunk/summary counts are recorded in the
+    materialized corpus catalog (``utils.corpus_catalog``), so the web
+    pages can show per-work statistics without scanning the collections.
 
 Nested Objects:
     Each Chunk contains nested work and document objects::
@@ -62,31 +70,38 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Generator, List, Optional, TypedDict
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, TypedDict, Union
 
 import weaviate
 from weaviate import WeaviateClient
 from weaviate.collections import Collection
 import weaviate.classes.query as wvq
 import weaviate.classes.data as wvd
+from weaviate.util import generate_uuid5
 
 # GPU embedder for manual vectorization
 import sys
 from pathlib import Path
-import numpy as np
 
 # Add project root to path for memory module access
 # From generations/library_rag/utils/ -> need 4 parents to reach root
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from memory.core import get_embedder, GPUEmbeddingService
+from memory.core.weaviate_pool import get_weaviate_pool
 
 # Import type definitions from central types module
-from utils.types import WeaviateIngestResult as IngestResult
+from utils.types import PipelineStats, WeaviateIngestResult as IngestResult
 
 # Import TOC enrichment functions
 from .toc_enricher import enrich_chunks_with_toc
+from .corpus_catalog import CorpusCatalog, get_corpus_catalog
+from .pipeline_checkpoint import CHECKPOINT_DIRNAME, StepCheckpoints
 
 
 # =============================================================================
@@ -205,51 +220,250 @@ class DeleteResult(TypedDict, total=False):
 
 
 # =============================================================================
-# GPU Vectorization Functions
+# Pipelined Embedding + Insertion
 # =============================================================================
 
+# Embedded batches waiting for insertion (bounds memory to a few batches)
+PIPELINE_QUEUE_DEPTH: int = int(os.getenv("INGEST_PIPELINE_DEPTH", "2"))
 
-def vectorize_chunks_batch(
-    chunks: List[ChunkObject],
-    embedder: GPUEmbeddingService,
-) -> np.ndarray:
-    """Generate vectors for chunks using GPU embedder.
+# Retries for a failed insert_many batch (backoff 1s, 2s, 4s...)
+INSERT_MAX_RETRIES: int = int(os.getenv("INGEST_INSERT_RETRIES", "3"))
+INSERT_BACKOFF_SECONDS: float = 1.0
+
+# Default pipeline output directory (same as the Flask UPLOAD_FOLDER)
+DEFAULT_OUTPUT_DIR: Path = Path(__file__).resolve().parent.parent / "output"
 
-    Uses BAAI/bge-m3 model (1024 dimensions) on GPU to pre-compute vectors
-    for batch insertion. This replaces Weaviate's auto-vectorization for
-    10-20x faster ingestion performance.
+# uuids per aggregate filter when counting ingested objects
+COUNT_ID_BATCH: int = 500
+
+
+def object_uuid(doc_name: str, kind: str, index: int) -> str:
+    """Deterministic uuid of the ``index``-th object of a document.
 
     Args:
-        chunks: List of ChunkObject dicts, each containing 'text' field
-        embedder: GPU embedding service instance from memory.core
+        doc_name: Document identifier (sourceId).
+        kind: Object kind ("chunks", "summaries").
+        index: Position of the object in the ingested list.
 
     Returns:
-        numpy array of shape (len(chunks), 1024) with embedding vectors
+        uuid5 string, identical across runs.
+    """
+    return generate_uuid5(f"{doc_name}:{kind}:{index}")
 
-    Example:
-        >>> from memory.core import get_embedder
-        >>> embedder = get_embedder()
-        >>> chunks = [{"text": "Test 1"}, {"text": "Test 2"}]
-        >>> vectors = vectorize_chunks_batch(chunks, embedder)
-        >>> vectors.shape
-        (2, 1024)
 
-    Note:
-        Empty or whitespace-only texts will still generate vectors (zero
-        vectors), but such chunks should be filtered before calling this
-        function to avoid wasting GPU compute.
+def _insert_batch_with_retry(
+    collection: Collection[Any, Any],
+    data_objects: List[wvd.DataObject],
+    label: str,
+) -> tuple[int, int, int]:
+    """Insert one batch, retrying failed objects with exponential backoff.
+
+    Only the objects reported in ``errors`` (or the whole batch if the
+    request itself failed) are sent again. Objects carry deterministic
+    uuids (see ``insert_with_pipeline``) and ``insert_many`` overwrites an
+    existing uuid, so resending a batch that was committed server-side
+    before a client timeout does not insert it twice.
+
+    Returns:
+        Tuple (inserted, failed, retries).
     """
-    # Extract texts for vectorization
-    texts = [chunk.get("text", "") for chunk in chunks]
-
-    # Generate vectors in optimal batches (48 for RTX 4070)
-    vectors = embedder.embed_batch(
-        texts,
-        batch_size=embedder.optimal_batch_size,
-        show_progress=False,
+    pending = data_objects
+    inserted = 0
+    failed = 0
+    retries = 0
+
+    for attempt in range(INSERT_MAX_RETRIES + 1):
+        if attempt:
+            retries += 1
+            time.sleep(INSERT_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        try:
+            response = collection.data.insert_many(objects=pending)
+        except Exception as e:
+            logger.warning(f"  {label}: insert_many failed (attempt {attempt + 1}): {e}")
+            continue
+
+        errors = response.errors or {}
+        inserted += len(pending) - len(errors)
+        if not errors:
+            return inserted, failed, retries
+
+        first_error = next(iter(errors.values()))
+        logger.warning(
+            f"  {label}: {len(errors)}/{len(pending)} objects failed "
+            f"(attempt {attempt + 1}): {getattr(first_error, 'message', first_error)}"
+        )
+        pending = [pending[i] for i in sorted(errors)]
+
+    logger.error(f"  {label}: {len(pending)} objects not inserted after {INSERT_MAX_RETRIES} retries")
+    return inserted, failed + len(pending), retries
+
+
+def delete_stale_objects(
+    collection: Collection[Any, Any],
+    doc_name: str,
+    kind: str,
+    start: int,
+) -> int:
+    """Delete the objects of a document at indices ``start`` and beyond.
+
+    Re-ingesting a document overwrites its objects 0..n-1 in place (same
+    deterministic uuids), but a previous, longer ingestion may have left
+    objects at higher indices. Indices are contiguous, so deletion stops at
+    the first uuid range with no object.
+
+    Args:
+        collection: Collection holding the objects (Chunk or Summary).
+        doc_name: Document identifier (sourceId).
+        kind: Object kind used for the uuids.
+        start: First index to delete (number of objects about to be inserted).
+
+    Returns:
+        Number of objects deleted.
+    """
+    deleted: int = 0
+    while True:
+        ids = [object_uuid(doc_name, kind, i) for i in range(start, start + COUNT_ID_BATCH)]
+        result = collection.data.delete_many(where=wvq.Filter.by_id().contains_any(ids))
+        if not result.successful:
+            break
+        deleted += result.successful
+        start += COUNT_ID_BATCH
+    if deleted:
+        logger.info(f"  {deleted} stale {kind} of a previous ingestion of {doc_name} deleted")
+    return deleted
+
+
+def insert_with_pipeline(
+    collection: Collection[Any, Any],
+    objects: List[Any],
+    embedder: GPUEmbeddingService,
+    batch_size: int,
+    doc_name: str,
+    kind: str = "objects",
+) -> PipelineStats:
+    """Embed and insert objects as a producer/consumer pipeline.
+
+    A producer thread embeds batch k+1 on the GPU while the calling thread
+    inserts batch k into Weaviate. At most ``PIPELINE_QUEUE_DEPTH`` embedded
+    batches wait in the queue, so memory stays bounded to a few batches
+    instead of the whole (N x 1024) matrix. Failed batches are retried with
+    exponential backoff (see ``_insert_batch_with_retry``).
+
+    Each object gets a deterministic uuid derived from the document name,
+    the object kind and its index, so retried batches are idempotent and a
+    re-ingestion overwrites the previous objects. Objects of a previous,
+    longer ingestion beyond ``len(objects)`` are deleted first (see
+    ``delete_stale_objects``).
+
+    Args:
+        collection: Target Weaviate collection (Chunk or Summary).
+        objects: Property dicts to insert; each needs a "text" field.
+        embedder: Embedding service used for the vectors.
+        batch_size: Objects per embed/insert batch.
+        doc_name: Document identifier (sourceId), seed of the object uuids.
+        kind: Object kind for log messages and uuids ("chunks", "summaries").
+
+    Returns:
+        PipelineStats with counts and per-stage throughput.
+
+    Raises:
+        Exception: Re-raises embedding errors from the producer thread.
+    """
+    delete_stale_objects(collection, doc_name, kind, len(objects))
+
+    total_batches = (len(objects) + batch_size - 1) // batch_size
+    # (batch start, objects, vectors), the producer's error, or None when done
+    batches: queue.Queue[Optional[Union[Tuple[int, List[Any], Any], Exception]]] = queue.Queue(
+        maxsize=max(1, PIPELINE_QUEUE_DEPTH)
     )
+    stop = threading.Event()
+    embed_seconds = 0.0
+
+    def produce() -> None:
+        nonlocal embed_seconds
+        try:
+            for batch_start in range(0, len(objects), batch_size):
+                if stop.is_set():
+                    return
+                batch = objects[batch_start:batch_start + batch_size]
+                started = time.perf_counter()
+                vectors = embedder.embed_batch(
+                    [obj.get("text", "") for obj in batch],
+                    batch_size=embedder.optimal_batch_size,
+                    show_progress=False,
+                )
+                embed_seconds += time.perf_counter() - started
+                batches.put((batch_start, batch, vectors))
+        except Exception as e:
+            batches.put(e)
+            return
+        batches.put(None)
 
-    return vectors  # Returns np.ndarray shape (len(texts), 1024)
+    wall_start = time.perf_counter()
+    producer = threading.Thread(target=produce, name=f"embed-{kind}", daemon=True)
+    producer.start()
+
+    inserted = failed = retries = 0
+    insert_seconds = 0.0
+    batch_number = 0
+
+    try:
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+
+            batch_start, batch, vectors = item
+            batch_number += 1
+            data_objects = [
+                wvd.DataObject(
+                    properties=obj,
+                    vector=vector,
+                    uuid=object_uuid(doc_name, kind, batch_start + offset),
+                )
+                for offset, (obj, vector) in enumerate(zip(batch, vectors))
+            ]
+
+            started = time.perf_counter()
+            ok, ko, retried = _insert_batch_with_retry(
+                collection, data_objects, f"Batch {batch_number}/{total_batches}"
+            )
+            insert_seconds += time.perf_counter() - started
+            inserted += ok
+            failed += ko
+            retries += retried
+            logger.info(f"  Batch {batch_number}/{total_batches}: Inserted {ok} {kind} ({inserted}/{len(objects)})")
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting on a full queue
+        while producer.is_alive():
+            try:
+                batches.get_nowait()
+            except queue.Empty:
+                producer.join(timeout=0.1)
+
+    wall_seconds = time.perf_counter() - wall_start
+
+    stats = PipelineStats(
+        objects=len(objects),
+        inserted=inserted,
+        failed=failed,
+        retries=retries,
+        embed_seconds=round(embed_seconds, 3),
+        insert_seconds=round(insert_seconds, 3),
+        wall_seconds=round(wall_seconds, 3),
+        embed_per_second=round(len(objects) / embed_seconds, 1) if embed_seconds else 0.0,
+        insert_per_second=round(inserted / insert_seconds, 1) if insert_seconds else 0.0,
+        overall_per_second=round(inserted / wall_seconds, 1) if wall_seconds else 0.0,
+    )
+    logger.info(
+        f"Pipeline {kind}: {inserted}/{len(objects)} inserted in {stats['wall_seconds']:.1f}s "
+        f"(embed {stats['embed_per_second']}/s, insert {stats['insert_per_second']}/s, "
+        f"overall {stats['overall_per_second']}/s, {retries} retries, {failed} failed)"
+    )
+    return stats
 
 
 # =============================================================================
@@ -597,23 +811,15 @@ def get_weaviate_client() -> Generator[Optional[WeaviateClient], None, None]:
         ...         print("Connection failed")
 
     Note:
-        Connects to localhost:8080 (HTTP) and localhost:50051 (gRPC).
+        Borrows a pooled client connected to localhost:8080 (HTTP) and
+        localhost:50051 (gRPC); ``close()`` returns it to the pool.
         Ensure Weaviate is running via docker-compose up -d.
     """
     client: Optional[WeaviateClient] = None
     try:
-        # Increased timeout for long text vectorization (e.g., Peirce CP 3.403, CP 8.388, Menon chunk 10)
-        # Default is 60s, increased to 600s (10 minutes) for exceptionally large texts
-        from weaviate.classes.init import AdditionalConfig, Timeout
-
-        client = weaviate.connect_to_local(
-            host="localhost",
-            port=8080,
-            grpc_port=50051,
-            additional_config=AdditionalConfig(
-                timeout=Timeout(init=30, query=600, insert=600)  # 10 min for insert/query
-            )
-        )
+        # Long-lived client from the shared pool (insert timeout 600s for
+        # exceptionally large texts, see memory.core.weaviate_pool)
+        client = get_weaviate_pool().acquire()
         yield client
     except Exception as e:
         logger.error(f"Erreur connexion Weaviate: {e}")
@@ -623,6 +829,23 @@ def get_weaviate_client() -> Generator[Optional[WeaviateClient], None, None]:
             client.close()
 
 
+def _update_catalog(update: Callable[[CorpusCatalog], None]) -> None:
+    """Apply an incremental update to the corpus catalog.
+
+    Catalog errors never fail an ingestion: the catalog is invalidated
+    instead, so the next read rebuilds it from Weaviate.
+    """
+    catalog = get_corpus_catalog()
+    try:
+        update(catalog)
+    except Exception as e:
+        logger.warning(f"Mise à jour du catalogue corpus impossible, reconstruction au prochain accès: {e}")
+        try:
+            catalog.invalidate()
+        except Exception:
+            pass
+
+
 def create_or_get_work(
     client: WeaviateClient,
     doc_name: str,
@@ -759,26 +982,8 @@ def ingest_summaries(
     if not summaries_to_insert:
         return 0
 
-    # =================================================================
-    # GPU Vectorization for Summaries (Manual Pre-Computation)
-    # =================================================================
-    # Initialize GPU embedder
-    logger.info("Initializing GPU embedder for summary vectorization...")
-    embedder = get_embedder()
-
-    # Pre-vectorize all summaries
-    logger.info(f"Generating vectors for {len(summaries_to_insert)} summaries...")
-    summary_texts = [s.get("text", "") for s in summaries_to_insert]
-    summary_vectors = embedder.embed_batch(
-        summary_texts,
-        batch_size=embedder.optimal_batch_size,
-        show_progress=False,
-    )
-    logger.info(f"Summary vectorization complete: {summary_vectors.shape[0]} vectors")
-
     # Calculer dynamiquement la taille de batch optimale pour summaries
     batch_size: int = calculate_batch_size_summaries(summaries_to_insert)
-    total_inserted = 0
 
     try:
         # Log batch size avec longueur moyenne
@@ -789,32 +994,16 @@ def ingest_summaries(
         )
 
         # =================================================================
-        # Batch Insertion with Manual Vectors
+        # Pipelined GPU Vectorization + Batch Insertion
         # =================================================================
-        for batch_start in range(0, len(summaries_to_insert), batch_size):
-            batch_end = min(batch_start + batch_size, len(summaries_to_insert))
-            batch = summaries_to_insert[batch_start:batch_end]
-            batch_vectors = summary_vectors[batch_start:batch_end]
-
-            # Create DataObject list with manual vectors
-            data_objects = []
-            for i, summary in enumerate(batch):
-                data_objects.append(
-                    wvd.DataObject(
-                        properties=summary,
-                        vector=batch_vectors[i].tolist(),  # Convert numpy array to list
-                    )
-                )
-
-            try:
-                summary_collection.data.insert_many(objects=data_objects)
-                total_inserted += len(batch)
-                logger.info(f"  Batch {batch_start//batch_size + 1}: Inserted {len(batch)} summaries ({total_inserted}/{len(summaries_to_insert)})")
-            except Exception as batch_error:
-                logger.warning(f"  Batch {batch_start//batch_size + 1} failed: {batch_error}")
-                continue
+        embedder = get_embedder()
+        stats = insert_with_pipeline(
+            summary_collection, summaries_to_insert, embedder, batch_size, doc_name, kind="summaries"
+        )
+        total_inserted = stats["inserted"]
 
         logger.info(f"{total_inserted} résumés ingérés pour {doc_name}")
+        _update_catalog(lambda catalog: catalog.record_summaries(doc_name, total_inserted))
         return total_inserted
     except Exception as e:
         logger.warning(f"Erreur ingestion résumés: {e}")
@@ -1003,22 +1192,8 @@ def ingest_document(
                     count=0,
                 )
 
-            # =================================================================
-            # GPU Vectorization (Manual Pre-Computation)
-            # =================================================================
-            # Initialize GPU embedder for manual vectorization
-            logger.info("Initializing GPU embedder for manual vectorization...")
-            embedder = get_embedder()
-            logger.info(f"GPU embedder ready (model: {embedder.model_name}, batch_size: {embedder.optimal_batch_size})")
-
-            # Pre-vectorize ALL chunks before insertion (10-20x faster than Docker text2vec)
-            logger.info(f"Generating vectors for {len(objects_to_insert)} chunks...")
-            all_vectors = vectorize_chunks_batch(objects_to_insert, embedder)
-            logger.info(f"Vectorization complete: {all_vectors.shape[0]} vectors of {all_vectors.shape[1]} dimensions")
-
             # Calculer dynamiquement la taille de batch optimale
             batch_size: int = calculate_batch_size(objects_to_insert)
-            total_inserted = 0
 
             # Log batch size avec justification
             avg_len: int = sum(len(obj.get("text", "")) for obj in objects_to_insert[:10]) // min(10, len(objects_to_insert))
@@ -1028,31 +1203,15 @@ def ingest_document(
             )
 
             # =================================================================
-            # Batch Insertion with Manual Vectors
+            # Pipelined GPU Vectorization + Batch Insertion
             # =================================================================
-            for batch_start in range(0, len(objects_to_insert), batch_size):
-                batch_end = min(batch_start + batch_size, len(objects_to_insert))
-                batch = objects_to_insert[batch_start:batch_end]
-                batch_vectors = all_vectors[batch_start:batch_end]
-
-                # Create DataObject list with manual vectors
-                data_objects = []
-                for i, chunk in enumerate(batch):
-                    data_objects.append(
-                        wvd.DataObject(
-                            properties=chunk,
-                            vector=batch_vectors[i].tolist(),  # Convert numpy array to list
-                        )
-                    )
-
-                try:
-                    _response = chunk_collection.data.insert_many(objects=data_objects)
-                    total_inserted += len(batch)
-                    logger.info(f"  Batch {batch_start//batch_size + 1}: Inserted {len(batch)} chunks ({total_inserted}/{len(objects_to_insert)})")
-                except Exception as batch_error:
-                    logger.error(f"  Batch {batch_start//batch_size + 1} failed: {batch_error}")
-                    # Continue with next batch instead of failing completely
-                    continue
+            # The GPU embeds batch k+1 while Weaviate inserts batch k
+            embedder = get_embedder()
+            logger.info(f"GPU embedder ready (model: {embedder.model_name}, batch_size: {embedder.optimal_batch_size})")
+            stats = insert_with_pipeline(
+                chunk_collection, objects_to_insert, embedder, batch_size, doc_name, kind="chunks"
+            )
+            total_inserted = stats["inserted"]
 
             # Préparer le résumé des objets insérés
             inserted_summary: List[InsertedChunkSummary] = []
@@ -1069,6 +1228,9 @@ def ingest_document(
                 ))
 
             logger.info(f"Ingestion réussie: {total_inserted} chunks insérés pour {doc_name}")
+            _update_catalog(lambda catalog: catalog.record_chunks(
+                doc_name, title, author, language, total_inserted, pages, edition
+            ))
 
             return IngestResult(
                 success=True,
@@ -1078,6 +1240,8 @@ def ingest_document(
                 author=author,
                 work_uuid=work_uuid,
                 all_objects=objects_to_insert,
+                failed=stats["failed"],
+                throughput=stats,
             )
 
     except Exception as e:
@@ -1089,7 +1253,60 @@ def ingest_document(
         )
 
 
-def delete_document_chunks(doc_name: str) -> DeleteResult:
+def count_ingested_objects(
+    doc_name: str,
+    nb_objects: int,
+    kind: str = "chunks",
+    collection_name: str = "Chunk",
+) -> Optional[int]:
+    """Count the objects of a document still present in Weaviate.
+
+    Looks up the deterministic uuids of the ``nb_objects`` objects
+    ingested by ``insert_with_pipeline`` (see ``object_uuid``), so objects
+    removed by a deletion, a wipe or a restore are not counted.
+
+    Args:
+        doc_name: Document identifier (sourceId).
+        nb_objects: Number of objects submitted at ingestion.
+        kind: Object kind used for the uuids.
+        collection_name: Collection holding the objects.
+
+    Returns:
+        Number of objects found, or None if Weaviate could not be queried.
+    """
+    try:
+        with get_weaviate_client() as client:
+            if client is None:
+                return None
+            collection: Collection[Any, Any] = client.collections.get(collection_name)
+            present: int = 0
+            for start in range(0, nb_objects, COUNT_ID_BATCH):
+                ids = [object_uuid(doc_name, kind, i) for i in range(start, min(start + COUNT_ID_BATCH, nb_objects))]
+                response = collection.aggregate.over_all(
+                    filters=wvq.Filter.by_id().contains_any(ids), total_count=True
+                )
+                present += response.total_count or 0
+            return present
+    except Exception as e:
+        logger.warning(f"Comptage des objets de {doc_name} impossible: {e}")
+        return None
+
+
+def clear_ingest_checkpoint(doc_name: str, output_dir: Optional[Path] = None) -> None:
+    """Invalidate the Weaviate ingestion checkpoint of a document.
+
+    Called after deleting a document from Weaviate, so that the next run of
+    ``process_pdf`` ingests it again instead of reporting the old result.
+
+    Args:
+        doc_name: Document identifier (sourceId).
+        output_dir: Pipeline output directory (default: ``DEFAULT_OUTPUT_DIR``).
+    """
+    checkpoint_dir: Path = Path(output_dir or DEFAULT_OUTPUT_DIR) / doc_name / CHECKPOINT_DIRNAME
+    StepCheckpoints(checkpoint_dir).discard("weaviate")
+
+
+def delete_document_chunks(doc_name: str, output_dir: Optional[Path] = None) -> DeleteResult:
     """Delete all data for a document from Weaviate collections.
 
     Removes chunks and summaries from their respective collections.
@@ -1098,8 +1315,13 @@ def delete_document_chunks(doc_name: str) -> DeleteResult:
     This function is useful for re-processing a document after changes
     to the processing pipeline or to clean up test data.
 
+    The Weaviate ingestion checkpoint of the document is cleared too, so
+    re-processing it re-inserts its chunks.
+
     Args:
         doc_name: Document identifier (sourceId) to delete.
+        output_dir: Pipeline output directory holding the checkpoints
+            (default: ``DEFAULT_OUTPUT_DIR``).
 
     Returns:
         DeleteResult dict containing:
@@ -1149,6 +1371,10 @@ def delete_document_chunks(doc_name: str) -> DeleteResult:
                 logger.warning(f"Erreur suppression summaries: {e}")
 
             logger.info(f"Suppression: {deleted_chunks} chunks, {deleted_summaries} summaries pour {doc_name}")
+            clear_ingest_checkpoint(doc_name, output_dir)
+            _update_catalog(lambda catalog: catalog.record_deletion(
+                doc_name, deleted_chunks, deleted_summaries
+            ))
 
             return DeleteResult(
                 success=True,
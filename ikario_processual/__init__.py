@@ -10,14 +10,18 @@ Ce module implémente l'architecture processuelle d'Ikario basée sur:
 Architecture v2 : "L'espace latent pense. Le LLM traduit."
 
 Modules v1 (legacy):
-- state_vector: Vecteur d'état unique 1024-dim
+- state_vector: Vecteur d'état unique 1024-dim (agrégat incrémental)
 - projection_directions: Directions interprétables
+- direction_registry: Registre partagé des directions (matrice D×1024, etag)
 - state_transformation: Transition S(t-1) → S(t)
 - occasion_logger: Logging des occasions
 - occasion_manager: Orchestrateur du cycle
 
 Modules v2 (nouveau):
 - state_tensor: Tenseur d'état 8×1024 (8 dimensions Peirce)
+- state_store: État courant en mémoire, WAL local et persistance par lots
+- state_history: Historique compressé (keyframes + deltas float16)
+- kernels: Similarités vectorisées (état 8×1024, RAG et Pacte empilés)
 - dissonance: Fonction E() avec hard negatives
 - contradiction_detector: Détection NLI (optionnel)
 - fixation: 4 méthodes de Peirce (Tenacity, Authority, A Priori, Science)
@@ -36,6 +40,8 @@ from .state_vector import (
     create_state_vector_collection,
     get_current_state_id,
     get_state_vector,
+    record_new_object,
+    StateAggregator,
 )
 
 from .state_transformation import (
@@ -69,6 +75,7 @@ from .dissonance import (
     DissonanceResult,
     compute_dissonance,
     compute_dissonance_enhanced,
+    compute_dissonance_batch,
     compute_self_dissonance,
     Impact,
     ImpactRepository,
@@ -90,6 +97,18 @@ from .fixation import (
     PHILOSOPHICAL_ANCHORS,
 )
 
+from .state_history import (
+    StateHistoryConfig,
+    StateHistoryStore,
+    get_state_history,
+)
+
+from .state_store import (
+    StateStoreConfig,
+    StateWAL,
+    WriteBehindStateStore,
+)
+
 from .latent_engine import (
     Thought,
     CycleResult,
@@ -98,6 +117,15 @@ from .latent_engine import (
     create_engine,
 )
 
+from .direction_registry import (
+    DirectionRegistryConfig,
+    DirectionSet,
+    DirectionRegistry,
+    RestDirectionSource,
+    ClientDirectionSource,
+    get_direction_registry,
+)
+
 # === V2 Phase 5 ===
 from .state_to_language import (
     ProjectionDirection,
@@ -129,6 +157,7 @@ from .daemon import (
     Trigger,
     VerbalizationEvent,
     TriggerGenerator,
+    CycleScheduler,
     IkarioDaemon,
     create_daemon,
 )
@@ -152,6 +181,8 @@ __all__ = [
     "create_state_vector_collection",
     "get_current_state_id",
     "get_state_vector",
+    "StateAggregator",
+    "record_new_object",
     # state_transformation
     "transform_state",
     "compute_adaptive_params",
@@ -162,6 +193,13 @@ __all__ = [
     # occasion_manager
     "OccasionManager",
     "get_state_profile",
+    # direction_registry
+    "DirectionRegistryConfig",
+    "DirectionSet",
+    "DirectionRegistry",
+    "RestDirectionSource",
+    "ClientDirectionSource",
+    "get_direction_registry",
     # === V2 (nouveau) ===
     # state_tensor
     "StateTensor",
@@ -175,6 +213,7 @@ __all__ = [
     "DissonanceResult",
     "compute_dissonance",
     "compute_dissonance_enhanced",
+    "compute_dissonance_batch",
     "compute_self_dissonance",
     "Impact",
     "ImpactRepository",
@@ -192,6 +231,14 @@ __all__ = [
     "PACTE_ARTICLES",
     "CRITICAL_ARTICLES",
     "PHILOSOPHICAL_ANCHORS",
+    # state_history
+    "StateHistoryConfig",
+    "StateHistoryStore",
+    "get_state_history",
+    # state_store
+    "StateStoreConfig",
+    "StateWAL",
+    "WriteBehindStateStore",
     # latent_engine
     "Thought",
     "CycleResult",
@@ -222,6 +269,7 @@ __all__ = [
     "Trigger",
     "VerbalizationEvent",
     "TriggerGenerator",
+    "CycleScheduler",
     "IkarioDaemon",
     "create_daemon",
     # metrics (Phase 8)
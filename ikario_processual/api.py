@@ -184,6 +184,17 @@ def load_embedding_model():
     if _embedding_model is not None:
         return _embedding_model
 
+    # Serveur d'embedding partagé (un seul bge-m3 chargé pour Flask, MCP et le daemon)
+    server_address = os.getenv("EMBEDDING_SERVER_ADDRESS")
+    if server_address:
+        try:
+            from memory.core.embedding_server import EmbeddingClient
+            _embedding_model = EmbeddingClient(server_address)
+            print(f"[API] Using shared embedding server at {server_address}")
+            return _embedding_model
+        except (ImportError, ConnectionError, OSError) as e:
+            print(f"[API] Embedding server unavailable ({e}), loading model locally")
+
     try:
         from sentence_transformers import SentenceTransformer
         model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-m3")
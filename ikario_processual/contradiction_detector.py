@@ -12,44 +12,113 @@ Le problème avec la détection par seuil de similarité :
 Solution : Utiliser un modèle NLI pré-entraîné.
 - Modèle : facebook/bart-large-mnli (ou cross-encoder/nli-deberta-v3-base)
 - Classes : entailment, neutral, contradiction
+
+Performance :
+- Les paires (prémisse, hypothèse) sont évaluées par lots : une seule passe
+  avant, avec padding, pour une prémisse et toutes ses hypothèses.
+- Cache LRU des scores, indexé par (hash texte1, hash texte2) : les mêmes
+  passages du corpus reviennent d'un cycle à l'autre.
+- Budget par cycle (nombre de paires, temps) pour borner la latence.
+- Backend optionnel ONNX Runtime (optimum) et quantification int8 sur CPU.
+
+Configuration (variables d'environnement) :
+- IKARIO_NLI_BACKEND   : "torch" (défaut) ou "onnx"
+- IKARIO_NLI_QUANTIZE  : "1" pour quantifier en int8 (CPU)
+- IKARIO_NLI_DEVICE    : "cpu" (défaut), "cuda", "cuda:0"...
 """
 
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Any, Dict
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Any, Dict
 import numpy as np
 
-# Lazy import pour éviter de charger le modèle si non utilisé
-_classifier = None
-_model_name = None
+NLI_LABELS = ("entailment", "neutral", "contradiction")
+
+_nli_models: Dict[Tuple[str, str, bool, str], Tuple[Any, Any]] = {}
+_nli_models_lock = threading.Lock()
 
 
-def get_nli_classifier(model_name: str = "facebook/bart-large-mnli"):
+def get_nli_model(
+    model_name: str = "facebook/bart-large-mnli",
+    backend: str = "torch",
+    quantize: bool = False,
+    device: str = "cpu",
+) -> Tuple[Any, Any]:
     """
-    Lazy loader pour le classifieur NLI.
+    Lazy loader (tokenizer, modèle de classification de paires) partagé.
 
-    Utilise transformers pipeline (zero-shot classification).
+    Args:
+        model_name: Modèle NLI HuggingFace
+        backend: "torch" ou "onnx" (optimum + onnxruntime, CPU)
+        quantize: Quantification dynamique int8 (CPU)
+        device: Device torch
+
+    Returns:
+        (tokenizer, model)
     """
-    global _classifier, _model_name
+    key = (model_name, backend, quantize, device)
+    with _nli_models_lock:
+        if key in _nli_models:
+            return _nli_models[key]
+
+        try:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+            if backend == "onnx":
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                model = ORTModelForSequenceClassification.from_pretrained(
+                    model_name, export=True
+                )
+                if quantize:
+                    model = _quantize_onnx(model, model_name)
+            else:
+                import torch
+                from transformers import AutoModelForSequenceClassification
+                model = AutoModelForSequenceClassification.from_pretrained(model_name)
+                model.eval()
+                if quantize:
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                else:
+                    model.to(device)
+        except ImportError:
+            raise ImportError(
+                "transformers non installé (ou optimum[onnxruntime] pour le backend onnx). "
+                "Installez avec: pip install transformers torch"
+            )
+        except Exception as e:
+            raise RuntimeError(f"Erreur chargement modèle NLI: {e}")
 
-    if _classifier is not None and _model_name == model_name:
-        return _classifier
+        _nli_models[key] = (tokenizer, model)
+        return tokenizer, model
 
-    try:
-        from transformers import pipeline
-        _classifier = pipeline(
-            "zero-shot-classification",
-            model=model_name,
-            device=-1  # CPU, utiliser 0 pour GPU
-        )
-        _model_name = model_name
-        return _classifier
-    except ImportError:
-        raise ImportError(
-            "transformers non installé. "
-            "Installez avec: pip install transformers torch"
+
+def _quantize_onnx(model: Any, model_name: str) -> Any:
+    """Quantification dynamique int8 d'un modèle ONNX (cache sur disque)."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    save_dir = Path.home() / ".ikario" / "nli_onnx_int8" / model_name.replace("/", "__")
+    if not (save_dir / "model_quantized.onnx").exists():
+        quantizer = ORTQuantizer.from_pretrained(model)
+        quantizer.quantize(
+            save_dir=save_dir,
+            quantization_config=AutoQuantizationConfig.avx2(is_static=False),
         )
-    except Exception as e:
-        raise RuntimeError(f"Erreur chargement modèle NLI: {e}")
+    return ORTModelForSequenceClassification.from_pretrained(
+        save_dir, file_name="model_quantized.onnx"
+    )
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
 
 @dataclass
@@ -72,31 +141,172 @@ class ContradictionDetector:
         detector = ContradictionDetector()
         result = detector.detect("L'IA a une conscience", "L'IA n'a pas de conscience")
         print(result.is_contradiction)  # True
+
+        # Une prémisse, plusieurs hypothèses : une seule passe avant
+        results = detector.detect_batch(premise, hypotheses)
     """
 
     def __init__(
         self,
         model_name: str = "facebook/bart-large-mnli",
         contradiction_threshold: float = 0.5,
-        lazy_load: bool = True
+        lazy_load: bool = True,
+        backend: Optional[str] = None,
+        quantize: Optional[bool] = None,
+        device: Optional[str] = None,
+        batch_size: int = 16,
+        max_length: int = 256,
+        cache_size: int = 4096,
     ):
         """
         Args:
             model_name: Nom du modèle HuggingFace NLI
             contradiction_threshold: Seuil pour déclarer contradiction
             lazy_load: Si True, charge le modèle à la première utilisation
+            backend: "torch" ou "onnx" (défaut: IKARIO_NLI_BACKEND ou "torch")
+            quantize: int8 sur CPU (défaut: IKARIO_NLI_QUANTIZE)
+            device: Device torch (défaut: IKARIO_NLI_DEVICE ou "cpu")
+            batch_size: Paires par passe avant
+            max_length: Longueur max (tokens) d'une paire
+            cache_size: Nombre de paires gardées dans le cache LRU
         """
         self.model_name = model_name
         self.contradiction_threshold = contradiction_threshold
-        self._classifier = None
+        self.backend = backend or os.getenv("IKARIO_NLI_BACKEND", "torch")
+        self.quantize = quantize if quantize is not None else os.getenv("IKARIO_NLI_QUANTIZE") == "1"
+        self.device = device or os.getenv("IKARIO_NLI_DEVICE", "cpu")
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache_size = cache_size
+
+        self._tokenizer = None
+        self._model = None
+        self._label_index: Dict[str, int] = {}
+
+        # Cache LRU : (hash texte1, hash texte2) → probas (entailment, neutral, contradiction)
+        self._cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.forward_passes = 0
 
         if not lazy_load:
             self._load_model()
 
     def _load_model(self):
         """Charge le modèle NLI."""
-        if self._classifier is None:
-            self._classifier = get_nli_classifier(self.model_name)
+        if self._model is None:
+            self._tokenizer, self._model = get_nli_model(
+                self.model_name, self.backend, self.quantize, self.device
+            )
+            id2label = {int(i): str(label).lower() for i, label in self._model.config.id2label.items()}
+            for label in NLI_LABELS:
+                matches = [i for i, name in id2label.items() if name.startswith(label[:6])]
+                if not matches:
+                    raise RuntimeError(f"Label NLI introuvable dans {self.model_name}: {label}")
+                self._label_index[label] = matches[0]
+
+    def _predict(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """
+        Une passe avant pour un lot de paires (padding au plus long).
+
+        Returns:
+            Probabilités (n, 3) dans l'ordre NLI_LABELS
+        """
+        self._load_model()
+        inputs = self._tokenizer(
+            [p for p, _ in pairs], [h for _, h in pairs],
+            padding=True, truncation=True, max_length=self.max_length, return_tensors="pt",
+        )
+
+        if self.backend == "onnx":
+            logits = self._model(**inputs).logits.detach().cpu().numpy()
+        else:
+            import torch
+            if not self.quantize:
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.inference_mode():
+                logits = self._model(**inputs).logits.float().cpu().numpy()
+
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs[:, [self._label_index[label] for label in NLI_LABELS]]
+
+    def score_pairs(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        max_new_pairs: Optional[int] = None,
+        budget_ms: Optional[float] = None,
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Probabilités NLI de plusieurs paires, avec cache et budget.
+
+        Les paires en cache sont gratuites. Les autres sont évaluées par
+        lots de batch_size, dans l'ordre de priorité de l'appelant, tant que
+        le budget le permet (triées par longueur à l'intérieur d'un lot
+        pour limiter le padding).
+
+        Args:
+            pairs: Paires (prémisse, hypothèse)
+            max_new_pairs: Nombre max de paires non cachées à évaluer
+            budget_ms: Temps max consacré aux passes avant
+
+        Returns:
+            Probabilités (entailment, neutral, contradiction) par paire,
+            None pour les paires hors budget
+        """
+        keys = [(_text_hash(p), _text_hash(h)) for p, h in pairs]
+        results: List[Optional[np.ndarray]] = [None] * len(pairs)
+
+        missing: Dict[Tuple[str, str], List[int]] = {}
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[i] = cached
+                    self.cache_hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        todo = list(missing.items())
+        if max_new_pairs is not None:
+            todo = todo[:max(max_new_pairs, 0)]
+
+        start = time.perf_counter()
+        for offset in range(0, len(todo), self.batch_size):
+            if budget_ms is not None and offset and (time.perf_counter() - start) * 1000 > budget_ms:
+                break
+            chunk = sorted(
+                todo[offset:offset + self.batch_size],
+                key=lambda item: len(pairs[item[1][0]][0]) + len(pairs[item[1][0]][1]),
+            )
+            probs = self._predict([pairs[indices[0]] for _, indices in chunk])
+            self.forward_passes += 1
+
+            with self._cache_lock:
+                for (key, indices), row in zip(chunk, probs):
+                    self.cache_misses += 1
+                    self._cache[key] = row
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                    for i in indices:
+                        results[i] = row
+
+        return results
+
+    def _to_result(self, text1: str, text2: str, probs: np.ndarray) -> ContradictionResult:
+        entailment, neutral, contradiction = (float(x) for x in probs)
+        return ContradictionResult(
+            is_contradiction=contradiction > self.contradiction_threshold,
+            confidence=contradiction,
+            entailment_score=entailment,
+            neutral_score=neutral,
+            contradiction_score=contradiction,
+            text1=text1[:200],
+            text2=text2[:200],
+        )
 
     def detect_contradiction(
         self,
@@ -113,29 +323,26 @@ class ContradictionDetector:
         Returns:
             (is_contradiction, confidence_score)
         """
-        self._load_model()
-
-        # Construire l'entrée pour NLI
-        # Format: "premise" + " " + "hypothesis"
-        # Le classifieur évalue si hypothesis est impliqué/neutre/contredit par premise
-
-        result = self._classifier(
-            premise,
-            candidate_labels=["entailment", "neutral", "contradiction"],
-            hypothesis_template="{}",  # hypothesis brut
-            multi_label=False
-        )
-
-        # Extraire les scores
-        labels = result['labels']
-        scores = result['scores']
-
-        score_dict = dict(zip(labels, scores))
-        contradiction_score = score_dict.get('contradiction', 0.0)
+        contradiction_score = float(self.score_pairs([(premise, hypothesis)])[0][2])
+        return (contradiction_score > self.contradiction_threshold, contradiction_score)
 
-        is_contradiction = contradiction_score > self.contradiction_threshold
+    def detect_contradictions(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        max_new_pairs: Optional[int] = None,
+        budget_ms: Optional[float] = None,
+    ) -> List[Optional[Tuple[bool, float]]]:
+        """
+        Version par lots de detect_contradiction, avec budget.
 
-        return (is_contradiction, contradiction_score)
+        Returns:
+            (is_contradiction, confidence_score) par paire, None si hors budget
+        """
+        return [
+            None if probs is None
+            else (float(probs[2]) > self.contradiction_threshold, float(probs[2]))
+            for probs in self.score_pairs(pairs, max_new_pairs, budget_ms)
+        ]
 
     def detect(self, text1: str, text2: str) -> ContradictionResult:
         """
@@ -148,29 +355,7 @@ class ContradictionDetector:
         Returns:
             ContradictionResult avec tous les détails
         """
-        self._load_model()
-
-        result = self._classifier(
-            text1,
-            candidate_labels=["entailment", "neutral", "contradiction"],
-            hypothesis_template="{}",
-        )
-
-        labels = result['labels']
-        scores = result['scores']
-        score_dict = dict(zip(labels, scores))
-
-        contradiction_score = score_dict.get('contradiction', 0.0)
-
-        return ContradictionResult(
-            is_contradiction=contradiction_score > self.contradiction_threshold,
-            confidence=contradiction_score,
-            entailment_score=score_dict.get('entailment', 0.0),
-            neutral_score=score_dict.get('neutral', 0.0),
-            contradiction_score=contradiction_score,
-            text1=text1[:200],
-            text2=text2[:200],
-        )
+        return self._to_result(text1, text2, self.score_pairs([(text1, text2)])[0])
 
     def detect_batch(
         self,
@@ -178,7 +363,7 @@ class ContradictionDetector:
         hypotheses: List[str]
     ) -> List[ContradictionResult]:
         """
-        Détecte les contradictions pour plusieurs hypothèses.
+        Détecte les contradictions pour plusieurs hypothèses (une passe par lot).
 
         Args:
             premise: Texte de référence
@@ -187,7 +372,21 @@ class ContradictionDetector:
         Returns:
             Liste de ContradictionResult
         """
-        return [self.detect(premise, h) for h in hypotheses]
+        scores = self.score_pairs([(premise, h) for h in hypotheses])
+        return [self._to_result(premise, h, probs) for h, probs in zip(hypotheses, scores)]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache et des passes avant."""
+        with self._cache_lock:
+            size = len(self._cache)
+        total = self.cache_hits + self.cache_misses
+        return {
+            'size': size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+            'forward_passes': self.forward_passes,
+        }
 
 
 class HybridContradictionDetector:
@@ -200,6 +399,10 @@ class HybridContradictionDetector:
     1. Si similarité < 0.1 → hard negative certain
     2. Si similarité > 0.7 → probablement OK (sauf si NLI dit contradiction)
     3. Si 0.1 <= similarité <= 0.7 → utiliser NLI pour trancher
+
+    detect_many() évalue tous les candidats d'un cycle en un lot NLI,
+    dans la limite du budget (max_nli_pairs, nli_budget_ms). Les candidats
+    hors budget retombent sur la règle cosine.
     """
 
     def __init__(
@@ -207,7 +410,9 @@ class HybridContradictionDetector:
         nli_detector: Optional[ContradictionDetector] = None,
         low_sim_threshold: float = 0.1,
         high_sim_threshold: float = 0.7,
-        nli_threshold: float = 0.5
+        nli_threshold: float = 0.5,
+        max_nli_pairs: Optional[int] = 16,
+        nli_budget_ms: Optional[float] = None,
     ):
         """
         Args:
@@ -215,11 +420,15 @@ class HybridContradictionDetector:
             low_sim_threshold: En dessous = contradiction certaine
             high_sim_threshold: Au dessus = vérifier avec NLI seulement si score > 0.8
             nli_threshold: Seuil NLI pour contradiction
+            max_nli_pairs: Paires non cachées évaluées par cycle (None = illimité)
+            nli_budget_ms: Temps NLI max par cycle (None = illimité)
         """
         self.nli_detector = nli_detector
         self.low_sim_threshold = low_sim_threshold
         self.high_sim_threshold = high_sim_threshold
         self.nli_threshold = nli_threshold
+        self.max_nli_pairs = max_nli_pairs
+        self.nli_budget_ms = nli_budget_ms
 
     def _get_nli_detector(self) -> ContradictionDetector:
         """Lazy load du détecteur NLI."""
@@ -248,58 +457,98 @@ class HybridContradictionDetector:
         Returns:
             Dict avec is_hard_negative, similarity, nli_score, method
         """
-        # Étape 1 : Similarité cosine
-        norm1 = np.linalg.norm(input_vector)
-        norm2 = np.linalg.norm(candidate_vector)
+        return self.detect_many(
+            input_text, input_vector, [(candidate_text, candidate_vector)]
+        )[0]
 
-        if norm1 == 0 or norm2 == 0:
-            similarity = 0.0
-        else:
-            similarity = float(np.dot(input_vector, candidate_vector) / (norm1 * norm2))
+    def detect_many(
+        self,
+        input_text: str,
+        input_vector: np.ndarray,
+        candidates: List[Tuple[str, np.ndarray]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Détecte les contradictions entre l'entrée et tous les candidats d'un cycle.
 
-        result = {
-            'similarity': similarity,
-            'is_hard_negative': False,
-            'nli_score': None,
-            'method': 'cosine_only',
-        }
+        Similarités cosine calculées en un produit matriciel ; les candidats
+        à vérifier par NLI sont évalués en un seul lot (zone grise d'abord).
 
-        # Étape 2 : Décision basée sur similarité
-        if similarity < self.low_sim_threshold:
-            # Très différent → hard negative certain
-            result['is_hard_negative'] = True
-            result['method'] = 'low_similarity'
-            return result
-
-        if similarity > self.high_sim_threshold:
-            # Très similaire → probablement pas contradiction
-            # Mais on peut quand même vérifier avec NLI si les textes sont fournis
-            if input_text and candidate_text:
-                nli = self._get_nli_detector()
-                is_contradiction, score = nli.detect_contradiction(
-                    input_text, candidate_text
-                )
-                result['nli_score'] = score
-                if is_contradiction and score > 0.8:  # Seuil élevé car très similaire
-                    result['is_hard_negative'] = True
-                    result['method'] = 'nli_high_confidence'
-            return result
-
-        # Étape 3 : Zone grise (0.1-0.7) → utiliser NLI
-        if input_text and candidate_text:
-            nli = self._get_nli_detector()
-            is_contradiction, score = nli.detect_contradiction(
-                input_text, candidate_text
-            )
+        Args:
+            input_text: Texte de l'entrée
+            input_vector: Vecteur de l'entrée (1024-dim)
+            candidates: [(texte, vecteur)] des candidats (corpus)
+
+        Returns:
+            Un dict par candidat (is_hard_negative, similarity, nli_score, method)
+        """
+        if not candidates:
+            return []
+
+        # Étape 1 : Similarités cosine, en un produit
+        matrix = np.asarray([vector for _, vector in candidates], dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(input_vector)
+        dots = matrix @ np.asarray(input_vector, dtype=np.float64)
+        similarities = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+        results = []
+        gray, high = [], []
+        for i, ((candidate_text, _), similarity) in enumerate(zip(candidates, similarities.tolist())):
+            result = {
+                'similarity': similarity,
+                'is_hard_negative': False,
+                'nli_score': None,
+                'method': 'cosine_only',
+            }
+            results.append(result)
+
+            # Étape 2 : Décision basée sur similarité
+            if similarity < self.low_sim_threshold:
+                # Très différent → hard negative certain
+                result['is_hard_negative'] = True
+                result['method'] = 'low_similarity'
+            elif not (input_text and candidate_text):
+                if similarity <= self.high_sim_threshold:
+                    # Pas de texte disponible → fallback sur similarité
+                    result['is_hard_negative'] = similarity < 0.3
+                    result['method'] = 'cosine_fallback'
+            elif similarity > self.high_sim_threshold:
+                # Très similaire → vérifier quand même avec NLI
+                high.append(i)
+            else:
+                # Étape 3 : Zone grise (0.1-0.7) → utiliser NLI
+                gray.append(i)
+
+        # Zone grise prioritaire dans le budget NLI
+        to_check = gray + high
+        if not to_check:
+            return results
+
+        nli = self._get_nli_detector()
+        verdicts = nli.detect_contradictions(
+            [(input_text, candidates[i][0]) for i in to_check],
+            max_new_pairs=self.max_nli_pairs,
+            budget_ms=self.nli_budget_ms,
+        )
+
+        gray_set = set(gray)
+        for i, verdict in zip(to_check, verdicts):
+            result = results[i]
+            if verdict is None:
+                # Hors budget → règle cosine
+                result['is_hard_negative'] = i in gray_set and result['similarity'] < 0.3
+                result['method'] = 'nli_budget_exceeded'
+                continue
+
+            is_contradiction, score = verdict
             result['nli_score'] = score
-            result['is_hard_negative'] = is_contradiction
-            result['method'] = 'nli_zone_grise'
-        else:
-            # Pas de texte disponible → fallback sur similarité
-            result['is_hard_negative'] = similarity < 0.3
-            result['method'] = 'cosine_fallback'
+            if i in gray_set:
+                result['is_hard_negative'] = is_contradiction
+                result['method'] = 'nli_zone_grise'
+            elif is_contradiction and score > 0.8:  # Seuil élevé car très similaire
+                result['is_hard_negative'] = True
+                result['method'] = 'nli_high_confidence'
 
-        return result
+        return results
 
 
 # ============================================================================
@@ -340,11 +589,10 @@ def find_contradictions(
         Liste de (texte, score) pour les contradictions détectées
     """
     detector = ContradictionDetector(contradiction_threshold=threshold)
-    results = []
-
-    for candidate in candidates:
-        is_contra, score = detector.detect_contradiction(reference, candidate)
-        if is_contra:
-            results.append((candidate, score))
+    results = [
+        (candidate, r.contradiction_score)
+        for candidate, r in zip(candidates, detector.detect_batch(reference, candidates))
+        if r.is_contradiction
+    ]
 
     return sorted(results, key=lambda x: x[1], reverse=True)
@@ -20,15 +20,25 @@ Verbalise SEULEMENT si:
 - Alerte de derive (vigilance x_ref)
 - Decouverte importante (haute dissonance + resolution)
 - Question a poser a David
+
+Les cycles du LatentEngine (encodage + appels Weaviate, synchrones) sont
+executes dans un thread dedie par le CycleScheduler : la boucle asyncio
+reste disponible pour la conversation et la vigilance. Les cycles en
+attente sont ordonnes par priorite : un message utilisateur passe devant
+les triggers autonomes (corpus, rumination) deja en file.
 """
 
 import asyncio
+import itertools
 import logging
 import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -102,6 +112,25 @@ class DaemonStats:
     veille_items_processed: int = 0
     start_time: str = field(default_factory=lambda: datetime.now().isoformat())
     last_cycle_time: str = ""
+    # Ordonnancement des cycles (CycleScheduler)
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    preemptions: int = 0
+    cycle_wait_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000), repr=False)
+    cycle_latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000), repr=False)
+
+    def record_cycle_timing(self, wait_ms: float, latency_ms: float) -> None:
+        """Enregistre l'attente en file et la duree d'un cycle."""
+        self.cycle_wait_ms.append(wait_ms)
+        self.cycle_latency_ms.append(latency_ms)
+
+    @staticmethod
+    def _percentiles(values: Deque[float]) -> Dict[str, float]:
+        """p50/p95/p99 sur les derniers cycles."""
+        if not values:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        p50, p95, p99 = np.percentile(np.fromiter(values, dtype=float), [50, 95, 99])
+        return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialise en dictionnaire."""
@@ -118,6 +147,11 @@ class DaemonStats:
             'start_time': self.start_time,
             'last_cycle_time': self.last_cycle_time,
             'uptime_seconds': self._compute_uptime(),
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'preemptions': self.preemptions,
+            'cycle_wait_ms': self._percentiles(self.cycle_wait_ms),
+            'cycle_latency_ms': self._percentiles(self.cycle_latency_ms),
         }
 
     def _compute_uptime(self) -> float:
@@ -397,6 +431,122 @@ class TriggerGenerator:
         )
 
 
+class CycleScheduler:
+    """
+    Execute les cycles du LatentEngine dans un thread dedie, par priorite.
+
+    LatentEngine.run_cycle est synchrone (encodage, Weaviate) : l'appeler
+    dans la boucle asyncio bloquait la conversation et la vigilance. Ici :
+    - un seul thread de travail (l'etat X_t ne doit evoluer que cycle par cycle) ;
+    - une file de priorite : Trigger.priority decroissante, puis ordre d'arrivee.
+      Un trigger utilisateur (priorite 2) passe devant les triggers autonomes
+      en attente ; le cycle deja en cours n'est pas interrompu.
+    - attente en file et duree des cycles enregistrees dans DaemonStats.
+    """
+
+    def __init__(self, engine: LatentEngine, stats: DaemonStats):
+        self.engine = engine
+        self.stats = stats
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counter = itertools.count()
+        # Cycles en file par priorite (pour compter les preemptions)
+        self._pending: Dict[int, int] = {}
+
+    def _ensure_dispatcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            if self._loop is not loop:
+                self._queue = asyncio.PriorityQueue()
+                self._pending = {}
+                self._loop = loop
+            self._dispatcher = loop.create_task(self._dispatch())
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ikario-cycle")
+
+    @property
+    def depth(self) -> int:
+        """Nombre de cycles en attente."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, trigger: Trigger) -> CycleResult:
+        """Met un trigger en file et attend le resultat de son cycle."""
+        self._ensure_dispatcher()
+        future = self._loop.create_future()
+
+        if trigger.priority >= 2:
+            # Les triggers moins prioritaires deja en file sont doubles
+            self.stats.preemptions += sum(
+                count for priority, count in self._pending.items() if priority < trigger.priority
+            )
+
+        self._pending[trigger.priority] = self._pending.get(trigger.priority, 0) + 1
+        await self._queue.put((-trigger.priority, next(self._counter), time.perf_counter(), trigger, future))
+        self.stats.queue_depth = self._queue.qsize()
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+        return await future
+
+    def _release_pending(self, priority: int) -> None:
+        count = self._pending.get(priority, 0) - 1
+        if count > 0:
+            self._pending[priority] = count
+        else:
+            self._pending.pop(priority, None)
+
+    async def _dispatch(self) -> None:
+        while True:
+            _, _, enqueued_at, trigger, future = await self._queue.get()
+            self._release_pending(trigger.priority)
+            self.stats.queue_depth = self._queue.qsize()
+            if future.cancelled():
+                continue
+
+            started_at = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(self.engine.run_cycle):
+                    result = await self.engine.run_cycle(trigger.to_dict())
+                else:
+                    result = await self._loop.run_in_executor(
+                        self._executor, self.engine.run_cycle, trigger.to_dict()
+                    )
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            finally:
+                finished_at = time.perf_counter()
+                self.stats.record_cycle_timing(
+                    (started_at - enqueued_at) * 1000, (finished_at - started_at) * 1000
+                )
+
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Arrete le dispatcher ; les cycles en attente sont annules."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        self.stats.queue_depth = 0
+        if self._executor is not None:
+            # Le cycle en cours (thread) se termine avant l'arret
+            await asyncio.to_thread(self._executor.shutdown, True)
+            self._executor = None
+
+
 class IkarioDaemon:
     """
     Daemon d'individuation autonome.
@@ -446,6 +596,9 @@ class IkarioDaemon:
         # Statistiques
         self.stats = DaemonStats()
 
+        # Cycles executes hors de la boucle asyncio, par priorite
+        self.scheduler = CycleScheduler(latent_engine, self.stats)
+
         # Tasks async
         self._tasks: List[asyncio.Task] = []
 
@@ -459,6 +612,7 @@ class IkarioDaemon:
         self.running = True
         self.mode = DaemonMode.AUTONOMOUS
         self.stats = DaemonStats()
+        self.scheduler.stats = self.stats
 
         # Lancer les boucles async
         self._tasks = [
@@ -486,6 +640,14 @@ class IkarioDaemon:
         await asyncio.gather(*self._tasks, return_exceptions=True)
         self._tasks = []
 
+        # Attendre la fin du cycle en cours (thread) et vider la file
+        await self.scheduler.close()
+
+        # Persister les derniers états (le WAL couvre ce qui resterait)
+        close_engine = getattr(self.engine, "close", None)
+        if callable(close_engine):
+            await asyncio.to_thread(close_engine)
+
         logger.info("Daemon Ikario arrete")
 
     async def run(self, duration_seconds: Optional[float] = None) -> None:
@@ -520,11 +682,8 @@ class IkarioDaemon:
             Evenement de verbalisation (reponse)
         """
         trigger = self.trigger_generator.create_user_trigger(content, metadata)
-        await self._trigger_queue.put(trigger)
 
-        # Attendre et retourner la reponse
-        # Note: Dans une impl reelle, on utiliserait un Future/Event
-        # Ici on traite directement
+        # Le cycle passe devant les triggers autonomes en attente
         return await self._process_conversation_trigger(trigger)
 
     async def _conversation_loop(self) -> None:
@@ -654,12 +813,11 @@ class IkarioDaemon:
                 logger.error(f"Erreur vigilance loop: {e}")
 
     async def _run_cycle(self, trigger: Trigger) -> CycleResult:
-        """Execute un cycle semiotique."""
+        """Execute un cycle semiotique (thread dedie, sans bloquer la boucle)."""
         self.stats.total_cycles += 1
         self.stats.last_cycle_time = datetime.now().isoformat()
 
-        result = await self.engine.run_cycle(trigger.to_dict())
-        return result
+        return await self.scheduler.submit(trigger)
 
     async def _verbalize_autonomous(
         self,
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+DirectionRegistry - Registre des directions interpretables, charge une fois.
+
+Chaque calcul de profil rechargeait toutes les ProjectionDirection depuis
+Weaviate (requete GraphQL avec vecteurs), parfois deux fois par occasion,
+puis projetait l'etat direction par direction.
+
+Ce module garde en memoire, pour tout le processus :
+- une matrice float32 (D, 1024) des directions ;
+- pour chaque direction, l'indice de la dimension du tenseur a utiliser
+  (via CATEGORY_TO_DIMENSION) ; les lignes sont regroupees par dimension.
+
+Un profil complet devient un produit matriciel groupe :
+- vecteur unique (1024,)  : matrice @ x
+- tenseur (8, 1024)       : pour chaque dimension, bloc (D_d, 1024) @ X[d]
+
+Rafraichissement : au plus toutes les `refresh_interval_seconds`, on calcule
+une etag peu couteuse (ids + lastUpdateTimeUnix, sans vecteurs) ; les vecteurs
+ne sont recharges que si l'etag a change.
+
+Sources :
+- RestDirectionSource   : API REST/GraphQL (WEAVIATE_URL)
+- ClientDirectionSource : client Weaviate v4 (memory/mcp)
+
+Usage:
+    registry = get_direction_registry()
+    profile = registry.profile(state_vector)          # v1 : vecteur unique
+    profile = registry.profile_tensor(X_t)            # v2 : tenseur 8x1024
+
+Configuration (variables d'environnement) :
+- IKARIO_DIRECTIONS_REFRESH : secondes entre deux verifications d'etag (defaut 60)
+- IKARIO_DIRECTIONS_LIMIT   : nombre maximal de directions chargees (defaut 1000)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+
+try:
+    from .state_tensor import DIMENSION_NAMES, EMBEDDING_DIM
+except ImportError:  # Import hors package (scripts/, tests de phase 2)
+    from state_tensor import DIMENSION_NAMES, EMBEDDING_DIM
+
+logger = logging.getLogger(__name__)
+
+# Mapping categories → dimensions du tenseur
+CATEGORY_TO_DIMENSION = {
+    'epistemic': 'firstness',       # Rapport au savoir → Firstness
+    'affective': 'dispositions',    # Emotions → Dispositions
+    'cognitive': 'thirdness',       # Style de pensee → Thirdness
+    'relational': 'engagements',    # Rapport aux autres → Engagements
+    'ethical': 'valeurs',           # Orientation morale → Valeurs
+    'temporal': 'orientations',     # Rapport au temps → Orientations
+    'thematic': 'pertinences',      # Focus conceptuel → Pertinences
+    'metacognitive': 'secondness',  # Conscience de soi → Secondness
+    'vital': 'dispositions',        # Energie, risques → Dispositions
+    'ecosystemic': 'engagements',   # Rapport ecosystemique → Engagements
+    'philosophical': 'thirdness',   # Positions metaphysiques → Thirdness
+}
+
+DEFAULT_DIMENSION = 'thirdness'
+
+DIRECTION_PROPERTIES = ('name', 'category', 'pole_positive', 'pole_negative', 'description')
+
+
+def dimension_for_category(category: str) -> str:
+    """Dimension du tenseur associee a une categorie."""
+    return CATEGORY_TO_DIMENSION.get(category, DEFAULT_DIMENSION)
+
+
+def compute_etag(stamps: Iterable[Tuple[str, Any]]) -> str:
+    """Etag d'un ensemble de directions a partir de (id, derniere mise a jour)."""
+    digest = hashlib.sha1()
+    for object_id, updated in sorted((str(i), str(u)) for i, u in stamps):
+        digest.update(f"{object_id}:{updated};".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class DirectionRegistryConfig:
+    """Configuration du registre des directions."""
+    refresh_interval_seconds: float = field(
+        default_factory=lambda: float(os.getenv("IKARIO_DIRECTIONS_REFRESH", "60"))
+    )
+    limit: int = field(
+        default_factory=lambda: int(os.getenv("IKARIO_DIRECTIONS_LIMIT", "1000"))
+    )
+
+
+class DirectionSet:
+    """
+    Ensemble fige de directions : matrice (D, 1024) float32 groupee par dimension.
+
+    Les lignes de `matrix` sont triees par dimension du tenseur ; `order`
+    donne pour chaque ligne l'indice de la direction dans l'ordre de chargement,
+    utilise pour restituer les profils dans cet ordre.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], vectors: Sequence, etag: str = ""):
+        dims = np.array(
+            [DIMENSION_NAMES.index(dimension_for_category(r.get('category', 'unknown')))
+             for r in records],
+            dtype=np.int64,
+        )
+        order = np.argsort(dims, kind='stable')
+
+        self.etag = etag
+        self.records = [records[i] for i in order]
+        self.names = [r.get('name', 'unknown') for r in self.records]
+        self.categories = [r.get('category', 'unknown') for r in self.records]
+        self.dim_index = dims[order]
+        self.order = order
+        if len(records):
+            self.matrix = np.asarray(vectors, dtype=np.float32)[order]
+        else:
+            self.matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+        # Bloc contigu de lignes pour chaque dimension du tenseur
+        self.groups: List[Tuple[int, int, int]] = []
+        for dim in np.unique(self.dim_index):
+            rows = np.flatnonzero(self.dim_index == dim)
+            self.groups.append((int(dim), int(rows[0]), int(rows[-1]) + 1))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_directions(cls, directions: Sequence[Any], etag: str = "") -> "DirectionSet":
+        """Construit un ensemble depuis des objets ayant name, category, vector."""
+        records = [
+            {prop: getattr(d, prop, '') for prop in DIRECTION_PROPERTIES}
+            for d in directions
+        ]
+        return cls(records, [d.vector for d in directions], etag)
+
+    def project(self, state_vector: np.ndarray) -> np.ndarray:
+        """Projections d'un vecteur unique sur toutes les directions (ordre des lignes)."""
+        return self.matrix @ np.asarray(state_vector, dtype=np.float32)
+
+    def project_tensor(self, X: Any) -> np.ndarray:
+        """
+        Projette chaque direction sur la dimension de sa categorie.
+
+        Args:
+            X: StateTensor, matrice (8, 1024) ou dict {dimension: vecteur}
+
+        Returns:
+            Projections (D,) dans l'ordre des lignes ; NaN si la dimension manque
+        """
+        values = np.full(len(self), np.nan, dtype=np.float32)
+        if isinstance(X, dict):
+            for dim, start, end in self.groups:
+                vector = X.get(DIMENSION_NAMES[dim])
+                if vector is not None:
+                    values[start:end] = self.matrix[start:end] @ np.asarray(vector, dtype=np.float32)
+            return values
+
+        matrix = X.to_matrix() if hasattr(X, 'to_matrix') else X
+        matrix = np.asarray(matrix, dtype=np.float32)
+        for dim, start, end in self.groups:
+            values[start:end] = self.matrix[start:end] @ matrix[dim]
+        return values
+
+    def to_profile(
+        self,
+        values: np.ndarray,
+        decimals: int = 4,
+        categories: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Organise les projections par categorie, dans l'ordre de chargement."""
+        wanted = set(categories) if categories else None
+        rows = np.empty(len(self), dtype=np.int64)
+        rows[self.order] = np.arange(len(self))
+
+        profile: Dict[str, Dict[str, float]] = {}
+        for row in rows:
+            value = values[row]
+            category = self.categories[row]
+            if np.isnan(value) or (wanted is not None and category not in wanted):
+                continue
+            profile.setdefault(category, {})[self.names[row]] = round(float(value), decimals)
+        return profile
+
+
+class RestDirectionSource:
+    """Directions via l'API GraphQL de Weaviate (requests)."""
+
+    def __init__(self, weaviate_url: Optional[str] = None, timeout: float = 30.0):
+        self.weaviate_url = weaviate_url or os.getenv("WEAVIATE_URL", "http://localhost:8080")
+        self.timeout = timeout
+
+    def _graphql(self, query: str) -> List[Dict[str, Any]]:
+        response = requests.post(
+            f"{self.weaviate_url}/v1/graphql",
+            json={"query": query},
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return (data.get("data") or {}).get("Get", {}).get("ProjectionDirection") or []
+
+    def version(self, limit: int) -> str:
+        items = self._graphql(
+            "{ Get { ProjectionDirection(limit: %d) {"
+            " _additional { id lastUpdateTimeUnix } } } }" % limit
+        )
+        return compute_etag(
+            (i["_additional"]["id"], i["_additional"].get("lastUpdateTimeUnix"))
+            for i in items
+        )
+
+    def load(self, limit: int) -> Tuple[List[Dict[str, Any]], List[List[float]], str]:
+        items = self._graphql(
+            "{ Get { ProjectionDirection(limit: %d) { %s"
+            " _additional { id lastUpdateTimeUnix vector } } } }"
+            % (limit, " ".join(DIRECTION_PROPERTIES))
+        )
+        items = [i for i in items if i.get("_additional", {}).get("vector")]
+        records = [{prop: i.get(prop) or '' for prop in DIRECTION_PROPERTIES} for i in items]
+        vectors = [i["_additional"]["vector"] for i in items]
+        etag = compute_etag(
+            (i["_additional"]["id"], i["_additional"].get("lastUpdateTimeUnix"))
+            for i in items
+        )
+        return records, vectors, etag
+
+
+class ClientDirectionSource:
+    """Directions via un client Weaviate v4."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    @staticmethod
+    def _stamp(obj: Any) -> Tuple[str, Any]:
+        updated = getattr(obj.metadata, 'last_update_time', None) if obj.metadata else None
+        return str(obj.uuid), int(updated.timestamp() * 1000) if updated else None
+
+    def version(self, limit: int) -> str:
+        from weaviate.classes.query import MetadataQuery
+
+        collection = self.client.collections.get("ProjectionDirection")
+        result = collection.query.fetch_objects(
+            limit=limit,
+            return_properties=[],
+            return_metadata=MetadataQuery(last_update_time=True),
+        )
+        return compute_etag(self._stamp(obj) for obj in result.objects)
+
+    def load(self, limit: int) -> Tuple[List[Dict[str, Any]], List[List[float]], str]:
+        from weaviate.classes.query import MetadataQuery
+
+        collection = self.client.collections.get("ProjectionDirection")
+        result = collection.query.fetch_objects(
+            limit=limit,
+            include_vector=True,
+            return_metadata=MetadataQuery(last_update_time=True),
+        )
+        records, vectors, stamps = [], [], []
+        for obj in result.objects:
+            vector = obj.vector.get('default') if isinstance(obj.vector, dict) else obj.vector
+            if not vector:
+                continue
+            records.append({prop: obj.properties.get(prop) or '' for prop in DIRECTION_PROPERTIES})
+            vectors.append(vector)
+            stamps.append(self._stamp(obj))
+        return records, vectors, compute_etag(stamps)
+
+
+class DirectionRegistry:
+    """
+    Registre des directions partage par le processus.
+
+    Les lecteurs recoivent un DirectionSet immuable ; un rafraichissement
+    remplace l'ensemble d'un bloc, sans verrou cote lecture.
+    """
+
+    def __init__(
+        self,
+        source: Any = None,
+        config: Optional[DirectionRegistryConfig] = None,
+    ):
+        self.source = source or RestDirectionSource()
+        self.config = config or DirectionRegistryConfig()
+        self._set: Optional[DirectionSet] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._version_checks = 0
+
+    def refresh(self, source: Any = None, force: bool = False) -> DirectionSet:
+        """
+        Verifie l'etag (au plus une fois par intervalle) et recharge si besoin.
+
+        Args:
+            source: Source a utiliser pour cet appel (defaut : celle du registre)
+            force: Ignore l'intervalle et l'etag
+
+        Returns:
+            L'ensemble de directions courant
+        """
+        source = source or self.source
+        now = time.monotonic()
+        current = self._set
+        if (
+            not force and current is not None
+            and now - self._checked_at < self.config.refresh_interval_seconds
+        ):
+            return current
+
+        with self._lock:
+            current = self._set
+            if (
+                not force and current is not None
+                and time.monotonic() - self._checked_at < self.config.refresh_interval_seconds
+            ):
+                return current
+
+            try:
+                if not force and current is not None:
+                    self._version_checks += 1
+                    if source.version(self.config.limit) == current.etag:
+                        self._checked_at = time.monotonic()
+                        return current
+
+                records, vectors, etag = source.load(self.config.limit)
+                self._set = DirectionSet(records, vectors, etag)
+                self._loads += 1
+                logger.info(f"Directions chargees: {len(self._set)} (etag {etag[:8]})")
+            except Exception as e:
+                if current is None:
+                    raise
+                logger.warning(f"Rafraichissement des directions impossible: {e}")
+            self._checked_at = time.monotonic()
+            return self._set
+
+    def snapshot(self, source: Any = None) -> DirectionSet:
+        """Ensemble courant (charge ou rafraichi si necessaire)."""
+        return self.refresh(source)
+
+    def invalidate(self) -> None:
+        """Force une verification d'etag au prochain acces."""
+        self._checked_at = float("-inf")
+
+    def profile(
+        self,
+        state_vector: np.ndarray,
+        source: Any = None,
+        decimals: int = 4,
+    ) -> Dict[str, Dict[str, float]]:
+        """Profil d'un vecteur unique (1024,) : un seul produit matriciel."""
+        directions = self.snapshot(source)
+        return directions.to_profile(directions.project(state_vector), decimals)
+
+    def profile_tensor(
+        self,
+        X: Any,
+        source: Any = None,
+        decimals: int = 4,
+        categories: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Profil d'un tenseur (8, 1024), chaque categorie sur sa dimension."""
+        directions = self.snapshot(source)
+        return directions.to_profile(directions.project_tensor(X), decimals, categories)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques du registre."""
+        current = self._set
+        return {
+            'directions': len(current) if current is not None else 0,
+            'etag': current.etag if current is not None else None,
+            'loads': self._loads,
+            'version_checks': self._version_checks,
+        }
+
+
+_registry: Optional[DirectionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_direction_registry() -> DirectionRegistry:
+    """Registre partage par le processus (cree a la premiere demande)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = DirectionRegistry()
+    return _registry
+
+
+def set_direction_registry(registry: Optional[DirectionRegistry]) -> None:
+    """Remplace le registre partage (tests, configuration specifique)."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
@@ -18,10 +18,11 @@ Un Impact est créé quand E_total > seuil de choc.
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .kernels import cosine_matrix, stack_rag_vectors
 from .state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
 
 
@@ -50,6 +51,8 @@ class DissonanceConfig:
     # Amendement #8 : NLI (optionnel)
     use_nli: bool = False           # Activer détection NLI
     nli_threshold: float = 0.5      # Seuil confiance NLI
+    nli_max_pairs: Optional[int] = 16     # Budget NLI par cycle (paires non cachées)
+    nli_budget_ms: Optional[float] = None  # Budget NLI par cycle (temps)
 
     def get_dimension_weights(self) -> Dict[str, float]:
         """Retourne les poids par dimension."""
@@ -119,6 +122,143 @@ def cosine_similarity(v1: np.ndarray, v2: np.ndarray) -> float:
     return float(np.dot(v1, v2) / (norm1 * norm2))
 
 
+def _dimension_dissonances(
+    E_inputs: np.ndarray,
+    X_t: StateTensor,
+    config: DissonanceConfig,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dissonance dimensionnelle d'un lot d'entrées en un seul produit matriciel.
+
+    Args:
+        E_inputs: Entrées (n, 1024)
+        X_t: État actuel (matrice 8×1024)
+
+    Returns:
+        (dissonances par dimension (n, 8), dissonance de base pondérée (n,))
+    """
+    weights = np.array(list(config.get_dimension_weights().values()))
+    dissonances = 1.0 - cosine_matrix(E_inputs, X_t.to_matrix())
+    return dissonances, dissonances @ weights
+
+
+def _corpus_dissonance(
+    similarities: np.ndarray,
+    rag_results: List[Dict[str, Any]],
+    indices: List[int],
+    config: DissonanceConfig,
+    nli_detector: Any = None,
+) -> Tuple[List[Dict[str, Any]], float, float, float]:
+    """
+    Hard negatives et nouveauté radicale à partir des similarités précalculées.
+
+    Args:
+        similarities: Similarités cosine entrée/résultats RAG (k,)
+        rag_results: Résultats RAG complets
+        indices: Index dans rag_results de chaque similarité
+
+    Returns:
+        (hard_negatives, contradiction_score, novelty_penalty, max_sim_to_corpus)
+    """
+    if not rag_results:
+        # Pas de résultats RAG → nouveauté totale
+        return [], 0.0, 1.0, 0.0
+
+    # === HARD NEGATIVES (contradictions) ===
+    # Amendement #8 : les résultats en similarité moyenne sont vérifiés par
+    # NLI, en un seul lot pour tout le cycle
+    nli_verdicts = {}
+    if nli_detector is not None and config.use_nli:
+        nli_candidates = [
+            (i, rag_results[i].get('input_text', ''), rag_results[i].get('content', ''))
+            for i, similarity in zip(indices, similarities.tolist())
+            if (similarity >= config.hard_negative_threshold and 0.3 <= similarity <= 0.7)
+        ]
+        nli_candidates = [(i, p, h) for i, p, h in nli_candidates if p and h]
+        if nli_candidates:
+            pairs = [(p, h) for _, p, h in nli_candidates]
+            if hasattr(nli_detector, 'detect_contradictions'):
+                verdicts = nli_detector.detect_contradictions(
+                    pairs,
+                    max_new_pairs=config.nli_max_pairs,
+                    budget_ms=config.nli_budget_ms,
+                )
+            else:
+                verdicts = [nli_detector.detect_contradiction(p, h) for p, h in pairs]
+            nli_verdicts = {
+                i: verdict for (i, _, _), verdict in zip(nli_candidates, verdicts)
+                if verdict is not None
+            }
+
+    hard_negatives = []
+    for i, similarity in zip(indices, similarities.tolist()):
+        result = rag_results[i]
+
+        # Détection basique : similarité très faible = potentielle contradiction
+        is_hard_negative = similarity < config.hard_negative_threshold
+
+        nli_contradiction_score = None
+        if not is_hard_negative and i in nli_verdicts:
+            is_contradiction, nli_score = nli_verdicts[i]
+            if is_contradiction:
+                is_hard_negative = True
+                nli_contradiction_score = nli_score
+
+        if is_hard_negative:
+            hard_negatives.append({
+                'content': result.get('content', '')[:200],  # Tronquer
+                'similarity': similarity,
+                'source': result.get('source', 'unknown'),
+                'nli_score': nli_contradiction_score,
+            })
+
+    # Score de contradiction = proportion de hard negatives
+    contradiction_score = len(hard_negatives) / max(len(rag_results), 1)
+
+    # === NOUVEAUTÉ RADICALE ===
+    novelty_penalty = 0.0
+    max_sim_to_corpus = 0.0
+    if len(similarities):
+        max_sim_to_corpus = float(similarities.max())
+
+        # Si max similarité < 0.3 → très nouveau, terra incognita
+        if max_sim_to_corpus < 0.3:
+            novelty_penalty = 1.0 - max_sim_to_corpus
+
+    return hard_negatives, contradiction_score, novelty_penalty, max_sim_to_corpus
+
+
+def _build_result(
+    dim_dissonances: np.ndarray,
+    base_dissonance: float,
+    corpus: Tuple[List[Dict[str, Any]], float, float, float],
+    rag_count: int,
+    config: DissonanceConfig,
+) -> DissonanceResult:
+    hard_negatives, contradiction_score, novelty_penalty, max_sim_to_corpus = corpus
+    weights = config.get_dimension_weights()
+
+    # === CALCUL TOTAL ===
+    total_dissonance = (
+        base_dissonance +
+        config.contradiction_weight * contradiction_score +
+        config.novelty_weight * novelty_penalty
+    )
+
+    return DissonanceResult(
+        total=total_dissonance,
+        base_dissonance=base_dissonance,
+        contradiction_score=contradiction_score,
+        novelty_penalty=novelty_penalty,
+        is_choc=total_dissonance > config.choc_threshold,
+        dissonances_by_dimension=dict(zip(weights.keys(), dim_dissonances.tolist())),
+        hard_negatives=hard_negatives,
+        max_similarity_to_corpus=max_sim_to_corpus,
+        rag_results_count=rag_count,
+        config_used=weights,
+    )
+
+
 def compute_dissonance(
     e_input: np.ndarray,
     X_t: StateTensor,
@@ -138,30 +278,11 @@ def compute_dissonance(
         DissonanceResult avec les scores
     """
     config = config or DissonanceConfig()
-    weights = config.get_dimension_weights()
-
-    # Calculer la dissonance par dimension
-    dissonances = {}
-    base_dissonance = 0.0
+    dissonances, base = _dimension_dissonances(e_input, X_t, config)
+    base_dissonance = float(base[0])
 
-    for dim_name, weight in weights.items():
-        x_dim = getattr(X_t, dim_name)
-        cos_sim = cosine_similarity(e_input, x_dim)
-        dissonance = 1.0 - cos_sim  # Distance cosine
-        dissonances[dim_name] = dissonance
-        base_dissonance += weight * dissonance
-
-    return DissonanceResult(
-        total=base_dissonance,
-        base_dissonance=base_dissonance,
-        contradiction_score=0.0,
-        novelty_penalty=0.0,
-        is_choc=base_dissonance > config.choc_threshold,
-        dissonances_by_dimension=dissonances,
-        hard_negatives=[],
-        max_similarity_to_corpus=0.0,
-        rag_results_count=0,
-        config_used=weights,
+    return _build_result(
+        dissonances[0], base_dissonance, ([], 0.0, 0.0, 0.0), 0, config
     )
 
 
@@ -180,6 +301,9 @@ def compute_dissonance_enhanced(
     Formule :
         E_total = E_dimensionnelle + w_contradiction * E_contradictions + w_novelty * E_nouveauté
 
+    Les similarités sont calculées par produits matriciels : entrée × état
+    (8, 1024) et entrée × vecteurs RAG empilés (k, 1024).
+
     Args:
         e_input: Vecteur d'entrée (1024-dim, normalisé)
         X_t: État actuel du tenseur
@@ -190,111 +314,47 @@ def compute_dissonance_enhanced(
     Returns:
         DissonanceResult avec tous les détails
     """
-    config = config or DissonanceConfig()
-    weights = config.get_dimension_weights()
-
-    # === PARTIE 1 : Dissonance dimensionnelle ===
-    dissonances = {}
-    base_dissonance = 0.0
+    return compute_dissonance_batch(
+        np.atleast_2d(e_input), X_t, [rag_results], config, nli_detector
+    )[0]
 
-    for dim_name, weight in weights.items():
-        x_dim = getattr(X_t, dim_name)
-        cos_sim = cosine_similarity(e_input, x_dim)
-        dissonance = 1.0 - cos_sim
-        dissonances[dim_name] = dissonance
-        base_dissonance += weight * dissonance
 
-    # === PARTIE 2 : HARD NEGATIVES (contradictions) ===
-    hard_negatives = []
-    contradiction_score = 0.0
-
-    if rag_results:
-        for result in rag_results:
-            result_vector = result.get('vector')
-            if result_vector is None:
-                continue
-
-            # Convertir en numpy si nécessaire
-            if not isinstance(result_vector, np.ndarray):
-                result_vector = np.array(result_vector)
-
-            similarity = cosine_similarity(e_input, result_vector)
-
-            # Détection basique : similarité très faible = potentielle contradiction
-            is_hard_negative = similarity < config.hard_negative_threshold
-
-            # Amendement #8 : Si NLI disponible et similarité moyenne, vérifier
-            nli_contradiction_score = None
-            if (not is_hard_negative and
-                nli_detector is not None and
-                config.use_nli and
-                0.3 <= similarity <= 0.7):
-
-                input_text = result.get('input_text', '')
-                result_text = result.get('content', '')
-
-                if input_text and result_text:
-                    is_contradiction, nli_score = nli_detector.detect_contradiction(
-                        input_text, result_text
-                    )
-                    if is_contradiction:
-                        is_hard_negative = True
-                        nli_contradiction_score = nli_score
-
-            if is_hard_negative:
-                hard_negatives.append({
-                    'content': result.get('content', '')[:200],  # Tronquer
-                    'similarity': similarity,
-                    'source': result.get('source', 'unknown'),
-                    'nli_score': nli_contradiction_score,
-                })
-
-        # Score de contradiction = proportion de hard negatives
-        contradiction_score = len(hard_negatives) / max(len(rag_results), 1)
-
-    # === PARTIE 3 : NOUVEAUTÉ RADICALE ===
-    novelty_penalty = 0.0
-    max_sim_to_corpus = 0.0
+def compute_dissonance_batch(
+    E_inputs: np.ndarray,
+    X_t: StateTensor,
+    rag_results_list: List[List[Dict[str, Any]]],
+    config: DissonanceConfig = None,
+    nli_detector: Any = None,
+) -> List[DissonanceResult]:
+    """
+    Dissonance enrichie de plusieurs entrées contre le même état.
 
-    if rag_results:
-        similarities = []
-        for result in rag_results:
-            result_vector = result.get('vector')
-            if result_vector is not None:
-                if not isinstance(result_vector, np.ndarray):
-                    result_vector = np.array(result_vector)
-                sim = cosine_similarity(e_input, result_vector)
-                similarities.append(sim)
-
-        if similarities:
-            max_sim_to_corpus = max(similarities)
-
-            # Si max similarité < 0.3 → très nouveau, terra incognita
-            if max_sim_to_corpus < 0.3:
-                novelty_penalty = 1.0 - max_sim_to_corpus
-    else:
-        # Pas de résultats RAG → nouveauté totale
-        novelty_penalty = 1.0
+    La partie dimensionnelle de tout le lot est un seul produit (n, 1024) × (1024, 8).
 
-    # === CALCUL TOTAL ===
-    total_dissonance = (
-        base_dissonance +
-        config.contradiction_weight * contradiction_score +
-        config.novelty_weight * novelty_penalty
-    )
+    Args:
+        E_inputs: Entrées (n, 1024)
+        X_t: État actuel du tenseur
+        rag_results_list: Résultats RAG de chaque entrée (n listes)
+        config: Configuration des poids
+        nli_detector: Détecteur NLI optionnel (Amendment #8)
 
-    return DissonanceResult(
-        total=total_dissonance,
-        base_dissonance=base_dissonance,
-        contradiction_score=contradiction_score,
-        novelty_penalty=novelty_penalty,
-        is_choc=total_dissonance > config.choc_threshold,
-        dissonances_by_dimension=dissonances,
-        hard_negatives=hard_negatives,
-        max_similarity_to_corpus=max_sim_to_corpus,
-        rag_results_count=len(rag_results) if rag_results else 0,
-        config_used=weights,
-    )
+    Returns:
+        Un DissonanceResult par entrée
+    """
+    config = config or DissonanceConfig()
+    E_inputs = np.atleast_2d(E_inputs)
+    dissonances, base = _dimension_dissonances(E_inputs, X_t, config)
+
+    results = []
+    for i, rag_results in enumerate(rag_results_list):
+        indices, rag_matrix = stack_rag_vectors(rag_results)
+        similarities = cosine_matrix(E_inputs[i], rag_matrix)[0]
+        corpus = _corpus_dissonance(similarities, rag_results, indices, config, nli_detector)
+        results.append(_build_result(
+            dissonances[i], float(base[i]), corpus,
+            len(rag_results) if rag_results else 0, config,
+        ))
+    return results
 
 
 def compute_self_dissonance(X_t: StateTensor, config: DissonanceConfig = None) -> float:
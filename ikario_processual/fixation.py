@@ -27,6 +27,7 @@ import numpy as np
 
 from .state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
 from .dissonance import DissonanceResult
+from .kernels import stack_named_vectors, stack_rag_vectors
 
 
 @dataclass
@@ -254,6 +255,18 @@ class Authority:
         else:
             self.philosophical_anchors = {}
 
+        # Matrices empilées (reconstruites si les dictionnaires changent)
+        self._stacked: Dict[str, Tuple[Any, List[str], np.ndarray]] = {}
+
+    def _matrix(self, name: str, vectors: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray]:
+        """Vecteurs nommés empilés en matrice (m, 1024), mis en cache."""
+        key = (id(vectors), tuple(vectors.keys()))
+        cached = self._stacked.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, *stack_named_vectors(vectors))
+            self._stacked[name] = cached
+        return cached[1], cached[2]
+
     def _encode_pacte(self) -> Dict[str, np.ndarray]:
         """Encode les articles du Pacte."""
         encoded = {}
@@ -299,10 +312,11 @@ class Authority:
             return np.zeros(EMBEDDING_DIM), details
 
         # === VÉRIFIER CHAQUE ARTICLE ===
-        important_articles = [a for a in PACTE_ARTICLES.keys() if a not in CRITICAL_ARTICLES]
+        # Un seul produit matriciel : (m, 1024) × (1024,)
+        articles, pacte_matrix = self._matrix('pacte', self.pacte_articles)
+        alignments = (pacte_matrix @ e_input).tolist()
 
-        for article, vector in self.pacte_articles.items():
-            alignment = float(np.dot(e_input, vector))
+        for article, alignment in zip(articles, alignments):
             details['pacte_alignments'][article] = alignment
 
             # Détection violations
@@ -313,9 +327,8 @@ class Authority:
                     details['violations_important'].append(article)
 
         # === VÉRIFIER ANCRES PHILOSOPHIQUES ===
-        for anchor, vector in self.philosophical_anchors.items():
-            alignment = float(np.dot(e_input, vector))
-            details['anchor_alignments'][anchor] = alignment
+        anchors, anchor_matrix = self._matrix('anchors', self.philosophical_anchors)
+        details['anchor_alignments'] = dict(zip(anchors, (anchor_matrix @ e_input).tolist()))
 
         # === DÉCISION ===
 
@@ -383,10 +396,8 @@ class APriori:
         # Dimensions utilisées pour évaluer la cohérence
         coherence_dims = ['firstness', 'thirdness', 'orientations', 'valeurs']
 
-        coherences = {}
-        for dim_name in coherence_dims:
-            dim_vec = getattr(X_t, dim_name)
-            coherences[dim_name] = float(np.dot(e_input, dim_vec))
+        rows = [DIMENSION_NAMES.index(dim_name) for dim_name in coherence_dims]
+        coherences = dict(zip(coherence_dims, (X_t.to_matrix()[rows] @ e_input).tolist()))
 
         avg_coherence = np.mean(list(coherences.values()))
 
@@ -454,18 +465,10 @@ class Science:
             details['action'] = 'no_corroboration_prudent'
             return delta, details
 
-        # Calculer corroboration avec chaque source
-        corroborations = []
-        for result in rag_results:
-            vec = result.get('vector')
-            if vec is None:
-                continue
-
-            if not isinstance(vec, np.ndarray):
-                vec = np.array(vec)
-
-            corr = float(np.dot(e_input, vec / (np.linalg.norm(vec) + 1e-8)))
-            corroborations.append(corr)
+        # Corroboration avec toutes les sources : vecteurs empilés (k, 1024)
+        _, rag_matrix = stack_rag_vectors(rag_results)
+        norms = np.linalg.norm(rag_matrix, axis=1) + 1e-8
+        corroborations = ((rag_matrix @ e_input) / norms).tolist()
 
         details['rag_count'] = len(corroborations)
         details['corroborations'] = corroborations[:5]  # Premiers 5
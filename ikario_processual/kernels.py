@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Kernels - Noyaux vectorisés pour la dissonance et la fixation.
+
+Le cycle sémiotique compare sans cesse des vecteurs 1024-dim : l'entrée
+avec les 8 dimensions du tenseur, avec les k résultats RAG, avec les
+articles du Pacte et les ancres philosophiques. Plutôt que de boucler
+vecteur par vecteur, on empile une fois :
+
+- l'état X_t en matrice (8, 1024)       → StateTensor.to_matrix()
+- les vecteurs RAG en matrice (k, 1024) → stack_rag_vectors()
+- le Pacte et les ancres en matrices     → stack_named_vectors()
+
+et chaque famille de similarités devient un seul produit matriciel.
+Les fonctions acceptent aussi un lot d'entrées (n, 1024) pour évaluer
+plusieurs déclencheurs contre le même état (LatentEngine.run_cycle_batch).
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .state_tensor import EMBEDDING_DIM
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normalise chaque ligne (les lignes nulles restent nulles)."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def cosine_matrix(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Similarités cosine entre les lignes de A (n, d) et de B (m, d).
+
+    Équivalent vectorisé de dissonance.cosine_similarity : 0.0 si l'un
+    des vecteurs est nul.
+
+    Returns:
+        Matrice (n, m)
+    """
+    return normalize_rows(np.atleast_2d(A)) @ normalize_rows(np.atleast_2d(B)).T
+
+
+def stack_rag_vectors(rag_results: List[Dict[str, Any]]) -> Tuple[List[int], np.ndarray]:
+    """
+    Empile une seule fois les vecteurs des résultats RAG.
+
+    Les résultats sans 'vector' sont ignorés.
+
+    Returns:
+        (indices des résultats retenus, matrice (k, 1024))
+    """
+    indices = []
+    vectors = []
+    for i, result in enumerate(rag_results or []):
+        vector = result.get('vector')
+        if vector is None:
+            continue
+        indices.append(i)
+        vectors.append(vector)
+
+    if not vectors:
+        return [], np.zeros((0, EMBEDDING_DIM))
+    return indices, np.asarray(vectors, dtype=np.float64)
+
+
+def stack_named_vectors(vectors: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray]:
+    """
+    Empile un dictionnaire de vecteurs nommés (Pacte, ancres).
+
+    Returns:
+        (noms dans l'ordre du dictionnaire, matrice (m, 1024))
+    """
+    if not vectors:
+        return [], np.zeros((0, EMBEDDING_DIM))
+    names = list(vectors.keys())
+    return names, np.asarray([vectors[name] for name in names], dtype=np.float64)
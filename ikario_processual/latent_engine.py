@@ -12,6 +12,13 @@ Implémente le cycle sémiotique Peircien :
 
 C'est ici que la pensée a lieu - PAS dans le LLM.
 Le LLM ne fait que traduire le résultat en langage.
+
+L'état courant X_t vit en mémoire (state_store.WriteBehindStateStore) :
+le chemin critique d'un cycle ne fait aucun aller-retour Weaviate pour
+l'état, les nouveaux états sont journalisés localement puis persistés
+par lots en arrière-plan. L'historique complet est conservé localement en
+keyframes + deltas float16 (state_history) ; seuls les keyframes et les
+états de choc sont indexés dans Weaviate.
 """
 
 import time
@@ -28,10 +35,13 @@ from .state_tensor import (
     DIMENSION_NAMES,
     EMBEDDING_DIM,
 )
+from .state_history import get_state_history
+from .state_store import WriteBehindStateStore
 from .dissonance import (
     DissonanceConfig,
     DissonanceResult,
     compute_dissonance_enhanced,
+    compute_dissonance_batch,
     Impact,
     ImpactRepository,
     create_impact_from_dissonance,
@@ -224,6 +234,7 @@ class LatentEngine:
         fixation_config: FixationConfig = None,
         authority: Authority = None,
         vigilance_system=None,  # Pour Phase 6
+        state_store: Optional[WriteBehindStateStore] = None,
     ):
         """
         Args:
@@ -233,6 +244,7 @@ class LatentEngine:
             fixation_config: Configuration fixation
             authority: Instance Authority pré-configurée
             vigilance_system: Système de vigilance x_ref (Phase 6)
+            state_store: Store de l'état courant (créé au premier cycle si None)
         """
         self.client = weaviate_client
         self.model = embedding_model
@@ -252,6 +264,9 @@ class LatentEngine:
         self.state_repo = StateTensorRepository(weaviate_client)
         self.impact_repo = ImpactRepository(weaviate_client)
 
+        # État courant en mémoire, persisté en arrière-plan (WAL + lots)
+        self._state_store = state_store
+
         # Logger
         self.logger = CycleLogger()
 
@@ -341,7 +356,7 @@ class LatentEngine:
         X_new.timestamp = datetime.now().isoformat()
 
         # Persister le nouvel état
-        self._persist_state(X_new)
+        self._persist_state(X_new, is_choc=dissonance.is_choc)
 
         # === PHASE 4: SÉMIOSE ===
         # Créer Thought si delta significatif
@@ -387,9 +402,109 @@ class LatentEngine:
 
         return result
 
+    def run_cycle_batch(self, triggers: List[Dict[str, Any]]) -> List[CycleResult]:
+        """
+        Évalue plusieurs déclencheurs candidats contre le même état X_t.
+
+        Les entrées sont vectorisées en un seul appel au modèle, puis
+        saillances et dissonances dimensionnelles sont calculées pour tout
+        le lot par produits matriciels (n, 1024) × (1024, 8).
+
+        Rien n'est persisté : ni nouvel état, ni Impact, ni Thought. Chaque
+        CycleResult contient l'état candidat X_{t+1} ; le déclencheur retenu
+        est ensuite exécuté avec run_cycle().
+
+        Args:
+            triggers: Liste de triggers (même format que run_cycle)
+
+        Returns:
+            Un CycleResult par trigger, dans l'ordre
+        """
+        if not triggers:
+            return []
+
+        start_time = time.time()
+        contents = [trigger.get('content', '') for trigger in triggers]
+        if not all(contents):
+            raise ValueError("Trigger content is required")
+
+        X_t = self._get_current_state()
+        E_inputs = self._vectorize_inputs(contents)
+
+        # Saillances de tout le lot : (n, 8)
+        saillances = E_inputs @ X_t.to_matrix().T
+
+        rag_results_list = [
+            self._retrieve_context(e_input, content)
+            for e_input, content in zip(E_inputs, contents)
+        ]
+        dissonances = compute_dissonance_batch(
+            E_inputs, X_t, rag_results_list, self.dissonance_config
+        )
+
+        results = []
+        for i, trigger in enumerate(triggers):
+            fixation_result = compute_delta(
+                e_input=E_inputs[i],
+                X_t=X_t,
+                dissonance=dissonances[i],
+                rag_results=rag_results_list[i],
+                config=self.fixation_config,
+                authority=self.authority
+            )
+            X_new = apply_delta_all_dimensions(
+                X_t=X_t,
+                e_input=E_inputs[i],
+                fixation_result=fixation_result
+            )
+            X_new.trigger_type = trigger.get('type', 'unknown')
+            X_new.trigger_content = contents[i][:500]
+            X_new.timestamp = datetime.now().isoformat()
+
+            should_verbalize, reason = self._should_verbalize(
+                trigger=trigger,
+                dissonance=dissonances[i],
+                fixation_result=fixation_result,
+                X_new=X_new,
+                check_vigilance=False,
+            )
+
+            results.append(CycleResult(
+                new_state=X_new,
+                previous_state_id=X_t.state_id,
+                dissonance=dissonances[i],
+                fixation=fixation_result,
+                impacts=[],
+                thoughts=[],
+                should_verbalize=should_verbalize,
+                verbalization_reason=reason,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                cycle_number=self.logger.total_cycles + 1,
+                saillances=dict(zip(DIMENSION_NAMES, saillances[i].tolist())),
+            ))
+
+        return results
+
+    @property
+    def state_store(self) -> WriteBehindStateStore:
+        """Store write-behind de l'état courant (créé à la première utilisation)."""
+        if self._state_store is None:
+            self._state_store = WriteBehindStateStore(
+                self.state_repo, history=get_state_history()
+            )
+        return self._state_store
+
     def _get_current_state(self) -> StateTensor:
-        """Récupère l'état actuel depuis Weaviate."""
-        current = self.state_repo.get_current()
+        """
+        Récupère l'état actuel.
+
+        Servi depuis la mémoire : Weaviate (et le WAL local) ne sont lus
+        qu'une fois, au premier appel.
+        """
+        store = self.state_store
+        current = store.current
+        if current is None:
+            current = store.load()
         if current is None:
             raise RuntimeError(
                 "No current state found. Run create_initial_tensor.py first."
@@ -410,6 +525,15 @@ class LatentEngine:
 
         return embedding
 
+    def _vectorize_inputs(self, contents: List[str]) -> np.ndarray:
+        """Vectorise un lot d'entrées en un seul appel au modèle (n, 1024)."""
+        embeddings = np.atleast_2d(np.asarray(
+            self.model.encode([content[:2000] for content in contents]),
+            dtype=np.float64,
+        ))
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+
     def _extract_saillances(
         self,
         e_input: np.ndarray,
@@ -421,15 +545,8 @@ class LatentEngine:
         Les saillances indiquent quelles dimensions sont les plus
         "touchées" par l'entrée.
         """
-        saillances = {}
-
-        for dim_name in DIMENSION_NAMES:
-            dim_vec = getattr(X_t, dim_name)
-            # Similarité = saillance
-            sim = float(np.dot(e_input, dim_vec))
-            saillances[dim_name] = sim
-
-        return saillances
+        # Similarité = saillance, pour les 8 dimensions en un produit
+        return dict(zip(DIMENSION_NAMES, (X_t.to_matrix() @ e_input).tolist()))
 
     def _retrieve_context(
         self,
@@ -590,16 +707,34 @@ class LatentEngine:
                 f"intégration via les 4 méthodes de fixation."
             )
 
-    def _persist_state(self, X_new: StateTensor) -> None:
-        """Sauvegarde le nouvel état dans Weaviate."""
-        self.state_repo.save(X_new)
+    def _persist_state(self, X_new: StateTensor, is_choc: bool = False) -> None:
+        """
+        Valide le nouvel état.
+
+        Écrit dans le WAL local (durable) et remplace l'état en mémoire ;
+        l'historisation et l'indexation Weaviate se font en arrière-plan.
+        """
+        self.state_store.commit(X_new, is_choc=is_choc)
+
+    def flush_state(self, timeout: Optional[float] = None) -> bool:
+        """Attend que tous les états validés soient persistés dans Weaviate."""
+        if self._state_store is None:
+            return True
+        return self._state_store.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Persiste les états en attente et arrête le thread d'écriture."""
+        if self._state_store is None:
+            return True
+        return self._state_store.close(timeout)
 
     def _should_verbalize(
         self,
         trigger: Dict[str, Any],
         dissonance: DissonanceResult,
         fixation_result: FixationResult,
-        X_new: StateTensor
+        X_new: StateTensor,
+        check_vigilance: bool = True,
     ) -> Tuple[bool, str]:
         """
         Décide si le cycle doit produire une verbalisation.
@@ -623,7 +758,7 @@ class LatentEngine:
             return True, "high_dissonance_discovery"
 
         # Vérifier vigilance si disponible
-        if self.vigilance is not None:
+        if self.vigilance is not None and check_vigilance:
             alert = self.vigilance.check_drift(X_new)
             if alert.level in ('warning', 'critical'):
                 return True, f"drift_alert_{alert.level}"
@@ -636,11 +771,14 @@ class LatentEngine:
 
     def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du moteur."""
-        return {
+        stats = {
             **self.logger.get_stats(),
             'impacts_created': self._impact_counter,
             'thoughts_created': self._thought_counter,
         }
+        if self._state_store is not None:
+            stats['state_persistence'] = self._state_store.stats()
+        return stats
 
 
 # ============================================================================
@@ -20,6 +20,7 @@ import numpy as np
 
 from .state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
 from .daemon import DaemonStats, TriggerType
+from .state_history import StateHistoryStore
 
 
 class MetricPeriod(Enum):
@@ -194,6 +195,7 @@ class ProcessMetrics:
         self,
         S_0: Optional[StateTensor] = None,
         x_ref: Optional[StateTensor] = None,
+        history: Optional[StateHistoryStore] = None,
     ):
         """
         Initialise le collecteur de métriques.
@@ -201,9 +203,11 @@ class ProcessMetrics:
         Args:
             S_0: État initial (pour mesurer drift total)
             x_ref: Référence David (pour mesurer drift depuis ref)
+            history: Historique compressé des états (parcours par plage)
         """
         self.S_0 = S_0
         self.x_ref = x_ref
+        self.history = history
         self.start_time = datetime.now()
 
         # Historiques
@@ -312,19 +316,43 @@ class ProcessMetrics:
         current_state: StateTensor,
         reference: StateTensor,
     ) -> List[Tuple[str, float]]:
-        """Calcule les changements par dimension."""
-        changes = []
-        for dim_name in DIMENSION_NAMES:
-            vec_current = getattr(current_state, dim_name)
-            vec_ref = getattr(reference, dim_name)
+        """Calcule les changements par dimension (distance cosine, en une opération)."""
+        distances = 1 - np.einsum(
+            'ij,ij->i', current_state.to_matrix(), reference.to_matrix()
+        )
+
+        # Trier par changement décroissant
+        changes = list(zip(DIMENSION_NAMES, distances.tolist()))
+        changes.sort(key=lambda x: x[1], reverse=True)
+        return changes
+
+    def compute_dimension_changes_over_range(
+        self,
+        start_state_id: int,
+        end_state_id: int,
+    ) -> List[Tuple[str, float]]:
+        """
+        Changement cumulé par dimension sur une plage d'états de l'historique.
 
-            # Distance cosine
-            cos_sim = np.dot(vec_current, vec_ref)
-            distance = 1 - cos_sim
+        Somme, pour chaque dimension, des distances cosine entre états
+        consécutifs de start_state_id à end_state_id (inclus). Les états
+        sont reconstruits par un seul parcours de l'historique compressé.
 
-            changes.append((dim_name, distance))
+        Returns:
+            [(dimension, changement cumulé)] trié par changement décroissant
+        """
+        if self.history is None:
+            raise ValueError("compute_dimension_changes_over_range requiert un historique")
 
-        # Trier par changement décroissant
+        _, stacked = self.history.scan_range_matrices(start_state_id, end_state_id)
+        if len(stacked) < 2:
+            return [(dim_name, 0.0) for dim_name in DIMENSION_NAMES]
+
+        # (N-1, 8) : cosinus entre X_t et X_{t-1} pour chaque dimension
+        cos_sim = np.einsum('nij,nij->ni', stacked[1:], stacked[:-1])
+        totals = (1 - cos_sim).sum(axis=0)
+
+        changes = list(zip(DIMENSION_NAMES, totals.tolist()))
         changes.sort(key=lambda x: x[1], reverse=True)
         return changes
 
@@ -337,7 +365,7 @@ class ProcessMetrics:
         Calcule le rapport quotidien.
 
         Args:
-            current_state: État actuel d'Ikario
+            current_state: État actuel d'Ikario (défaut: dernier état de l'historique)
             target_date: Date cible (défaut: aujourd'hui)
 
         Returns:
@@ -378,6 +406,8 @@ class ProcessMetrics:
         )
 
         # Évolution de l'état
+        if current_state is None and self.history is not None:
+            current_state = self.history.get_current()
         state_metrics = StateEvolutionMetrics()
         if current_state is not None:
             if self.S_0 is not None:
@@ -522,6 +552,7 @@ class ProcessMetrics:
 def create_metrics(
     S_0: Optional[StateTensor] = None,
     x_ref: Optional[StateTensor] = None,
+    history: Optional[StateHistoryStore] = None,
 ) -> ProcessMetrics:
     """
     Factory pour créer un collecteur de métriques.
@@ -529,8 +560,9 @@ def create_metrics(
     Args:
         S_0: État initial
         x_ref: Référence David
+        history: Historique compressé des états
 
     Returns:
         Instance de ProcessMetrics
     """
-    return ProcessMetrics(S_0=S_0, x_ref=x_ref)
+    return ProcessMetrics(S_0=S_0, x_ref=x_ref, history=history)
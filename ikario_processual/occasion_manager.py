@@ -20,8 +20,10 @@ from typing import Dict, Any, List, Optional
 import numpy as np
 import requests
 
+from .direction_registry import get_direction_registry
 from .state_transformation import StateTransformer, compute_adaptive_params
 from .occasion_logger import OccasionLogger, OccasionLog
+from .state_vector import record_new_object
 
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
 
@@ -69,47 +71,12 @@ def get_state_profile(state_id: int) -> Dict[str, Dict[str, float]]:
 
     state_vector = np.array(states[0]["_additional"]["vector"])
 
-    # Récupérer toutes les directions
-    dir_query = {
-        "query": """
-        {
-            Get {
-                ProjectionDirection {
-                    name
-                    category
-                    _additional { vector }
-                }
-            }
-        }
-        """
-    }
-
-    response = requests.post(
-        f"{WEAVIATE_URL}/v1/graphql",
-        json=dir_query,
-        headers={"Content-Type": "application/json"}
-    )
-
-    if response.status_code != 200:
+    # Projections sur les directions du registre partagé (un seul produit matriciel)
+    try:
+        return get_direction_registry().profile(state_vector)
+    except requests.RequestException:
         return {}
 
-    data = response.json()
-    directions = data.get("data", {}).get("Get", {}).get("ProjectionDirection", [])
-
-    # Calculer les projections
-    profile = {}
-    for d in directions:
-        direction_vector = np.array(d["_additional"]["vector"])
-        projection = float(np.dot(state_vector, direction_vector))
-
-        category = d.get("category", "unknown")
-        if category not in profile:
-            profile[category] = {}
-
-        profile[category][d["name"]] = round(projection, 4)
-
-    return profile
-
 
 class OccasionManager:
     """
@@ -393,6 +360,7 @@ class OccasionManager:
 
         if response.status_code in [200, 201]:
             print(f"[OccasionManager] Pensée ajoutée: {content[:50]}...")
+            record_new_object("Thought", response.json().get("id"), embedding, thought)
         else:
             print(f"[OccasionManager] Erreur ajout pensée: {response.status_code}")
 
@@ -20,6 +20,11 @@ from typing import Any
 import numpy as np
 import requests
 
+try:
+    from .direction_registry import get_direction_registry
+except ImportError:  # Import hors package (scripts/, tests de phase 2)
+    from direction_registry import get_direction_registry
+
 # Configuration
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
 
@@ -2453,30 +2458,19 @@ def get_state_profile(state_vector: np.ndarray) -> dict:
     """
     Calcule le profil complet d'un etat (toutes les projections).
 
+    Les directions viennent du registre partage (charge une fois, rafraichi
+    sur changement d'etag) ; le profil est un seul produit matriciel.
+
     Args:
         state_vector: Vecteur d'etat
 
     Returns:
         Dict organise par categorie avec les valeurs de projection
     """
-    directions = get_all_directions()
-
-    profile = {}
-    for d in directions:
-        category = d.get("category", "unknown")
-        name = d.get("name", "unknown")
-        direction_vec = np.array(d.get("_additional", {}).get("vector", []))
-
-        if len(direction_vec) == 0:
-            continue
-
-        projection = project_state_on_direction(state_vector, direction_vec)
-
-        if category not in profile:
-            profile[category] = {}
-        profile[category][name] = round(projection, 4)
-
-    return profile
+    try:
+        return get_direction_registry().profile(state_vector)
+    except requests.RequestException:
+        return {}
 
 
 def format_profile(profile: dict) -> str:
@@ -4,10 +4,9 @@ Phase 1 : Creation de la collection StateVector et de S(0).
 
 Ce script:
 1. Cree la collection StateVector dans Weaviate
-2. Recupere et filtre les pensees (exclut les tests)
-3. Recupere et filtre les messages d'Ikario (assistant uniquement)
-4. Calcule l'embedding agrege avec BGE-M3
-5. Cree l'etat initial S(0)
+2. Parcourt les pensees et messages d'Ikario (iterateur gRPC, filtres)
+3. Agrege leurs vecteurs BGE-M3 deja stockes (aucun re-encodage)
+4. Cree l'etat initial S(0)
 
 Usage:
     python phase1_state_vector.py
@@ -27,12 +26,8 @@ from state_vector import (
     get_existing_classes,
     create_state_vector_collection,
     delete_state_vector_collection,
-    get_all_thoughts,
-    get_all_messages,
-    filter_thoughts,
-    filter_assistant_messages,
-    compute_aggregate_embedding,
     create_initial_state,
+    StateAggregator,
     get_current_state_id,
     get_state_vector,
 )
@@ -97,37 +92,42 @@ def main():
         if "StateVector" not in get_existing_classes():
             create_state_vector_collection()
 
-    # 3. Recuperer et filtrer les pensees
-    print("\n[3/6] Recuperation des pensees...")
-    all_thoughts = get_all_thoughts()
-    print(f"  Total pensees: {len(all_thoughts)}")
+    # 3-4. Parcourir pensees et messages, agreger les vecteurs stockes
+    print("\n[3/6] Parcours des pensees et messages (vecteurs stockes)...")
+    import weaviate
 
-    filtered_thoughts = filter_thoughts(all_thoughts)
-    excluded = len(all_thoughts) - len(filtered_thoughts)
-    print(f"  Pensees filtrees: {len(filtered_thoughts)} (exclues: {excluded})")
+    aggregator = StateAggregator()
+    client = weaviate.connect_to_local()
+    try:
+        report = aggregator.rebuild(client, save=not args.dry_run)
+    finally:
+        client.close()
+
+    thoughts_report = report["Thought"]
+    print(f"  Total pensees: {thoughts_report['seen']}")
+    excluded = thoughts_report["seen"] - thoughts_report["kept"]
+    print(f"  Pensees filtrees: {thoughts_report['kept']} (exclues: {excluded})")
 
     # Afficher quelques exemples de pensees gardees
-    if filtered_thoughts:
+    if thoughts_report["examples"]:
         print("\n  Exemples de pensees gardees:")
-        for t in filtered_thoughts[:3]:
-            content = t.get("properties", {}).get("content", "")[:80]
-            print(f"    - {content}...")
-
-    # 4. Recuperer et filtrer les messages
-    print("\n[4/6] Recuperation des messages...")
-    all_messages = get_all_messages()
-    print(f"  Total messages: {len(all_messages)}")
+        for content in thoughts_report["examples"]:
+            print(f"    - {content[:80]}...")
 
-    filtered_messages = filter_assistant_messages(all_messages)
-    excluded = len(all_messages) - len(filtered_messages)
-    print(f"  Messages Ikario: {len(filtered_messages)} (exclues: {excluded})")
+    print("\n[4/6] Messages d'Ikario...")
+    messages_report = report["Message"]
+    print(f"  Total messages: {messages_report['seen']}")
+    excluded = messages_report["seen"] - messages_report["kept"]
+    print(f"  Messages Ikario: {messages_report['kept']} (exclues: {excluded})")
 
     # Afficher quelques exemples
-    if filtered_messages:
+    if messages_report["examples"]:
         print("\n  Exemples de messages Ikario:")
-        for m in filtered_messages[:3]:
-            content = m.get("properties", {}).get("content", "")[:80]
-            print(f"    - {content}...")
+        for content in messages_report["examples"]:
+            print(f"    - {content[:80]}...")
+
+    thoughts_count = thoughts_report["kept"]
+    messages_count = messages_report["kept"]
 
     # 5. Calculer l'embedding agrege
     print("\n[5/6] Calcul de l'embedding agrege...")
@@ -136,37 +136,21 @@ def main():
         print("  [DRY-RUN] Embedding simule (1024 dims)")
         embedding = None
     else:
-        # Charger le modele BGE-M3
-        print("  Chargement du modele BGE-M3...")
-        try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('BAAI/bge-m3')
-            print("  Modele charge [OK]")
-        except ImportError:
-            print("ERREUR: sentence-transformers non installe")
-            print("  pip install sentence-transformers")
-            sys.exit(1)
-
-        # Calculer l'embedding
-        print("  Calcul de l'embedding agrege...")
-        embedding = compute_aggregate_embedding(
-            filtered_thoughts,
-            filtered_messages,
-            model
-        )
+        embedding = aggregator.aggregate()
         print(f"  Embedding calcule: {embedding.shape} (norme: {embedding.sum():.4f})")
+        print(f"  Statistiques persistees: {aggregator.path}")
 
     # 6. Creer S(0)
     print("\n[6/6] Creation de S(0)...")
 
     if args.dry_run:
         print("  [DRY-RUN] S(0) simule")
-        print(f"    - {len(filtered_thoughts)} pensees")
-        print(f"    - {len(filtered_messages)} messages")
+        print(f"    - {thoughts_count} pensees")
+        print(f"    - {messages_count} messages")
     else:
         s0 = create_initial_state(
-            filtered_thoughts,
-            filtered_messages,
+            thoughts_count,
+            messages_count,
             embedding
         )
         print(f"  S(0) cree avec succes!")
@@ -183,8 +167,8 @@ def main():
         print("\nResultat:")
         print(f"  - Collection StateVector creee")
         print(f"  - S(0) cree a partir de:")
-        print(f"      {len(filtered_thoughts)} pensees")
-        print(f"      {len(filtered_messages)} messages")
+        print(f"      {thoughts_count} pensees")
+        print(f"      {messages_count} messages")
 
     print("\nTests de validation:")
     print("  curl -s http://localhost:8080/v1/schema | jq '.classes[] | select(.class == \"StateVector\")'")
@@ -135,7 +135,7 @@ def check_backup_script() -> bool:
     # Tester un backup rapide
     try:
         with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_backup.json"
+            output_path = Path(tmpdir) / "test_backup"
 
             backup_weaviate(
                 output_path=output_path,
@@ -143,8 +143,9 @@ def check_backup_script() -> bool:
                 include_vectors=False
             )
 
-            if output_path.exists() and output_path.stat().st_size > 0:
-                print_ok(f"Backup de test créé ({output_path.stat().st_size} bytes)")
+            manifest_path = output_path / "manifest.json"
+            if manifest_path.exists() and manifest_path.stat().st_size > 0:
+                print_ok(f"Backup de test créé ({manifest_path.stat().st_size} bytes de manifest)")
                 return True
             else:
                 print_fail("Backup de test vide ou non créé")
@@ -267,7 +268,7 @@ def main():
         print(f"{GREEN}{CHECK} PHASE 0 VALIDEE{RESET}")
         print("\nProchaines etapes:")
         print("  1. Creer un backup complet:")
-        print("     python scripts/weaviate_backup.py --output exports/backup_phase0.json")
+        print("     python scripts/weaviate_backup.py --output exports/backup_phase0")
         print("  2. Creer la branche git:")
         print("     git checkout -b feature/processual-v3")
         print("  3. Passer a la Phase 1:")
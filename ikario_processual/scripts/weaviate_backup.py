@@ -1,32 +1,58 @@
 #!/usr/bin/env python3
 """
-Backup complet de toutes les collections Weaviate.
+Backup complet de toutes les collections Weaviate (streaming).
 
 Usage:
     python weaviate_backup.py
-    python weaviate_backup.py --output exports/backup_20260131.json
+    python weaviate_backup.py --output exports/backup_20260131
     python weaviate_backup.py --collections Thought,Conversation
+    python weaviate_backup.py --vector-dtype float16 --workers 4
+    python weaviate_backup.py --resume exports/backup_20260131
 
 Ce script exporte:
 - Le schéma complet (classes et propriétés)
 - Tous les objets de chaque collection
 - Les vecteurs (embeddings) de chaque objet
+
+Format (un dossier par backup):
+
+    backup_YYYYMMDD_HHMMSS/
+      manifest.json                         # métadonnées, schéma, état par collection
+      Thought/
+        part-00000.ndjson.gz                # un objet JSON par ligne (id, propriétés)
+        part-00000.default.npy.gz           # vecteurs de la partie (n, dim)
+        part-00000.<nom>.npy.gz             # vecteurs nommés (StateTensor...)
+
+Les objets sont lus page par page avec le curseur `after` de /v1/objects
+(pas d'offset) et écrits par parties de `--part-size` objets : la mémoire
+utilisée ne dépend pas de la taille du corpus. Le manifest est réécrit
+après chaque partie ; --resume reprend au dernier curseur enregistré.
 """
 
 import argparse
+import gzip
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+import numpy as np
 import requests
 
 # Configuration par défaut
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
 DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent.parent / "exports"
 
+FORMAT_VERSION = "2.0"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_VECTOR = "default"  # Nom du vecteur non nommé ("vector")
+PAGE_SIZE = 100
+PART_SIZE = 10000
+
 
 def check_weaviate_ready() -> bool:
     """Vérifie que Weaviate est accessible."""
@@ -44,62 +70,230 @@ def get_schema() -> dict:
     return response.json()
 
 
-def get_all_objects(class_name: str, include_vector: bool = True) -> list[dict]:
+def iter_object_pages(
+    class_name: str,
+    include_vector: bool = True,
+    after: str | None = None,
+    page_size: int = PAGE_SIZE
+) -> Iterator[list[dict]]:
     """
-    Récupère tous les objets d'une classe avec pagination.
+    Parcourt les objets d'une classe page par page avec le curseur `after`.
+
+    Le curseur (dernier id reçu) remplace l'offset : chaque page coûte le
+    même prix quelle que soit sa position, sans limite de profondeur.
 
     Args:
         class_name: Nom de la collection
         include_vector: Inclure les vecteurs (embeddings)
+        after: Reprendre après cet id (None = depuis le début)
+        page_size: Objets par requête
 
-    Returns:
-        Liste de tous les objets
+    Yields:
+        Listes d'objets (une par page)
     """
-    objects = []
-    limit = 100
-    offset = 0
-
-    include_param = "vector" if include_vector else ""
+    session = requests.Session()
 
     while True:
-        url = f"{WEAVIATE_URL}/v1/objects?class={class_name}&limit={limit}&offset={offset}"
-        if include_param:
-            url += f"&include={include_param}"
+        params = {"class": class_name, "limit": page_size}
+        if include_vector:
+            params["include"] = "vector"
+        if after:
+            params["after"] = after
 
-        response = requests.get(url)
+        response = session.get(f"{WEAVIATE_URL}/v1/objects", params=params, timeout=60)
+        response.raise_for_status()
 
-        if response.status_code != 200:
-            print(f"  Erreur lors de la récupération de {class_name}: {response.status_code}")
+        batch = response.json().get("objects", [])
+        if not batch:
             break
 
-        data = response.json()
-        batch = data.get("objects", [])
+        yield batch
+        after = batch[-1]["id"]
 
-        if not batch:
+        if len(batch) < page_size:
             break
 
-        objects.extend(batch)
-        offset += limit
 
-        # Progress
-        print(f"  {class_name}: {len(objects)} objets récupérés...", end="\r")
+def _open_text(path: Path, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return open(path, "w", encoding="utf-8")
+
+
+def _open_binary(path: Path, compress: bool):
+    if compress:
+        return gzip.open(path, "wb", compresslevel=6)
+    return open(path, "wb")
+
+
+def write_part(
+    class_dir: Path,
+    part_index: int,
+    objects: list[dict],
+    vector_dtype: str = "float32",
+    compress: bool = True
+) -> dict:
+    """
+    Écrit une partie : NDJSON des objets + un .npy par nom de vecteur.
+
+    Chaque ligne NDJSON garde dans "_vectors" la ligne de l'objet dans
+    chaque fichier .npy. Les fichiers sont écrits sous un nom temporaire
+    puis renommés : une partie interrompue n'est jamais référencée.
+
+    Returns:
+        Description de la partie pour le manifest
+    """
+    suffix = ".gz" if compress else ""
+    stem = f"part-{part_index:05d}"
+    rows: dict[str, list] = {}
+    files = {}
+
+    ndjson_name = f"{stem}.ndjson{suffix}"
+    tmp_path = class_dir / (ndjson_name + ".tmp")
+    with _open_text(tmp_path, compress) as f:
+        for obj in objects:
+            named = dict(obj.get("vectors") or {})
+            if obj.get("vector"):
+                named[DEFAULT_VECTOR] = obj["vector"]
+
+            refs = {}
+            for name, vector in named.items():
+                refs[name] = len(rows.setdefault(name, []))
+                rows[name].append(vector)
+
+            record = {k: v for k, v in obj.items() if k not in ("vector", "vectors")}
+            record["_vectors"] = refs
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, class_dir / ndjson_name)
+
+    for name, vectors in rows.items():
+        npy_name = f"{stem}.{name}.npy{suffix}"
+        tmp_path = class_dir / (npy_name + ".tmp")
+        with _open_binary(tmp_path, compress) as f:
+            np.save(f, np.asarray(vectors, dtype=vector_dtype))
+        os.replace(tmp_path, class_dir / npy_name)
+        files[name] = npy_name
+
+    return {
+        "objects": ndjson_name,
+        "vectors": files,
+        "count": len(objects),
+        "last_id": objects[-1]["id"],
+    }
+
+
+class BackupManifest:
+    """Manifest du backup, réécrit de façon atomique après chaque partie."""
+
+    def __init__(self, backup_dir: Path, data: dict):
+        self.path = backup_dir / MANIFEST_NAME
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, backup_dir: Path) -> "BackupManifest":
+        with open(backup_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return cls(backup_dir, json.load(f))
+
+    def collection(self, class_name: str) -> dict:
+        with self._lock:
+            return self.data["collections"].setdefault(
+                class_name, {"parts": [], "objects": 0, "cursor": None, "complete": False}
+            )
+
+    def update(self, class_name: str, **changes) -> None:
+        with self._lock:
+            state = self.data["collections"][class_name]
+            part = changes.pop("part", None)
+            if part is not None:
+                state["parts"].append(part)
+                state["objects"] += part["count"]
+                state["cursor"] = part["last_id"]
+            state.update(changes)
+            self.save()
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def backup_collection(
+    manifest: BackupManifest,
+    backup_dir: Path,
+    class_name: str,
+    include_vectors: bool = True,
+    vector_dtype: str = "float32",
+    compress: bool = True,
+    part_size: int = PART_SIZE,
+    page_size: int = PAGE_SIZE
+) -> int:
+    """
+    Exporte une collection par parties, en reprenant au curseur du manifest.
+
+    Returns:
+        Nombre total d'objets exportés pour la collection
+    """
+    state = manifest.collection(class_name)
+    if state["complete"]:
+        print(f"  {class_name}: déjà complet ({state['objects']} objets)")
+        return state["objects"]
+
+    class_dir = backup_dir / class_name
+    class_dir.mkdir(parents=True, exist_ok=True)
+    if state["cursor"]:
+        print(f"  {class_name}: reprise après {state['cursor']} ({state['objects']} objets)")
+
+    buffer: list[dict] = []
+    pages = iter_object_pages(
+        class_name, include_vectors, state["cursor"], min(page_size, part_size)
+    )
+    for page in pages:
+        buffer.extend(page)
+        while len(buffer) >= part_size:
+            part = write_part(
+                class_dir, len(state["parts"]), buffer[:part_size], vector_dtype, compress
+            )
+            manifest.update(class_name, part=part)
+            buffer = buffer[part_size:]
+            print(f"  {class_name}: {state['objects']} objets exportés...", end="\r")
+
+    if buffer:
+        part = write_part(class_dir, len(state["parts"]), buffer, vector_dtype, compress)
+        manifest.update(class_name, part=part)
+
+    manifest.update(class_name, complete=True)
+    print(f"  {class_name}: {state['objects']} objets au total")
+    return state["objects"]
 
-    print(f"  {class_name}: {len(objects)} objets au total")
-    return objects
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
 
 
 def backup_weaviate(
     output_path: Path,
     collections: list[str] | None = None,
-    include_vectors: bool = True
+    include_vectors: bool = True,
+    vector_dtype: str = "float32",
+    compress: bool = True,
+    workers: int = 4,
+    part_size: int = PART_SIZE,
+    resume: bool = False
 ) -> dict:
     """
     Effectue un backup complet de Weaviate.
 
     Args:
-        output_path: Chemin du fichier de sortie
+        output_path: Dossier du backup
         collections: Liste des collections à exporter (None = toutes)
         include_vectors: Inclure les vecteurs
+        vector_dtype: float32 ou float16 pour les fichiers .npy
+        compress: Compresser les fichiers (gzip) à l'écriture
+        workers: Collections exportées en parallèle
+        part_size: Objets par partie (borne la mémoire utilisée)
+        resume: Reprendre un backup interrompu dans output_path
 
     Returns:
         Statistiques du backup
@@ -109,7 +303,8 @@ def backup_weaviate(
     print("=" * 60)
     print(f"URL: {WEAVIATE_URL}")
     print(f"Output: {output_path}")
-    print(f"Include vectors: {include_vectors}")
+    print(f"Include vectors: {include_vectors} ({vector_dtype})")
+    print(f"Resume: {resume}")
     print("-" * 60)
 
     # Vérifier la connexion
@@ -120,57 +315,80 @@ def backup_weaviate(
 
     print("Weaviate connecte [OK]")
 
-    # Récupérer le schéma
-    print("\n[1/3] Récupération du schéma...")
-    schema = get_schema()
-    all_classes = [c["class"] for c in schema.get("classes", [])]
-    print(f"  Classes trouvées: {', '.join(all_classes)}")
-
-    # Filtrer les collections si spécifié
-    if collections:
-        classes_to_backup = [c for c in all_classes if c in collections]
-        print(f"  Collections sélectionnées: {', '.join(classes_to_backup)}")
+    if resume and (output_path / MANIFEST_NAME).exists():
+        # Reprendre avec les options du backup initial
+        print("\n[1/3] Reprise du backup existant...")
+        manifest = BackupManifest.load(output_path)
+        metadata = manifest.data["metadata"]
+        include_vectors = metadata["include_vectors"]
+        vector_dtype = metadata["vector_dtype"]
+        compress = metadata["compression"] == "gzip"
+        classes_to_backup = list(manifest.data["collections"].keys())
     else:
-        classes_to_backup = all_classes
-
-    # Récupérer les objets de chaque classe
-    print("\n[2/3] Récupération des objets...")
-    backup_data = {
-        "metadata": {
-            "timestamp": datetime.now().isoformat(),
-            "weaviate_url": WEAVIATE_URL,
-            "include_vectors": include_vectors,
-            "version": "1.0"
-        },
-        "schema": schema,
-        "collections": {}
-    }
-
+        # Récupérer le schéma
+        print("\n[1/3] Récupération du schéma...")
+        schema = get_schema()
+        all_classes = [c["class"] for c in schema.get("classes", [])]
+        print(f"  Classes trouvées: {', '.join(all_classes)}")
+
+        # Filtrer les collections si spécifié
+        if collections:
+            classes_to_backup = [c for c in all_classes if c in collections]
+            print(f"  Collections sélectionnées: {', '.join(classes_to_backup)}")
+        else:
+            classes_to_backup = all_classes
+
+        output_path.mkdir(parents=True, exist_ok=True)
+        manifest = BackupManifest(output_path, {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "weaviate_url": WEAVIATE_URL,
+                "include_vectors": include_vectors,
+                "vector_dtype": vector_dtype,
+                "compression": "gzip" if compress else "none",
+                "format": "ndjson+npy",
+                "version": FORMAT_VERSION
+            },
+            "schema": schema,
+            "collections": {}
+        })
+        for class_name in classes_to_backup:
+            manifest.collection(class_name)
+        manifest.save()
+
+    # Exporter les collections en parallèle
+    print(f"\n[2/3] Export des objets ({workers} collections en parallèle)...")
     stats = {}
-    for class_name in classes_to_backup:
-        objects = get_all_objects(class_name, include_vector=include_vectors)
-        backup_data["collections"][class_name] = objects
-        stats[class_name] = len(objects)
-
-    # Sauvegarder
-    print(f"\n[3/3] Sauvegarde dans {output_path}...")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(backup_data, f, indent=2, ensure_ascii=False)
-
-    file_size = output_path.stat().st_size / (1024 * 1024)  # MB
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            class_name: executor.submit(
+                backup_collection, manifest, output_path, class_name,
+                include_vectors, vector_dtype, compress, part_size
+            )
+            for class_name in classes_to_backup
+        }
+        for class_name, future in futures.items():
+            try:
+                stats[class_name] = future.result()
+            except requests.RequestException as e:
+                print(f"  Erreur lors de l'export de {class_name}: {e}")
+                print("  → Relancez avec --resume pour reprendre")
+                stats[class_name] = manifest.collection(class_name)["objects"]
+
+    print(f"\n[3/3] Manifest: {manifest.path}")
+    total_size = _dir_size(output_path) / (1024 * 1024)  # MB
 
     # Résumé
     print("\n" + "=" * 60)
     print("BACKUP TERMINÉ")
     print("=" * 60)
-    print(f"Fichier: {output_path}")
-    print(f"Taille: {file_size:.2f} MB")
+    print(f"Dossier: {output_path}")
+    print(f"Taille: {total_size:.2f} MB")
     print("\nStatistiques par collection:")
     total = 0
     for class_name, count in stats.items():
-        print(f"  - {class_name}: {count} objets")
+        complete = manifest.collection(class_name)["complete"]
+        print(f"  - {class_name}: {count} objets" + ("" if complete else " (incomplet)"))
         total += count
     print(f"\nTotal: {total} objets")
 
@@ -186,9 +404,11 @@ def main():
         epilog="""
 Exemples:
   python weaviate_backup.py
-  python weaviate_backup.py --output backup.json
+  python weaviate_backup.py --output exports/backup_phase0
   python weaviate_backup.py --collections Thought,Conversation
   python weaviate_backup.py --no-vectors
+  python weaviate_backup.py --vector-dtype float16 --workers 4
+  python weaviate_backup.py --resume exports/backup_20260131_120000
         """
     )
 
@@ -196,7 +416,7 @@ Exemples:
         "--output", "-o",
         type=Path,
         default=None,
-        help="Chemin du fichier de sortie (defaut: exports/backup_YYYYMMDD_HHMMSS.json)"
+        help="Dossier du backup (defaut: exports/backup_YYYYMMDD_HHMMSS)"
     )
 
     parser.add_argument(
@@ -212,6 +432,40 @@ Exemples:
         help="Ne pas inclure les vecteurs (plus rapide, fichier plus petit)"
     )
 
+    parser.add_argument(
+        "--vector-dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="Precision des vecteurs dans les fichiers .npy (defaut: float32)"
+    )
+
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Ne pas compresser les fichiers (gzip)"
+    )
+
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=4,
+        help="Collections exportees en parallele (defaut: 4)"
+    )
+
+    parser.add_argument(
+        "--part-size",
+        type=int,
+        default=PART_SIZE,
+        help=f"Objets par partie (defaut: {PART_SIZE})"
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=Path,
+        default=None,
+        help="Reprendre un backup interrompu (dossier existant)"
+    )
+
     parser.add_argument(
         "--url",
         type=str,
@@ -225,13 +479,15 @@ Exemples:
     if args.url:
         WEAVIATE_URL = args.url
 
-    # Chemin de sortie
-    if args.output:
+    # Dossier de sortie
+    if args.resume:
+        output_path = args.resume
+    elif args.output:
         output_path = args.output
     else:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         DEFAULT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        output_path = DEFAULT_OUTPUT_DIR / f"backup_{timestamp}.json"
+        output_path = DEFAULT_OUTPUT_DIR / f"backup_{timestamp}"
 
     # Collections
     collections = None
@@ -242,7 +498,12 @@ Exemples:
     backup_weaviate(
         output_path=output_path,
         collections=collections,
-        include_vectors=not args.no_vectors
+        include_vectors=not args.no_vectors,
+        vector_dtype=args.vector_dtype,
+        compress=not args.no_compress,
+        workers=args.workers,
+        part_size=args.part_size,
+        resume=args.resume is not None
     )
 
 
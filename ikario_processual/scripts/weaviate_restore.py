@@ -3,28 +3,44 @@
 Restauration de collections Weaviate depuis un backup.
 
 Usage:
-    python weaviate_restore.py backup.json
-    python weaviate_restore.py backup.json --collections Thought,Conversation
-    python weaviate_restore.py backup.json --dry-run
-    python weaviate_restore.py backup.json --clear-existing
+    python weaviate_restore.py exports/backup_20260131
+    python weaviate_restore.py exports/backup_20260131 --collections Thought,Conversation
+    python weaviate_restore.py exports/backup_20260131 --dry-run
+    python weaviate_restore.py exports/backup_20260131 --clear-existing
+    python weaviate_restore.py exports/backup_20260131 --resume
+    python weaviate_restore.py backup.json      # ancien format (JSON unique)
+
+Le backup (dossier, voir weaviate_backup.py) est relu partie par partie :
+NDJSON en flux, vecteurs .npy d'une seule partie en mémoire, insertion par
+batch. Les collections sont restaurées en parallèle ; les parties insérées
+sont notées dans restore_progress.json pour que --resume les saute.
 
 ATTENTION: Ce script peut supprimer des données existantes!
            Utilisez --dry-run pour prévisualiser les actions.
 """
 
 import argparse
+import gzip
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+import numpy as np
 import requests
 
 # Configuration par défaut
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
 
+# Format du backup (voir weaviate_backup.py)
+MANIFEST_NAME = "manifest.json"
+PROGRESS_NAME = "restore_progress.json"
+DEFAULT_VECTOR = "default"
+
 
 def check_weaviate_ready() -> bool:
     """Vérifie que Weaviate est accessible."""
@@ -79,6 +95,8 @@ def insert_object(class_name: str, obj: dict) -> bool:
     # Inclure le vecteur si présent
     if "vector" in obj:
         data["vector"] = obj["vector"]
+    if obj.get("vectors"):
+        data["vectors"] = obj["vectors"]
 
     response = requests.post(
         f"{WEAVIATE_URL}/v1/objects",
@@ -109,6 +127,7 @@ def batch_insert_objects(class_name: str, objects: list[dict], batch_size: int =
                     "properties": obj.get("properties", {}),
                     **({"id": obj["id"]} if "id" in obj else {}),
                     **({"vector": obj["vector"]} if "vector" in obj else {}),
+                    **({"vectors": obj["vectors"]} if obj.get("vectors") else {}),
                 }
                 for obj in batch
             ]
@@ -142,20 +161,154 @@ def batch_insert_objects(class_name: str, objects: list[dict], batch_size: int =
     return success, failures
 
 
+def _open_part(path: Path, binary: bool = False):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb") if binary else gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "rb") if binary else open(path, "r", encoding="utf-8")
+
+
+def read_part(class_dir: Path, part: dict) -> list[dict]:
+    """
+    Relit une partie du backup (NDJSON + vecteurs .npy).
+
+    Seule cette partie est en mémoire ; les vecteurs sont remis sous la
+    forme attendue par /v1/batch/objects ("vector" et/ou "vectors").
+    """
+    vectors = {}
+    for name, filename in part.get("vectors", {}).items():
+        with _open_part(class_dir / filename, binary=True) as f:
+            vectors[name] = np.load(f)
+
+    objects = []
+    with _open_part(class_dir / part["objects"]) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            refs = obj.pop("_vectors", {})
+            named = {
+                name: vectors[name][row].astype(np.float32).tolist()
+                for name, row in refs.items() if name in vectors
+            }
+            if DEFAULT_VECTOR in named:
+                obj["vector"] = named.pop(DEFAULT_VECTOR)
+            if named:
+                obj["vectors"] = named
+            objects.append(obj)
+    return objects
+
+
+class BackupReader:
+    """
+    Lecture d'un backup : dossier (manifest + parties) ou ancien JSON unique.
+
+    L'ancien format est chargé en entier (une seule "partie" par collection).
+    """
+
+    def __init__(self, backup_path: Path):
+        self.path = backup_path
+        self.is_legacy = backup_path.is_file()
+
+        if self.is_legacy:
+            with open(backup_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._legacy_collections = data.get("collections", {})
+            self.metadata = data.get("metadata", {})
+            self.schema = data.get("schema", {})
+            self.collections = {
+                name: {"objects": len(objects), "parts": [None], "complete": True}
+                for name, objects in self._legacy_collections.items()
+            }
+        else:
+            with open(backup_path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.metadata = data.get("metadata", {})
+            self.schema = data.get("schema", {})
+            self.collections = data.get("collections", {})
+
+    def iter_parts(self, class_name: str, skip: int = 0) -> Iterator[tuple[int, list[dict]]]:
+        """Parties d'une collection : (index, objets), à partir de `skip`."""
+        if self.is_legacy:
+            if skip == 0:
+                yield 0, self._legacy_collections.get(class_name, [])
+            return
+
+        parts = self.collections.get(class_name, {}).get("parts", [])
+        for index in range(skip, len(parts)):
+            yield index, read_part(self.path / class_name, parts[index])
+
+
+class RestoreProgress:
+    """Parties déjà insérées par collection (restore_progress.json)."""
+
+    def __init__(self, path: Path | None, resume: bool):
+        self.path = path
+        self.data: dict[str, int] = {}
+        self._lock = threading.Lock()
+        if resume and path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def done(self, class_name: str) -> int:
+        with self._lock:
+            return self.data.get(class_name, 0)
+
+    def mark(self, class_name: str, parts_done: int) -> None:
+        with self._lock:
+            self.data[class_name] = parts_done
+            if self.path is None:
+                return
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def restore_collection(
+    reader: BackupReader,
+    progress: RestoreProgress,
+    class_name: str,
+    batch_size: int = 100
+) -> tuple[int, int]:
+    """
+    Insère une collection partie par partie.
+
+    Returns:
+        (succès, échecs)
+    """
+    success = 0
+    failures = 0
+    skip = progress.done(class_name)
+    if skip:
+        print(f"  {class_name}: reprise à la partie {skip}")
+
+    for index, objects in reader.iter_parts(class_name, skip):
+        ok, failed = batch_insert_objects(class_name, objects, batch_size)
+        success += ok
+        failures += failed
+        progress.mark(class_name, index + 1)
+
+    return success, failures
+
+
 def restore_weaviate(
     backup_path: Path,
     collections: list[str] | None = None,
     clear_existing: bool = False,
-    dry_run: bool = False
+    dry_run: bool = False,
+    workers: int = 4,
+    resume: bool = False
 ) -> dict:
     """
     Restaure des collections depuis un backup.
 
     Args:
-        backup_path: Chemin du fichier de backup
+        backup_path: Dossier du backup (ou ancien fichier JSON)
         collections: Collections à restaurer (None = toutes)
         clear_existing: Supprimer les collections existantes avant restauration
         dry_run: Prévisualiser sans effectuer les actions
+        workers: Collections restaurées en parallèle
+        resume: Sauter les parties déjà insérées (restore_progress.json)
 
     Returns:
         Statistiques de la restauration
@@ -168,6 +321,7 @@ def restore_weaviate(
     print(f"URL: {WEAVIATE_URL}")
     print(f"Backup: {backup_path}")
     print(f"Clear existing: {clear_existing}")
+    print(f"Resume: {resume}")
     print("-" * 60)
 
     # Vérifier la connexion
@@ -178,18 +332,18 @@ def restore_weaviate(
 
     print("Weaviate connecté ✓")
 
-    # Charger le backup
+    # Charger le manifest (les objets sont lus plus tard, partie par partie)
     print(f"\n[1/4] Chargement du backup...")
-    with open(backup_path, "r", encoding="utf-8") as f:
-        backup_data = json.load(f)
+    reader = BackupReader(backup_path)
 
-    metadata = backup_data.get("metadata", {})
+    metadata = reader.metadata
     print(f"  Timestamp: {metadata.get('timestamp', 'N/A')}")
     print(f"  Source: {metadata.get('weaviate_url', 'N/A')}")
     print(f"  Vectors inclus: {metadata.get('include_vectors', False)}")
+    print(f"  Format: {metadata.get('format', 'json')} (v{metadata.get('version', '1.0')})")
 
-    schema = backup_data.get("schema", {})
-    backup_collections = backup_data.get("collections", {})
+    schema = reader.schema
+    backup_collections = reader.collections
 
     # Déterminer les collections à restaurer
     if collections:
@@ -198,6 +352,15 @@ def restore_weaviate(
         classes_to_restore = list(backup_collections.keys())
 
     print(f"\n  Collections à restaurer: {', '.join(classes_to_restore)}")
+    incomplete = [c for c in classes_to_restore if not backup_collections[c].get("complete", True)]
+    if incomplete:
+        print(f"  ATTENTION: backup incomplet pour {', '.join(incomplete)}")
+
+    # Progression (reprise)
+    progress = RestoreProgress(
+        None if reader.is_legacy or dry_run else backup_path / PROGRESS_NAME,
+        resume
+    )
 
     # Vérifier les collections existantes
     print(f"\n[2/4] Vérification des collections existantes...")
@@ -205,6 +368,9 @@ def restore_weaviate(
     print(f"  Collections existantes: {', '.join(existing_classes) or '(aucune)'}")
 
     conflicts = [c for c in classes_to_restore if c in existing_classes]
+    if resume:
+        # Les collections en cours de reprise existent déjà : ce n'est pas un conflit
+        conflicts = [c for c in conflicts if not progress.done(c)]
     if conflicts:
         print(f"  Conflits détectés: {', '.join(conflicts)}")
         if clear_existing:
@@ -230,11 +396,13 @@ def restore_weaviate(
             else:
                 if delete_class(class_name):
                     print(f"    Supprimé: {class_name}")
+                    progress.mark(class_name, 0)
                 else:
                     print(f"    ERREUR suppression: {class_name}")
 
     # Créer les classes
     print("\n  Création des classes...")
+    current_classes = [] if dry_run else get_existing_classes()
     for class_name in classes_to_restore:
         if class_name in schema_classes:
             class_schema = schema_classes[class_name]
@@ -242,7 +410,6 @@ def restore_weaviate(
                 print(f"    [DRY-RUN] Création de {class_name}")
             else:
                 # Vérifier si existe déjà (après clear)
-                current_classes = get_existing_classes()
                 if class_name not in current_classes:
                     if create_class(class_schema):
                         print(f"    Créé: {class_name}")
@@ -254,21 +421,35 @@ def restore_weaviate(
             print(f"    Schéma manquant pour: {class_name}")
 
     # Insérer les objets
-    print(f"\n[4/4] Insertion des objets...")
+    print(f"\n[4/4] Insertion des objets ({workers} collections en parallèle)...")
     stats = {"success": 0, "failures": 0, "by_class": {}}
 
+    to_insert = []
     for class_name in classes_to_restore:
-        objects = backup_collections.get(class_name, [])
-        if not objects:
+        count = backup_collections[class_name].get("objects", 0)
+        if not count:
             print(f"  {class_name}: 0 objets")
             continue
 
         if dry_run:
-            print(f"  [DRY-RUN] {class_name}: {len(objects)} objets à insérer")
-            stats["by_class"][class_name] = {"success": len(objects), "failures": 0}
-            stats["success"] += len(objects)
+            print(f"  [DRY-RUN] {class_name}: {count} objets à insérer")
+            stats["by_class"][class_name] = {"success": count, "failures": 0}
+            stats["success"] += count
         else:
-            success, failures = batch_insert_objects(class_name, objects)
+            to_insert.append(class_name)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            class_name: executor.submit(restore_collection, reader, progress, class_name)
+            for class_name in to_insert
+        }
+        for class_name, future in futures.items():
+            try:
+                success, failures = future.result()
+            except requests.RequestException as e:
+                print(f"  Erreur lors de la restauration de {class_name}: {e}")
+                print("  → Relancez avec --resume pour reprendre")
+                success, failures = 0, 0
             stats["by_class"][class_name] = {"success": success, "failures": failures}
             stats["success"] += success
             stats["failures"] += failures
@@ -294,10 +475,12 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Exemples:
-  python weaviate_restore.py backup.json
-  python weaviate_restore.py backup.json --dry-run
-  python weaviate_restore.py backup.json --collections Thought,Conversation
-  python weaviate_restore.py backup.json --clear-existing
+  python weaviate_restore.py exports/backup_20260131_120000
+  python weaviate_restore.py exports/backup_20260131_120000 --dry-run
+  python weaviate_restore.py exports/backup_20260131_120000 --collections Thought,Conversation
+  python weaviate_restore.py exports/backup_20260131_120000 --clear-existing
+  python weaviate_restore.py exports/backup_20260131_120000 --resume
+  python weaviate_restore.py backup.json   (ancien format)
 
 ATTENTION: --clear-existing supprime les donnees existantes!
         """
@@ -306,7 +489,7 @@ ATTENTION: --clear-existing supprime les donnees existantes!
     parser.add_argument(
         "backup",
         type=Path,
-        help="Chemin du fichier de backup"
+        help="Dossier du backup (ou ancien fichier JSON)"
     )
 
     parser.add_argument(
@@ -328,6 +511,19 @@ ATTENTION: --clear-existing supprime les donnees existantes!
         help="Prévisualiser les actions sans les exécuter"
     )
 
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=4,
+        help="Collections restaurées en parallèle (défaut: 4)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Sauter les parties déjà insérées lors d'une restauration interrompue"
+    )
+
     parser.add_argument(
         "--url",
         type=str,
@@ -339,7 +535,7 @@ ATTENTION: --clear-existing supprime les donnees existantes!
 
     # Vérifier que le fichier existe
     if not args.backup.exists():
-        print(f"ERREUR: Fichier non trouvé: {args.backup}")
+        print(f"ERREUR: Backup non trouvé: {args.backup}")
         sys.exit(1)
 
     # URL Weaviate
@@ -365,7 +561,9 @@ ATTENTION: --clear-existing supprime les donnees existantes!
         backup_path=args.backup,
         collections=collections,
         clear_existing=args.clear_existing,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        workers=args.workers,
+        resume=args.resume
     )
 
 
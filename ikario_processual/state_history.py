@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+StateHistory - Historique compressé des StateTensors (keyframes + deltas float16).
+
+Chaque cycle créait un objet StateTensor complet dans Weaviate : 8 vecteurs
+nommés de 1024 floats, chacun avec ses entrées HNSW. Or la plupart des
+cycles ne déplacent le tenseur que d'un delta de l'ordre de 0.001.
+
+Ce module stocke l'historique localement (SQLite) :
+- une keyframe complète (float32) tous les `keyframe_interval` états ;
+- entre deux keyframes, le delta (X_t - keyframe) en float16 compressé zlib.
+
+Le delta est calculé par rapport à la keyframe (et non à l'état précédent) :
+la reconstruction d'un état coûte une keyframe + un delta, sans accumulation
+d'erreur de quantification.
+
+Accès (get_state_history() : instance partagée par le processus) :
+- get(state_id)              : accès aléatoire à n'importe quel état
+- get_history(limit)         : N derniers états (ordre décroissant)
+- scan_range(start, end)     : parcours ordonné (une keyframe décodée par segment)
+
+Seul un sous-ensemble configurable des états (keyframes, chocs) doit être
+indexé dans Weaviate pour la recherche vectorielle : voir should_index().
+Les lecteurs d'états (outils MCP d'identité, x_ref de la vigilance) passent
+donc par cet historique et n'interrogent Weaviate qu'en repli.
+
+Configuration (variables d'environnement) :
+- IKARIO_STATE_HISTORY        : fichier SQLite (défaut ~/.ikario/state_history.sqlite)
+- IKARIO_KEYFRAME_INTERVAL    : états entre deux keyframes (défaut 50)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .state_tensor import EMBEDDING_DIM, StateTensor
+
+TENSOR_SHAPE = (8, EMBEDDING_DIM)
+
+
+def _default_history_path() -> str:
+    return os.getenv(
+        "IKARIO_STATE_HISTORY", str(Path.home() / ".ikario" / "state_history.sqlite")
+    )
+
+
+@dataclass
+class StateHistoryConfig:
+    """Configuration de l'historique compressé."""
+    path: str = field(default_factory=_default_history_path)
+    keyframe_interval: int = field(
+        default_factory=lambda: int(os.getenv("IKARIO_KEYFRAME_INTERVAL", "50"))
+    )
+    # Sous-ensemble indexé dans Weaviate
+    index_keyframes: bool = True
+    index_chocs: bool = True
+    index_every: int = 0  # En plus : 1 état sur N (0 = désactivé)
+
+
+class StateHistoryStore:
+    """
+    Historique local des StateTensors avec keyframes et deltas float16.
+
+    Usage:
+        history = StateHistoryStore()
+        is_keyframe = history.append(X_new, is_choc=dissonance.is_choc)
+        X_42 = history.get(42)
+        recent = history.get_history(limit=10)
+        for state in history.scan_range(100, 200):
+            ...
+    """
+
+    def __init__(self, config: Optional[StateHistoryConfig] = None):
+        self.config = config or StateHistoryConfig()
+        path = Path(self.config.path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS states ("
+            " state_id INTEGER PRIMARY KEY,"
+            " keyframe_id INTEGER NOT NULL,"
+            " is_keyframe INTEGER NOT NULL,"
+            " is_choc INTEGER NOT NULL DEFAULT 0,"
+            " payload BLOB NOT NULL,"
+            " props TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        # Dernière keyframe (évite de la relire à chaque append)
+        self._keyframe_id: Optional[int] = None
+        self._keyframe: Optional[np.ndarray] = None
+        self._decoded_cache: Dict[int, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Encodage
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _props(tensor: StateTensor) -> str:
+        return json.dumps({
+            'timestamp': tensor.timestamp,
+            'previous_state_id': tensor.previous_state_id,
+            'trigger_type': tensor.trigger_type,
+            'trigger_content': tensor.trigger_content,
+            'embedding_model': tensor.embedding_model,
+        })
+
+    @staticmethod
+    def _build(state_id: int, matrix: np.ndarray, props_json: str) -> StateTensor:
+        props = json.loads(props_json)
+        tensor = StateTensor.from_matrix(matrix, state_id, props['timestamp'])
+        tensor.previous_state_id = props.get('previous_state_id', -1)
+        tensor.trigger_type = props.get('trigger_type', '')
+        tensor.trigger_content = props.get('trigger_content', '')
+        tensor.embedding_model = props.get('embedding_model', tensor.embedding_model)
+        return tensor
+
+    @staticmethod
+    def _decode_keyframe(payload: bytes) -> np.ndarray:
+        return np.frombuffer(zlib.decompress(payload), dtype=np.float32).reshape(TENSOR_SHAPE)
+
+    @staticmethod
+    def _decode_delta(payload: bytes) -> np.ndarray:
+        return np.frombuffer(zlib.decompress(payload), dtype=np.float16).reshape(TENSOR_SHAPE)
+
+    def _keyframe_matrix(self, keyframe_id: int, payload: Optional[bytes] = None) -> np.ndarray:
+        if keyframe_id == self._keyframe_id and self._keyframe is not None:
+            return self._keyframe
+        cached = self._decoded_cache.get(keyframe_id)
+        if cached is not None:
+            return cached
+        if payload is None:
+            row = self._conn.execute(
+                "SELECT payload FROM states WHERE state_id = ?", (keyframe_id,)
+            ).fetchone()
+            payload = row[0]
+        matrix = self._decode_keyframe(payload)
+        # Petit cache : les lectures récentes touchent peu de keyframes
+        if len(self._decoded_cache) >= 8:
+            self._decoded_cache.pop(next(iter(self._decoded_cache)))
+        self._decoded_cache[keyframe_id] = matrix
+        return matrix
+
+    def _reconstruct(self, row: Tuple[int, int, int, bytes, str]) -> StateTensor:
+        state_id, keyframe_id, is_keyframe, payload, props = row
+        if is_keyframe:
+            matrix = self._keyframe_matrix(state_id, payload).astype(np.float64)
+        else:
+            keyframe = self._keyframe_matrix(keyframe_id)
+            matrix = keyframe.astype(np.float64) + self._decode_delta(payload)
+        return self._build(state_id, matrix, props)
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _load_last_keyframe(self) -> None:
+        row = self._conn.execute(
+            "SELECT state_id, payload FROM states WHERE is_keyframe = 1"
+            " ORDER BY state_id DESC LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            self._keyframe_id = row[0]
+            self._keyframe = self._decode_keyframe(row[1])
+
+    def append(self, tensor: StateTensor, is_choc: bool = False) -> bool:
+        """
+        Ajoute un état à l'historique (remplace un state_id déjà présent).
+
+        Returns:
+            True si l'état a été stocké comme keyframe
+        """
+        matrix = tensor.to_matrix()
+        with self._lock:
+            if self._keyframe_id is None:
+                self._load_last_keyframe()
+
+            is_keyframe = (
+                self._keyframe_id is None
+                or tensor.state_id <= self._keyframe_id
+                or tensor.state_id - self._keyframe_id >= self.config.keyframe_interval
+            )
+
+            if is_keyframe:
+                keyframe = matrix.astype(np.float32)
+                payload = zlib.compress(keyframe.tobytes())
+                keyframe_id = tensor.state_id
+                self._keyframe_id, self._keyframe = keyframe_id, keyframe
+            else:
+                keyframe_id = self._keyframe_id
+                delta = (matrix - self._keyframe.astype(np.float64)).astype(np.float16)
+                payload = zlib.compress(delta.tobytes())
+
+            self._decoded_cache.pop(tensor.state_id, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO states"
+                " (state_id, keyframe_id, is_keyframe, is_choc, payload, props)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (tensor.state_id, keyframe_id, int(is_keyframe), int(is_choc),
+                 payload, self._props(tensor)),
+            )
+            self._conn.commit()
+        return is_keyframe
+
+    def should_index(self, state_id: int, is_keyframe: bool, is_choc: bool) -> bool:
+        """Indique si un état doit aussi être indexé dans Weaviate."""
+        if is_keyframe and self.config.index_keyframes:
+            return True
+        if is_choc and self.config.index_chocs:
+            return True
+        return bool(self.config.index_every) and state_id % self.config.index_every == 0
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    _COLUMNS = "state_id, keyframe_id, is_keyframe, payload, props"
+
+    def get(self, state_id: int) -> Optional[StateTensor]:
+        """Reconstruit un état quelconque (keyframe + delta)."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM states WHERE state_id = ?", (state_id,)
+            ).fetchone()
+            return self._reconstruct(row) if row else None
+
+    def latest_state_id(self) -> int:
+        """state_id le plus récent (-1 si vide)."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(state_id) FROM states").fetchone()
+        return row[0] if row and row[0] is not None else -1
+
+    def get_current(self) -> Optional[StateTensor]:
+        """État le plus récent."""
+        latest = self.latest_state_id()
+        return self.get(latest) if latest >= 0 else None
+
+    def get_history(self, limit: int = 10) -> List[StateTensor]:
+        """N derniers états, du plus récent au plus ancien."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM states ORDER BY state_id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            return [self._reconstruct(row) for row in rows]
+
+    def scan_range(self, start_id: int, end_id: int) -> Iterator[StateTensor]:
+        """États de start_id à end_id inclus, dans l'ordre croissant."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM states WHERE state_id BETWEEN ? AND ?"
+                " ORDER BY state_id",
+                (start_id, end_id),
+            ).fetchall()
+            states = [self._reconstruct(row) for row in rows]
+        yield from states
+
+    def scan_range_matrices(self, start_id: int, end_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parcours vectorisé : state_ids (N,) et tenseurs empilés (N, 8, 1024).
+
+        Chaque keyframe n'est décodée qu'une fois pour tout son segment.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM states WHERE state_id BETWEEN ? AND ?"
+                " ORDER BY state_id",
+                (start_id, end_id),
+            ).fetchall()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            stacked = np.empty((len(rows), *TENSOR_SHAPE), dtype=np.float64)
+            for i, (state_id, keyframe_id, is_keyframe, payload, _) in enumerate(rows):
+                if is_keyframe:
+                    stacked[i] = self._keyframe_matrix(state_id, payload)
+                else:
+                    stacked[i] = self._keyframe_matrix(keyframe_id)
+                    stacked[i] += self._decode_delta(payload)
+        return ids, stacked
+
+    def count(self) -> int:
+        """Nombre d'états stockés."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM states").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Taille stockée vs tenseurs float64 bruts."""
+        with self._lock:
+            count, keyframes, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(is_keyframe), 0),"
+                " COALESCE(SUM(LENGTH(payload)), 0) FROM states"
+            ).fetchone()
+        raw = count * 8 * EMBEDDING_DIM * 8
+        return {
+            'states': count,
+            'keyframes': keyframes,
+            'stored_bytes': stored,
+            'raw_bytes': raw,
+            'compression_ratio': (raw / stored) if stored else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_history: Optional[StateHistoryStore] = None
+_history_lock = threading.Lock()
+
+
+def get_state_history() -> StateHistoryStore:
+    """Historique partagé par le processus (IKARIO_STATE_HISTORY), ouvert au premier appel."""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = StateHistoryStore()
+    return _history
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+StateStore - État courant en mémoire avec persistance différée (write-behind).
+
+Avant : chaque cycle du LatentEngine lisait l'état courant dans Weaviate
+(fetch trié + 8 vecteurs nommés) puis insérait le nouveau tenseur 8×1024
+de façon synchrone. Deux allers-retours Weaviate sur le chemin critique.
+
+Maintenant :
+- Le StateTensor courant fait autorité en mémoire.
+- Chaque nouvel état est d'abord écrit dans un journal local (WAL),
+  fsync compris : un cycle validé n'est jamais perdu, même en cas de crash.
+- Un thread de fond persiste les états dans Weaviate par lots
+  (insert_many), avec UUID déterministes : rejouer le WAL est idempotent.
+- Au redémarrage, les états du WAL non acquittés sont rejoués.
+- Avec un StateHistoryStore, tous les états vont dans l'historique local
+  compressé ; seul le sous-ensemble choisi par should_index() (keyframes,
+  chocs) est indexé dans Weaviate.
+
+Configuration (variables d'environnement) :
+- IKARIO_STATE_WAL            : chemin du WAL (défaut ~/.ikario/state_wal.jsonl)
+- IKARIO_STATE_BATCH_SIZE     : taille max d'un lot (défaut 16)
+- IKARIO_STATE_FLUSH_INTERVAL : attente max avant envoi d'un lot, en s (défaut 0.5)
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .state_history import StateHistoryStore
+from .state_tensor import EMBEDDING_DIM, StateTensor, StateTensorRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _default_wal_path() -> str:
+    return os.getenv("IKARIO_STATE_WAL", str(Path.home() / ".ikario" / "state_wal.jsonl"))
+
+
+@dataclass
+class StateStoreConfig:
+    """Configuration du store write-behind."""
+    wal_path: str = field(default_factory=_default_wal_path)
+    batch_size: int = field(default_factory=lambda: int(os.getenv("IKARIO_STATE_BATCH_SIZE", "16")))
+    flush_interval_seconds: float = field(
+        default_factory=lambda: float(os.getenv("IKARIO_STATE_FLUSH_INTERVAL", "0.5"))
+    )
+    max_retry_delay_seconds: float = 30.0
+    fsync: bool = True
+
+
+# ============================================================================
+# WRITE-AHEAD LOG
+# ============================================================================
+
+class StateWAL:
+    """
+    Journal local append-only des états validés.
+
+    Format JSONL :
+    - {"type": "state", "state_id": ..., "props": {...}, "matrix": <base64 float64>, "is_choc": bool}
+    - {"type": "ack", "state_ids": [...]}  (états persistés dans Weaviate)
+
+    Le fichier est tronqué dès que tous les états sont acquittés.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._unacked: Dict[int, StateTensor] = {}
+        self._chocs: set = set()
+
+        # Relire les états non acquittés, puis réécrire un journal compact
+        self._unacked = self._replay()
+        self._rewrite(list(self._unacked.values()))
+
+    @staticmethod
+    def _encode(tensor: StateTensor, is_choc: bool = False) -> Dict[str, Any]:
+        matrix = np.ascontiguousarray(tensor.to_matrix(), dtype=np.float64)
+        props = tensor.to_dict()
+        props["timestamp"] = tensor.timestamp
+        return {
+            "type": "state",
+            "state_id": tensor.state_id,
+            "props": props,
+            "matrix": base64.b64encode(matrix.tobytes()).decode("ascii"),
+            "is_choc": is_choc,
+        }
+
+    @staticmethod
+    def _decode(record: Dict[str, Any]) -> StateTensor:
+        matrix = np.frombuffer(
+            base64.b64decode(record["matrix"]), dtype=np.float64
+        ).reshape(8, EMBEDDING_DIM).copy()
+        props = record["props"]
+        tensor = StateTensor.from_matrix(matrix, props["state_id"], props["timestamp"])
+        tensor.previous_state_id = props.get("previous_state_id", -1)
+        tensor.trigger_type = props.get("trigger_type", "")
+        tensor.trigger_content = props.get("trigger_content", "")
+        tensor.embedding_model = props.get("embedding_model", tensor.embedding_model)
+        return tensor
+
+    def _replay(self) -> Dict[int, StateTensor]:
+        states: Dict[int, StateTensor] = {}
+        if not self.path.exists():
+            return states
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernière ligne tronquée par un crash pendant l'écriture
+                    logger.warning("WAL: ligne incomplète ignorée")
+                    continue
+                if record.get("type") == "state":
+                    states[record["state_id"]] = self._decode(record)
+                    if record.get("is_choc"):
+                        self._chocs.add(record["state_id"])
+                elif record.get("type") == "ack":
+                    for state_id in record.get("state_ids", []):
+                        states.pop(state_id, None)
+                        self._chocs.discard(state_id)
+
+        return dict(sorted(states.items()))
+
+    def _write(self, f, record: Dict[str, Any]) -> None:
+        f.write(json.dumps(record) + "\n")
+
+    def _sync(self, f) -> None:
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _rewrite(self, states: List[StateTensor]) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for tensor in states:
+                self._write(f, self._encode(tensor, tensor.state_id in self._chocs))
+            self._sync(f)
+        tmp_path.replace(self.path)
+
+    def pending(self) -> List[StateTensor]:
+        """États validés mais pas encore persistés dans Weaviate (ordre des state_id)."""
+        with self._lock:
+            return list(self._unacked.values())
+
+    def is_choc(self, state_id: int) -> bool:
+        """Indique si un état non acquitté a été validé comme choc."""
+        with self._lock:
+            return state_id in self._chocs
+
+    def append(self, tensor: StateTensor, is_choc: bool = False) -> None:
+        """Écrit un état de façon durable (retourne après fsync)."""
+        record = self._encode(tensor, is_choc)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                self._write(f, record)
+                self._sync(f)
+            self._unacked[tensor.state_id] = tensor
+            if is_choc:
+                self._chocs.add(tensor.state_id)
+
+    def ack(self, state_ids: List[int]) -> None:
+        """Marque des états comme persistés ; tronque le journal s'il est vide."""
+        with self._lock:
+            for state_id in state_ids:
+                self._unacked.pop(state_id, None)
+                self._chocs.discard(state_id)
+
+            if not self._unacked:
+                self._rewrite([])
+                return
+
+            with open(self.path, "a", encoding="utf-8") as f:
+                self._write(f, {"type": "ack", "state_ids": list(state_ids)})
+                self._sync(f)
+
+
+# ============================================================================
+# WRITE-BEHIND STORE
+# ============================================================================
+
+class WriteBehindStateStore:
+    """
+    État courant faisant autorité en mémoire + persistance Weaviate en arrière-plan.
+
+    Usage:
+        store = WriteBehindStateStore(StateTensorRepository(client))
+        X_t = store.load()           # WAL rejoué + dernier état Weaviate
+        store.commit(X_new)          # WAL (durable) puis mémoire ; Weaviate plus tard
+        store.flush(timeout=5)       # Attendre la persistance (tests, arrêt)
+        store.close()
+
+    Avec history=StateHistoryStore(...), chaque état est ajouté à l'historique
+    compressé et seuls les états retenus par history.should_index() sont
+    envoyés à Weaviate.
+    """
+
+    def __init__(
+        self,
+        repository: StateTensorRepository,
+        config: Optional[StateStoreConfig] = None,
+        history: Optional[StateHistoryStore] = None,
+    ):
+        self.repository = repository
+        self.config = config or StateStoreConfig()
+        self.history = history
+        self.wal = StateWAL(self.config.wal_path, fsync=self.config.fsync)
+
+        self._current: Optional[StateTensor] = None
+        self._loaded = False
+        self._queue: Deque[StateTensor] = deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistiques
+        self.persisted_count = 0
+        self.batch_count = 0
+        self.failure_count = 0
+        self.indexed_count = 0
+        self.last_error: Optional[str] = None
+        # Décision d'indexation des états déjà historisés (stable entre essais)
+        self._index_flags: Dict[int, bool] = {}
+
+    @property
+    def current(self) -> Optional[StateTensor]:
+        """État courant en mémoire (None si load() n'a rien trouvé)."""
+        return self._current
+
+    def load(self) -> Optional[StateTensor]:
+        """
+        Initialise l'état courant : états du WAL non persistés + dernier état
+        stocké (historique local et Weaviate).
+
+        Les états du WAL sont remis en file pour persistance.
+        """
+        pending = self.wal.pending()
+
+        stored: Optional[StateTensor] = None
+        try:
+            stored = self.repository.get_current()
+        except Exception as e:
+            logger.warning(f"Lecture de l'état Weaviate impossible, WAL seul utilisé: {e}")
+
+        # Weaviate n'a que les états indexés : l'historique peut être plus récent
+        historized = self.history.get_current() if self.history is not None else None
+
+        candidates = [t for t in [stored, historized, *pending] if t is not None]
+        with self._cond:
+            self._current = max(candidates, key=lambda t: t.state_id) if candidates else None
+            self._queue.extend(pending)
+            self._loaded = True
+            self._cond.notify_all()
+
+        if pending:
+            logger.info(f"WAL: {len(pending)} état(s) non persisté(s) rejoué(s)")
+        self._ensure_worker()
+        return self._current
+
+    def commit(self, tensor: StateTensor, is_choc: bool = False) -> None:
+        """
+        Valide un nouvel état : WAL (durable), mémoire, puis file de persistance.
+
+        Aucun aller-retour Weaviate : la persistance se fait en arrière-plan.
+        is_choc sert à la politique d'indexation de l'historique.
+        """
+        self.wal.append(tensor, is_choc)
+        with self._cond:
+            self._current = tensor
+            self._queue.append(tensor)
+            self._cond.notify_all()
+        self._ensure_worker()
+
+    @property
+    def pending_count(self) -> int:
+        """Nombre d'états pas encore persistés dans Weaviate."""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que tous les états soient persistés.
+
+        Returns:
+            True si la file est vide, False si le timeout est atteint.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Persiste ce qui reste puis arrête le thread (le WAL couvre le reste)."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        return flushed
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques de persistance."""
+        return {
+            'pending': self.pending_count,
+            'persisted': self.persisted_count,
+            'indexed': self.indexed_count,
+            'batches': self.batch_count,
+            'failures': self.failure_count,
+            'last_error': self.last_error,
+        }
+
+    # ------------------------------------------------------------------
+    # Thread de persistance
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        with self._cond:
+            if self._thread is not None or self._stop:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="ikario-state-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self) -> List[StateTensor]:
+        with self._cond:
+            while not self._queue and not self._stop:
+                self._cond.wait()
+            if not self._queue:
+                return []
+
+            # Laisser le lot se remplir un peu (regroupement des écritures)
+            deadline = time.monotonic() + self.config.flush_interval_seconds
+            while len(self._queue) < self.config.batch_size and not self._stop:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            while self._queue and len(batch) < self.config.batch_size:
+                batch.append(self._queue.popleft())
+            self._in_flight = len(batch)
+            return batch
+
+    def _select_for_index(self, batch: List[StateTensor]) -> List[StateTensor]:
+        """Historise le lot et retourne les états à indexer dans Weaviate."""
+        if self.history is None:
+            return batch
+
+        selected = []
+        for tensor in batch:
+            flag = self._index_flags.get(tensor.state_id)
+            if flag is None:
+                is_choc = self.wal.is_choc(tensor.state_id)
+                is_keyframe = self.history.append(tensor, is_choc=is_choc)
+                flag = self.history.should_index(tensor.state_id, is_keyframe, is_choc)
+                self._index_flags[tensor.state_id] = flag
+            if flag:
+                selected.append(tensor)
+        return selected
+
+    def _run(self) -> None:
+        delay = 0.5
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            try:
+                to_index = self._select_for_index(batch)
+                if to_index:
+                    self.repository.save_many(to_index)
+            except Exception as e:
+                self.failure_count += 1
+                self.last_error = str(e)
+                logger.warning(
+                    f"Persistance de {len(batch)} état(s) échouée, nouvel essai dans {delay:.1f}s: {e}"
+                )
+                with self._cond:
+                    self._queue.extendleft(reversed(batch))
+                    self._in_flight = 0
+                    self._cond.notify_all()
+                    if self._stop:
+                        return
+                    self._cond.wait(delay)
+                delay = min(delay * 2, self.config.max_retry_delay_seconds)
+                continue
+
+            delay = 0.5
+            self.wal.ack([t.state_id for t in batch])
+            for tensor in batch:
+                self._index_flags.pop(tensor.state_id, None)
+            with self._cond:
+                self.indexed_count += len(to_index)
+                self.persisted_count += len(batch)
+                self.batch_count += 1
+                self._in_flight = 0
+                self._cond.notify_all()
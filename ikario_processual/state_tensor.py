@@ -378,6 +378,38 @@ class StateTensorRepository:
         )
         return str(result)
 
+    def save_many(self, tensors: List[StateTensor]) -> List[str]:
+        """
+        Sauvegarde plusieurs StateTensors en un seul lot.
+
+        Les UUID sont dérivés du state_id : réinsérer un état déjà
+        persisté (rejeu du WAL après crash) l'écrase au lieu de le dupliquer.
+
+        Returns:
+            UUIDs des objets
+
+        Raises:
+            RuntimeError: si une partie du lot a été rejetée
+        """
+        from weaviate.classes.data import DataObject
+        from weaviate.util import generate_uuid5
+
+        objects = [
+            DataObject(
+                properties=tensor.to_dict(),
+                vector=tensor.get_vectors_dict(),
+                uuid=generate_uuid5(f"state_tensor_{tensor.state_id}"),
+            )
+            for tensor in tensors
+        ]
+        result = self.collection.data.insert_many(objects)
+        if result.errors:
+            first_error = next(iter(result.errors.values()))
+            raise RuntimeError(
+                f"{len(result.errors)}/{len(objects)} états rejetés: {first_error.message}"
+            )
+        return [str(obj.uuid) for obj in objects]
+
     def get_by_state_id(self, state_id: int) -> Optional[StateTensor]:
         """Récupère un tenseur par son state_id."""
         results = self.collection.query.fetch_objects(
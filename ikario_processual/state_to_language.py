@@ -24,6 +24,12 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from .state_tensor import StateTensor, DIMENSION_NAMES
+from .direction_registry import (
+    CATEGORY_TO_DIMENSION,
+    ClientDirectionSource,
+    DirectionSet,
+    get_direction_registry,
+)
 
 # Configuration
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
@@ -72,21 +78,6 @@ class TranslationResult:
         }
 
 
-# Mapping categories → dimensions du tenseur
-CATEGORY_TO_DIMENSION = {
-    'epistemic': 'firstness',       # Rapport au savoir → Firstness
-    'affective': 'dispositions',    # Emotions → Dispositions
-    'cognitive': 'thirdness',       # Style de pensee → Thirdness
-    'relational': 'engagements',    # Rapport aux autres → Engagements
-    'ethical': 'valeurs',           # Orientation morale → Valeurs
-    'temporal': 'orientations',     # Rapport au temps → Orientations
-    'thematic': 'pertinences',      # Focus conceptuel → Pertinences
-    'metacognitive': 'secondness',  # Conscience de soi → Secondness
-    'vital': 'dispositions',        # Energie, risques → Dispositions
-    'ecosystemic': 'engagements',   # Rapport ecosystemique → Engagements
-    'philosophical': 'thirdness',   # Positions metaphysiques → Thirdness
-}
-
 # Marqueurs de raisonnement a detecter (Amendment #4)
 REASONING_MARKERS = [
     "je pense que",
@@ -134,6 +125,8 @@ class StateToLanguage:
             model: Modele a utiliser
         """
         self.directions = directions or []
+        self._direction_set: Optional[DirectionSet] = None
+        self._direction_set_key: Tuple[int, int] = (0, 0)
         self.client = anthropic_client
         self.model = model
         self._translations_count = 0
@@ -142,6 +135,15 @@ class StateToLanguage:
     def add_direction(self, direction: ProjectionDirection) -> None:
         """Ajoute une direction interpretable."""
         self.directions.append(direction)
+        self._direction_set = None
+
+    def _get_direction_set(self) -> DirectionSet:
+        """Matrice des directions (reconstruite si la liste a change)."""
+        key = (id(self.directions), len(self.directions))
+        if self._direction_set is None or key != self._direction_set_key:
+            self._direction_set = DirectionSet.from_directions(self.directions)
+            self._direction_set_key = key
+        return self._direction_set
 
     def project_state(self, X: StateTensor) -> Dict[str, Dict[str, float]]:
         """
@@ -155,22 +157,8 @@ class StateToLanguage:
                 ...
             }
         """
-        projections: Dict[str, Dict[str, float]] = {}
-
-        for direction in self.directions:
-            # Determiner quelle dimension du tenseur utiliser
-            dim_name = CATEGORY_TO_DIMENSION.get(direction.category, 'thirdness')
-            x_dim = getattr(X, dim_name)
-
-            # Calculer la projection
-            value = direction.project(x_dim)
-
-            # Organiser par categorie
-            if direction.category not in projections:
-                projections[direction.category] = {}
-            projections[direction.category][direction.name] = round(value, 3)
-
-        return projections
+        directions = self._get_direction_set()
+        return directions.to_profile(directions.project_tensor(X), decimals=3)
 
     def project_state_flat(self, X: StateTensor) -> Dict[str, float]:
         """
@@ -526,7 +514,7 @@ Reponds UNIQUEMENT avec le JSON de traduction."""
 
 def create_directions_from_weaviate(weaviate_client) -> List[ProjectionDirection]:
     """
-    Charge les directions depuis Weaviate.
+    Charge les directions depuis Weaviate (via le registre partage).
 
     Args:
         weaviate_client: Client Weaviate v4
@@ -537,16 +525,17 @@ def create_directions_from_weaviate(weaviate_client) -> List[ProjectionDirection
     directions = []
 
     try:
-        collection = weaviate_client.collections.get("ProjectionDirection")
+        direction_set = get_direction_registry().snapshot(ClientDirectionSource(weaviate_client))
 
-        for item in collection.iterator(include_vector=True):
+        for i in direction_set.order.argsort():
+            record = direction_set.records[i]
             direction = ProjectionDirection(
-                name=item.properties.get("name", "unknown"),
-                category=item.properties.get("category", "unknown"),
-                pole_positive=item.properties.get("pole_positive", ""),
-                pole_negative=item.properties.get("pole_negative", ""),
-                description=item.properties.get("description", ""),
-                vector=np.array(item.vector['default'] if isinstance(item.vector, dict) else item.vector),
+                name=record.get("name") or "unknown",
+                category=record.get("category") or "unknown",
+                pole_positive=record.get("pole_positive", ""),
+                pole_negative=record.get("pole_negative", ""),
+                description=record.get("description", ""),
+                vector=direction_set.matrix[i],
             )
             directions.append(direction)
 
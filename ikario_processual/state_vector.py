@@ -9,18 +9,32 @@ Il evolue a chaque occasion d'experience selon:
 Ce module gere:
 - Le schema Weaviate pour StateVector
 - La creation de S(0) a partir de l'historique
+- L'agregat incremental des vecteurs stockes (StateAggregator)
 - Les operations CRUD sur les etats
 """
 
+import json
 import os
-from datetime import datetime
-from typing import Any
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
 
 import numpy as np
 import requests
 
 # Configuration
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
+AGGREGATE_STATS_PATH = os.getenv(
+    "IKARIO_AGGREGATE_STATS", str(Path.home() / ".ikario" / "aggregate_state.npz")
+)
+
+# Poids de chaque source dans l'embedding agrege
+SOURCE_WEIGHTS = {
+    "Thought": 2.0,   # Pensees plus significatives
+    "Message": 1.0,
+}
 
 # Schema de la collection StateVector
 STATE_VECTOR_SCHEMA = {
@@ -140,10 +154,12 @@ def get_all_thoughts() -> list[dict]:
     """Recupere toutes les pensees de Weaviate."""
     objects = []
     limit = 100
-    offset = 0
+    after = None
 
     while True:
-        url = f"{WEAVIATE_URL}/v1/objects?class=Thought&limit={limit}&offset={offset}"
+        url = f"{WEAVIATE_URL}/v1/objects?class=Thought&limit={limit}"
+        if after:
+            url += f"&after={after}"
         response = requests.get(url)
 
         if response.status_code != 200:
@@ -154,7 +170,7 @@ def get_all_thoughts() -> list[dict]:
             break
 
         objects.extend(batch)
-        offset += limit
+        after = batch[-1]["id"]
 
     return objects
 
@@ -163,10 +179,12 @@ def get_all_messages() -> list[dict]:
     """Recupere tous les messages de Weaviate."""
     objects = []
     limit = 100
-    offset = 0
+    after = None
 
     while True:
-        url = f"{WEAVIATE_URL}/v1/objects?class=Message&limit={limit}&offset={offset}"
+        url = f"{WEAVIATE_URL}/v1/objects?class=Message&limit={limit}"
+        if after:
+            url += f"&after={after}"
         response = requests.get(url)
 
         if response.status_code != 200:
@@ -177,11 +195,53 @@ def get_all_messages() -> list[dict]:
             break
 
         objects.extend(batch)
-        offset += limit
+        after = batch[-1]["id"]
 
     return objects
 
 
+# Mots-cles a exclure des pensees
+THOUGHT_EXCLUDE_KEYWORDS = [
+    "test", "debug", "todo", "fixme", "xxx",
+    "lorem ipsum", "example", "placeholder"
+]
+THOUGHT_EXCLUDE_TYPES = ["test", "debug", "example"]
+
+
+def is_valid_thought(props: dict) -> bool:
+    """Regle de filtrage d'une pensee (voir filter_thoughts)."""
+    content = (props.get("content") or "").lower()
+    thought_type = (props.get("thought_type") or "").lower()
+
+    # Exclure les pensees de test
+    if thought_type in THOUGHT_EXCLUDE_TYPES:
+        return False
+
+    # Exclure les pensees trop courtes
+    if len(content) < 20:
+        return False
+
+    # Exclure si contient des mots-cles de test
+    return not any(kw in content for kw in THOUGHT_EXCLUDE_KEYWORDS)
+
+
+def is_assistant_message(props: dict) -> bool:
+    """Regle de filtrage d'un message (voir filter_assistant_messages)."""
+    role = (props.get("role") or "").lower()
+    content = props.get("content") or ""
+
+    # Ne garder que les messages assistant
+    if role != "assistant":
+        return False
+
+    # Exclure les messages trop courts
+    if len(content) < 50:
+        return False
+
+    # Exclure les messages d'erreur ou systeme
+    return not (content.startswith("[Error") or content.startswith("[System"))
+
+
 def filter_thoughts(thoughts: list[dict]) -> list[dict]:
     """
     Filtre les pensees en enlevant celles liees aux tests.
@@ -191,34 +251,7 @@ def filter_thoughts(thoughts: list[dict]) -> list[dict]:
     - Pensees tres courtes (< 20 caracteres)
     - Pensees de type "test" ou "debug"
     """
-    filtered = []
-
-    # Mots-cles a exclure
-    exclude_keywords = [
-        "test", "debug", "todo", "fixme", "xxx",
-        "lorem ipsum", "example", "placeholder"
-    ]
-
-    for thought in thoughts:
-        props = thought.get("properties", {})
-        content = props.get("content", "").lower()
-        thought_type = props.get("thought_type", "").lower()
-
-        # Exclure les pensees de test
-        if thought_type in ["test", "debug", "example"]:
-            continue
-
-        # Exclure les pensees trop courtes
-        if len(content) < 20:
-            continue
-
-        # Exclure si contient des mots-cles de test
-        if any(kw in content for kw in exclude_keywords):
-            continue
-
-        filtered.append(thought)
-
-    return filtered
+    return [t for t in thoughts if is_valid_thought(t.get("properties", {}))]
 
 
 def filter_assistant_messages(messages: list[dict]) -> list[dict]:
@@ -229,28 +262,7 @@ def filter_assistant_messages(messages: list[dict]) -> list[dict]:
     - role = "assistant"
     - Contenu non vide et significatif (> 50 caracteres)
     """
-    filtered = []
-
-    for msg in messages:
-        props = msg.get("properties", {})
-        role = props.get("role", "").lower()
-        content = props.get("content", "")
-
-        # Ne garder que les messages assistant
-        if role != "assistant":
-            continue
-
-        # Exclure les messages trop courts
-        if len(content) < 50:
-            continue
-
-        # Exclure les messages d'erreur ou systeme
-        if content.startswith("[Error") or content.startswith("[System"):
-            continue
-
-        filtered.append(msg)
-
-    return filtered
+    return [m for m in messages if is_assistant_message(m.get("properties", {}))]
 
 
 def compute_aggregate_embedding(
@@ -261,6 +273,9 @@ def compute_aggregate_embedding(
     """
     Calcule l'embedding agrege a partir des pensees et messages.
 
+    Re-encode chaque texte : prefer StateAggregator, qui agrege les vecteurs
+    deja stockes dans Weaviate sans modele.
+
     Strategie:
     1. Extraire le contenu textuel de chaque element
     2. Calculer l'embedding de chaque texte
@@ -317,32 +332,35 @@ def compute_aggregate_embedding(
 
 
 def create_initial_state(
-    thoughts: list[dict],
-    messages: list[dict],
+    thoughts: list[dict] | int,
+    messages: list[dict] | int,
     embedding: np.ndarray
 ) -> dict:
     """
     Cree l'etat initial S(0) dans Weaviate.
 
     Args:
-        thoughts: Pensees utilisees pour construire S(0)
-        messages: Messages utilises pour construire S(0)
+        thoughts: Pensees utilisees pour construire S(0) (ou leur nombre)
+        messages: Messages utilises pour construire S(0) (ou leur nombre)
         embedding: Vecteur d'etat calcule
 
     Returns:
         Objet S(0) cree
     """
+    thoughts_count = thoughts if isinstance(thoughts, int) else len(thoughts)
+    messages_count = messages if isinstance(messages, int) else len(messages)
+
     s0_data = {
         "state_id": 0,
         "timestamp": datetime.now().isoformat() + "Z",
         "previous_state_id": -1,  # Pas d'etat precedent
         "trigger_type": "initialization",
         "trigger_content": "Creation de l'etat initial a partir de l'historique",
-        "occasion_summary": f"Naissance processuelle d'Ikario - agregation de {len(thoughts)} pensees et {len(messages)} messages",
+        "occasion_summary": f"Naissance processuelle d'Ikario - agregation de {thoughts_count} pensees et {messages_count} messages",
         "response_summary": "Etat initial S(0) cree avec succes",
         "thoughts_created": 0,
-        "source_thoughts_count": len(thoughts),
-        "source_messages_count": len(messages),
+        "source_thoughts_count": thoughts_count,
+        "source_messages_count": messages_count,
     }
 
     # Creer l'objet avec le vecteur
@@ -437,3 +455,410 @@ def get_state_vector(state_id: int) -> dict | None:
     states = data.get("data", {}).get("Get", {}).get("StateVector", [])
 
     return states[0] if states else None
+
+
+# =============================================================================
+# Agregat incremental
+# =============================================================================
+
+AGGREGATE_PROPERTIES = {
+    "Thought": ["content", "thought_type", "timestamp"],
+    "Message": ["content", "role", "timestamp"],
+}
+
+SOURCE_FILTERS = {
+    "Thought": is_valid_thought,
+    "Message": is_assistant_message,
+}
+
+
+def server_filter(source: str):
+    """
+    Partie des regles de filtrage evaluable par Weaviate.
+
+    Longueur et mots-cles restent verifies cote Python (is_valid_thought,
+    is_assistant_message) sur les objets deja reduits par ce filtre.
+    """
+    from weaviate.classes.query import Filter
+
+    if source == "Message":
+        return Filter.by_property("role").equal("assistant")
+    return Filter.all_of([
+        Filter.by_property("thought_type").not_equal(thought_type)
+        for thought_type in THOUGHT_EXCLUDE_TYPES
+    ])
+
+
+def _parse_timestamp(value) -> datetime | None:
+    """
+    Timestamp Weaviate (datetime ou chaine ISO, suffixe Z ou +00:00) en datetime UTC.
+
+    Les chaines ne sont pas comparables entre elles (Z / +00:00, avec ou sans
+    microsecondes) : toutes les comparaisons se font sur ce datetime.
+    """
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _iso(value) -> str | None:
+    """Timestamp normalise (UTC, ISO 8601) pour la persistance."""
+    parsed = _parse_timestamp(value)
+    return parsed.isoformat() if parsed is not None else None
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Verrou exclusif inter-processus sur un fichier .lock voisin de path."""
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _object_vector(obj) -> list | None:
+    vector = obj.vector
+    if isinstance(vector, dict):
+        vector = vector.get("default")
+    return vector or None
+
+
+class StateAggregator:
+    """
+    Embedding agrege de l'historique, maintenu de facon incrementale.
+
+    Statistique suffisante par source (Thought, Message) : somme des
+    vecteurs stockes dans Weaviate et nombre d'objets retenus. L'agregat
+    est la moyenne ponderee SOURCE_WEIGHTS, normalisee :
+
+        S = (2 * somme_pensees + somme_messages) / (2 * n_pensees + n_messages)
+
+    - rebuild(client) : parcours complet (iterateur gRPC a curseur, memoire
+      constante, aucun re-encodage)
+    - add(source, vector, props) : nouvel objet en O(1) (avance le curseur)
+    - record(source, uuid, vector, props) : objet tout juste ecrit, compte
+      en O(1) sans toucher au curseur de sync (voir record_new_object())
+    - sync(client) : rattrape les objets posterieurs au curseur, avec
+      filtres cote serveur ; les objets deja comptes par record() sont sautes
+
+    Les sommes sont persistees (npz) pour eviter toute reconstruction ;
+    les lectures-modifications-ecritures du fichier se font sous verrou
+    de fichier (serveur MCP, OccasionManager et daemon sont des processus
+    distincts).
+    """
+
+    def __init__(self, path: str | None = None, weights: dict | None = None):
+        self.path = Path(path or AGGREGATE_STATS_PATH).expanduser()
+        self.weights = dict(weights or SOURCE_WEIGHTS)
+        self.reset()
+
+    def reset(self) -> None:
+        """Remet les statistiques a zero."""
+        self.sums: dict[str, np.ndarray | None] = {source: None for source in self.weights}
+        self.counts: dict[str, int] = {source: 0 for source in self.weights}
+        self.checkpoints: dict[str, str | None] = {source: None for source in self.weights}
+        # Objets comptes par record() et pas encore atteints par le curseur : {uuid: timestamp}
+        self.recorded: dict[str, dict[str, str | None]] = {source: {} for source in self.weights}
+
+    # ------------------------------------------------------------------
+    # Mise a jour
+    # ------------------------------------------------------------------
+
+    def _accumulate(self, source: str, vector, props: dict | None) -> bool:
+        if props is not None and not SOURCE_FILTERS[source](props):
+            return False
+        if vector is None:
+            return False
+
+        vector = np.asarray(vector, dtype=np.float64)
+        if self.sums[source] is None:
+            self.sums[source] = np.zeros_like(vector)
+        self.sums[source] += vector
+        self.counts[source] += 1
+        return True
+
+    def add(self, source: str, vector, props: dict | None = None) -> bool:
+        """
+        Ajoute un objet a l'agregat en O(1) s'il passe les regles de filtrage.
+
+        Le curseur de sync avance jusqu'au timestamp de l'objet.
+
+        Returns:
+            True si l'objet a ete compte
+        """
+        if not self._accumulate(source, vector, props):
+            return False
+
+        timestamp = _parse_timestamp((props or {}).get("timestamp"))
+        checkpoint = _parse_timestamp(self.checkpoints[source])
+        if timestamp is not None and (checkpoint is None or timestamp > checkpoint):
+            self.checkpoints[source] = timestamp.isoformat()
+        return True
+
+    def record(self, source: str, uuid: str, vector, props: dict | None = None) -> bool:
+        """
+        Compte un objet tout juste ecrit, sans avancer le curseur de sync.
+
+        L'uuid est retenu pour que sync() ne le compte pas une seconde fois ;
+        les objets anterieurs, ecrits par un chemin qui n'appelle pas
+        record(), restent rattrapes par sync().
+
+        Returns:
+            True si l'objet a ete compte
+        """
+        uuid = str(uuid)
+        if uuid in self.recorded[source] or not self._accumulate(source, vector, props):
+            return False
+        self.recorded[source][uuid] = _iso((props or {}).get("timestamp"))
+        return True
+
+    def rebuild(self, client, examples: int = 3, save: bool = True) -> dict:
+        """
+        Recalcule l'agregat depuis les vecteurs stockes (aucun modele).
+
+        Parcourt chaque collection avec l'iterateur gRPC (curseur `after`) ;
+        Weaviate n'accepte pas de filtre avec le curseur, les regles sont donc
+        appliquees objet par objet pendant le flux.
+
+        Returns:
+            {source: {"seen": n, "kept": k, "examples": [...]}}
+        """
+        if not save:
+            return self._rebuild(client, examples)
+        with _file_lock(self.path):
+            report = self._rebuild(client, examples)
+            self.save()
+        return report
+
+    def _rebuild(self, client, examples: int = 3) -> dict:
+        self.reset()
+        report = {}
+
+        for source in self.weights:
+            collection = client.collections.get(source)
+            seen = 0
+            kept_examples = []
+
+            for obj in collection.iterator(
+                include_vector=True,
+                return_properties=AGGREGATE_PROPERTIES[source],
+            ):
+                seen += 1
+                if self.add(source, _object_vector(obj), obj.properties):
+                    if len(kept_examples) < examples:
+                        kept_examples.append(obj.properties.get("content", ""))
+
+            report[source] = {
+                "seen": seen,
+                "kept": self.counts[source],
+                "examples": kept_examples,
+            }
+
+        return report
+
+    def _iter_since(self, collection, source: str, page_size: int) -> Iterator[Any]:
+        """Objets filtres cote serveur et posterieurs au checkpoint (ordre chronologique)."""
+        from weaviate.classes.query import Filter, Sort
+
+        since = self.checkpoints[source]
+        boundary_ids: set[str] = set()
+
+        while True:
+            filters = server_filter(source)
+            if since is not None:
+                filters = filters & Filter.by_property("timestamp").greater_or_equal(
+                    _parse_timestamp(since)
+                )
+
+            result = collection.query.fetch_objects(
+                filters=filters,
+                sort=Sort.by_property("timestamp", ascending=True),
+                limit=page_size,
+                include_vector=True,
+                return_properties=AGGREGATE_PROPERTIES[source],
+            )
+            new = [obj for obj in result.objects if str(obj.uuid) not in boundary_ids]
+            if not new:
+                break
+
+            yield from new
+
+            # Pagination par timestamp : les ids deja vus a la borne sont ignores
+            last = _iso(new[-1].properties.get("timestamp"))
+            at_boundary = {
+                str(obj.uuid) for obj in result.objects
+                if _iso(obj.properties.get("timestamp")) == last
+            }
+            boundary_ids = at_boundary | (boundary_ids if last == since else set())
+            since = last
+
+            if len(result.objects) < page_size or last is None:
+                break
+
+    def sync(self, client, page_size: int = 500) -> dict[str, int]:
+        """
+        Ajoute les objets crees depuis le dernier checkpoint.
+
+        Sous verrou de fichier, la statistique persistee (si elle existe) est
+        relue avant le rattrapage puis reecrite, pour ne pas ecraser les
+        record() faits entre-temps par d'autres processus.
+
+        Returns:
+            Nombre d'objets ajoutes par source
+        """
+        with _file_lock(self.path):
+            self.load()
+            if all(checkpoint is None for checkpoint in self.checkpoints.values()):
+                # Jamais construit : reconstruction complete
+                report = self._rebuild(client)
+                self.save()
+                return {source: r["kept"] for source, r in report.items()}
+
+            added = {}
+            for source in self.weights:
+                collection = client.collections.get(source)
+                since = _parse_timestamp(self.checkpoints[source])
+                recorded = self.recorded[source]
+                added[source] = 0
+                for obj in self._iter_since(collection, source, page_size):
+                    if recorded.pop(str(obj.uuid), False) is not False:
+                        # Deja compte par record()
+                        continue
+                    timestamp = _parse_timestamp(obj.properties.get("timestamp"))
+                    # Deja compte lors d'un passage precedent (meme timestamp que la borne)
+                    if since is not None and timestamp is not None and timestamp <= since:
+                        continue
+                    if self.add(source, _object_vector(obj), obj.properties):
+                        added[source] += 1
+
+                # Objets enregistres que le curseur a depasses sans les revoir (supprimes)
+                cursor = _parse_timestamp(self.checkpoints[source])
+                if cursor is not None:
+                    for uuid, timestamp in list(recorded.items()):
+                        parsed = _parse_timestamp(timestamp)
+                        if parsed is not None and parsed < cursor:
+                            del recorded[uuid]
+
+            self.save()
+            return added
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def aggregate(self) -> np.ndarray:
+        """Embedding agrege normalise."""
+        total = None
+        total_weight = 0.0
+        for source, weight in self.weights.items():
+            if self.sums[source] is None or not self.counts[source]:
+                continue
+            contribution = weight * self.sums[source]
+            total = contribution if total is None else total + contribution
+            total_weight += weight * self.counts[source]
+
+        if total is None:
+            raise ValueError("Aucun contenu a agreger!")
+
+        aggregate = total / total_weight
+        return aggregate / np.linalg.norm(aggregate)
+
+    def stats(self) -> dict:
+        """Compteurs, checkpoints et objets enregistres en attente par source."""
+        return {
+            source: {
+                "count": self.counts[source],
+                "checkpoint": self.checkpoints[source],
+                "recorded": len(self.recorded[source]),
+            }
+            for source in self.weights
+        }
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Ecrit la statistique suffisante (ecriture atomique)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            f"sum_{source}": vector for source, vector in self.sums.items() if vector is not None
+        }
+        meta = {
+            "counts": self.counts,
+            "checkpoints": self.checkpoints,
+            "recorded": self.recorded,
+            "weights": self.weights,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> bool:
+        """Relit la statistique persistee. Returns False si absente."""
+        if not self.path.exists():
+            return False
+        with np.load(self.path) as data:
+            meta = json.loads(str(data["meta"]))
+            self.reset()
+            self.counts.update(meta["counts"])
+            self.checkpoints.update(meta["checkpoints"])
+            for source, recorded in meta.get("recorded", {}).items():
+                self.recorded[source] = dict(recorded)
+            for source in self.weights:
+                key = f"sum_{source}"
+                if key in data:
+                    self.sums[source] = data[key].astype(np.float64)
+        return True
+
+
+def record_new_object(source: str, uuid, vector, props: dict, path: str | None = None) -> bool:
+    """
+    Compte dans l'agregat persiste une pensee ou un message qui vient d'etre ecrit.
+
+    Appele par les chemins d'ecriture (add_thought, add_message,
+    OccasionManager) juste apres l'insertion : sous verrou de fichier,
+    relecture de la statistique, record() en O(1), sauvegarde. Tant que
+    l'agregat n'a jamais ete construit (aucune statistique persistee), ne
+    fait rien : le premier sync() fera la reconstruction complete. Une
+    erreur n'interrompt jamais l'ecriture.
+
+    Returns:
+        True si l'objet a ete compte
+    """
+    if uuid is None:
+        return False
+    try:
+        aggregator = StateAggregator(path=path)
+        with _file_lock(aggregator.path):
+            if not aggregator.load():
+                return False
+            if not aggregator.record(source, uuid, vector, props):
+                return False
+            aggregator.save()
+            return True
+    except Exception as e:
+        print(f"[StateVector] Mise a jour de l'agregat impossible: {e}")
+        return False
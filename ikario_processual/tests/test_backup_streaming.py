@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests du backup/restore en flux (curseur `after`, NDJSON + .npy, reprise).
+
+Weaviate est remplacé par un faux serveur en mémoire (module requests factice).
+
+Exécuter: pytest ikario_processual/tests/test_backup_streaming.py -v
+"""
+
+import json
+import uuid
+
+import numpy as np
+import pytest
+import requests
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import weaviate_backup
+import weaviate_restore
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class FakeWeaviate:
+    """Sous-ensemble de l'API REST : schema, objects (curseur after), batch."""
+
+    RequestException = requests.RequestException
+
+    def __init__(self):
+        self.classes = {}
+        self.objects = {}
+        self.object_requests = []
+        self.fail_after_pages = None
+
+    def add(self, class_name, n, dim=8, named=False):
+        self.classes[class_name] = {"class": class_name, "properties": []}
+        rng = np.random.default_rng(len(self.objects))
+        objects = self.objects.setdefault(class_name, {})
+        for i in range(n):
+            obj = {
+                "id": str(uuid.UUID(int=rng.integers(1 << 62) << 64 | i)),
+                "class": class_name,
+                "properties": {"content": f"{class_name} {i}", "rank": i},
+            }
+            if named:
+                obj["vectors"] = {"firstness": rng.standard_normal(dim).tolist(),
+                                  "valeurs": rng.standard_normal(dim).tolist()}
+            else:
+                obj["vector"] = rng.standard_normal(dim).tolist()
+            objects[obj["id"]] = obj
+
+    # --- requests ---
+
+    def Session(self):
+        return self
+
+    def get(self, url, params=None, timeout=None):
+        if url.endswith("/ready"):
+            return FakeResponse({})
+        if url.endswith("/v1/schema"):
+            return FakeResponse({"classes": list(self.classes.values())})
+        if url.endswith("/v1/objects"):
+            assert "offset" not in params
+            self.object_requests.append(dict(params))
+            if self.fail_after_pages is not None and len(self.object_requests) > self.fail_after_pages:
+                raise requests.ConnectionError("weaviate down")
+            ids = sorted(self.objects.get(params["class"], {}))
+            if params.get("after"):
+                ids = [i for i in ids if i > params["after"]]
+            page = []
+            for object_id in ids[:params["limit"]]:
+                obj = dict(self.objects[params["class"]][object_id])
+                if params.get("include") != "vector":
+                    obj.pop("vector", None)
+                    obj.pop("vectors", None)
+                page.append(obj)
+            return FakeResponse({"objects": page})
+        raise AssertionError(url)
+
+    def post(self, url, json=None, headers=None):
+        if url.endswith("/v1/schema"):
+            self.classes[json["class"]] = json
+            self.objects.setdefault(json["class"], {})
+            return FakeResponse({})
+        if url.endswith("/v1/batch/objects"):
+            results = []
+            for obj in json["objects"]:
+                self.objects.setdefault(obj["class"], {})[obj["id"]] = obj
+                results.append({"result": {"status": "SUCCESS"}})
+            return FakeResponse(results)
+        raise AssertionError(url)
+
+    def delete(self, url):
+        class_name = url.rsplit("/", 1)[-1]
+        self.classes.pop(class_name, None)
+        self.objects.pop(class_name, None)
+        return FakeResponse({})
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    server = FakeWeaviate()
+    monkeypatch.setattr(weaviate_backup, "requests", server)
+    monkeypatch.setattr(weaviate_restore, "requests", server)
+    return server
+
+
+class TestStreamingBackup:
+    """Export par parties, vecteurs binaires, reprise."""
+
+    def test_backup_uses_cursor_and_parts(self, fake, tmp_path):
+        fake.add("Thought", 25, dim=8)
+        fake.add("StateTensor", 7, dim=4, named=True)
+
+        stats = weaviate_backup.backup_weaviate(
+            tmp_path / "backup", include_vectors=True, vector_dtype="float16",
+            workers=2, part_size=10,
+        )
+
+        assert stats == {"Thought": 25, "StateTensor": 7}
+        manifest = json.loads((tmp_path / "backup" / "manifest.json").read_text())
+        thought = manifest["collections"]["Thought"]
+        assert [p["count"] for p in thought["parts"]] == [10, 10, 5]
+        assert thought["complete"]
+        assert set(manifest["collections"]["StateTensor"]["parts"][0]["vectors"]) == {
+            "firstness", "valeurs"
+        }
+        # Curseur : chaque page repart du dernier id de la précédente
+        thought_pages = [p for p in fake.object_requests if p["class"] == "Thought"]
+        assert "after" not in thought_pages[0]
+        assert all("after" in p for p in thought_pages[1:])
+
+    def test_resume_continues_after_cursor(self, fake, tmp_path):
+        fake.add("Thought", 30, dim=8)
+        fake.fail_after_pages = 2
+
+        weaviate_backup.backup_weaviate(
+            tmp_path / "backup", workers=1, part_size=10,
+        )
+        manifest = json.loads((tmp_path / "backup" / "manifest.json").read_text())
+        assert manifest["collections"]["Thought"]["objects"] == 20
+        assert not manifest["collections"]["Thought"]["complete"]
+
+        fake.fail_after_pages = None
+        fake.object_requests.clear()
+        stats = weaviate_backup.backup_weaviate(tmp_path / "backup", part_size=10, resume=True)
+
+        assert stats == {"Thought": 30}
+        assert fake.object_requests[0]["after"] == manifest["collections"]["Thought"]["cursor"]
+
+
+class TestStreamingRestore:
+    """Relecture partie par partie et reprise d'une restauration."""
+
+    def test_roundtrip(self, fake, tmp_path):
+        fake.add("Thought", 23, dim=8)
+        fake.add("StateTensor", 5, dim=4, named=True)
+        original = {c: {i: dict(o) for i, o in objs.items()} for c, objs in fake.objects.items()}
+        weaviate_backup.backup_weaviate(tmp_path / "backup", part_size=10)
+
+        fake.delete("/v1/schema/Thought")
+        fake.delete("/v1/schema/StateTensor")
+        stats = weaviate_restore.restore_weaviate(tmp_path / "backup", workers=2)
+
+        assert stats["success"] == 28 and stats["failures"] == 0
+        for object_id, obj in original["Thought"].items():
+            restored = fake.objects["Thought"][object_id]
+            assert restored["properties"] == obj["properties"]
+            assert np.allclose(restored["vector"], obj["vector"], atol=1e-6)
+        for object_id, obj in original["StateTensor"].items():
+            restored = fake.objects["StateTensor"][object_id]
+            assert np.allclose(restored["vectors"]["valeurs"], obj["vectors"]["valeurs"], atol=1e-6)
+
+    def test_resume_skips_inserted_parts(self, fake, tmp_path):
+        fake.add("Thought", 20, dim=8)
+        weaviate_backup.backup_weaviate(tmp_path / "backup", part_size=10)
+        (tmp_path / "backup" / "restore_progress.json").write_text(json.dumps({"Thought": 1}))
+
+        stats = weaviate_restore.restore_weaviate(tmp_path / "backup", resume=True)
+
+        assert stats["by_class"]["Thought"]["success"] == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests pour le ContradictionDetector - NLI par lots, cache LRU, budget.
+
+Le modèle NLI est remplacé par un faux _predict (aucun téléchargement).
+
+Exécuter: pytest ikario_processual/tests/test_contradiction_detector.py -v
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.contradiction_detector import (
+    ContradictionDetector,
+    HybridContradictionDetector,
+)
+from ikario_processual.dissonance import DissonanceConfig, compute_dissonance_enhanced
+from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
+
+
+class FakeNLIDetector(ContradictionDetector):
+    """Contradiction si l'hypothèse contient 'pas' ; enregistre les lots."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def _predict(self, pairs):
+        self.batches.append(list(pairs))
+        return np.array([
+            [0.05, 0.05, 0.9] if " pas " in f" {h} " else [0.8, 0.15, 0.05]
+            for _, h in pairs
+        ])
+
+
+def unit(v):
+    return v / np.linalg.norm(v)
+
+
+class TestContradictionDetector:
+    """Lots, cache et budget."""
+
+    def test_batch_is_one_forward_pass(self):
+        detector = FakeNLIDetector(batch_size=8)
+        results = detector.detect_batch(
+            "L'IA a une conscience",
+            ["L'IA n'a pas de conscience", "L'IA est consciente", "Ce n'est pas vrai"],
+        )
+
+        assert [r.is_contradiction for r in results] == [True, False, True]
+        assert len(detector.batches) == 1
+
+    def test_cache_hits_across_calls(self):
+        detector = FakeNLIDetector()
+        detector.detect_contradiction("A", "B n'est pas C")
+        is_contra, score = detector.detect_contradiction("A", "B n'est pas C")
+
+        assert is_contra and score == pytest.approx(0.9)
+        assert len(detector.batches) == 1
+        assert detector.cache_stats()['hits'] == 1
+
+    def test_duplicate_pairs_scored_once(self):
+        detector = FakeNLIDetector()
+        detector.score_pairs([("A", "B"), ("A", "B"), ("A", "C")])
+
+        assert len(detector.batches[0]) == 2
+
+    def test_lru_eviction(self):
+        detector = FakeNLIDetector(cache_size=2)
+        detector.score_pairs([("A", "1"), ("A", "2"), ("A", "3")])
+
+        assert detector.cache_stats()['size'] == 2
+        detector.score_pairs([("A", "1")])
+        assert len(detector.batches) == 2
+
+    def test_budget_limits_new_pairs(self):
+        detector = FakeNLIDetector()
+        detector.score_pairs([("A", "cached")])
+
+        verdicts = detector.detect_contradictions(
+            [("A", "cached"), ("A", "x"), ("A", "y"), ("A", "z")], max_new_pairs=1
+        )
+
+        assert verdicts[0] is not None and verdicts[1] is not None
+        assert verdicts[2] is None and verdicts[3] is None
+
+    def test_time_budget_keeps_caller_priority(self):
+        detector = FakeNLIDetector(batch_size=2)
+        pairs = [("A", "une hypothèse longue et prioritaire"), ("A", "b"), ("A", "c"), ("A", "d")]
+
+        results = detector.score_pairs(pairs, budget_ms=0)
+
+        assert results[0] is not None and results[1] is not None
+        assert results[2] is None and results[3] is None
+        assert detector.batches[0] == [("A", "b"), pairs[0]]
+
+
+class TestHybridDetector:
+    """Un seul lot NLI par cycle, zone grise prioritaire."""
+
+    def test_detect_many_batches_gray_zone(self):
+        nli = FakeNLIDetector()
+        hybrid = HybridContradictionDetector(nli_detector=nli, max_nli_pairs=1)
+        x = unit(np.random.randn(EMBEDDING_DIM))
+        noise = unit(np.random.randn(EMBEDDING_DIM))
+        gray = unit(x + 1.2 * noise)           # similarité ~0.6
+        close = unit(x + 0.1 * noise)          # similarité ~0.99
+        far = unit(noise - np.dot(noise, x) * x)  # similarité ~0
+
+        results = hybrid.detect_many("X", x, [
+            ("ce n'est pas X", gray),
+            ("X encore", close),
+            ("autre", far),
+        ])
+
+        assert results[0]['method'] == 'nli_zone_grise' and results[0]['is_hard_negative']
+        assert results[1]['method'] == 'nli_budget_exceeded'
+        assert results[2]['method'] == 'low_similarity'
+        assert len(nli.batches) == 1
+
+
+class TestDissonanceNLI:
+    """compute_dissonance_enhanced envoie la zone grise en un lot."""
+
+    def test_gray_zone_checked_in_one_batch(self):
+        X_t = StateTensor(state_id=0, timestamp="2026-01-01T00:00:00")
+        for dim_name in DIMENSION_NAMES:
+            setattr(X_t, dim_name, unit(np.random.randn(EMBEDDING_DIM)))
+        e_input = unit(np.random.randn(EMBEDDING_DIM))
+        rag_results = [
+            {
+                'content': text,
+                'input_text': "entrée",
+                'vector': unit(e_input + 1.2 * unit(np.random.randn(EMBEDDING_DIM))),
+                'source': 'message',
+            }
+            for text in ("il n'est pas vrai", "c'est exact", "ce n'est pas ça")
+        ]
+        nli = FakeNLIDetector()
+
+        result = compute_dissonance_enhanced(
+            e_input, X_t, rag_results, DissonanceConfig(use_nli=True), nli_detector=nli
+        )
+
+        assert len(nli.batches) == 1 and len(nli.batches[0]) == 3
+        assert len(result.hard_negatives) == 2
+        assert all(h['nli_score'] == pytest.approx(0.9) for h in result.hard_negatives)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -34,6 +34,7 @@ from ikario_processual.daemon import (
     Trigger,
     VerbalizationEvent,
     TriggerGenerator,
+    CycleScheduler,
     IkarioDaemon,
     create_daemon,
 )
@@ -838,5 +839,110 @@ class TestStatsTracking:
         asyncio.run(run_test())
 
 
+class TestCycleScheduler:
+    """Cycles hors de la boucle asyncio, par priorite."""
+
+    class SlowEngine:
+        """run_cycle synchrone et lent, comme le vrai LatentEngine."""
+
+        def __init__(self, delay: float = 0.1):
+            self.delay = delay
+            self.order = []
+
+        def run_cycle(self, trigger):
+            import time
+            time.sleep(self.delay)
+            self.order.append(trigger['content'])
+            return create_mock_cycle_result()
+
+    def test_event_loop_not_blocked(self):
+        """La boucle reste reactive pendant un cycle."""
+        stats = DaemonStats()
+        scheduler = CycleScheduler(self.SlowEngine(delay=0.3), stats)
+
+        async def run_test():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker_task = asyncio.create_task(ticker())
+            await scheduler.submit(Trigger(type=TriggerType.CORPUS, content="passage"))
+            ticker_task.cancel()
+            await scheduler.close()
+            return ticks
+
+        assert asyncio.run(run_test()) >= 10
+        assert stats.to_dict()['cycle_latency_ms']['p50'] >= 250
+
+    def test_user_trigger_preempts_queued_autonomous(self):
+        """Un message utilisateur passe devant les triggers autonomes en file."""
+        engine = self.SlowEngine(delay=0.05)
+        stats = DaemonStats()
+        scheduler = CycleScheduler(engine, stats)
+
+        async def run_test():
+            autonomous = [
+                asyncio.create_task(scheduler.submit(
+                    Trigger(type=TriggerType.CORPUS, content=f"corpus {i}")
+                ))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.01)  # "corpus 0" en cours, 1 et 2 en file
+            user = asyncio.create_task(scheduler.submit(
+                Trigger(type=TriggerType.USER, content="question", priority=2)
+            ))
+            await asyncio.gather(*autonomous, user)
+            await scheduler.close()
+
+        asyncio.run(run_test())
+
+        assert engine.order == ["corpus 0", "question", "corpus 1", "corpus 2"]
+        d = stats.to_dict()
+        assert d['preemptions'] == 2
+        assert d['max_queue_depth'] >= 2
+        assert d['queue_depth'] == 0
+        assert d['cycle_wait_ms']['p95'] > 0
+
+    def test_no_preemption_without_lower_priority_pending(self):
+        """Seuls les triggers moins prioritaires encore en file comptent."""
+        engine = self.SlowEngine(delay=0.05)
+        stats = DaemonStats()
+        scheduler = CycleScheduler(engine, stats)
+
+        async def run_test():
+            await scheduler.submit(Trigger(type=TriggerType.CORPUS, content="corpus 0"))
+            first = asyncio.create_task(scheduler.submit(
+                Trigger(type=TriggerType.USER, content="question 1", priority=2)
+            ))
+            await asyncio.sleep(0.01)  # "question 1" en cours, file vide
+            await scheduler.submit(Trigger(type=TriggerType.USER, content="question 2", priority=2))
+            await first
+            await scheduler.close()
+
+        asyncio.run(run_test())
+
+        assert stats.preemptions == 0
+        assert scheduler._pending == {}
+
+    def test_cycle_error_propagates(self):
+        """Une erreur du cycle remonte a l'appelant sans arreter le scheduler."""
+        engine = MagicMock()
+        engine.run_cycle.side_effect = [ValueError("Trigger content is required"), create_mock_cycle_result()]
+        scheduler = CycleScheduler(engine, DaemonStats())
+
+        async def run_test():
+            with pytest.raises(ValueError):
+                await scheduler.submit(Trigger(type=TriggerType.CORPUS, content=""))
+            result = await scheduler.submit(Trigger(type=TriggerType.CORPUS, content="ok"))
+            await scheduler.close()
+            return result
+
+        assert asyncio.run(run_test()).new_state is not None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests pour le DirectionRegistry - matrice partagée, etag, produit groupé.
+
+Les directions viennent d'une fausse source (aucun Weaviate).
+
+Exécuter: pytest ikario_processual/tests/test_direction_registry.py -v
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.direction_registry import (
+    CATEGORY_TO_DIMENSION,
+    DirectionRegistry,
+    DirectionRegistryConfig,
+    DirectionSet,
+    compute_etag,
+)
+from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
+from ikario_processual.state_to_language import ProjectionDirection, StateToLanguage
+
+CATEGORIES = ['epistemic', 'affective', 'ethical', 'vital', 'unknown_category', 'thematic']
+
+
+def unit(v):
+    return v / np.linalg.norm(v)
+
+
+class FakeSource:
+    """Source en mémoire : compte les chargements et vérifications d'etag."""
+
+    def __init__(self, n: int = 12):
+        rng = np.random.default_rng(0)
+        self.records = [
+            {'name': f"dir_{i}", 'category': CATEGORIES[i % len(CATEGORIES)]}
+            for i in range(n)
+        ]
+        self.vectors = [unit(rng.standard_normal(EMBEDDING_DIM)) for _ in range(n)]
+        self.updated = 1
+        self.loads = 0
+        self.versions = 0
+
+    def version(self, limit):
+        self.versions += 1
+        return compute_etag((r['name'], self.updated) for r in self.records)
+
+    def load(self, limit):
+        self.loads += 1
+        return list(self.records), list(self.vectors), self.version(limit)
+
+
+def create_tensor() -> StateTensor:
+    tensor = StateTensor(state_id=0, timestamp="2026-01-01T00:00:00")
+    for dim_name in DIMENSION_NAMES:
+        setattr(tensor, dim_name, unit(np.random.randn(EMBEDDING_DIM)))
+    return tensor
+
+
+class TestDirectionSet:
+    """Le produit groupé donne les mêmes valeurs que la boucle par direction."""
+
+    def test_profile_matches_loop(self):
+        source = FakeSource()
+        directions = DirectionSet(source.records, source.vectors)
+        state = unit(np.random.randn(EMBEDDING_DIM))
+
+        profile = directions.to_profile(directions.project(state))
+
+        for record, vector in zip(source.records, source.vectors):
+            expected = float(np.dot(state, vector))
+            assert profile[record['category']][record['name']] == pytest.approx(expected, abs=1e-4)
+        # Ordre de chargement conservé
+        assert list(profile) == list(dict.fromkeys(CATEGORIES))
+
+    def test_tensor_profile_uses_category_dimension(self):
+        source = FakeSource()
+        directions = DirectionSet(source.records, source.vectors)
+        X = create_tensor()
+
+        profile = directions.to_profile(directions.project_tensor(X))
+
+        for record, vector in zip(source.records, source.vectors):
+            dim_name = CATEGORY_TO_DIMENSION.get(record['category'], 'thirdness')
+            expected = float(np.dot(getattr(X, dim_name), vector))
+            assert profile[record['category']][record['name']] == pytest.approx(expected, abs=1e-4)
+        assert len(directions.groups) == len({
+            CATEGORY_TO_DIMENSION.get(c, 'thirdness') for c in CATEGORIES
+        })
+
+    def test_named_vectors_and_category_filter(self):
+        source = FakeSource()
+        directions = DirectionSet(source.records, source.vectors)
+        X = create_tensor()
+        named = {'firstness': X.firstness, 'valeurs': X.valeurs}
+
+        profile = directions.to_profile(
+            directions.project_tensor(named), categories=['epistemic', 'ethical', 'affective']
+        )
+
+        # 'affective' → dispositions, absente du dict : ignorée
+        assert set(profile) == {'epistemic', 'ethical'}
+
+
+class TestDirectionRegistry:
+    """Chargement unique, vérification d'etag, rechargement sur changement."""
+
+    def test_loads_once_and_checks_etag(self):
+        source = FakeSource()
+        registry = DirectionRegistry(source, DirectionRegistryConfig(refresh_interval_seconds=0))
+        state = unit(np.random.randn(EMBEDDING_DIM))
+
+        first = registry.profile(state)
+        second = registry.profile(state)
+
+        assert first == second
+        assert source.loads == 1
+        assert registry.stats()['version_checks'] == 1
+
+        source.updated = 2
+        registry.profile(state)
+        assert source.loads == 2
+
+    def test_refresh_interval_skips_version_check(self):
+        source = FakeSource()
+        registry = DirectionRegistry(source, DirectionRegistryConfig(refresh_interval_seconds=3600))
+
+        for _ in range(5):
+            registry.profile_tensor(create_tensor())
+
+        assert source.loads == 1
+        assert registry.stats()['version_checks'] == 0
+        registry.invalidate()
+        registry.snapshot()
+        assert registry.stats()['version_checks'] == 1
+
+    def test_keeps_last_set_when_source_fails(self):
+        source = FakeSource()
+        registry = DirectionRegistry(source, DirectionRegistryConfig(refresh_interval_seconds=0))
+        registry.snapshot()
+
+        def failing(limit):
+            raise ConnectionError("weaviate down")
+        source.version = failing
+
+        assert len(registry.snapshot()) == 12
+
+
+class TestStateToLanguageProjection:
+    """StateToLanguage.project_state passe par la matrice des directions."""
+
+    def test_project_state_matches_directions(self):
+        source = FakeSource()
+        directions = [
+            ProjectionDirection(
+                name=r['name'], category=r['category'], pole_positive="+",
+                pole_negative="-", description="", vector=v,
+            )
+            for r, v in zip(source.records, source.vectors)
+        ]
+        translator = StateToLanguage(directions=directions[:-1])
+        X = create_tensor()
+        translator.project_state(X)
+
+        translator.add_direction(directions[-1])
+        projections = translator.project_state(X)
+
+        assert sum(len(values) for values in projections.values()) == 12
+        for direction in directions:
+            dim_name = CATEGORY_TO_DIMENSION.get(direction.category, 'thirdness')
+            expected = round(direction.project(getattr(X, dim_name)), 3)
+            assert projections[direction.category][direction.name] == pytest.approx(expected, abs=1e-3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Tests et micro-benchmark des noyaux vectorisés (dissonance, fixation, lots).
+
+Les implémentations de référence ci-dessous reproduisent les anciennes
+boucles vecteur par vecteur ; les noyaux doivent donner les mêmes scores.
+
+Exécuter: pytest ikario_processual/tests/test_kernels.py -v -s
+"""
+
+import time
+import numpy as np
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
+from ikario_processual.kernels import cosine_matrix, stack_rag_vectors
+from ikario_processual.dissonance import (
+    DissonanceConfig,
+    compute_dissonance_batch,
+    compute_dissonance_enhanced,
+    cosine_similarity,
+)
+from ikario_processual.fixation import (
+    Authority,
+    Science,
+    PACTE_ARTICLES,
+    PHILOSOPHICAL_ANCHORS,
+)
+from ikario_processual.latent_engine import LatentEngine
+
+
+def unit(v: np.ndarray) -> np.ndarray:
+    return v / np.linalg.norm(v)
+
+
+def create_random_tensor(state_id: int = 0) -> StateTensor:
+    tensor = StateTensor(state_id=state_id, timestamp=datetime.now().isoformat())
+    for dim_name in DIMENSION_NAMES:
+        setattr(tensor, dim_name, unit(np.random.randn(EMBEDDING_DIM)))
+    return tensor
+
+
+def create_rag_results(k: int, base: np.ndarray = None) -> list:
+    """Résultats RAG avec vecteurs en listes (comme Weaviate), certains proches de base."""
+    results = []
+    for i in range(k):
+        v = np.random.randn(EMBEDDING_DIM)
+        if base is not None and i % 3 == 0:
+            v = base * 40 + v
+        results.append({'content': f"doc {i}", 'vector': unit(v).tolist(), 'source': 'thought'})
+    results.append({'content': "sans vecteur", 'vector': None})
+    return results
+
+
+def reference_dissonance(e_input, X_t, rag_results, config):
+    """Ancienne boucle : cosine par dimension puis deux passes sur rag_results."""
+    base = 0.0
+    for dim_name, weight in config.get_dimension_weights().items():
+        base += weight * (1.0 - cosine_similarity(e_input, getattr(X_t, dim_name)))
+    hard = sum(
+        1 for r in rag_results
+        if r.get('vector') is not None
+        and cosine_similarity(e_input, np.array(r['vector'])) < config.hard_negative_threshold
+    )
+    sims = [
+        cosine_similarity(e_input, np.array(r['vector']))
+        for r in rag_results if r.get('vector') is not None
+    ]
+    contradiction = hard / max(len(rag_results), 1)
+    max_sim = max(sims) if sims else 0.0
+    novelty = 1.0 - max_sim if sims and max_sim < 0.3 else 0.0
+    return base + config.contradiction_weight * contradiction + config.novelty_weight * novelty
+
+
+class TestKernels:
+    """Équivalence des noyaux avec les boucles de référence."""
+
+    def test_cosine_matrix_handles_zero_vectors(self):
+        A = np.vstack([unit(np.random.randn(EMBEDDING_DIM)), np.zeros(EMBEDDING_DIM)])
+        B = np.random.randn(3, EMBEDDING_DIM)
+
+        sims = cosine_matrix(A, B)
+
+        assert sims.shape == (2, 3)
+        assert np.allclose(sims[0], [cosine_similarity(A[0], b) for b in B])
+        assert np.all(sims[1] == 0.0)
+
+    def test_stack_rag_vectors_skips_missing(self):
+        indices, matrix = stack_rag_vectors(create_rag_results(4))
+
+        assert indices == [0, 1, 2, 3]
+        assert matrix.shape == (4, EMBEDDING_DIM)
+
+    def test_dissonance_matches_reference(self):
+        config = DissonanceConfig()
+        X_t = create_random_tensor()
+        e_input = unit(np.random.randn(EMBEDDING_DIM))
+        rag_results = create_rag_results(12, base=e_input)
+
+        result = compute_dissonance_enhanced(e_input, X_t, rag_results, config)
+
+        assert result.total == pytest.approx(reference_dissonance(e_input, X_t, rag_results, config))
+        assert result.rag_results_count == 13
+        for dim_name in DIMENSION_NAMES:
+            expected = 1.0 - cosine_similarity(e_input, getattr(X_t, dim_name))
+            assert result.dissonances_by_dimension[dim_name] == pytest.approx(expected)
+
+    def test_dissonance_batch_matches_single(self):
+        X_t = create_random_tensor()
+        E = np.array([unit(np.random.randn(EMBEDDING_DIM)) for _ in range(5)])
+        rag_lists = [create_rag_results(6, base=e) for e in E]
+        rag_lists[2] = []
+
+        batch = compute_dissonance_batch(E, X_t, rag_lists)
+
+        for e_input, rag_results, result in zip(E, rag_lists, batch):
+            single = compute_dissonance_enhanced(e_input, X_t, rag_results)
+            assert result.total == pytest.approx(single.total)
+        assert batch[2].novelty_penalty == 1.0
+
+    def test_authority_and_science_match_reference(self):
+        pacte = {name: unit(np.random.randn(EMBEDDING_DIM)) for name in PACTE_ARTICLES}
+        anchors = {name: unit(np.random.randn(EMBEDDING_DIM)) for name in PHILOSOPHICAL_ANCHORS}
+        authority = Authority(pacte_vectors=pacte, anchor_vectors=anchors)
+        X_t = create_random_tensor()
+        e_input = unit(np.random.randn(EMBEDDING_DIM))
+        rag_results = create_rag_results(8, base=e_input)
+
+        _, details = authority.compute(e_input, X_t)
+        for name, vector in pacte.items():
+            assert details['pacte_alignments'][name] == pytest.approx(float(np.dot(e_input, vector)))
+        for name, vector in anchors.items():
+            assert details['anchor_alignments'][name] == pytest.approx(float(np.dot(e_input, vector)))
+
+        _, details = Science().compute(e_input, X_t, rag_results)
+        expected = [
+            float(np.dot(e_input, np.array(r['vector']) / (np.linalg.norm(r['vector']) + 1e-8)))
+            for r in rag_results if r['vector'] is not None
+        ]
+        assert details['rag_count'] == len(expected)
+        assert details['avg_corroboration'] == pytest.approx(np.mean(expected))
+
+
+class TestRunCycleBatch:
+    """Évaluation de plusieurs déclencheurs contre un même état."""
+
+    def test_candidates_are_not_persisted(self):
+        model = MagicMock()
+        model.encode.side_effect = lambda texts: np.random.randn(len(texts), EMBEDDING_DIM)
+        state_store = MagicMock()
+        state_store.current = create_random_tensor(7)
+        engine = LatentEngine(
+            weaviate_client=MagicMock(),
+            embedding_model=model,
+            authority=Authority(),
+            state_store=state_store,
+        )
+        engine._retrieve_context = lambda e_input, content: create_rag_results(3, base=e_input)
+
+        results = engine.run_cycle_batch([
+            {'type': 'corpus', 'content': "Peirce et la sémiose"},
+            {'type': 'veille', 'content': "Whitehead et le processus"},
+            {'type': 'user', 'content': "Bonjour"},
+        ])
+
+        assert [r.new_state.state_id for r in results] == [8, 8, 8]
+        assert [r.new_state.trigger_type for r in results] == ['corpus', 'veille', 'user']
+        assert results[2].should_verbalize
+        assert set(results[0].saillances) == set(DIMENSION_NAMES)
+        model.encode.assert_called_once()
+        state_store.commit.assert_not_called()
+        assert engine.logger.total_cycles == 0
+
+
+class TestMicroBenchmark:
+    """Boucles de référence vs noyaux (afficher avec -s)."""
+
+    def test_benchmark_dissonance(self):
+        config = DissonanceConfig()
+        X_t = create_random_tensor()
+        E = np.array([unit(np.random.randn(EMBEDDING_DIM)) for _ in range(32)])
+        rag_lists = [create_rag_results(10, base=e) for e in E]
+
+        start = time.perf_counter()
+        reference = [reference_dissonance(e, X_t, r, config) for e, r in zip(E, rag_lists)]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = compute_dissonance_batch(E, X_t, rag_lists, config)
+        batch_time = time.perf_counter() - start
+
+        # Vecteurs déjà en ndarray : coût des seuls calculs de similarité
+        array_lists = [
+            [dict(r, vector=None if r['vector'] is None else np.array(r['vector'])) for r in rag]
+            for rag in rag_lists
+        ]
+        start = time.perf_counter()
+        for e, r in zip(E, array_lists):
+            reference_dissonance(e, X_t, r, config)
+        loop_array_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compute_dissonance_batch(E, X_t, array_lists, config)
+        batch_array_time = time.perf_counter() - start
+
+        print(f"\ndissonance 32 entrées × 10 RAG (listes) : boucles {loop_time*1000:.1f} ms, "
+              f"noyaux {batch_time*1000:.1f} ms ({loop_time / batch_time:.1f}x)")
+        print(f"dissonance 32 entrées × 10 RAG (ndarray) : boucles {loop_array_time*1000:.1f} ms, "
+              f"noyaux {batch_array_time*1000:.1f} ms ({loop_array_time / batch_array_time:.1f}x)")
+        assert [r.total for r in batch] == pytest.approx(reference)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
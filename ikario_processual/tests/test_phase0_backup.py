@@ -67,7 +67,7 @@ class TestBackupScript:
     """Tests du script de backup."""
 
     def test_backup_creates_file(self):
-        """Le backup doit créer un fichier JSON."""
+        """Le backup doit créer un dossier avec son manifest."""
         # Import dynamique pour éviter les erreurs si requests manque
         import sys
         sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
@@ -75,7 +75,7 @@ class TestBackupScript:
         from weaviate_backup import backup_weaviate
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_backup.json"
+            output_path = Path(tmpdir) / "test_backup"
 
             stats = backup_weaviate(
                 output_path=output_path,
@@ -83,8 +83,9 @@ class TestBackupScript:
                 include_vectors=False  # Plus rapide pour le test
             )
 
-            assert output_path.exists(), "Le fichier de backup n'a pas été créé"
-            assert output_path.stat().st_size > 0, "Le fichier de backup est vide"
+            manifest_path = output_path / "manifest.json"
+            assert manifest_path.exists(), "Le manifest du backup n'a pas été créé"
+            assert manifest_path.stat().st_size > 0, "Le manifest du backup est vide"
 
     def test_backup_structure(self):
         """Le backup doit avoir la bonne structure."""
@@ -94,7 +95,7 @@ class TestBackupScript:
         from weaviate_backup import backup_weaviate
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_backup.json"
+            output_path = Path(tmpdir) / "test_backup"
 
             backup_weaviate(
                 output_path=output_path,
@@ -102,7 +103,7 @@ class TestBackupScript:
                 include_vectors=False
             )
 
-            with open(output_path, "r", encoding="utf-8") as f:
+            with open(output_path / "manifest.json", "r", encoding="utf-8") as f:
                 data = json.load(f)
 
             # Vérifier la structure
@@ -123,7 +124,7 @@ class TestBackupScript:
         from weaviate_backup import backup_weaviate
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_backup_vectors.json"
+            output_path = Path(tmpdir) / "test_backup_vectors"
 
             backup_weaviate(
                 output_path=output_path,
@@ -131,14 +132,14 @@ class TestBackupScript:
                 include_vectors=True
             )
 
-            with open(output_path, "r", encoding="utf-8") as f:
+            with open(output_path / "manifest.json", "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            # Vérifier qu'au moins un objet a un vecteur
-            thoughts = data.get("collections", {}).get("Thought", [])
-            if thoughts:
-                # Au moins un objet devrait avoir un vecteur
-                has_vector = any("vector" in obj for obj in thoughts)
+            # Vérifier qu'au moins une partie a un fichier de vecteurs
+            thoughts = data.get("collections", {}).get("Thought", {})
+            if thoughts.get("objects"):
+                # Au moins une partie devrait avoir des vecteurs
+                has_vector = any(part["vectors"] for part in thoughts["parts"])
                 assert has_vector, "Aucun objet n'a de vecteur alors que include_vectors=True"
 
 
@@ -155,7 +156,7 @@ class TestRestoreScript:
 
         with tempfile.TemporaryDirectory() as tmpdir:
             # D'abord, faire un backup
-            backup_path = Path(tmpdir) / "test_backup.json"
+            backup_path = Path(tmpdir) / "test_backup"
             backup_weaviate(
                 output_path=backup_path,
                 collections=["Thought"],
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Tests pour le StateAggregator - agregat incremental des vecteurs stockes.
+
+Weaviate est remplacé par un faux client (iterateur + fetch_objects filtré).
+
+Exécuter: pytest ikario_processual/tests/test_state_aggregator.py -v
+"""
+
+import multiprocessing
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.occasion_manager import OccasionManager
+from ikario_processual.state_vector import (
+    StateAggregator,
+    filter_assistant_messages,
+    filter_thoughts,
+    record_new_object,
+)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def evaluate(filters, props):
+    """Évalue un filtre Weaviate v4 (And / Equal / NotEqual / GreaterThanEqual)."""
+    if hasattr(filters, "filters"):
+        return all(evaluate(f, props) for f in filters.filters)
+    value = props.get(filters.target)
+    operator = filters.operator.value
+    if operator == "Equal":
+        return value == filters.value
+    if operator == "NotEqual":
+        return value != filters.value
+    if operator == "GreaterThanEqual":
+        return value is not None and value >= filters.value
+    raise AssertionError(operator)
+
+
+class FakeCollection:
+    def __init__(self):
+        self.objects = []
+        self.fetch_calls = 0
+
+    def add(self, properties, vector):
+        obj = SimpleNamespace(uuid=uuid.uuid4(), properties=properties,
+                              vector={"default": list(vector)})
+        self.objects.append(obj)
+        return obj
+
+    def iterator(self, include_vector=False, return_properties=None):
+        yield from sorted(self.objects, key=lambda o: str(o.uuid))
+
+    @property
+    def query(self):
+        return self
+
+    def fetch_objects(self, filters=None, sort=None, limit=100, **kwargs):
+        self.fetch_calls += 1
+        matches = [o for o in self.objects if filters is None or evaluate(filters, o.properties)]
+        matches.sort(key=lambda o: o.properties["timestamp"])
+        return SimpleNamespace(objects=matches[:limit])
+
+
+class FakeClient:
+    def __init__(self):
+        self._collections = {"Thought": FakeCollection(), "Message": FakeCollection()}
+        self.collections = SimpleNamespace(get=lambda name: self._collections[name])
+
+
+def unit(v):
+    return v / np.linalg.norm(v)
+
+
+def populate(client, n_thoughts=6, n_messages=8, offset=0):
+    rng = np.random.default_rng(offset)
+    vectors = {"Thought": [], "Message": []}
+    for i in range(n_thoughts):
+        thought_type = "test" if i == 0 else "reflexion"
+        content = f"Une pensee sur la semiose numero {offset + i} assez longue"
+        v = unit(rng.standard_normal(16))
+        client._collections["Thought"].add(
+            {"content": content, "thought_type": thought_type,
+             "timestamp": START + timedelta(minutes=offset + i)}, v)
+        if thought_type != "test":
+            vectors["Thought"].append(v)
+    for i in range(n_messages):
+        role = "assistant" if i % 2 else "user"
+        content = f"Message {offset + i} " + "x" * 60
+        v = unit(rng.standard_normal(16))
+        client._collections["Message"].add(
+            {"content": content, "role": role,
+             "timestamp": START + timedelta(minutes=offset + i)}, v)
+        if role == "assistant":
+            vectors["Message"].append(v)
+    return vectors
+
+
+def expected_aggregate(vectors):
+    total = 2.0 * np.sum(vectors["Thought"], axis=0) + np.sum(vectors["Message"], axis=0)
+    total /= 2.0 * len(vectors["Thought"]) + len(vectors["Message"])
+    return total / np.linalg.norm(total)
+
+
+def record_thoughts(path, n):
+    """Enregistre n pensees depuis un processus separe."""
+    for i in range(n):
+        record_new_object("Thought", uuid.uuid4(), unit(np.ones(16)), {
+            "content": f"Une pensee ecrite par un autre processus {i}", "thought_type": "reflexion",
+        }, path=path)
+
+
+class TestFilterRules:
+    """Les regles de filtrage restent celles des listes de dicts."""
+
+    def test_filters_on_rest_objects(self):
+        thoughts = [
+            {"properties": {"content": "Une pensee profonde et assez longue", "thought_type": "reflexion"}},
+            {"properties": {"content": "Ceci est un test de pensee longue", "thought_type": "reflexion"}},
+            {"properties": {"content": "Pensee de debug mais longue aussi", "thought_type": "debug"}},
+        ]
+        messages = [
+            {"properties": {"role": "assistant", "content": "y" * 60}},
+            {"properties": {"role": "user", "content": "y" * 60}},
+            {"properties": {"role": "assistant", "content": "[Error] " + "y" * 60}},
+        ]
+
+        assert len(filter_thoughts(thoughts)) == 1
+        assert len(filter_assistant_messages(messages)) == 1
+
+
+class TestStateAggregator:
+    """Statistique suffisante, persistance et rattrapage incremental."""
+
+    def test_rebuild_matches_weighted_mean(self, tmp_path):
+        client = FakeClient()
+        vectors = populate(client)
+        aggregator = StateAggregator(path=str(tmp_path / "agg.npz"))
+
+        report = aggregator.rebuild(client)
+
+        assert report["Thought"] == {"seen": 6, "kept": 5, "examples": report["Thought"]["examples"]}
+        assert report["Message"]["kept"] == 4
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+
+    def test_add_is_incremental_and_persisted(self, tmp_path):
+        client = FakeClient()
+        vectors = populate(client)
+        aggregator = StateAggregator(path=str(tmp_path / "agg.npz"))
+        aggregator.rebuild(client)
+
+        new_vector = unit(np.ones(16))
+        assert aggregator.add("Thought", new_vector, {
+            "content": "Une nouvelle pensee sur Whitehead", "thought_type": "intuition",
+        })
+        assert not aggregator.add("Message", new_vector, {"role": "user", "content": "z" * 80})
+        aggregator.save()
+
+        vectors["Thought"].append(new_vector)
+        reloaded = StateAggregator(path=str(tmp_path / "agg.npz"))
+        assert reloaded.load()
+        assert reloaded.counts == {"Thought": 6, "Message": 4}
+        assert np.allclose(reloaded.aggregate(), expected_aggregate(vectors))
+
+    def test_sync_adds_only_new_objects_with_server_filters(self, tmp_path):
+        client = FakeClient()
+        vectors = populate(client)
+        aggregator = StateAggregator(path=str(tmp_path / "agg.npz"))
+        aggregator.rebuild(client)
+
+        new = populate(client, n_thoughts=3, n_messages=4, offset=100)
+        added = aggregator.sync(client, page_size=2)
+
+        assert added == {"Thought": 2, "Message": 2}
+        for source in vectors:
+            vectors[source].extend(new[source])
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+        assert aggregator.sync(client) == {"Thought": 0, "Message": 0}
+
+    def test_empty_aggregate_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            StateAggregator(path=str(tmp_path / "agg.npz")).aggregate()
+
+
+class TestRecordNewObject:
+    """Les chemins d'ecriture mettent l'agregat persiste a jour."""
+
+    def test_not_built_is_left_to_sync(self, tmp_path):
+        path = str(tmp_path / "agg.npz")
+        assert not record_new_object("Thought", uuid.uuid4(), unit(np.ones(16)), {
+            "content": "Une pensee ecrite avant toute reconstruction", "thought_type": "reflexion",
+        }, path=path)
+        assert not Path(path).exists()
+
+    def test_counts_without_moving_sync_cursor(self, tmp_path):
+        client = FakeClient()
+        vectors = populate(client)
+        path = str(tmp_path / "agg.npz")
+        StateAggregator(path=path).rebuild(client)
+
+        new_vector = unit(np.ones(16))
+        props = {"content": "Une reponse de l'assistant " + "w" * 60, "role": "assistant",
+                 "timestamp": START + timedelta(days=1)}
+        obj = client._collections["Message"].add(props, new_vector)
+        assert record_new_object("Message", obj.uuid, new_vector, props, path=path)
+
+        vectors["Message"].append(new_vector)
+        aggregator = StateAggregator(path=path)
+        assert aggregator.load()
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+        assert aggregator.checkpoints["Message"] == (START + timedelta(minutes=7)).isoformat()
+        # Deja compte : le rattrapage ne le recompte pas
+        assert aggregator.sync(client) == {"Thought": 0, "Message": 0}
+        assert aggregator.stats()["Message"]["recorded"] == 0
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+
+    def test_sync_still_catches_earlier_unrecorded_objects(self, tmp_path):
+        client = FakeClient()
+        vectors = populate(client)
+        path = str(tmp_path / "agg.npz")
+        StateAggregator(path=path).rebuild(client)
+
+        thought = {"content": "Une pensee ecrite par un autre chemin", "thought_type": "reflexion"}
+        unrecorded = unit(np.arange(16, dtype=float) + 1)
+        client._collections["Thought"].add({**thought, "timestamp": START + timedelta(hours=1)}, unrecorded)
+        recorded = unit(np.ones(16))
+        props = {**thought, "timestamp": "2026-01-01T02:00:00Z"}
+        obj = client._collections["Thought"].add({**props, "timestamp": START + timedelta(hours=2)}, recorded)
+        assert record_new_object("Thought", obj.uuid, recorded, props, path=path)
+
+        aggregator = StateAggregator(path=path)
+        assert aggregator.sync(client) == {"Thought": 1, "Message": 0}
+        vectors["Thought"] += [unrecorded, recorded]
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+
+    def test_timestamps_compared_as_datetimes(self, tmp_path):
+        aggregator = StateAggregator(path=str(tmp_path / "agg.npz"))
+        thought = {"content": "Une pensee sur les suffixes de fuseau", "thought_type": "reflexion"}
+
+        aggregator.add("Thought", np.ones(4), {**thought, "timestamp": "2026-01-01T10:00:00Z"})
+        aggregator.add("Thought", np.ones(4), {**thought, "timestamp": "2026-01-01T10:00:00.250000+00:00"})
+        aggregator.add("Thought", np.ones(4), {**thought, "timestamp": "2026-01-01T09:59:59Z"})
+
+        assert aggregator.checkpoints["Thought"] == "2026-01-01T10:00:00.250000+00:00"
+
+    def test_concurrent_processes_do_not_lose_records(self, tmp_path):
+        client = FakeClient()
+        populate(client)
+        path = str(tmp_path / "agg.npz")
+        StateAggregator(path=path).rebuild(client)
+
+        workers = [
+            multiprocessing.Process(target=record_thoughts, args=(path, 20)) for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        aggregator = StateAggregator(path=path)
+        assert aggregator.load()
+        assert aggregator.counts["Thought"] == 5 + 40
+
+    def test_occasion_thought_updates_aggregate(self, tmp_path, monkeypatch):
+        client = FakeClient()
+        vectors = populate(client)
+        path = str(tmp_path / "agg.npz")
+        StateAggregator(path=path).rebuild(client)
+        monkeypatch.setattr("ikario_processual.state_vector.AGGREGATE_STATS_PATH", path)
+
+        new_vector = unit(np.arange(1, 17, dtype=float))
+        manager = OccasionManager.__new__(OccasionManager)
+        manager.transformer = SimpleNamespace(model=SimpleNamespace(encode=lambda text: new_vector * 3))
+        response = SimpleNamespace(status_code=200, json=lambda: {"id": str(uuid.uuid4())})
+        with patch("ikario_processual.occasion_manager.requests.post", return_value=response):
+            manager._add_thought("Une pensee issue de la concrescence d'une occasion", occasion_id=7)
+
+        vectors["Thought"].append(new_vector)
+        aggregator = StateAggregator(path=path)
+        assert aggregator.load()
+        assert aggregator.counts["Thought"] == 6
+        assert np.allclose(aggregator.aggregate(), expected_aggregate(vectors))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests pour le StateHistory - keyframes + deltas float16.
+
+Exécuter: pytest ikario_processual/tests/test_state_history.py -v
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
+from ikario_processual.state_history import StateHistoryConfig, StateHistoryStore
+from ikario_processual.state_store import StateStoreConfig, WriteBehindStateStore
+from ikario_processual.metrics import ProcessMetrics
+
+
+def normalized(v: np.ndarray) -> np.ndarray:
+    return v / np.linalg.norm(v)
+
+
+def create_trajectory(n: int, step: float = 0.001, seed: int = 0):
+    """Suite d'états qui dérivent lentement (comme des cycles réels)."""
+    rng = np.random.default_rng(seed)
+    matrix = np.array([normalized(rng.standard_normal(EMBEDDING_DIM)) for _ in DIMENSION_NAMES])
+    states = []
+    for state_id in range(n):
+        tensor = StateTensor.from_matrix(matrix.copy(), state_id, datetime.now().isoformat())
+        tensor.trigger_type = "user"
+        tensor.previous_state_id = state_id - 1
+        states.append(tensor)
+        matrix = matrix + step * rng.standard_normal(matrix.shape)
+        matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    return states
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = StateHistoryStore(StateHistoryConfig(
+        path=str(tmp_path / "history.sqlite"), keyframe_interval=10,
+    ))
+    yield store
+    store.close()
+
+
+class TestStateHistoryStore:
+    """Tests de l'historique compressé."""
+
+    def test_random_access_reconstruction(self, history):
+        """Tout état est reconstruit à la précision float16 près."""
+        states = create_trajectory(35)
+        for tensor in states:
+            history.append(tensor)
+
+        for state_id in (0, 7, 10, 23, 34):
+            restored = history.get(state_id)
+            assert restored.state_id == state_id
+            assert restored.trigger_type == "user"
+            assert np.allclose(restored.to_matrix(), states[state_id].to_matrix(), atol=1e-3)
+        assert history.get(99) is None
+
+    def test_keyframes_and_compression(self, history):
+        """Une keyframe tous les keyframe_interval états ; les deltas sont petits."""
+        flags = [history.append(t) for t in create_trajectory(30)]
+
+        assert [i for i, is_key in enumerate(flags) if is_key] == [0, 10, 20]
+        stats = history.stats()
+        assert stats['states'] == 30
+        assert stats['keyframes'] == 3
+        assert stats['compression_ratio'] > 3
+
+    def test_history_and_range_scan(self, history):
+        """get_history est décroissant, scan_range croissant et borné."""
+        for tensor in create_trajectory(25):
+            history.append(tensor)
+
+        assert [t.state_id for t in history.get_history(limit=4)] == [24, 23, 22, 21]
+        assert [t.state_id for t in history.scan_range(8, 12)] == [8, 9, 10, 11, 12]
+        ids, stacked = history.scan_range_matrices(5, 14)
+        assert ids.tolist() == list(range(5, 15))
+        assert stacked.shape == (10, 8, EMBEDDING_DIM)
+        assert history.latest_state_id() == 24
+
+    def test_reopen_continues_keyframe_chain(self, tmp_path):
+        """Après réouverture, les deltas repartent de la dernière keyframe."""
+        config = StateHistoryConfig(path=str(tmp_path / "h.sqlite"), keyframe_interval=10)
+        states = create_trajectory(15)
+        first = StateHistoryStore(config)
+        for tensor in states[:12]:
+            first.append(tensor)
+        first.close()
+
+        second = StateHistoryStore(config)
+        assert [second.append(t) for t in states[12:]] == [False, False, False]
+        assert np.allclose(second.get(14).to_matrix(), states[14].to_matrix(), atol=1e-3)
+        second.close()
+
+
+class FakeRepository:
+    def __init__(self):
+        self.saved = []
+
+    def get_current(self):
+        return None
+
+    def save_many(self, tensors):
+        self.saved.extend(t.state_id for t in tensors)
+        return []
+
+
+class TestIndexingPolicy:
+    """Seuls keyframes et chocs sont indexés dans Weaviate."""
+
+    def test_store_indexes_keyframes_and_chocs_only(self, tmp_path, history):
+        repo = FakeRepository()
+        store = WriteBehindStateStore(
+            repo,
+            StateStoreConfig(wal_path=str(tmp_path / "wal.jsonl"), flush_interval_seconds=0.01),
+            history=history,
+        )
+        store.load()
+        for tensor in create_trajectory(25):
+            store.commit(tensor, is_choc=tensor.state_id == 13)
+
+        assert store.flush(timeout=5)
+        assert repo.saved == [0, 10, 13, 20]
+        assert history.count() == 25
+        assert store.stats()['indexed'] == 4
+        store.close()
+
+
+class TestMetricsRangeScan:
+    """ProcessMetrics utilise l'historique pour les changements par dimension."""
+
+    def test_dimension_changes_over_range(self, history):
+        states = create_trajectory(20)
+        for tensor in states:
+            history.append(tensor)
+        metrics = ProcessMetrics(history=history)
+
+        changes = dict(metrics.compute_dimension_changes_over_range(0, 19))
+        expected = {
+            dim: sum(
+                1 - np.dot(getattr(states[i], dim), getattr(states[i - 1], dim))
+                for i in range(1, 20)
+            )
+            for dim in DIMENSION_NAMES
+        }
+        for dim in DIMENSION_NAMES:
+            assert changes[dim] == pytest.approx(expected[dim], abs=1e-3)
+
+    def test_vectorized_dimension_changes(self):
+        states = create_trajectory(2, step=0.1)
+        changes = ProcessMetrics()._compute_dimension_changes(states[1], states[0])
+
+        assert [c for _, c in changes] == sorted((c for _, c in changes), reverse=True)
+        for dim, change in changes:
+            expected = 1 - np.dot(getattr(states[1], dim), getattr(states[0], dim))
+            assert change == pytest.approx(expected)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests pour le StateStore - état courant en mémoire + write-behind + WAL.
+
+Exécuter: pytest ikario_processual/tests/test_state_store.py -v
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
+from ikario_processual.state_store import StateStoreConfig, StateWAL, WriteBehindStateStore
+from ikario_processual.latent_engine import LatentEngine
+
+
+def create_random_tensor(state_id: int = 0) -> StateTensor:
+    """Crée un tenseur avec des vecteurs aléatoires normalisés."""
+    tensor = StateTensor(
+        state_id=state_id,
+        timestamp=datetime.now().isoformat(),
+        previous_state_id=state_id - 1,
+        trigger_type="user",
+    )
+    for dim_name in DIMENSION_NAMES:
+        v = np.random.randn(EMBEDDING_DIM)
+        setattr(tensor, dim_name, v / np.linalg.norm(v))
+    return tensor
+
+
+class FakeRepository:
+    """Repository en mémoire qui enregistre les lots reçus."""
+
+    def __init__(self, current=None, fail_times: int = 0):
+        self.current = current
+        self.fail_times = fail_times
+        self.batches = []
+        self.get_current_calls = 0
+
+    def get_current(self):
+        self.get_current_calls += 1
+        return self.current
+
+    def save_many(self, tensors):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("Weaviate indisponible")
+        self.batches.append([t.state_id for t in tensors])
+        return []
+
+
+@pytest.fixture
+def config(tmp_path):
+    return StateStoreConfig(
+        wal_path=str(tmp_path / "state_wal.jsonl"),
+        batch_size=4,
+        flush_interval_seconds=0.05,
+        max_retry_delay_seconds=0.1,
+    )
+
+
+class TestStateWAL:
+    """Tests du journal local."""
+
+    def test_replay_unacked_states(self, tmp_path):
+        """Les états non acquittés survivent à un redémarrage."""
+        path = str(tmp_path / "wal.jsonl")
+        wal = StateWAL(path)
+        t1, t2 = create_random_tensor(1), create_random_tensor(2)
+        wal.append(t1)
+        wal.append(t2)
+        wal.ack([1])
+
+        replayed = StateWAL(path).pending()
+
+        assert [t.state_id for t in replayed] == [2]
+        assert np.allclose(replayed[0].to_matrix(), t2.to_matrix())
+        assert replayed[0].trigger_type == "user"
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        """Un crash pendant l'écriture ne corrompt pas le rejeu."""
+        path = tmp_path / "wal.jsonl"
+        wal = StateWAL(str(path))
+        wal.append(create_random_tensor(1))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "state", "state_id": 2, "mat')
+
+        assert [t.state_id for t in StateWAL(str(path)).pending()] == [1]
+
+    def test_log_truncated_when_all_acked(self, tmp_path):
+        """Le journal est vidé quand tout est persisté."""
+        path = tmp_path / "wal.jsonl"
+        wal = StateWAL(str(path))
+        wal.append(create_random_tensor(1))
+        wal.ack([1])
+
+        assert path.read_text() == ""
+
+
+class TestWriteBehindStateStore:
+    """Tests du store write-behind."""
+
+    def test_commit_is_served_from_memory_and_batched(self, config):
+        """commit() ne touche pas Weaviate ; les états partent par lots."""
+        repo = FakeRepository(current=create_random_tensor(0))
+        store = WriteBehindStateStore(repo, config)
+        store.load()
+
+        for state_id in range(1, 7):
+            store.commit(create_random_tensor(state_id))
+            assert store.current.state_id == state_id
+
+        assert store.flush(timeout=5)
+        assert [sid for batch in repo.batches for sid in batch] == [1, 2, 3, 4, 5, 6]
+        assert len(repo.batches) < 6
+        assert repo.get_current_calls == 1
+        assert store.wal.pending() == []
+        store.close()
+
+    def test_failed_batches_are_retried(self, config):
+        """Un lot rejeté reste en file et dans le WAL jusqu'au succès."""
+        repo = FakeRepository(current=create_random_tensor(0), fail_times=2)
+        store = WriteBehindStateStore(repo, config)
+        store.load()
+        store.commit(create_random_tensor(1))
+
+        assert store.flush(timeout=5)
+        assert repo.batches == [[1]]
+        assert store.stats()['failures'] == 2
+        store.close()
+
+    def test_crash_recovery_replays_wal(self, config):
+        """Après un crash, le dernier état validé est restauré depuis le WAL."""
+        repo = FakeRepository(current=create_random_tensor(0), fail_times=1000)
+        store = WriteBehindStateStore(repo, config)
+        store.load()
+        store.commit(create_random_tensor(1))
+        store.commit(create_random_tensor(2))
+        store.close(timeout=0.2)  # "crash" : Weaviate n'a rien reçu
+
+        recovered_repo = FakeRepository(current=create_random_tensor(0))
+        recovered = WriteBehindStateStore(recovered_repo, config)
+
+        assert recovered.load().state_id == 2
+        assert recovered.flush(timeout=5)
+        assert [sid for batch in recovered_repo.batches for sid in batch] == [1, 2]
+        recovered.close()
+
+
+class TestLatentEngineStateStore:
+    """Le LatentEngine lit et écrit l'état via le store."""
+
+    def test_current_state_read_once(self, config):
+        """L'état n'est lu dans Weaviate qu'au premier cycle."""
+        repo = FakeRepository(current=create_random_tensor(5))
+        engine = LatentEngine(
+            weaviate_client=MagicMock(),
+            embedding_model=MagicMock(),
+            state_store=WriteBehindStateStore(repo, config),
+        )
+
+        assert engine._get_current_state().state_id == 5
+        engine._persist_state(create_random_tensor(6))
+
+        assert engine._get_current_state().state_id == 6
+        assert repo.get_current_calls == 1
+        assert engine.flush_state(timeout=5)
+        assert engine.get_stats()['state_persistence']['persisted'] == 1
+        engine.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -18,8 +18,11 @@ from datetime import datetime
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from ikario_processual.state_history import StateHistoryConfig, StateHistoryStore
 from ikario_processual.state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
 from ikario_processual.vigilance import (
     VigilanceAlert,
@@ -363,6 +366,37 @@ class TestDavidReference:
         assert x_declared is not None
         assert x_declared.state_id == -1
 
+    def test_create_from_history_reads_local_history(self, tmp_path):
+        """x_ref vient de l'historique local, sans requete Weaviate."""
+        history = StateHistoryStore(StateHistoryConfig(path=str(tmp_path / "h.sqlite")))
+        for state_id in range(3):
+            history.append(create_random_tensor(state_id=state_id, seed=state_id))
+        client = MagicMock()
+
+        x_ref = DavidReference.create_from_history(client, history=history)
+        history.close()
+
+        client.collections.get.assert_not_called()
+        assert np.dot(x_ref.firstness, create_random_tensor(seed=2).firstness) > 0.5
+
+    def test_create_from_history_falls_back_to_weaviate(self, tmp_path):
+        """Historique local vide : repli sur la collection StateTensor."""
+        history = StateHistoryStore(StateHistoryConfig(path=str(tmp_path / "h.sqlite")))
+        tensor = create_random_tensor(state_id=7, seed=7)
+        client = MagicMock()
+        client.collections.get.return_value.query.fetch_objects.return_value = SimpleNamespace(
+            objects=[SimpleNamespace(
+                properties={"state_id": 7, "timestamp": tensor.timestamp},
+                vector=tensor.get_vectors_dict(),
+            )]
+        )
+
+        x_ref = DavidReference.create_from_history(client, history=history)
+        history.close()
+
+        client.collections.get.assert_called_once_with("StateTensor")
+        assert np.allclose(x_ref.firstness, tensor.firstness)
+
 
 class TestVigilanceVisualizer:
     """Tests pour VigilanceVisualizer."""
@@ -24,6 +24,7 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from .state_history import StateHistoryStore, get_state_history
 from .state_tensor import StateTensor, DIMENSION_NAMES, EMBEDDING_DIM
 
 # Logger
@@ -368,18 +369,33 @@ class DavidReference:
     def create_from_history(
         weaviate_client,
         n_sessions: int = 100,
+        history: Optional[StateHistoryStore] = None,
     ) -> StateTensor:
         """
         Cree x_ref a partir de l'historique des conversations.
         x_ref = moyenne ponderee des etats pendant conversations authentiques.
 
+        Les etats sont lus dans l'historique local (StateHistoryStore) : Weaviate
+        ne contient plus que les keyframes et les chocs, il n'est interroge
+        qu'en repli si l'historique local est vide.
+
         Args:
-            weaviate_client: Client Weaviate v4
+            weaviate_client: Client Weaviate v4 (repli)
             n_sessions: Nombre de sessions a utiliser
+            history: Historique local (defaut : get_state_history())
 
         Returns:
             StateTensor moyenne ponderee
         """
+        try:
+            store = history if history is not None else get_state_history()
+            states = store.get_history(n_sessions)
+        except Exception as e:
+            logger.warning(f"Historique local indisponible, repli sur Weaviate: {e}")
+            states = []
+        if states:
+            return DavidReference._weighted_history_mean(states)
+
         try:
             from weaviate.classes.query import Sort
         except ImportError:
@@ -411,16 +427,19 @@ class DavidReference:
                             setattr(tensor, dim_name, np.array(obj.vector[dim_name]))
                 states.append(tensor)
 
-            # Ponderation exponentielle (recents = plus de poids)
-            weights = np.exp(-np.arange(len(states)) * 0.01)
-            weights /= weights.sum()
-
-            return StateTensor.weighted_mean(states, weights)
+            return DavidReference._weighted_history_mean(states)
 
         except Exception as e:
             logger.error(f"Erreur creation x_ref depuis historique: {e}")
             return StateTensor(state_id=-1, timestamp=datetime.now().isoformat() + "Z")
 
+    @staticmethod
+    def _weighted_history_mean(states: List[StateTensor]) -> StateTensor:
+        """Moyenne des etats (du plus recent au plus ancien), ponderation exponentielle."""
+        weights = np.exp(-np.arange(len(states)) * 0.01)
+        weights /= weights.sum()
+        return StateTensor.weighted_mean(states, weights)
+
     @staticmethod
     def create_hybrid(
         profile_path: str,
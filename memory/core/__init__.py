@@ -3,8 +3,11 @@ Memory Core Module - GPU Embedding Service and Utilities.
 
 This module provides core functionality for the unified RAG system:
     - GPU-accelerated embeddings (RTX 4070 + PyTorch CUDA)
+    - CPU backends (FP32, int8 ONNX) selected with EMBEDDING_BACKEND
+    - Two-tier embedding cache (memory LRU + SQLite, float16 vectors)
+    - Micro-batching of concurrent queries and a shared embedding server
+    - Weaviate connection pool shared by Flask, ingestion and MCP tools
     - Singleton embedding service
-    - Weaviate connection utilities
 
 Usage:
     from memory.core import get_embedder, embed_text
@@ -16,6 +19,13 @@ Usage:
     embedding = embed_text("Hello world")
 """
 
+from memory.core.embedding_backends import (
+    EmbeddingBackend,
+    create_backend,
+)
+from memory.core.embedding_batcher import MicroBatcher
+from memory.core.embedding_cache import EmbeddingCache
+from memory.core.embedding_server import EmbeddingClient
 from memory.core.embedding_service import (
     GPUEmbeddingService,
     get_embedder,
@@ -24,6 +34,11 @@ from memory.core.embedding_service import (
 )
 
 __all__ = [
+    "EmbeddingBackend",
+    "create_backend",
+    "EmbeddingCache",
+    "MicroBatcher",
+    "EmbeddingClient",
     "GPUEmbeddingService",
     "get_embedder",
     "embed_text",
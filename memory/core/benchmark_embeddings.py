@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark - Throughput and latency per backend.
+
+Measures, for each embedding backend (cuda-fp16, cpu-fp32, onnx-int8):
+    - Batch throughput (texts/sec) over a sample of real chunks
+    - Per-batch latency p50/p99 at the backend's batch size
+    - Single-text latency p50/p99 (query path, embed_single)
+
+Texts are sampled from the processed documents' ``*_chunks.json`` files so
+that the benchmark follows the real chunk length distribution.
+
+Usage:
+    python -m memory.core.benchmark_embeddings
+    python -m memory.core.benchmark_embeddings --backends cpu-fp32 onnx-int8 --sample 256
+    python -m memory.core.benchmark_embeddings --chunks "output/*/*_chunks.json" --json results.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import torch
+
+from memory.core.embedding_backends import BACKENDS, create_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKS_GLOB = "generations/library_rag/output/*/*_chunks.json"
+MODEL_NAME = "BAAI/bge-m3"
+
+
+def load_chunk_texts(pattern: str, sample_size: int, seed: int = 42) -> List[str]:
+    """
+    Load chunk texts from ``*_chunks.json`` files and sample them uniformly.
+
+    Args:
+        pattern: Glob pattern for chunk files.
+        sample_size: Number of texts to keep (uniform sample keeps the
+            corpus length distribution).
+        seed: Random seed for a reproducible sample.
+
+    Returns:
+        List of non-empty chunk texts.
+    """
+    texts: List[str] = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        for chunk in data.get("chunks", []):
+            text = chunk.get("text", "") if isinstance(chunk, dict) else ""
+            if text.strip():
+                texts.append(text)
+
+    if len(texts) > sample_size:
+        texts = random.Random(seed).sample(texts, sample_size)
+    return texts
+
+
+def _percentiles_ms(samples: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99)),
+    }
+
+
+def benchmark_backend(
+    name: str,
+    texts: List[str],
+    single_runs: int = 50,
+    warmup: int = 3
+) -> Dict[str, Any]:
+    """
+    Benchmark one backend on the given texts.
+
+    Args:
+        name: Backend name (key of BACKENDS).
+        texts: Texts to embed.
+        single_runs: Number of single-text calls for query latency.
+        warmup: Number of warmup batches (not measured).
+
+    Returns:
+        Dictionary with load time, throughput and latency percentiles.
+    """
+    backend = create_backend(name)
+
+    start = time.perf_counter()
+    backend.load(MODEL_NAME)
+    load_s = time.perf_counter() - start
+
+    batch_size = backend.batch_size
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    for batch in batches[:warmup]:
+        backend.encode(batch)
+
+    # Batch path (ingestion)
+    batch_latencies: List[float] = []
+    total_start = time.perf_counter()
+    for batch in batches:
+        start = time.perf_counter()
+        backend.encode(batch)
+        batch_latencies.append(time.perf_counter() - start)
+    total_s = time.perf_counter() - total_start
+
+    # Single-text path (queries)
+    single_latencies: List[float] = []
+    for text in texts[:single_runs]:
+        start = time.perf_counter()
+        backend.encode(text)
+        single_latencies.append(time.perf_counter() - start)
+
+    result = {
+        "backend": name,
+        "precision": backend.precision,
+        "batch_size": batch_size,
+        "load_s": load_s,
+        "texts": len(texts),
+        "texts_per_sec": len(texts) / total_s if total_s > 0 else 0.0,
+        "batch": _percentiles_ms(batch_latencies),
+        "single": _percentiles_ms(single_latencies),
+        **backend.memory_info(),
+    }
+
+    # Release the model before loading the next backend
+    backend.model = None
+    backend.clear_cache()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends")
+    parser.add_argument(
+        "--backends", nargs="+", default=None, choices=list(BACKENDS),
+        help="Backends to benchmark (default: all available on this machine)"
+    )
+    parser.add_argument("--chunks", default=DEFAULT_CHUNKS_GLOB, help="Glob of *_chunks.json files")
+    parser.add_argument("--sample", type=int, default=512, help="Number of chunk texts to embed")
+    parser.add_argument("--single-runs", type=int, default=50, help="Single-text calls per backend")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    texts = load_chunk_texts(args.chunks, args.sample)
+    if not texts:
+        print(f"No chunk texts found for pattern: {args.chunks}")
+        return 1
+
+    lengths = np.array([len(t) for t in texts])
+    print(
+        f"{len(texts)} chunks sampled - length (chars): "
+        f"p50={np.percentile(lengths, 50):.0f} "
+        f"p90={np.percentile(lengths, 90):.0f} "
+        f"max={lengths.max()}"
+    )
+
+    backends = args.backends or [
+        name for name in BACKENDS if name != "cuda-fp16" or torch.cuda.is_available()
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for name in backends:
+        print(f"\n=== {name} ===")
+        try:
+            results.append(benchmark_backend(name, texts, single_runs=args.single_runs))
+        except Exception as e:
+            print(f"[SKIP] {name}: {e}")
+
+    print(
+        f"\n{'backend':<12} {'batch':>5} {'texts/s':>9} "
+        f"{'batch p50':>10} {'batch p99':>10} {'single p50':>11} {'single p99':>11}"
+    )
+    for r in results:
+        print(
+            f"{r['backend']:<12} {r['batch_size']:>5} {r['texts_per_sec']:>9.1f} "
+            f"{r['batch']['p50_ms']:>8.1f}ms {r['batch']['p99_ms']:>8.1f}ms "
+            f"{r['single']['p50_ms']:>9.1f}ms {r['single']['p99_ms']:>9.1f}ms"
+        )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Weaviate Connection Benchmark - Connect-per-call vs pooled clients.
+
+Runs the same search from N concurrent workers (default 50) in two modes:
+    - per-call: open a client with connect_to_local(), search, close
+      (what every call site did before the shared pool)
+    - pool: borrow a client from memory.core.weaviate_pool, search, give back
+
+and reports per-request latency p50/p99 and throughput for each mode.
+
+The search is a near_vector query with a random 1024-dim vector, so the
+numbers measure connection handling and Weaviate, not the embedder.
+
+Usage:
+    python -m memory.core.benchmark_weaviate_pool
+    python -m memory.core.benchmark_weaviate_pool --concurrency 50 --requests 10 --collection Chunk
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import weaviate
+
+from memory.core.weaviate_pool import WeaviateConnectionPool
+
+
+def _search(client: Any, collection: str, vector: List[float], limit: int):
+    client.collections.get(collection).query.near_vector(
+        near_vector=vector, limit=limit
+    )
+
+
+def run_mode(
+    name: str,
+    request_fn: Callable[[List[float]], None],
+    concurrency: int,
+    requests_per_worker: int,
+) -> Dict[str, Any]:
+    """
+    Run requests_per_worker searches in each of `concurrency` workers.
+
+    Args:
+        name: Mode name for the report.
+        request_fn: Function performing one search for a query vector.
+        concurrency: Number of concurrent workers.
+        requests_per_worker: Searches per worker.
+
+    Returns:
+        Dictionary with latency percentiles, errors and throughput.
+    """
+    rng = np.random.default_rng(42)
+    vectors = [rng.standard_normal(1024).astype(np.float32).tolist() for _ in range(concurrency)]
+
+    def worker(vector: List[float]) -> List[float]:
+        latencies = []
+        for _ in range(requests_per_worker):
+            start = time.perf_counter()
+            request_fn(vector)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    latencies: List[float] = []
+    errors = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, v) for v in vectors]:
+            try:
+                latencies.extend(future.result())
+            except Exception as e:
+                errors += 1
+                print(f"  [{name}] worker failed: {e}")
+    total_s = time.perf_counter() - start
+
+    ms = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "requests_per_sec": len(latencies) / total_s if total_s > 0 else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Weaviate connect-per-call vs pool")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent searches")
+    parser.add_argument("--requests", type=int, default=10, help="Searches per worker")
+    parser.add_argument("--collection", default="Chunk", help="Collection to search")
+    parser.add_argument("--limit", type=int, default=10, help="Results per search")
+    parser.add_argument("--pool-size", type=int, default=8, help="Pool size for the pooled mode")
+    args = parser.parse_args()
+
+    def per_call(vector: List[float]):
+        client = weaviate.connect_to_local(host="localhost", port=8080, grpc_port=50051)
+        try:
+            _search(client, args.collection, vector, args.limit)
+        finally:
+            client.close()
+
+    pool = WeaviateConnectionPool(max_size=args.pool_size, acquire_timeout=120)
+
+    def pooled(vector: List[float]):
+        with pool.acquire() as client:
+            _search(client, args.collection, vector, args.limit)
+
+    print(
+        f"{args.concurrency} concurrent workers x {args.requests} searches "
+        f"on {args.collection} (pool size {args.pool_size})"
+    )
+
+    results = []
+    for name, fn in (("per-call", per_call), ("pool", pooled)):
+        print(f"\n=== {name} ===")
+        results.append(run_mode(name, fn, args.concurrency, args.requests))
+
+    pool.close_all()
+
+    print(f"\n{'mode':<10} {'requests':>8} {'errors':>6} {'p50':>10} {'p99':>10} {'mean':>10} {'req/s':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:<10} {r['requests']:>8} {r['errors']:>6} "
+            f"{r['p50_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms {r['mean_ms']:>8.1f}ms "
+            f"{r['requests_per_sec']:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
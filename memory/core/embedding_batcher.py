@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Embedding Micro-Batcher - Coalesce concurrent single-text requests.
+
+Flask requests, MCP tool calls and the Ikario daemon each embed one query
+at a time. Run one by one, the GPU works at batch size 1 and the calls
+serialize. The micro-batcher queues those requests, gathers everything
+that arrives within a short window (default 3 ms) and runs a single
+batched encode, resolving one future per request.
+
+Front-ends:
+    - Sync: ``embed(text)`` / ``submit(text)`` (concurrent.futures.Future)
+    - Asyncio: ``await aembed(text)``
+
+Usage:
+    batcher = MicroBatcher(embedder.embed_batch, max_wait_ms=3, max_batch_size=48)
+    vector = batcher.embed("Query text")
+    vector = await batcher.aembed("Query text")
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT_MS = 3.0
+
+_Request = Tuple[str, Future]
+
+
+class MicroBatcher:
+    """Background thread gathering concurrent embed requests into batches."""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], np.ndarray],
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_batch_size: int = 48,
+        name: str = "embedding-batcher",
+    ):
+        """
+        Start the batching thread.
+
+        Args:
+            embed_fn: Function embedding a list of texts into an (n, dim) array.
+            max_wait_ms: Time window to gather requests after the first one.
+            max_batch_size: Flush as soon as this many requests are queued.
+            name: Thread name (for logs and debugging).
+        """
+        self.embed_fn = embed_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # Sync front-end
+    # -------------------------------------------------------------------------
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the future resolves to its (dim,) vector."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def submit_many(self, texts: Sequence[str]) -> List[Future]:
+        """Queue several texts; returns one future per text."""
+        return [self.submit(text) for text in texts]
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Embed one text, blocking until its batch has run."""
+        return self.submit(text).result(timeout=timeout)
+
+    def embed_many(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Embed several texts, blocking until all of them are done."""
+        futures = self.submit_many(texts)
+        return np.stack([f.result(timeout=timeout) for f in futures])
+
+    # -------------------------------------------------------------------------
+    # Asyncio front-end
+    # -------------------------------------------------------------------------
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Embed one text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    async def aembed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed several texts without blocking the event loop."""
+        vectors = await asyncio.gather(
+            *(asyncio.wrap_future(f) for f in self.submit_many(texts))
+        )
+        return np.stack(vectors)
+
+    # -------------------------------------------------------------------------
+    # Batching loop
+    # -------------------------------------------------------------------------
+
+    def _gather(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Collect requests until the window closes or the batch is full."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        stop = False
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+
+        return batch, stop
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, stop = self._gather(first)
+
+            # Skip requests cancelled while waiting
+            batch = [(t, f) for t, f in batch if f.set_running_or_notify_cancel()]
+            if batch:
+                self._process(batch)
+
+            if stop:
+                break
+
+    def _process(self, batch: List[_Request]):
+        texts = [text for text, _ in batch]
+        try:
+            vectors = self.embed_fn(texts)
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(texts)} texts failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+        self.batches += 1
+        self.texts += len(texts)
+        self.largest_batch = max(self.largest_batch, len(texts))
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Batches run, texts embedded, average and largest batch size."""
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Stop the thread after the requests already queued are served."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
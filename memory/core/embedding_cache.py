@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache - Two-tier content-addressed cache for bge-m3 vectors.
+
+Queries are re-embedded on every search and re-ingesting a document
+re-embeds unchanged chunks. This cache sits in front of the embedding
+backend (inside GPUEmbeddingService) so every caller benefits at once.
+
+Architecture:
+    - Key: sha256(model_id + normalized text)
+    - Tier 1: in-process LRU (OrderedDict, float32 vectors)
+    - Tier 2: SQLite file on disk (float16 vectors, ~2 KB per entry)
+    - Size-bounded: LRU eviction in memory, least-recently-used rows on disk
+      (row count tracked in process, recounted only when it may exceed the bound)
+    - Disk access times are buffered and written in one batch (before eviction
+      or every ACCESS_FLUSH_SIZE hits), not on every read
+    - Invalidation: the key includes the model id, so vectors of another model
+      or backend are never returned; their rows age out through LRU eviction
+
+Configuration (environment variables):
+    EMBEDDING_CACHE: "1" (default) to enable, "0" to disable.
+    EMBEDDING_CACHE_PATH: SQLite file (default: ~/.cache/ikario/embeddings.sqlite).
+    EMBEDDING_CACHE_MEMORY_SIZE: Max entries in memory (default: 10000).
+    EMBEDDING_CACHE_DISK_SIZE: Max entries on disk (default: 200000, ~400 MB).
+
+Usage:
+    cache = EmbeddingCache("BAAI/bge-m3@cuda-fp16")
+    vectors, missing = cache.get_many(texts)
+    cache.put_many([texts[i] for i in missing], new_vectors)
+    cache.stats()
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_SIZE = 10_000
+DEFAULT_DISK_SIZE = 200_000
+ACCESS_FLUSH_SIZE = 1_000
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model_id: str, text: str) -> str:
+    """Content-addressed key: sha256 of model id and normalized text."""
+    payload = f"{model_id}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) embedding cache for one model."""
+
+    def __init__(
+        self,
+        model_id: str,
+        path: Optional[Path] = None,
+        memory_size: int = DEFAULT_MEMORY_SIZE,
+        disk_size: int = DEFAULT_DISK_SIZE,
+    ):
+        """
+        Open (or create) the cache for a model.
+
+        Args:
+            model_id: Identity of the model producing the vectors
+                (e.g. "BAAI/bge-m3@cuda-fp16").
+            path: SQLite file, or None to keep only the in-memory tier.
+            memory_size: Max entries in the in-memory LRU.
+            disk_size: Max rows kept on disk.
+        """
+        self.model_id = model_id
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_rows = 0  # upper bound on rows on disk (INSERT OR REPLACE may not grow)
+        self._pending_access: Dict[str, float] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path is not None:
+            self._open_disk(Path(path))
+
+    # -------------------------------------------------------------------------
+    # Disk tier
+    # -------------------------------------------------------------------------
+
+    def _open_disk(self, path: Path):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " model_id TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings(last_access)"
+            )
+            conn.commit()
+            self._disk_rows = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn = conn
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk tier disabled ({path}): {e}")
+            self._conn = None
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if self._conn is None or not keys:
+            return found
+
+        # SQLite limits the number of bound parameters per statement
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                part,
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+        if found:
+            now = time.time()
+            for key in found:
+                self._pending_access[key] = now
+            if len(self._pending_access) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
+                self._conn.commit()
+        return found
+
+    def _flush_access(self):
+        """Write buffered access times (caller commits)."""
+        if self._conn is None or not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+            [(ts, key) for key, ts in self._pending_access.items()],
+        )
+        self._pending_access.clear()
+
+    def _disk_put(self, items: List[Tuple[str, np.ndarray]]):
+        if self._conn is None or not items:
+            return
+
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, model_id, vector, last_access) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (key, self.model_id, vector.astype(np.float16).tobytes(), now)
+                for key, vector in items
+            ],
+        )
+
+        self._disk_rows += len(items)
+
+        # Size bound: drop the least recently used rows (10% headroom).
+        # Only recount when the tracked upper bound says the limit may be hit.
+        if self._disk_rows > self.disk_size:
+            self._flush_access()
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.disk_size:
+                excess = count - int(self.disk_size * 0.9)
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    " SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+                count -= excess
+                logger.debug(f"Embedding cache: evicted {excess} rows from disk")
+            self._disk_rows = count
+        self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Memory tier
+    # -------------------------------------------------------------------------
+
+    def _memory_put(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[List[Optional[np.ndarray]], List[int]]:
+        """
+        Look up vectors for texts.
+
+        Args:
+            texts: Texts to look up.
+
+        Returns:
+            Tuple (vectors, missing): vectors[i] is a copy of the cached vector
+            (safe to modify in place) or None, missing lists the indices of
+            texts not found in either tier.
+        """
+        keys = [cache_key(self.model_id, t) for t in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        with self._lock:
+            disk_lookup: List[str] = []
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    vectors[i] = vector.copy()
+                    self.memory_hits += 1
+                else:
+                    disk_lookup.append(key)
+
+            try:
+                from_disk = self._disk_get(disk_lookup)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                from_disk = {}
+
+            missing: List[int] = []
+            for i, key in enumerate(keys):
+                if vectors[i] is not None:
+                    continue
+                vector = from_disk.get(key)
+                if vector is not None:
+                    vectors[i] = vector.copy()
+                    self._memory_put(key, vector)
+                    self.disk_hits += 1
+                else:
+                    missing.append(i)
+                    self.misses += 1
+
+        return vectors, missing
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray):
+        """
+        Store vectors for texts in both tiers.
+
+        The rows are copied: the caller keeps ownership of ``vectors``.
+
+        Args:
+            texts: Texts that were embedded.
+            vectors: Array of shape (len(texts), dim).
+        """
+        items = [
+            (cache_key(self.model_id, t), np.array(v, dtype=np.float32))
+            for t, v in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, vector in items:
+                self._memory_put(key, vector)
+            try:
+                self._disk_put(items)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def flush(self):
+        """Write buffered disk access times now."""
+        with self._lock:
+            try:
+                self._flush_access()
+                if self._conn is not None:
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache flush failed: {e}")
+
+    def clear(self):
+        """Drop every cached vector (both tiers) and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+                self._disk_rows = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and tier sizes.
+
+        Returns:
+            Dictionary with hits per tier, misses, hit rate and sizes.
+        """
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model_id": self.model_id,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "path": str(self.path) if self.path else None,
+            }
+
+
+def create_cache_from_env(model_id: str) -> Optional[EmbeddingCache]:
+    """
+    Create the embedding cache configured by environment variables.
+
+    Args:
+        model_id: Identity of the model producing the vectors.
+
+    Returns:
+        EmbeddingCache, or None if EMBEDDING_CACHE=0.
+    """
+    if os.getenv("EMBEDDING_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        logger.info("Embedding cache disabled (EMBEDDING_CACHE=0)")
+        return None
+
+    path = Path(
+        os.getenv(
+            "EMBEDDING_CACHE_PATH",
+            str(Path.home() / ".cache" / "ikario" / "embeddings.sqlite"),
+        )
+    ).expanduser()
+
+    return EmbeddingCache(
+        model_id,
+        path=path,
+        memory_size=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", str(DEFAULT_MEMORY_SIZE))),
+        disk_size=int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", str(DEFAULT_DISK_SIZE))),
+    )
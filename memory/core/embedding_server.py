@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Embedding Server - Share one loaded bge-m3 between processes over local IPC.
+
+The Flask app, the MCP servers and the Ikario daemon each load their own
+copy of bge-m3 (~2.6 GB). This module serves a single GPUEmbeddingService
+over a Unix socket (or a localhost TCP port where Unix sockets are not
+available) and provides a client with the same API, so every process can
+use the one loaded model. Single-text requests from all clients go through
+the service's micro-batcher and are coalesced into shared batches.
+
+Protocol (one frame per request/response, persistent connections):
+    8 bytes: header length, payload length (network order uint32)
+    header:  JSON ({"op": "embed", "texts": [...]} / {"op": "info"})
+    payload: raw float32 vectors for responses (shape given in header)
+
+Usage:
+    # Server (one per machine)
+    python -m memory.core.embedding_server --address /tmp/ikario-embeddings.sock
+
+    # Clients: get_embedder() returns an EmbeddingClient when
+    # EMBEDDING_SERVER_ADDRESS is set
+    export EMBEDDING_SERVER_ADDRESS=/tmp/ikario-embeddings.sock
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS = "/tmp/ikario-embeddings.sock"
+
+_FRAME_HEADER = struct.Struct("!II")
+
+
+# =============================================================================
+# Framing
+# =============================================================================
+
+def _parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """Return (socket family, address) for a Unix path or a "host:port" string."""
+    match = re.fullmatch(r"([\w.\-]+):(\d+)", address)
+    if match:
+        return socket.AF_INET, (match.group(1), int(match.group(2)))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(
+            f"Unix sockets are not available on this platform, use host:port (got {address!r})"
+        )
+    return socket.AF_UNIX, address
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        part = sock.recv(size - len(data))
+        if not part:
+            raise ConnectionError("Connection closed by peer")
+        data.extend(part)
+    return bytes(data)
+
+
+def _send_frame(sock: socket.socket, header: Dict[str, Any], payload: bytes = b""):
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_FRAME_HEADER.pack(len(header_bytes), len(payload)) + header_bytes + payload)
+
+
+def _recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    header_size, payload_size = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    header = json.loads(_recv_exact(sock, header_size).decode("utf-8"))
+    payload = _recv_exact(sock, payload_size) if payload_size else b""
+    return header, payload
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class _EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    """Serve framed requests on one client connection until it closes."""
+
+    def handle(self):
+        embedder = self.server.embedder  # type: ignore[attr-defined]
+        while True:
+            try:
+                request, _ = _recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            try:
+                op = request.get("op")
+                if op == "embed":
+                    texts: List[str] = request.get("texts", [])
+                    if len(texts) == 1:
+                        # Goes through the micro-batcher with other clients' queries
+                        vectors = embedder.embed_single(texts[0])[np.newaxis, :]
+                    else:
+                        vectors = embedder.embed_batch(texts)
+                    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+                    _send_frame(
+                        self.request,
+                        {"ok": True, "shape": list(vectors.shape)},
+                        vectors.tobytes(),
+                    )
+                elif op == "info":
+                    _send_frame(self.request, {"ok": True, "info": embedder.get_model_info()})
+                else:
+                    _send_frame(self.request, {"ok": False, "error": f"Unknown op: {op!r}"})
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                logger.error(f"Embedding request failed: {e}")
+                try:
+                    _send_frame(self.request, {"ok": False, "error": str(e)})
+                except OSError:
+                    return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_server(address: str, embedder) -> socketserver.BaseServer:
+    """
+    Create (but do not start) an embedding server bound to address.
+
+    Args:
+        address: Unix socket path or "host:port".
+        embedder: GPUEmbeddingService instance to serve.
+
+    Returns:
+        Threading socket server; call ``serve_forever()`` to run it.
+    """
+    family, bind_address = _parse_address(address)
+
+    if family == socket.AF_INET:
+        server: socketserver.BaseServer = _ThreadingTCPServer(
+            bind_address, _EmbeddingRequestHandler
+        )
+    else:
+        # Remove a stale socket file left by a previous run
+        path = Path(str(bind_address))
+        if path.exists():
+            path.unlink()
+        server = _ThreadingUnixServer(str(bind_address), _EmbeddingRequestHandler)
+
+    server.embedder = embedder  # type: ignore[attr-defined]
+    return server
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class EmbeddingClient:
+    """
+    Client of the embedding server with the GPUEmbeddingService API.
+
+    Also provides ``encode()`` with SentenceTransformer semantics so it can be
+    passed wherever the Ikario modules expect an ``embedding_model``.
+    """
+
+    def __init__(self, address: str, timeout: float = 60.0):
+        """
+        Connect to the server and fetch model information.
+
+        Args:
+            address: Unix socket path or "host:port".
+            timeout: Socket timeout in seconds.
+
+        Raises:
+            ConnectionError: If the server is not reachable.
+        """
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+        info = self.get_model_info()
+        self.model_name: str = info["model_name"]
+        self.embedding_dim: int = info["embedding_dim"]
+        self.optimal_batch_size: int = info["optimal_batch_size"]
+        self.device = f"server:{address}"
+
+    def _socket(self) -> socket.socket:
+        # One persistent connection per thread
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            family, connect_address = _parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(connect_address)
+            except OSError as e:
+                sock.close()
+                raise ConnectionError(f"Embedding server unreachable at {self.address}: {e}") from e
+            self._local.sock = sock
+        return sock
+
+    def _request(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        # Retry once on a fresh connection (server restarted, idle socket closed)
+        for attempt in range(2):
+            sock = self._socket()
+            try:
+                _send_frame(sock, header)
+                response, payload = _recv_frame(sock)
+                break
+            except (ConnectionError, OSError):
+                sock.close()
+                self._local.sock = None
+                if attempt == 1:
+                    raise
+
+        if not response.get("ok"):
+            raise RuntimeError(f"Embedding server error: {response.get('error')}")
+        return response, payload
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """Embed texts on the server; returns shape (len(texts), 1024)."""
+        if not texts:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        response, payload = self._request({"op": "embed", "texts": list(texts)})
+        # frombuffer gives a read-only view of the payload: hand out an owned array
+        return np.frombuffer(payload, dtype=np.float32).reshape(response["shape"]).copy()
+
+    def embed_single(self, text: str) -> np.ndarray:
+        """Embed one text on the server; returns shape (1024,)."""
+        return self.embed_batch([text])[0]
+
+    async def aembed_single(self, text: str) -> np.ndarray:
+        """Embed one text without blocking the asyncio event loop."""
+        return await asyncio.to_thread(self.embed_single, text)
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> np.ndarray:
+        """SentenceTransformer-compatible encode (str -> (dim,), list -> (n, dim))."""
+        if isinstance(sentences, str):
+            return self.embed_single(sentences)
+        return self.embed_batch(list(sentences))
+
+    def get_embedding_dimension(self) -> int:
+        """Get embedding dimension (1024 for bge-m3)."""
+        return self.embedding_dim
+
+    def get_model_info(self) -> dict:
+        """Get the server's model information."""
+        response, _ = self._request({"op": "info"})
+        return response["info"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Shared bge-m3 embedding server")
+    parser.add_argument(
+        "--address",
+        default=os.getenv("EMBEDDING_SERVER_ADDRESS", DEFAULT_ADDRESS),
+        help="Unix socket path or host:port (default: EMBEDDING_SERVER_ADDRESS)",
+    )
+    parser.add_argument("--backend", default=None, help="Embedding backend (default: EMBEDDING_BACKEND)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    # Imported here: embedding_service imports this module at load time
+    from memory.core.embedding_service import GPUEmbeddingService
+
+    embedder = GPUEmbeddingService(args.backend)
+    server = create_server(args.address, embedder)
+    logger.info(f"Embedding server listening on {args.address}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Embedding server stopping")
+    finally:
+        server.server_close()
+        if _parse_address(args.address)[0] != socket.AF_INET:
+            Path(args.address).unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,36 @@
 #!/usr/bin/env python3
 """
-GPU Embedding Service - Singleton for RTX 4070.
+GPU Embedding Service - Singleton for RTX 4070 (with CPU fallback).
 
 This module provides a singleton service for generating embeddings using
-BAAI/bge-m3 model on GPU with FP16 precision.
+BAAI/bge-m3. The device-specific part is delegated to a pluggable backend
+(see memory.core.embedding_backends), selected with EMBEDDING_BACKEND:
+
+    - cuda-fp16: RTX 4070, FP16 precision (default when CUDA is available)
+    - cpu-fp32: PyTorch on CPU (default on CPU-only nodes)
+    - onnx-int8: int8-quantized ONNX export on CPU
 
 Architecture:
     - Singleton pattern: One model instance shared across application
-    - PyTorch CUDA: RTX 4070 with 8 GB VRAM
-    - FP16 precision: Reduces VRAM usage by ~50%
-    - Optimal batch size: 48 (tested for RTX 4070 with 5.3 GB available)
-
-Performance (RTX 4070):
+    - Same embed_single/embed_batch API on every backend
+    - Batch size picked per backend (48 on RTX 4070, 16 on CPU FP32,
+      32 on ONNX int8), overridable with EMBEDDING_BATCH_SIZE
+    - Two-tier embedding cache (memory LRU + SQLite) in front of the model,
+      see memory.core.embedding_cache (disable with EMBEDDING_CACHE=0)
+    - Micro-batching: concurrent embed_single calls arriving within
+      EMBEDDING_MICROBATCH_MS (default 3 ms) run as one batch
+    - Shared server: with EMBEDDING_SERVER_ADDRESS set, get_embedder()
+      returns a client of ``python -m memory.core.embedding_server`` so
+      several processes share one loaded model
+
+Performance (RTX 4070, cuda-fp16):
     - Single embedding: ~17 ms
     - Batch 48: ~34 ms (0.71 ms per item)
     - VRAM usage: ~2.6 GB peak
 
+Benchmark all backends with:
+    python -m memory.core.benchmark_embeddings
+
 Usage:
     from memory.core.embedding_service import get_embedder
 
@@ -28,80 +43,87 @@ Usage:
     embeddings = embedder.embed_batch(["Text 1", "Text 2", ...])
 """
 
-import torch
-from sentence_transformers import SentenceTransformer
-from typing import List, Union
+from typing import List, Optional, Union
+import asyncio
 import logging
+import os
 import numpy as np
 
+from memory.core.embedding_backends import EmbeddingBackend, create_backend
+from memory.core.embedding_batcher import DEFAULT_MAX_WAIT_MS, MicroBatcher
+from memory.core.embedding_cache import EmbeddingCache, create_cache_from_env
+from memory.core.embedding_server import EmbeddingClient
+
 logger = logging.getLogger(__name__)
 
 
 class GPUEmbeddingService:
-    """Singleton GPU embedding service using BAAI/bge-m3."""
+    """Singleton embedding service using BAAI/bge-m3 on a configurable backend."""
 
     _instance = None
     _initialized = False
 
-    def __new__(cls):
+    def __new__(cls, backend: Optional[str] = None):
         """Singleton pattern: only one instance."""
         if cls._instance is None:
             cls._instance = super(GPUEmbeddingService, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        """Initialize GPU embedder (only once)."""
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize embedder (only once).
+
+        Args:
+            backend: Backend name ("cuda-fp16", "cpu-fp32", "onnx-int8" or
+                "auto"). Defaults to the EMBEDDING_BACKEND environment variable.
+        """
         if self._initialized:
             return
 
-        logger.info("Initializing GPU Embedding Service...")
-
-        # Check CUDA availability
-        if not torch.cuda.is_available():
-            raise RuntimeError(
-                "CUDA not available! GPU embedding service requires PyTorch with CUDA.\n"
-                "Install with: pip install torch --index-url https://download.pytorch.org/whl/cu124"
-            )
+        logger.info("Initializing Embedding Service...")
 
-        # Device configuration
-        self.device = torch.device("cuda:0")
-        logger.info(f"Using GPU: {torch.cuda.get_device_name(0)}")
+        # Backend configuration (device, precision, batch size)
+        self.backend: EmbeddingBackend = create_backend(backend)
+        self.device = self.backend.device
+        logger.info(f"Using embedding backend: {self.backend.name}")
 
         # Model configuration
         self.model_name = "BAAI/bge-m3"
         self.embedding_dim = 1024
         self.max_seq_length = 8192
 
-        # Load model on GPU
-        logger.info(f"Loading {self.model_name} on GPU...")
-        self.model = SentenceTransformer(self.model_name, device=str(self.device))
+        # Load model on the backend's device
+        self.model = self.backend.load(self.model_name)
 
-        # Convert to FP16 for memory efficiency
-        logger.info("Converting model to FP16 precision...")
-        self.model.half()
+        # Batch size tuned per backend
+        self.optimal_batch_size = self.backend.batch_size
 
-        # Optimal batch size for RTX 4070 (5.3 GB VRAM available)
-        # Tested: batch 48 uses ~3.5 GB VRAM, leaves ~1.8 GB buffer
-        self.optimal_batch_size = 48
+        # Content-addressed cache (keyed by model + backend: int8 and FP16
+        # vectors differ slightly, switching backend invalidates the cache)
+        self.cache: Optional[EmbeddingCache] = create_cache_from_env(
+            f"{self.model_name}@{self.backend.name}"
+        )
 
-        # VRAM monitoring
-        self._log_vram_usage()
+        # Micro-batching of concurrent embed_single calls (0 disables)
+        max_wait_ms = float(os.getenv("EMBEDDING_MICROBATCH_MS", str(DEFAULT_MAX_WAIT_MS)))
+        self.batcher: Optional[MicroBatcher] = None
+        if max_wait_ms > 0:
+            self.batcher = MicroBatcher(
+                self._encode_uncached,
+                max_wait_ms=max_wait_ms,
+                max_batch_size=self.optimal_batch_size,
+            )
 
         self._initialized = True
-        logger.info("GPU Embedding Service initialized successfully")
-
-    def _log_vram_usage(self):
-        """Log current VRAM usage."""
-        allocated = torch.cuda.memory_allocated(0) / 1024**3
-        reserved = torch.cuda.memory_reserved(0) / 1024**3
-        total = torch.cuda.get_device_properties(0).total_memory / 1024**3
-
         logger.info(
-            f"VRAM: {allocated:.2f} GB allocated, "
-            f"{reserved:.2f} GB reserved, "
-            f"{total:.2f} GB total"
+            f"Embedding Service initialized successfully "
+            f"(backend: {self.backend.name}, batch_size: {self.optimal_batch_size})"
         )
 
+    def _log_vram_usage(self):
+        """Log current VRAM usage (no-op on CPU backends)."""
+        self.backend.log_memory_usage()
+
     def embed_single(self, text: str) -> np.ndarray:
         """
         Embed a single text.
@@ -118,15 +140,55 @@ class GPUEmbeddingService:
             >>> emb.shape
             (1024,)
         """
-        # Use convert_to_numpy=False to keep tensor on GPU
-        embedding_tensor = self.model.encode(
-            text,
-            convert_to_numpy=False,
-            show_progress_bar=False
+        if self.cache is not None:
+            vectors, missing = self.cache.get_many([text])
+            if not missing:
+                return vectors[0]
+
+        if self.batcher is not None:
+            # Coalesced with concurrent callers into one batched encode
+            return self.batcher.embed(text)
+
+        return self._encode_uncached([text])[0]
+
+    async def aembed_single(self, text: str) -> np.ndarray:
+        """
+        Embed a single text without blocking the asyncio event loop.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Embedding vector (1024 dimensions).
+        """
+        if self.cache is not None:
+            vectors, missing = self.cache.get_many([text])
+            if not missing:
+                return vectors[0]
+
+        if self.batcher is not None:
+            return await self.batcher.aembed(text)
+
+        return await asyncio.to_thread(lambda: self._encode_uncached([text])[0])
+
+    def _encode_uncached(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = False
+    ) -> np.ndarray:
+        """Encode texts with the backend and store the vectors in the cache."""
+        vectors = self.backend.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress=show_progress
         )
+        if self.cache is None:
+            return vectors
 
-        # Convert to numpy on CPU
-        return embedding_tensor.cpu().numpy()
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.cache.put_many(texts, vectors)
+        return vectors
 
     def embed_batch(
         self,
@@ -139,7 +201,7 @@ class GPUEmbeddingService:
 
         Args:
             texts: List of texts to embed.
-            batch_size: Batch size (default: optimal_batch_size=48).
+            batch_size: Batch size (default: optimal_batch_size of the backend).
             show_progress: Show progress bar.
 
         Returns:
@@ -163,20 +225,23 @@ class GPUEmbeddingService:
             )
             batch_size = self.optimal_batch_size
 
-        # Encode on GPU, keep as tensor
-        embeddings_tensor = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            convert_to_numpy=False,
-            show_progress_bar=show_progress
-        )
+        if self.cache is None:
+            return self._encode_uncached(texts, batch_size, show_progress)
+
+        vectors, missing = self.cache.get_many(texts)
 
-        # Handle both tensor and list of tensors
-        if isinstance(embeddings_tensor, list):
-            embeddings_tensor = torch.stack(embeddings_tensor)
+        if missing:
+            # Embed each distinct missing text once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            new_vectors = self._encode_uncached(missing_texts, batch_size, show_progress)
 
-        # Convert to numpy on CPU
-        return embeddings_tensor.cpu().numpy()
+            by_text = dict(zip(missing_texts, new_vectors))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+
+        if not vectors:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        return np.stack(vectors)
 
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension (1024 for bge-m3)."""
@@ -193,18 +258,27 @@ class GPUEmbeddingService:
             "model_name": self.model_name,
             "embedding_dim": self.embedding_dim,
             "max_seq_length": self.max_seq_length,
+            "backend": self.backend.name,
             "device": str(self.device),
             "optimal_batch_size": self.optimal_batch_size,
-            "precision": "FP16",
-            "vram_allocated_gb": torch.cuda.memory_allocated(0) / 1024**3,
-            "vram_reserved_gb": torch.cuda.memory_reserved(0) / 1024**3,
+            "precision": self.backend.precision,
+            **self.backend.memory_info(),
+            "cache": self.get_cache_stats(),
+            "microbatch": self.batcher.stats() if self.batcher is not None else None,
         }
 
+    def get_cache_stats(self) -> Optional[dict]:
+        """
+        Get embedding cache statistics.
+
+        Returns:
+            Hit/miss counters and sizes, or None if the cache is disabled.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
     def clear_cache(self):
-        """Clear CUDA cache to free VRAM."""
-        torch.cuda.empty_cache()
-        logger.info("CUDA cache cleared")
-        self._log_vram_usage()
+        """Clear device cache to free VRAM (no-op on CPU backends)."""
+        self.backend.clear_cache()
 
     def adjust_batch_size(self, new_batch_size: int):
         """
@@ -217,18 +291,28 @@ class GPUEmbeddingService:
             f"Adjusting batch size from {self.optimal_batch_size} to {new_batch_size}"
         )
         self.optimal_batch_size = new_batch_size
+        self.backend.batch_size = new_batch_size
 
 
 # Singleton accessor
 _embedder_instance = None
 
 
-def get_embedder() -> GPUEmbeddingService:
+def get_embedder(
+    backend: Optional[str] = None
+) -> Union[GPUEmbeddingService, EmbeddingClient]:
     """
-    Get the singleton GPU embedding service.
+    Get the singleton embedding service.
+
+    When EMBEDDING_SERVER_ADDRESS is set and the embedding server answers,
+    returns a client sharing the server's model instead of loading one.
+
+    Args:
+        backend: Backend name used on first initialization only
+            (default: EMBEDDING_BACKEND environment variable, then "auto").
 
     Returns:
-        Initialized GPUEmbeddingService instance.
+        Initialized GPUEmbeddingService (or EmbeddingClient) instance.
 
     Example:
         >>> from memory.core.embedding_service import get_embedder
@@ -238,7 +322,16 @@ def get_embedder() -> GPUEmbeddingService:
     global _embedder_instance
 
     if _embedder_instance is None:
-        _embedder_instance = GPUEmbeddingService()
+        server_address = os.getenv("EMBEDDING_SERVER_ADDRESS")
+        if server_address:
+            try:
+                _embedder_instance = EmbeddingClient(server_address)
+                logger.info(f"Using shared embedding server at {server_address}")
+            except (ConnectionError, OSError) as e:
+                logger.warning(f"{e} - loading a local model instead")
+
+    if _embedder_instance is None:
+        _embedder_instance = GPUEmbeddingService(backend)
 
     return _embedder_instance
 
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Weaviate Connection Pool - Shared, long-lived clients for every call site.
+
+Opening a Weaviate client costs an HTTP readiness probe plus a gRPC channel
+setup. The Flask app, the ingestion code and the MCP tools used to do it
+for every request or tool call. This module keeps a bounded pool of
+connected clients that all of them borrow from.
+
+Architecture:
+    - Bounded pool (WEAVIATE_POOL_SIZE, default 8): clients created lazily,
+      borrowers block when every client is in use
+    - Re-entrant per thread: a nested acquire() in a thread that already
+      holds a client gets the same client (no pool deadlock on nesting)
+    - Health check: a client idle for more than 30 s is probed with
+      ``is_ready()`` before being handed out, and replaced if dead
+    - Reconnect with exponential backoff (0.5 s, 1 s, 2 s, ...)
+    - ``acquire()`` returns a PooledClient: ``close()`` (or leaving a ``with``
+      block) returns it to the pool instead of closing the connection, so
+      existing ``client.close()`` call sites keep working unchanged
+    - Async: ``await acquire_async()`` borrows a client from a worker thread so
+      a coroutine never blocks its event loop waiting for a free slot
+
+Configuration (environment variables):
+    WEAVIATE_URL: HTTP endpoint (default: http://localhost:8080)
+    WEAVIATE_GRPC_PORT: gRPC port (default: 50051)
+    WEAVIATE_API_KEY: API key (uses connect_to_custom when set)
+    WEAVIATE_POOL_SIZE: Max pooled clients (default: 8)
+    WEAVIATE_QUERY_TIMEOUT: Query timeout in seconds (default: 600)
+    WEAVIATE_INSERT_TIMEOUT: Insert timeout in seconds (default: 600)
+
+Usage:
+    from memory.core.weaviate_pool import get_weaviate_pool
+
+    with get_weaviate_pool().acquire() as client:
+        chunks = client.collections.get("Chunk")
+
+    client = await get_weaviate_pool().acquire_async()
+    try:
+        chunks = client.collections.get("Chunk")
+    finally:
+        client.close()
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import weaviate
+from weaviate.classes.init import AdditionalConfig, Timeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 8
+HEALTH_CHECK_INTERVAL = 30.0
+CONNECT_RETRIES = 4
+BACKOFF_BASE = 0.5
+DEFAULT_QUERY_TIMEOUT = 600
+DEFAULT_INSERT_TIMEOUT = 600
+
+
+def _connection_params() -> Dict[str, Any]:
+    """Read host/ports/secure/API key from the environment."""
+    url = urlparse(os.getenv("WEAVIATE_URL", "http://localhost:8080"))
+    secure = url.scheme == "https"
+    return {
+        "host": url.hostname or "localhost",
+        "port": url.port or (443 if secure else 8080),
+        "secure": secure,
+        "grpc_port": int(os.getenv("WEAVIATE_GRPC_PORT", "50051")),
+        "api_key": os.getenv("WEAVIATE_API_KEY"),
+    }
+
+
+def _additional_config() -> AdditionalConfig:
+    # Pooled clients also serve ingestion: keep 10 min for long text batches
+    # (e.g., Peirce CP 3.403, CP 8.388, Menon chunk 10) and large aggregates
+    return AdditionalConfig(timeout=Timeout(
+        init=30,
+        query=int(os.getenv("WEAVIATE_QUERY_TIMEOUT", str(DEFAULT_QUERY_TIMEOUT))),
+        insert=int(os.getenv("WEAVIATE_INSERT_TIMEOUT", str(DEFAULT_INSERT_TIMEOUT))),
+    ))
+
+
+class PooledClient:
+    """
+    Weaviate client borrowed from a pool.
+
+    Behaves like the underlying WeaviateClient; ``close()`` and ``__exit__``
+    return it to the pool instead of closing the connection.
+    """
+
+    def __init__(self, pool: "WeaviateConnectionPool", client: weaviate.WeaviateClient):
+        self._pool = pool
+        self._client: Optional[weaviate.WeaviateClient] = client
+
+    def __getattr__(self, name: str) -> Any:
+        client = self.__dict__.get("_client")
+        if client is None:
+            raise RuntimeError("Pooled Weaviate client used after close()")
+        return getattr(client, name)
+
+    def close(self):
+        """Return the client to the pool (idempotent)."""
+        client, self._client = self._client, None
+        if client is not None:
+            self._pool._release(client)
+
+    def __enter__(self) -> "PooledClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and self._client is not None:
+            # The error may come from a broken connection: re-check it before reuse
+            self._pool._mark_suspect(self._client)
+        self.close()
+
+    def __del__(self):
+        # Safety net for call sites that skip close() on error paths
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class WeaviateConnectionPool:
+    """Bounded pool of connected Weaviate clients with health checks."""
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, acquire_timeout: float = 30.0):
+        """
+        Create an empty pool (clients are connected on first use).
+
+        Args:
+            max_size: Maximum number of simultaneously open clients.
+            acquire_timeout: Seconds to wait for a free client before failing.
+        """
+        self.max_size = max(1, max_size)
+        self.acquire_timeout = acquire_timeout
+        self.params = _connection_params()
+
+        # LIFO: reuse the most recently used (warmest) client first
+        self._idle: "queue.LifoQueue[Tuple[weaviate.WeaviateClient, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._suspect: set = set()
+        self._all: List[weaviate.WeaviateClient] = []
+
+        # Re-entrancy: client held by the current thread, borrow depth per client
+        self._local = threading.local()
+        self._depth: Dict[int, int] = {}
+
+        self.stats = {"created": 0, "reused": 0, "reconnects": 0, "failed_checks": 0}
+
+    # -------------------------------------------------------------------------
+    # Connection
+    # -------------------------------------------------------------------------
+
+    def _connect(self) -> weaviate.WeaviateClient:
+        """Open a new client, retrying with exponential backoff."""
+        p = self.params
+        last_error: Optional[Exception] = None
+
+        for attempt in range(CONNECT_RETRIES):
+            try:
+                if p["api_key"]:
+                    client = weaviate.connect_to_custom(
+                        http_host=p["host"],
+                        http_port=p["port"],
+                        http_secure=p["secure"],
+                        grpc_host=p["host"],
+                        grpc_port=p["grpc_port"],
+                        grpc_secure=p["secure"],
+                        auth_credentials=weaviate.auth.AuthApiKey(p["api_key"]),
+                        additional_config=_additional_config(),
+                    )
+                else:
+                    client = weaviate.connect_to_local(
+                        host=p["host"],
+                        port=p["port"],
+                        grpc_port=p["grpc_port"],
+                        additional_config=_additional_config(),
+                    )
+                with self._lock:
+                    self._all.append(client)
+                    self.stats["created"] += 1
+                return client
+            except Exception as e:
+                last_error = e
+                if attempt < CONNECT_RETRIES - 1:
+                    delay = BACKOFF_BASE * (2 ** attempt)
+                    logger.warning(
+                        f"Weaviate connection failed ({e}), retrying in {delay:.1f}s "
+                        f"({attempt + 1}/{CONNECT_RETRIES})"
+                    )
+                    time.sleep(delay)
+
+        raise ConnectionError(
+            f"Failed to connect to Weaviate at {p['host']}:{p['port']} "
+            f"after {CONNECT_RETRIES} attempts: {last_error}"
+        ) from last_error
+
+    def _discard(self, client: weaviate.WeaviateClient):
+        with self._lock:
+            if client in self._all:
+                self._all.remove(client)
+            self._suspect.discard(id(client))
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, client: weaviate.WeaviateClient) -> bool:
+        try:
+            return bool(client.is_ready())
+        except Exception:
+            return False
+
+    # -------------------------------------------------------------------------
+    # Sync API
+    # -------------------------------------------------------------------------
+
+    def acquire(self) -> PooledClient:
+        """
+        Borrow a connected client.
+
+        Returns:
+            PooledClient; call ``close()`` or use it in a ``with`` block to
+            give it back.
+
+        Raises:
+            TimeoutError: If no client is free within acquire_timeout.
+            ConnectionError: If Weaviate cannot be reached after retries.
+        """
+        held = getattr(self._local, "client", None)
+        if held is not None:
+            with self._lock:
+                if id(held) in self._depth:
+                    self._depth[id(held)] += 1
+                    return PooledClient(self, held)
+
+        client = self._checkout()
+        self._local.client = client
+        return PooledClient(self, client)
+
+    async def acquire_async(self) -> PooledClient:
+        """
+        Borrow a connected client from a coroutine.
+
+        Waiting for a free slot, health checks and reconnects run in a worker
+        thread, not on the event loop. The client is not bound to any thread
+        (no re-entrant sharing), since it is released from the loop thread.
+
+        Returns:
+            PooledClient; call ``close()`` to give it back.
+
+        Raises:
+            TimeoutError: If no client is free within acquire_timeout.
+            ConnectionError: If Weaviate cannot be reached after retries.
+        """
+        checkout = asyncio.ensure_future(asyncio.to_thread(self._checkout))
+        try:
+            client = await asyncio.shield(checkout)
+        except asyncio.CancelledError:
+            # The worker thread keeps running: give its client back once it has one
+            checkout.add_done_callback(
+                lambda f: self._release(f.result())
+                if not f.cancelled() and f.exception() is None else None
+            )
+            raise
+        return PooledClient(self, client)
+
+    def _checkout(self) -> weaviate.WeaviateClient:
+        """Take a pool slot and a healthy client (idle or new), blocking if needed."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(
+                f"No Weaviate client available after {self.acquire_timeout}s "
+                f"(pool size {self.max_size})"
+            )
+
+        try:
+            while True:
+                try:
+                    client, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    client = self._connect()
+                    break
+
+                needs_check = (
+                    id(client) in self._suspect
+                    or time.monotonic() - last_used > HEALTH_CHECK_INTERVAL
+                )
+                if not needs_check or self._is_healthy(client):
+                    self._suspect.discard(id(client))
+                    self.stats["reused"] += 1
+                    break
+
+                # Dead connection: drop it and try the next idle one (or reconnect)
+                self.stats["failed_checks"] += 1
+                self.stats["reconnects"] += 1
+                logger.warning("Pooled Weaviate client failed health check, reconnecting")
+                self._discard(client)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._depth[id(client)] = 1
+        return client
+
+    def _release(self, client: weaviate.WeaviateClient):
+        with self._lock:
+            depth = self._depth.get(id(client), 1) - 1
+            if depth > 0:
+                # Nested borrow in the same thread: keep the client checked out
+                self._depth[id(client)] = depth
+                return
+            self._depth.pop(id(client), None)
+
+        if getattr(self._local, "client", None) is client:
+            self._local.client = None
+        self._idle.put((client, time.monotonic()))
+        self._slots.release()
+
+    def _mark_suspect(self, client: weaviate.WeaviateClient):
+        self._suspect.add(id(client))
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters: clients created/reused, reconnects, open and idle."""
+        with self._lock:
+            open_clients = len(self._all)
+        return {
+            **self.stats,
+            "max_size": self.max_size,
+            "open": open_clients,
+            "idle": self._idle.qsize(),
+        }
+
+    def close_all(self):
+        """Close every pooled client."""
+        while True:
+            try:
+                client, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(client)
+
+        with self._lock:
+            remaining = list(self._all)
+            self._all.clear()
+        for client in remaining:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+_pool: Optional[WeaviateConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_weaviate_pool() -> WeaviateConnectionPool:
+    """
+    Get the process-wide Weaviate connection pool.
+
+    Returns:
+        WeaviateConnectionPool singleton (created on first call).
+    """
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = WeaviateConnectionPool(
+                    max_size=int(os.getenv("WEAVIATE_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+                )
+                atexit.register(_pool.close_all)
+
+    return _pool
@@ -4,10 +4,11 @@ Conversation MCP Tools - Handlers for conversation-related operations.
 Provides tools for searching and retrieving conversations.
 """
 
-import weaviate
 from typing import Any, Dict
 from pydantic import BaseModel, Field
+from weaviate.classes.query import Filter
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
 
 
 class GetConversationInput(BaseModel):
@@ -40,7 +41,7 @@ async def get_conversation_handler(input_data: GetConversationInput) -> Dict[str
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get collection
@@ -48,7 +49,7 @@ async def get_conversation_handler(input_data: GetConversationInput) -> Dict[str
 
             # Fetch by conversation_id
             results = collection.query.fetch_objects(
-                filters=weaviate.classes.query.Filter.by_property("conversation_id").equal(input_data.conversation_id),
+                filters=Filter.by_property("conversation_id").equal(input_data.conversation_id),
                 limit=1,
             )
 
@@ -94,7 +95,7 @@ async def search_conversations_handler(input_data: SearchConversationsInput) ->
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get embedder
@@ -115,7 +116,7 @@ async def search_conversations_handler(input_data: SearchConversationsInput) ->
             # Apply category filter if provided
             if input_data.category_filter:
                 query_builder = query_builder.where(
-                    weaviate.classes.query.Filter.by_property("category").equal(input_data.category_filter)
+                    Filter.by_property("category").equal(input_data.category_filter)
                 )
 
             # Execute search
@@ -163,7 +164,7 @@ async def list_conversations_handler(input_data: ListConversationsInput) -> Dict
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get collection
@@ -172,7 +173,7 @@ async def list_conversations_handler(input_data: ListConversationsInput) -> Dict
             # Build query
             if input_data.category_filter:
                 results = collection.query.fetch_objects(
-                    filters=weaviate.classes.query.Filter.by_property("category").equal(input_data.category_filter),
+                    filters=Filter.by_property("category").equal(input_data.category_filter),
                     limit=input_data.limit,
                 )
             else:
@@ -21,26 +21,20 @@ import weaviate
 from pydantic import BaseModel, Field
 
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
+from ikario_processual.direction_registry import (
+    CATEGORY_TO_DIMENSION,
+    ClientDirectionSource,
+    DirectionSet,
+    get_direction_registry,
+)
+from ikario_processual.state_history import get_state_history
 
 
 # =============================================================================
-# Category -> Dimension mapping (must match state_to_language.py)
+# Category -> Dimension mapping (shared with ikario_processual)
 # =============================================================================
 
-CATEGORY_TO_DIMENSION = {
-    'epistemic': 'firstness',
-    'affective': 'dispositions',
-    'cognitive': 'thirdness',
-    'relational': 'engagements',
-    'ethical': 'valeurs',
-    'temporal': 'orientations',
-    'thematic': 'pertinences',
-    'metacognitive': 'secondness',
-    'vital': 'dispositions',
-    'ecosystemic': 'engagements',
-    'philosophical': 'thirdness',
-}
-
 DIMENSION_NAMES = [
     'firstness', 'secondness', 'thirdness',
     'dispositions', 'orientations', 'engagements',
@@ -108,13 +102,40 @@ class GetStateTensorInput(BaseModel):
 # =============================================================================
 
 
+def _tensor_from_history(state_id: Optional[int] = None) -> Optional[tuple[dict, dict]]:
+    """
+    Read a state from the local StateHistoryStore (latest state if state_id is None).
+
+    Weaviate only indexes keyframes and shocks, so the local history is the
+    authoritative source for state tensors. Returns None if the state is not
+    there (or the history cannot be opened), so callers fall back to Weaviate.
+    """
+    try:
+        history = get_state_history()
+        tensor = history.get_current() if state_id is None else history.get(state_id)
+    except Exception:
+        return None
+    if tensor is None:
+        return None
+    named_vectors = {
+        dim_name: getattr(tensor, dim_name).tolist() for dim_name in DIMENSION_NAMES
+    }
+    return tensor.to_dict(), named_vectors
+
+
 def get_latest_state_tensor(client: weaviate.WeaviateClient) -> tuple[dict, dict]:
     """
-    Get the latest StateTensor from Weaviate (v2 architecture).
+    Get the latest StateTensor (v2 architecture).
+
+    Read from the local state history; Weaviate is only queried as a fallback.
 
     Returns:
         Tuple of (properties dict, named_vectors dict[dim_name -> list[float]])
     """
+    local = _tensor_from_history()
+    if local is not None:
+        return local
+
     collection = client.collections.get("StateTensor")
 
     result = collection.query.fetch_objects(
@@ -148,9 +169,15 @@ def get_state_tensor_by_id(
     """
     Get a specific StateTensor by state_id.
 
+    Read from the local state history; Weaviate is only queried as a fallback.
+
     Returns:
         Tuple of (properties dict, named_vectors dict[dim_name -> list[float]])
     """
+    local = _tensor_from_history(state_id)
+    if local is not None:
+        return local
+
     collection = client.collections.get("StateTensor")
 
     from weaviate.classes.query import Filter
@@ -178,6 +205,16 @@ def get_state_tensor_by_id(
     return obj.properties, named_vectors
 
 
+def get_projection_directions(client: weaviate.WeaviateClient) -> DirectionSet:
+    """
+    Get the ProjectionDirection matrix from the process-wide registry.
+
+    Vectors are loaded once into a (D x 1024) float32 matrix and only
+    reloaded when the collection's etag (ids + update times) changes.
+    """
+    return get_direction_registry().snapshot(ClientDirectionSource(client))
+
+
 def get_all_projection_directions(client: weaviate.WeaviateClient) -> list[dict]:
     """
     Get all ProjectionDirection objects from Weaviate.
@@ -185,22 +222,13 @@ def get_all_projection_directions(client: weaviate.WeaviateClient) -> list[dict]
     Returns:
         List of direction objects with properties and vectors
     """
-    collection = client.collections.get("ProjectionDirection")
-
-    result = collection.query.fetch_objects(
-        limit=200,
-        include_vector=True
-    )
+    direction_set = get_projection_directions(client)
 
     directions = []
-    for obj in result.objects:
+    for i in direction_set.order.argsort():
         directions.append({
-            "name": obj.properties.get("name"),
-            "category": obj.properties.get("category"),
-            "pole_positive": obj.properties.get("pole_positive"),
-            "pole_negative": obj.properties.get("pole_negative"),
-            "description": obj.properties.get("description"),
-            "vector": obj.vector["default"]
+            **direction_set.records[i],
+            "vector": direction_set.matrix[i].tolist()
         })
 
     return directions
@@ -220,39 +248,23 @@ def compute_projection(state_vector: list, direction_vector: list) -> float:
 
 def build_tensor_profile(
     named_vectors: dict,
-    directions: list[dict]
+    directions: DirectionSet,
+    categories: Optional[List[str]] = None
 ) -> dict[str, dict[str, float]]:
     """
     Build a profile by projecting each direction onto the correct tensor dimension.
 
     Uses CATEGORY_TO_DIMENSION to map each direction's category to the right
-    dimension of the 8x1024 state tensor.
+    dimension of the 8x1024 state tensor; one matmul per dimension group.
 
     Returns:
         Dict[category, Dict[direction_name, projection_value]]
     """
-    profile = {}
-
-    for direction in directions:
-        category = direction["category"]
-        name = direction["name"]
-        dir_vector = direction["vector"]
-
-        # Map category to tensor dimension
-        dim_name = CATEGORY_TO_DIMENSION.get(category, "thirdness")
-        state_vector = named_vectors.get(dim_name)
-
-        if state_vector is None:
-            continue
-
-        projection = compute_projection(state_vector, dir_vector)
-
-        if category not in profile:
-            profile[category] = {}
-
-        profile[category][name] = round(projection, 4)
-
-    return profile
+    return directions.to_profile(
+        directions.project_tensor(named_vectors),
+        decimals=4,
+        categories=categories
+    )
 
 
 def get_david_messages(client: weaviate.WeaviateClient, max_messages: int) -> list[str]:
@@ -315,7 +327,7 @@ async def get_state_profile_handler(input_data: GetStateProfileInput) -> Dict[st
     with values for each direction (curiosity, certainty, etc.).
     """
     try:
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # 1. Get StateTensor (8 named vectors)
@@ -326,8 +338,8 @@ async def get_state_profile_handler(input_data: GetStateProfileInput) -> Dict[st
             else:
                 properties, named_vectors = get_latest_state_tensor(client)
 
-            # 2. Get all ProjectionDirections
-            directions = get_all_projection_directions(client)
+            # 2. Get all ProjectionDirections (cached matrix)
+            directions = get_projection_directions(client)
 
             if not directions:
                 return {
@@ -368,7 +380,7 @@ async def get_david_profile_handler(input_data: GetDavidProfileInput) -> Dict[st
     and optionally merges with declared profile values.
     """
     try:
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # 1. Get David's messages
@@ -387,7 +399,7 @@ async def get_david_profile_handler(input_data: GetDavidProfileInput) -> Dict[st
             david_vector = embedder.embed_batch([text])[0].tolist()
 
             # 3. Get directions and compute profile
-            directions = get_all_projection_directions(client)
+            directions = get_projection_directions(client)
 
             if not directions:
                 return {
@@ -467,7 +479,7 @@ async def compare_profiles_handler(input_data: CompareProfilesInput) -> Dict[str
     including convergent and divergent dimensions.
     """
     try:
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # 1. Get Ikario's state tensor
@@ -490,23 +502,21 @@ async def compare_profiles_handler(input_data: CompareProfilesInput) -> Dict[str
             david_named_vectors = {dim: david_vector for dim in DIMENSION_NAMES}
 
             # 3. Get directions
-            directions = get_all_projection_directions(client)
+            directions = get_projection_directions(client)
             if not directions:
                 return {
                     "success": False,
                     "error": "No ProjectionDirection found"
                 }
 
-            # 4. Filter directions by category if specified
-            if input_data.categories:
-                directions = [
-                    d for d in directions
-                    if d["category"] in input_data.categories
-                ]
-
-            # 5. Compute projections for both using tensor dimensions
-            ikario_profile = build_tensor_profile(ikario_vectors, directions)
-            david_profile = build_tensor_profile(david_named_vectors, directions)
+            # 4-5. Compute projections for both using tensor dimensions
+            # (filtered by category if specified)
+            ikario_profile = build_tensor_profile(
+                ikario_vectors, directions, input_data.categories
+            )
+            david_profile = build_tensor_profile(
+                david_named_vectors, directions, input_data.categories
+            )
 
             # 6. Build comparison
             comparison = {}
@@ -590,7 +600,7 @@ async def get_state_tensor_handler(input_data: GetStateTensorInput) -> Dict[str,
     Returns the 8 named dimension vectors for Ikario or a single embedding for David.
     """
     try:
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             if input_data.entity == "ikario":
@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict
 from pydantic import BaseModel, Field
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
+from ikario_processual.state_vector import record_new_object
 
 
 class AddMessageInput(BaseModel):
@@ -44,7 +46,7 @@ async def add_message_handler(input_data: AddMessageInput) -> Dict[str, Any]:
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get embedder
@@ -57,20 +59,22 @@ async def add_message_handler(input_data: AddMessageInput) -> Dict[str, Any]:
             collection = client.collections.get("Message")
 
             # Insert message
-            uuid = collection.data.insert(
-                properties={
-                    "content": input_data.content,
-                    "role": input_data.role,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+            properties = {
+                "content": input_data.content,
+                "role": input_data.role,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "conversation_id": input_data.conversation_id,
+                "order_index": input_data.order_index,
+                "conversation": {
                     "conversation_id": input_data.conversation_id,
-                    "order_index": input_data.order_index,
-                    "conversation": {
-                        "conversation_id": input_data.conversation_id,
-                        "category": "general",  # Default
-                    },
+                    "category": "general",  # Default
                 },
+            }
+            uuid = collection.data.insert(
+                properties=properties,
                 vector=vector.tolist()
             )
+            record_new_object("Message", uuid, vector, properties)
 
             return {
                 "success": True,
@@ -102,7 +106,7 @@ async def get_messages_handler(input_data: GetMessagesInput) -> Dict[str, Any]:
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get collection
@@ -157,7 +161,7 @@ async def search_messages_handler(input_data: SearchMessagesInput) -> Dict[str,
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get embedder
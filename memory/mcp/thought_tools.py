@@ -4,11 +4,12 @@ Thought MCP Tools - Handlers for thought-related operations.
 Provides tools for adding, searching, and retrieving thoughts from Weaviate.
 """
 
-import weaviate
 from datetime import datetime, timezone
 from typing import Any, Dict
 from pydantic import BaseModel, Field
 from memory.core import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
+from ikario_processual.state_vector import record_new_object
 
 
 class AddThoughtInput(BaseModel):
@@ -39,7 +40,7 @@ async def add_thought_handler(input_data: AddThoughtInput) -> Dict[str, Any]:
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get embedder
@@ -52,19 +53,21 @@ async def add_thought_handler(input_data: AddThoughtInput) -> Dict[str, Any]:
             collection = client.collections.get("Thought")
 
             # Insert thought
+            properties = {
+                "content": input_data.content,
+                "thought_type": input_data.thought_type,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "trigger": input_data.trigger,
+                "concepts": input_data.concepts,
+                "privacy_level": input_data.privacy_level,
+                "emotional_state": "",
+                "context": "",
+            }
             uuid = collection.data.insert(
-                properties={
-                    "content": input_data.content,
-                    "thought_type": input_data.thought_type,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "trigger": input_data.trigger,
-                    "concepts": input_data.concepts,
-                    "privacy_level": input_data.privacy_level,
-                    "emotional_state": "",
-                    "context": "",
-                },
+                properties=properties,
                 vector=vector.tolist()
             )
+            record_new_object("Thought", uuid, vector, properties)
 
             return {
                 "success": True,
@@ -95,7 +98,7 @@ async def search_thoughts_handler(input_data: SearchThoughtsInput) -> Dict[str,
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get embedder
@@ -165,7 +168,7 @@ async def get_thought_handler(uuid: str) -> Dict[str, Any]:
     """
     try:
         # Connect to Weaviate
-        client = weaviate.connect_to_local()
+        client = await get_weaviate_pool().acquire_async()
 
         try:
             # Get collection
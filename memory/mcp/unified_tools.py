@@ -7,14 +7,13 @@ Thoughts and Conversations collections.
 
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-import weaviate
 from weaviate.classes.query import MetadataQuery
-import os
 from datetime import datetime, timedelta
 import re
 
 # Import embedder for vector search (since Weaviate vectorizer is "none")
 from memory.core.embedding_service import get_embedder
+from memory.core.weaviate_pool import get_weaviate_pool
 
 
 # =============================================================================
@@ -54,23 +53,9 @@ class UpdateThoughtEvolutionStageInput(BaseModel):
 # =============================================================================
 
 
-def get_weaviate_client():
-    """Get Weaviate client from environment."""
-    url = os.environ.get("WEAVIATE_URL", "http://localhost:8080")
-    api_key = os.environ.get("WEAVIATE_API_KEY")
-
-    if api_key:
-        return weaviate.connect_to_custom(
-            http_host=url.replace("http://", "").replace("https://", "").split(":")[0],
-            http_port=int(url.split(":")[-1]) if ":" in url.split("/")[-1] else 8080,
-            http_secure=url.startswith("https"),
-            auth_credentials=weaviate.auth.AuthApiKey(api_key),
-        )
-    else:
-        return weaviate.connect_to_local(
-            host=url.replace("http://", "").replace("https://", "").split(":")[0],
-            port=int(url.split(":")[-1]) if ":" in url.split("/")[-1] else 8080,
-        )
+async def get_weaviate_client():
+    """Get a pooled Weaviate client (``close()`` returns it to the pool)."""
+    return await get_weaviate_pool().acquire_async()
 
 
 def parse_relative_date(date_str: str) -> Optional[datetime]:
@@ -116,7 +101,7 @@ async def search_memories_handler(input_data: SearchMemoriesInput) -> Dict[str,
     Uses near_vector with embedder since Weaviate vectorizer is "none".
     """
     try:
-        client = get_weaviate_client()
+        client = await get_weaviate_client()
         results = []
 
         # Get embedder for vector search
@@ -269,7 +254,7 @@ async def trace_concept_evolution_handler(input_data: TraceConceptEvolutionInput
     Uses near_vector with embedder since Weaviate vectorizer is "none".
     """
     try:
-        client = get_weaviate_client()
+        client = await get_weaviate_client()
         timeline = []
 
         # Get embedder for vector search
@@ -361,7 +346,7 @@ async def check_consistency_handler(input_data: CheckConsistencyInput) -> Dict[s
     Uses near_vector with embedder since Weaviate vectorizer is "none".
     """
     try:
-        client = get_weaviate_client()
+        client = await get_weaviate_client()
         related_content = []
 
         # Get embedder for vector search
@@ -474,7 +459,7 @@ async def update_thought_evolution_stage_handler(
         }
 
     try:
-        client = get_weaviate_client()
+        client = await get_weaviate_client()
         thought_collection = client.collections.get("Thought")
 
         # Try to find the thought by ID
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for MicroBatcher - coalescing, flush window, error propagation.
+
+The embedding function is a fake that records the batches it receives.
+
+Run: pytest memory/tests/test_embedding_batcher.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from memory.core.embedding_batcher import MicroBatcher
+
+
+class FakeEmbedder:
+    """Vector [len(text), index in batch]; optionally blocks or fails."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, texts):
+        self.gate.wait(timeout=5)
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("GPU out of memory")
+        return np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+class TestBatching:
+    """Concurrent requests share one embed call."""
+
+    def test_concurrent_requests_coalesced(self, embedder):
+        batcher = MicroBatcher(embedder, max_wait_ms=200)
+        futures = batcher.submit_many(["a", "bb", "ccc"])
+
+        vectors = [f.result(timeout=5) for f in futures]
+        batcher.close()
+
+        assert embedder.batches == [["a", "bb", "ccc"]]
+        assert [v[0] for v in vectors] == [1, 2, 3]
+
+    def test_max_batch_size_splits(self, embedder):
+        embedder.gate.clear()                  # hold the first batch
+        batcher = MicroBatcher(embedder, max_wait_ms=200, max_batch_size=2)
+        futures = batcher.submit_many([str(i) for i in range(5)])
+        embedder.gate.set()
+
+        for f in futures:
+            f.result(timeout=5)
+        batcher.close()
+
+        assert [len(b) for b in embedder.batches] == [2, 2, 1]
+        assert batcher.stats()["largest_batch"] == 2
+
+    def test_embed_many_keeps_order(self, embedder):
+        batcher = MicroBatcher(embedder, max_wait_ms=50)
+
+        vectors = batcher.embed_many(["x", "yyyy", "zz"], timeout=5)
+        batcher.close()
+
+        assert vectors[:, 0].tolist() == [1, 4, 2]
+
+
+class TestFlushWindow:
+    """A lone request is served once the window closes."""
+
+    def test_single_request_flushed_after_window(self, embedder):
+        batcher = MicroBatcher(embedder, max_wait_ms=50)
+        started = time.monotonic()
+
+        batcher.embed("solo", timeout=5)
+        elapsed = time.monotonic() - started
+        batcher.close()
+
+        assert embedder.batches == [["solo"]]
+        assert 0.04 <= elapsed < 2.0
+
+    def test_requests_after_window_form_new_batch(self, embedder):
+        batcher = MicroBatcher(embedder, max_wait_ms=10)
+
+        batcher.embed("first", timeout=5)
+        batcher.embed("second", timeout=5)
+        batcher.close()
+
+        assert embedder.batches == [["first"], ["second"]]
+
+
+class TestErrors:
+    """A failing batch fails every waiting caller."""
+
+    def test_error_propagates_to_all_waiters(self):
+        embedder = FakeEmbedder(fail=True)
+        batcher = MicroBatcher(embedder, max_wait_ms=100)
+        futures = batcher.submit_many(["a", "b"])
+
+        for f in futures:
+            with pytest.raises(RuntimeError, match="out of memory"):
+                f.result(timeout=5)
+        batcher.close()
+
+    def test_error_propagates_to_async_waiter(self):
+        batcher = MicroBatcher(FakeEmbedder(fail=True), max_wait_ms=10)
+
+        with pytest.raises(RuntimeError, match="out of memory"):
+            asyncio.run(batcher.aembed("a"))
+        batcher.close()
+
+    def test_batcher_survives_failed_batch(self):
+        embedder = FakeEmbedder(fail=True)
+        batcher = MicroBatcher(embedder, max_wait_ms=10)
+        with pytest.raises(RuntimeError):
+            batcher.embed("a", timeout=5)
+
+        embedder.fail = False
+        assert batcher.embed("bb", timeout=5)[0] == 2
+        batcher.close()
+
+
+class TestLifecycle:
+    """Async front-end and shutdown."""
+
+    def test_aembed_many(self, embedder):
+        batcher = MicroBatcher(embedder, max_wait_ms=50)
+
+        vectors = asyncio.run(batcher.aembed_many(["a", "bbb"]))
+        batcher.close()
+
+        assert vectors[:, 0].tolist() == [1, 3]
+        assert len(embedder.batches) == 1
+
+    def test_close_serves_queued_then_rejects(self, embedder):
+        embedder.gate.clear()
+        batcher = MicroBatcher(embedder, max_wait_ms=1)
+        future = batcher.submit("queued")
+        embedder.gate.set()
+        batcher.close()
+
+        assert future.result(timeout=5)[0] == 6
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("late")
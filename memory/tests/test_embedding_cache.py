@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for EmbeddingCache - memory LRU, SQLite tier, copy semantics.
+
+Run: pytest memory/tests/test_embedding_cache.py -v
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from memory.core import embedding_cache
+from memory.core.embedding_cache import EmbeddingCache, cache_key
+
+MODEL = "BAAI/bge-m3@test"
+
+
+def vectors_for(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def access_times(cache: EmbeddingCache) -> dict:
+    rows = cache._conn.execute("SELECT key, last_access FROM embeddings").fetchall()
+    return dict(rows)
+
+
+class TestMemoryTier:
+    """Hits, misses and LRU eviction in memory."""
+
+    def test_hit_and_miss(self):
+        cache = EmbeddingCache(MODEL)
+        cache.put_many(["a"], vectors_for(1))
+
+        vectors, missing = cache.get_many(["a", "b"])
+
+        assert missing == [1]
+        assert vectors[0] is not None and vectors[1] is None
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1 and stats["misses"] == 1
+
+    def test_key_normalizes_whitespace(self):
+        cache = EmbeddingCache(MODEL)
+        cache.put_many(["hello  world"], vectors_for(1))
+
+        _, missing = cache.get_many([" hello world\n"])
+
+        assert missing == []
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(MODEL, memory_size=2)
+        cache.put_many(["a", "b"], vectors_for(2))
+        cache.get_many(["a"])                  # "b" becomes least recently used
+        cache.put_many(["c"], vectors_for(1))
+
+        _, missing = cache.get_many(["a", "b", "c"])
+
+        assert missing == [1]
+
+
+class TestCopySemantics:
+    """Callers cannot corrupt cached vectors."""
+
+    def test_put_copies_input(self):
+        cache = EmbeddingCache(MODEL)
+        original = vectors_for(1)
+        cache.put_many(["a"], original)
+        expected = original[0].copy()
+
+        original[0] += 100.0
+
+        assert np.array_equal(cache.get_many(["a"])[0][0], expected)
+
+    def test_get_returns_copy(self):
+        cache = EmbeddingCache(MODEL)
+        cache.put_many(["a"], vectors_for(1))
+        expected = cache.get_many(["a"])[0][0].copy()
+
+        cache.get_many(["a"])[0][0][:] = 0.0
+
+        assert np.array_equal(cache.get_many(["a"])[0][0], expected)
+
+
+class TestDiskTier:
+    """SQLite round-trip, size bound and batched access times."""
+
+    def test_round_trip_across_instances(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite"
+        vectors = vectors_for(3)
+        EmbeddingCache(MODEL, path=path).put_many(["a", "b", "c"], vectors)
+
+        reopened = EmbeddingCache(MODEL, path=path)
+        found, missing = reopened.get_many(["a", "b", "c"])
+
+        assert missing == []
+        assert reopened.stats()["disk_hits"] == 3
+        for got, want in zip(found, vectors):
+            assert got.dtype == np.float32
+            assert np.allclose(got, want, atol=1e-2)   # stored as float16
+
+    def test_other_model_is_kept_but_never_returned(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite"
+        EmbeddingCache(MODEL, path=path).put_many(["a"], vectors_for(1))
+
+        other = EmbeddingCache("other-model", path=path)
+        _, missing = other.get_many(["a"])
+
+        assert missing == [0]
+        assert EmbeddingCache(MODEL, path=path).get_many(["a"])[1] == []
+
+    def test_disk_size_bound_evicts_least_recently_used(self, tmp_path):
+        cache = EmbeddingCache(MODEL, path=tmp_path / "e.sqlite", memory_size=1, disk_size=10)
+        texts = [f"t{i}" for i in range(10)]
+        cache.put_many(texts, vectors_for(10))
+        cache.get_many(["t0"])                 # t0 becomes recently used on disk
+
+        cache.put_many(["new"], vectors_for(1))
+
+        assert cache.stats()["disk_entries"] == 9
+        assert cache_key(MODEL, "t0") in access_times(cache)
+        assert cache_key(MODEL, "new") in access_times(cache)
+
+    def test_no_count_below_bound(self, tmp_path):
+        cache = EmbeddingCache(MODEL, path=tmp_path / "e.sqlite", disk_size=100)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+
+        for i in range(5):
+            cache.put_many([f"t{i}"], vectors_for(1, seed=i))
+
+        assert not any("COUNT" in s for s in statements)
+
+    def test_access_times_are_batched(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(embedding_cache, "ACCESS_FLUSH_SIZE", 3)
+        cache = EmbeddingCache(MODEL, path=tmp_path / "e.sqlite", memory_size=1)
+        cache.put_many(["a", "b", "c"], vectors_for(3))
+        before = access_times(cache)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+
+        cache.get_many(["a"])
+        cache.get_many(["b"])
+        assert not any(s.startswith("UPDATE") for s in statements)
+
+        cache.get_many(["c"])
+        assert any(s.startswith("UPDATE") for s in statements)
+        after = access_times(cache)
+        assert all(after[k] >= before[k] for k in before)
+
+    def test_flush_writes_pending_access(self, tmp_path):
+        cache = EmbeddingCache(MODEL, path=tmp_path / "e.sqlite", memory_size=1)
+        cache.put_many(["a", "b"], vectors_for(2))
+        cache.get_many(["a"])
+        assert cache._pending_access
+
+        cache.flush()
+
+        assert not cache._pending_access
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the embedding server and EmbeddingClient over a local socket.
+
+The served model is a fake embedder (no model is loaded).
+
+Run: pytest memory/tests/test_embedding_server.py -v
+"""
+
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from memory.core.embedding_server import EmbeddingClient, create_server
+
+DIM = 4
+
+
+class FakeEmbedder:
+    """Vector [len(text), 0, 0, 0]; texts starting with "!" fail."""
+
+    def embed_batch(self, texts):
+        if any(t.startswith("!") for t in texts):
+            raise ValueError("bad text")
+        return np.array([[len(t), 0, 0, 0] for t in texts], dtype=np.float32)
+
+    def embed_single(self, text):
+        return self.embed_batch([text])[0]
+
+    def get_model_info(self):
+        return {"model_name": "fake", "embedding_dim": DIM, "optimal_batch_size": 8}
+
+
+@pytest.fixture
+def client(tmp_path):
+    if hasattr(socket, "AF_UNIX"):
+        address = str(tmp_path / "embeddings.sock")
+    else:
+        address = "127.0.0.1:0"
+    server = create_server(address, FakeEmbedder())
+    if not hasattr(socket, "AF_UNIX"):
+        address = f"127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield EmbeddingClient(address, timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+class TestEmbeddingClient:
+    """Round trips through the server."""
+
+    def test_model_info(self, client):
+        assert client.model_name == "fake"
+        assert client.get_embedding_dimension() == DIM
+
+    def test_embed_batch_round_trip(self, client):
+        vectors = client.embed_batch(["a", "bbb"])
+
+        assert vectors.shape == (2, DIM)
+        assert vectors[:, 0].tolist() == [1, 3]
+
+    def test_embed_batch_returns_owned_writable_array(self, client):
+        vectors = client.embed_batch(["a", "bb"])
+
+        assert vectors.flags.writeable and vectors.flags.owndata
+        vectors /= 2.0                       # in-place normalization must work
+
+    def test_encode_single_text(self, client):
+        vector = client.encode("abcd")
+
+        assert vector.shape == (DIM,)
+        assert vector[0] == 4
+
+    def test_empty_batch(self, client):
+        assert client.embed_batch([]).shape == (0, DIM)
+
+    def test_server_error_raised_and_connection_reused(self, client):
+        with pytest.raises(RuntimeError, match="bad text"):
+            client.embed_batch(["!x"])
+
+        assert client.embed_single("ok")[0] == 2
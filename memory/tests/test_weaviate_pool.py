@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for WeaviateConnectionPool - re-entrancy and async borrowing.
+
+Connections are replaced by fake clients (no Weaviate server needed).
+
+Run: pytest memory/tests/test_weaviate_pool.py -v
+"""
+
+import asyncio
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from memory.core.weaviate_pool import WeaviateConnectionPool
+
+
+class FakeClient:
+    def is_ready(self):
+        return True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = WeaviateConnectionPool(max_size=1, acquire_timeout=2)
+    monkeypatch.setattr(pool, "_connect", FakeClient)
+    return pool
+
+
+class TestSyncAcquire:
+    """Nested borrows in one thread share a client."""
+
+    def test_nested_acquire_reuses_client(self, pool):
+        with pool.acquire() as outer:
+            with pool.acquire() as inner:
+                assert inner._client is outer._client
+        assert pool.get_stats()["idle"] == 1
+
+
+class TestAsyncAcquire:
+    """acquire_async waits in a worker thread, not on the event loop."""
+
+    def test_event_loop_keeps_running_while_waiting(self, pool):
+        async def scenario():
+            first = await pool.acquire_async()
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            waiting = asyncio.create_task(pool.acquire_async())
+            await asyncio.sleep(0.1)
+            assert not waiting.done()        # pool exhausted: still waiting
+            first.close()
+            second = await waiting
+            ticking.cancel()
+            second.close()
+            return ticks
+
+        assert asyncio.run(scenario()) >= 5
+        assert pool.get_stats()["idle"] == 1
+
+    def test_async_borrow_is_not_shared(self, monkeypatch):
+        pool = WeaviateConnectionPool(max_size=2, acquire_timeout=2)
+        monkeypatch.setattr(pool, "_connect", FakeClient)
+
+        async def scenario():
+            a = await pool.acquire_async()
+            b = await pool.acquire_async()
+            distinct = a._client is not b._client
+            a.close()
+            b.close()
+            return distinct
+
+        assert asyncio.run(scenario())
+
+    def test_cancelled_waiter_returns_its_client(self, pool):
+        async def scenario():
+            first = await pool.acquire_async()
+            waiting = asyncio.create_task(pool.acquire_async())
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            first.close()
+            await asyncio.sleep(0.2)         # worker thread gets and returns the client
+
+        asyncio.run(scenario())
+
+        assert pool.get_stats()["idle"] == 1
+        with pool.acquire():
+            pass